@@ -26,6 +26,7 @@ from juloserver.account.models import (
     CurrentCreditMatrix,
 )
 from juloserver.account.services.account_related import get_account_property_by_account
+from juloserver.account.services.credit_matrix_engine import get_current_credit_matrix
 from juloserver.account.utils import round_down_nearest
 from juloserver.ana_api.services import check_positive_processed_income
 from juloserver.ana_api.utils import check_app_cs_v20b
@@ -850,6 +851,12 @@ def get_credit_matrix_parameters(application):
 
 
 def get_credit_matrix(parameters, transaction_type, parameter: Q = None):
+    is_evaluated, credit_matrix = get_current_credit_matrix(
+        parameters, transaction_type, parameter
+    )
+    if is_evaluated:
+        return credit_matrix
+
     credit_matrix_ids = CurrentCreditMatrix.objects.filter(
         transaction_type=transaction_type
     ).values('credit_matrix_id')
@@ -866,7 +873,7 @@ def get_credit_matrix(parameters, transaction_type, parameter: Q = None):
     else:
         query_set = query_set.filter(parameter)
 
-    credit_matrix = query_set.order_by('-version', '-max_threshold').first()
+    credit_matrix = query_set.order_by('-version', '-max_threshold', '-id').first()
 
     return credit_matrix
 
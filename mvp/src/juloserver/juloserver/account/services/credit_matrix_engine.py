@@ -0,0 +1,302 @@
+"""
+Process-local engine for the current credit matrix lookups of get_credit_matrix.
+
+The current matrices of a transaction type are loaded once and sorted by min_threshold, so
+the min_threshold__lte filter of the pgood is a bisect and the other filters of the call are
+checked against the few matrices left. The filters are compiled to (attname, lookup, value)
+with the value converted like the ORM would, and the matrix is picked with the same ordering as
+the query. A filter the engine does not know raises UnsupportedCreditMatrixFilter and the
+caller queries the database.
+
+The matrices are reloaded when the version key in redis changes, which the CreditMatrix and
+CurrentCreditMatrix signals bump, and at least every max_age_seconds.
+"""
+import copy
+import logging
+import operator
+import threading
+import time
+from bisect import bisect_right
+from collections import defaultdict
+
+from django.db.models import Q
+
+from juloserver.account.models import CurrentCreditMatrix
+from juloserver.julo.constants import FeatureNameConst
+from juloserver.julo.models import CreditMatrix, FeatureSetting
+from juloserver.julo.services2 import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+CREDIT_MATRIX_ENGINE_VERSION_KEY = 'credit_matrix_engine:version'
+DEFAULT_CHECK_INTERVAL_SECONDS = 5
+DEFAULT_MAX_AGE_SECONDS = 10 * 60
+
+# lookup: comparison of the matrix value with the filter value, a null matrix value never
+# matches like in SQL
+COMPARISONS = {
+    'exact': operator.eq,
+    'lt': operator.lt,
+    'lte': operator.le,
+    'gt': operator.gt,
+    'gte': operator.ge,
+    'in': lambda value, values: value in values,
+}
+
+
+class UnsupportedCreditMatrixFilter(Exception):
+    pass
+
+
+def get_credit_matrix_engine_setting():
+    """
+    Return:
+        dict of check_interval_seconds and max_age_seconds when get_credit_matrix reads the
+        engine, None otherwise
+    """
+    feature_setting = FeatureSetting.objects.get_cached(
+        FeatureNameConst.CREDIT_MATRIX_ENGINE, is_active=True
+    )
+    if not feature_setting:
+        return None
+
+    parameters = feature_setting.parameters or {}
+    return dict(
+        check_interval_seconds=parameters.get(
+            'check_interval_seconds', DEFAULT_CHECK_INTERVAL_SECONDS
+        ),
+        max_age_seconds=parameters.get('max_age_seconds', DEFAULT_MAX_AGE_SECONDS),
+    )
+
+
+def compile_filter(key, value):
+    """(attname, lookup, value) of a CreditMatrix.objects.filter() keyword argument"""
+    parts = key.split('__')
+    if len(parts) > 2:
+        raise UnsupportedCreditMatrixFilter(key)
+
+    field_name, lookup = parts if len(parts) == 2 else (parts[0], 'exact')
+    if field_name == 'pk':
+        field_name = CreditMatrix._meta.pk.name
+    try:
+        field = CreditMatrix._meta.get_field(field_name)
+    except Exception:
+        raise UnsupportedCreditMatrixFilter(key)
+    if not field.concrete or (lookup not in COMPARISONS and lookup != 'isnull'):
+        raise UnsupportedCreditMatrixFilter(key)
+
+    if lookup == 'isnull':
+        return field.attname, 'isnull', bool(value)
+    if lookup == 'exact' and value is None:
+        return field.attname, 'isnull', True
+
+    def to_python(filter_value):
+        if field.is_relation:
+            filter_value = getattr(filter_value, 'pk', filter_value)
+            return field.target_field.to_python(filter_value)
+        return field.to_python(filter_value)
+
+    if lookup == 'in':
+        return field.attname, lookup, {to_python(item) for item in value if item is not None}
+    return field.attname, lookup, to_python(value)
+
+
+def compile_parameter_filter(parameter):
+    """The filters of the parameter argument of get_credit_matrix."""
+    if parameter is None:
+        return [('parameter', 'null_or_empty', None)]
+
+    if (
+        not isinstance(parameter, Q)
+        or parameter.negated
+        or len(parameter.children) != 1
+        or not isinstance(parameter.children[0], tuple)
+    ):
+        raise UnsupportedCreditMatrixFilter(str(parameter))
+
+    return [compile_filter(*parameter.children[0])]
+
+
+def matches(credit_matrix, compiled_filters):
+    for attname, lookup, filter_value in compiled_filters:
+        value = getattr(credit_matrix, attname)
+        if lookup == 'isnull':
+            if (value is None) != filter_value:
+                return False
+        elif lookup == 'null_or_empty':
+            if value not in (None, ''):
+                return False
+        elif value is None or not COMPARISONS[lookup](value, filter_value):
+            return False
+
+    return True
+
+
+def get_ordering_key(credit_matrix):
+    # order_by('-version', '-max_threshold', '-id'), version is never null here
+    return credit_matrix.version, credit_matrix.max_threshold, credit_matrix.id
+
+
+class CurrentCreditMatrixIndex:
+    """The current matrices of one transaction type sorted by min_threshold."""
+
+    def __init__(self, credit_matrices):
+        self.credit_matrices = sorted(credit_matrices, key=lambda matrix: matrix.min_threshold)
+        self.min_thresholds = [matrix.min_threshold for matrix in self.credit_matrices]
+
+    def find(self, compiled_filters):
+        candidates = self.credit_matrices
+        for attname, lookup, value in compiled_filters:
+            if attname == 'min_threshold' and lookup == 'lte':
+                candidates = candidates[:bisect_right(self.min_thresholds, value)]
+                break
+
+        found = None
+        for credit_matrix in candidates:
+            if matches(credit_matrix, compiled_filters) and (
+                found is None or get_ordering_key(credit_matrix) > get_ordering_key(found)
+            ):
+                found = credit_matrix
+        return found
+
+
+class CreditMatrixEngine:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._indexes = None
+        self._version = None
+        self._loaded_at = 0
+        self._checked_at = 0
+
+    def get_credit_matrix(self, parameters, transaction_type, parameter=None, setting=None):
+        """
+        Same result as the query of account.services.credit_limit.get_credit_matrix, a copy
+        of the loaded matrix is returned. Raise UnsupportedCreditMatrixFilter for a filter
+        the engine cannot evaluate.
+        """
+        setting = setting or dict(
+            check_interval_seconds=DEFAULT_CHECK_INTERVAL_SECONDS,
+            max_age_seconds=DEFAULT_MAX_AGE_SECONDS,
+        )
+        compiled_filters = [compile_filter(key, value) for key, value in parameters.items()]
+        compiled_filters += compile_parameter_filter(parameter)
+
+        index = self._get_indexes(setting).get(transaction_type)
+        if not index:
+            return None
+
+        credit_matrix = index.find(compiled_filters)
+        return copy.deepcopy(credit_matrix) if credit_matrix else None
+
+    def invalidate(self):
+        """Drop the matrices of this process and tell the other processes to drop theirs."""
+        self._indexes = None
+        get_redis_client().increment(CREDIT_MATRIX_ENGINE_VERSION_KEY)
+
+    def clear(self):
+        """Drop the matrices of this process only."""
+        self._indexes = None
+
+    def _get_indexes(self, setting):
+        indexes = self._indexes
+        if indexes is not None and not self._is_check_due(setting):
+            return indexes
+
+        with self._lock:
+            if self._indexes is not None and not self._is_check_due(setting):
+                return self._indexes
+
+            # read the version before the rows, a change in between only costs one more reload
+            version = get_redis_client().get(CREDIT_MATRIX_ENGINE_VERSION_KEY)
+            if (
+                self._indexes is None
+                or version != self._version
+                or time.monotonic() - self._loaded_at >= setting['max_age_seconds']
+            ):
+                self._indexes = self._load()
+                self._version = version
+                self._loaded_at = time.monotonic()
+            self._checked_at = time.monotonic()
+
+            return self._indexes
+
+    def _load(self):
+        start = time.monotonic()
+        current_credit_matrix_ids = defaultdict(set)
+        for credit_matrix_id, transaction_type in CurrentCreditMatrix.objects.values_list(
+            'credit_matrix_id', 'transaction_type'
+        ):
+            current_credit_matrix_ids[transaction_type].add(credit_matrix_id)
+
+        credit_matrices = defaultdict(list)
+        for credit_matrix in CreditMatrix.objects.filter(
+            id__in={
+                credit_matrix_id
+                for credit_matrix_ids in current_credit_matrix_ids.values()
+                for credit_matrix_id in credit_matrix_ids
+            },
+            version__isnull=False,
+        ):
+            # the matrix must be current for its own transaction type
+            if credit_matrix.id in current_credit_matrix_ids[credit_matrix.transaction_type]:
+                credit_matrices[credit_matrix.transaction_type].append(credit_matrix)
+
+        logger.info({
+            'action': 'CreditMatrixEngine._load',
+            'seconds': round(time.monotonic() - start, 3),
+            'credit_matrices': {
+                transaction_type: len(matrices)
+                for transaction_type, matrices in credit_matrices.items()
+            },
+        })
+        return {
+            transaction_type: CurrentCreditMatrixIndex(matrices)
+            for transaction_type, matrices in credit_matrices.items()
+        }
+
+    def _is_check_due(self, setting):
+        return time.monotonic() - self._checked_at >= setting['check_interval_seconds']
+
+
+credit_matrix_engine = CreditMatrixEngine()
+
+
+def get_current_credit_matrix(parameters, transaction_type, parameter=None):
+    """
+    Return:
+        (True, credit matrix or None) when the engine is enabled and can evaluate the
+        filters, (False, None) when the database has to be queried
+    """
+    setting = get_credit_matrix_engine_setting()
+    if not setting:
+        return False, None
+
+    try:
+        return True, credit_matrix_engine.get_credit_matrix(
+            parameters, transaction_type, parameter, setting
+        )
+    except UnsupportedCreditMatrixFilter as e:
+        logger.info({
+            'action': 'get_current_credit_matrix',
+            'message': 'unsupported filter, fallback to database',
+            'filter': str(e),
+        })
+    except Exception as e:
+        logger.warning({
+            'action': 'get_current_credit_matrix',
+            'message': 'fallback to database',
+            'error': str(e),
+        })
+    return False, None
+
+
+def invalidate_credit_matrix_engine():
+    try:
+        credit_matrix_engine.invalidate()
+    except Exception as e:
+        # the other processes still pick the change up at max_age_seconds
+        credit_matrix_engine.clear()
+        logger.error({
+            'action': 'invalidate_credit_matrix_engine',
+            'error': str(e),
+        })
@@ -13,10 +13,12 @@ from juloserver.account.models import (
     AccountLimitHistory,
     AccountStatusHistory,
     AccountTransaction,
+    CurrentCreditMatrix,
 )
+from juloserver.account.services.credit_matrix_engine import invalidate_credit_matrix_engine
 from juloserver.cfs.constants import CfsActionPointsActivity
 from juloserver.cfs.services.core_services import tracking_fraud_case_for_action_points
-from juloserver.julo.models import AccountingCutOffDate, Device
+from juloserver.julo.models import AccountingCutOffDate, CreditMatrix, Device
 from juloserver.julo.statuses import JuloOneCodes
 from juloserver.julo.utils import execute_after_transaction_safely
 from juloserver.moengage.services.use_cases import (
@@ -184,3 +186,11 @@ def update_user_timezone_account_level(sender, instance, created, **kwargs):
         from juloserver.account.tasks.account_task import update_user_timezone_async
 
         update_user_timezone_async.delay(instance.id)
+
+
+@receiver(signals.post_save, sender=CreditMatrix)
+@receiver(signals.post_delete, sender=CreditMatrix)
+@receiver(signals.post_save, sender=CurrentCreditMatrix)
+@receiver(signals.post_delete, sender=CurrentCreditMatrix)
+def invalidate_credit_matrix_engine_after_change(sender, instance, **kwargs):
+    execute_after_transaction_safely(invalidate_credit_matrix_engine)
@@ -0,0 +1,141 @@
+from unittest import mock
+
+from django.db.models import Q
+from django.test import TestCase
+
+from juloserver.account.services.credit_limit import get_credit_matrix
+from juloserver.account.services.credit_matrix_engine import (
+    CreditMatrixEngine,
+    UnsupportedCreditMatrixFilter,
+)
+from juloserver.apiv2.services import compile_custom_logic, evaluate_custom_logic
+from juloserver.julo.constants import FeatureNameConst
+from juloserver.julo.services2.redis_helper import MockRedisHelper
+from juloserver.julo.tests.factories import (
+    CreditMatrixFactory,
+    CurrentCreditMatrixFactory,
+    FeatureSettingFactory,
+)
+
+
+def create_current_credit_matrix(transaction_type='self', **kwargs):
+    data = dict(
+        parameter=None,
+        credit_matrix_type='julo1',
+        is_salaried=False,
+        is_premium_area=False,
+        is_fdc=False,
+        transaction_type=transaction_type,
+    )
+    data.update(kwargs)
+    credit_matrix = CreditMatrixFactory(**data)
+    CurrentCreditMatrixFactory(credit_matrix=credit_matrix, transaction_type=transaction_type)
+    return credit_matrix
+
+
+@mock.patch('juloserver.account.services.credit_matrix_engine.get_redis_client')
+class TestCreditMatrixEngine(TestCase):
+    def setUp(self):
+        self.redis_client = MockRedisHelper()
+        self.engine = CreditMatrixEngine()
+        create_current_credit_matrix(score='C', min_threshold=0, max_threshold=0.75, version=1)
+        create_current_credit_matrix(score='B', min_threshold=0.75, max_threshold=0.9, version=1)
+        create_current_credit_matrix(score='B+', min_threshold=0.75, max_threshold=0.9, version=2)
+        create_current_credit_matrix(score='A-', min_threshold=0.9, max_threshold=1, version=2)
+        create_current_credit_matrix(
+            score='A', min_threshold=0.9, max_threshold=1, version=2, is_salaried=True
+        )
+        create_current_credit_matrix(
+            score='B', min_threshold=0, max_threshold=1, version=3, parameter='feature:is_goldfish'
+        )
+        create_current_credit_matrix(
+            score='A-', min_threshold=0, max_threshold=1, version=3, parameter=''
+        )
+        create_current_credit_matrix(
+            transaction_type='ecommerce', score='B', min_threshold=0, max_threshold=1, version=1
+        )
+        # not current and no version
+        CreditMatrixFactory(
+            score='A', min_threshold=0, max_threshold=1, version=9, transaction_type='self'
+        )
+        create_current_credit_matrix(score='A', min_threshold=0, max_threshold=1, version=None)
+
+    def test_same_selection_as_the_orm(self, mock_get_redis_client):
+        mock_get_redis_client.return_value = self.redis_client
+        cases = []
+        for pgood in (0, 0.5, 0.75, 0.8, 0.9, 0.95, 1, 1.2):
+            for is_salaried in (True, False):
+                for credit_matrix_type in ('julo1', 'julo1_entry_level'):
+                    cases.append(
+                        dict(
+                            min_threshold__lte=pgood,
+                            max_threshold__gte=pgood,
+                            credit_matrix_type=credit_matrix_type,
+                            is_salaried=is_salaried,
+                        )
+                    )
+        cases.append(dict(score='B', score_tag__isnull=True))
+        cases.append(dict(score__in=['B', 'B+'], max_threshold__lt=1))
+
+        for transaction_type in ('self', 'ecommerce', 'other'):
+            for parameter in (None, Q(parameter='feature:is_goldfish')):
+                for parameters in cases:
+                    expected = get_credit_matrix(parameters, transaction_type, parameter)
+                    result = self.engine.get_credit_matrix(parameters, transaction_type, parameter)
+                    self.assertEqual(
+                        getattr(result, 'id', None),
+                        getattr(expected, 'id', None),
+                        (parameters, transaction_type, parameter),
+                    )
+
+    def test_no_query_after_load(self, mock_get_redis_client):
+        mock_get_redis_client.return_value = self.redis_client
+        parameters = dict(min_threshold__lte=0.95, max_threshold__gte=0.95, is_salaried=True)
+        self.engine.get_credit_matrix(parameters, 'self')
+
+        with self.assertNumQueries(0):
+            credit_matrix = self.engine.get_credit_matrix(parameters, 'self')
+        self.assertEqual(credit_matrix.score, 'A')
+
+    def test_reload_after_invalidate(self, mock_get_redis_client):
+        mock_get_redis_client.return_value = self.redis_client
+        parameters = dict(min_threshold__lte=0.95, max_threshold__gte=0.95, is_salaried=False)
+        self.assertEqual(self.engine.get_credit_matrix(parameters, 'self').score, 'A-')
+
+        create_current_credit_matrix(score='A', min_threshold=0.9, max_threshold=1, version=4)
+        self.engine.invalidate()
+
+        self.assertEqual(self.engine.get_credit_matrix(parameters, 'self').score, 'A')
+
+    def test_unsupported_filter(self, mock_get_redis_client):
+        mock_get_redis_client.return_value = self.redis_client
+
+        with self.assertRaises(UnsupportedCreditMatrixFilter):
+            self.engine.get_credit_matrix(dict(score__icontains='a'), 'self')
+        with self.assertRaises(UnsupportedCreditMatrixFilter):
+            self.engine.get_credit_matrix({}, 'self', ~Q(parameter='feature:is_goldfish'))
+
+    def test_get_credit_matrix_reads_the_engine(self, mock_get_redis_client):
+        mock_get_redis_client.return_value = self.redis_client
+        FeatureSettingFactory(feature_name=FeatureNameConst.CREDIT_MATRIX_ENGINE)
+        parameters = dict(min_threshold__lte=0.8, max_threshold__gte=0.8)
+
+        with mock.patch(
+            'juloserver.account.services.credit_matrix_engine.credit_matrix_engine', self.engine
+        ):
+            self.assertEqual(get_credit_matrix(parameters, 'self').score, 'B+')
+            # a filter the engine does not know is queried
+            self.assertEqual(
+                get_credit_matrix(dict(parameters, score__icontains='b'), 'self').score, 'B+'
+            )
+
+
+class TestCompileCustomLogic(TestCase):
+    def test_compiled_once(self):
+        parameter = 'job_industry:banking or repeat_time:>3'
+
+        self.assertIs(compile_custom_logic(parameter), compile_custom_logic(parameter))
+        self.assertTrue(evaluate_custom_logic(parameter, dict(job_industry='banking')))
+        self.assertTrue(evaluate_custom_logic(parameter, dict(job_industry='it', repeat_time=4)))
+        self.assertFalse(evaluate_custom_logic(parameter, dict(job_industry='it', repeat_time=1)))
+        self.assertIsNone(evaluate_custom_logic('', {}))
@@ -41,6 +41,7 @@ class FeatureNameConst:
     REINQUIRY_PAYMENT_STATUS = "reinquiry_payment_status"
     AUTOMATE_LATE_FEE_VOID = "automate_late_fee_void"
     EXCLUDE_GRAB_FROM_UPDATE_PAYMENT_STATUS = "exclude_grab_from_update_payment_status"
+    BATCH_ACCOUNT_PAYMENT_STATUS_UPDATE = "batch_account_payment_status_update"
 
 
 class LateFeeBlockReason:
@@ -0,0 +1,100 @@
+import random
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+
+from juloserver.account_payment.models import AccountPayment
+from juloserver.account_payment.services.account_payment_status_engine import (
+    DEFAULT_CHUNK_SIZE,
+    get_account_payment_id_chunks,
+    get_account_payment_status_changes,
+    process_account_payment_status_chunk,
+)
+from juloserver.julo.product_lines import ProductLineCodes
+from juloserver.julo.statuses import PaymentStatusCodes
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark the batch account payment status computation on synthetic rows, '
+        'or with --dry-run compare it against the per-row status of the real unpaid rows'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000000)
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+        parser.add_argument('--dry-run', action='store_true')
+        parser.add_argument('--limit', type=int, default=10000)
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            self.dry_run(options['chunk_size'], options['limit'])
+        else:
+            self.benchmark(options['rows'], options['chunk_size'])
+
+    def benchmark(self, rows, chunk_size):
+        today = date.today()
+        product_line_ids = {
+            account_id: random.choice((ProductLineCodes.J1, ProductLineCodes.DAGANGAN))
+            for account_id in range(rows // 3 + 1)
+        }
+        account_payments = [
+            {
+                'id': account_payment_id,
+                'account_id': account_payment_id // 3,
+                'due_date': today - timedelta(days=random.randint(-10, 200)),
+                'status_id': PaymentStatusCodes.PAYMENT_NOT_DUE,
+            }
+            for account_payment_id in range(rows)
+        ]
+
+        start = time.time()
+        changes = get_account_payment_status_changes(account_payments, product_line_ids, today)
+        elapsed = time.time() - start
+
+        changed_count = sum(
+            1 for change in changes if change.old_status_code != change.new_status_code
+        )
+        chunk_count = (rows + chunk_size - 1) // chunk_size
+        self.stdout.write(
+            self.style.SUCCESS(
+                '{} rows computed in {:.2f}s, {} changed. '
+                'celery messages: {} per row, {} batched'.format(
+                    rows, elapsed, changed_count, rows, chunk_count
+                )
+            )
+        )
+
+    def dry_run(self, chunk_size, limit):
+        unpaid_account_payments = AccountPayment.objects.not_paid_active().exclude(
+            due_date__isnull=True
+        )[:limit]
+        unpaid_account_payment_ids = list(unpaid_account_payments.values_list('id', flat=True))
+        account_payments = AccountPayment.objects.filter(id__in=unpaid_account_payment_ids)
+
+        mismatch_count = 0
+        checked_count = 0
+        for account_payment_ids in get_account_payment_id_chunks(account_payments, chunk_size):
+            result = process_account_payment_status_chunk(account_payment_ids, dry_run=True)
+            for change in result.changes:
+                checked_count += 1
+                account_payment = AccountPayment.objects.get(pk=change.account_payment_id)
+                expected_status_code = account_payment.get_status_based_on_due_date()
+                if expected_status_code != change.new_status_code:
+                    mismatch_count += 1
+                    self.stdout.write(
+                        self.style.ERROR(
+                            'account_payment {}: per-row {}, batch {}'.format(
+                                change.account_payment_id,
+                                expected_status_code,
+                                change.new_status_code,
+                            )
+                        )
+                    )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                '{} account payments checked, {} mismatches'.format(checked_count, mismatch_count)
+            )
+        )
@@ -580,43 +580,54 @@ class AccountPayment(AccountPaymentModel):
                     highest_payment_status_code = grab_payment_status_code
             if highest_payment_status_code:
                 return highest_payment_status_code
-        if self.dpd < -self.DUE_SOON_DAYS:
+        return self.get_status_code_by_dpd(
+            self.dpd, lambda: self.account.last_application.product_line_id
+        )
+
+    @classmethod
+    def get_status_code_by_dpd(cls, dpd, get_product_line_id):
+        """
+        Map a non-grab account payment dpd to its payment status code.
+        get_product_line_id is a callable, it is only called when the dpd needs the product line
+        of the account's last application.
+        """
+        if dpd < -cls.DUE_SOON_DAYS:
             return PaymentStatusCodes.PAYMENT_NOT_DUE
-        elif self.dpd < -1:
+        elif dpd < -1:
             return PaymentStatusCodes.PAYMENT_DUE_IN_3_DAYS
-        elif self.dpd < 0:
+        elif dpd < 0:
             return PaymentStatusCodes.PAYMENT_DUE_IN_1_DAYS
-        elif self.dpd == 0:
+        elif dpd == 0:
             return PaymentStatusCodes.PAYMENT_DUE_TODAY
-        elif self.account.last_application.product_line_id == ProductLineCodes.DAGANGAN and\
-                self.dpd == 4:
+        elif get_product_line_id() == ProductLineCodes.DAGANGAN and dpd == 4:
             return PaymentStatusCodes.PAYMENT_4DPD
-        elif self.dpd < 5:
+        elif dpd < 5:
             return PaymentStatusCodes.PAYMENT_1DPD
-        elif self.dpd < 30:
-            if self.account.last_application.product_line_id in {
+        elif dpd < 30:
+            product_line_id = get_product_line_id()
+            if product_line_id in {
                 ProductLineCodes.KOPERASI_TUNAS,
                 ProductLineCodes.KOPERASI_TUNAS_45,
             }:
-                if self.dpd < 8:
+                if dpd < 8:
                     return PaymentStatusCodes.PAYMENT_1DPD
                 else:
                     return PaymentStatusCodes.PAYMENT_8DPD
-            elif self.account.last_application.product_line_id == ProductLineCodes.DAGANGAN:
+            elif product_line_id == ProductLineCodes.DAGANGAN:
                 return PaymentStatusCodes.PAYMENT_4DPD
             else:
                 return PaymentStatusCodes.PAYMENT_5DPD
-        elif self.dpd < 60:
+        elif dpd < 60:
             return PaymentStatusCodes.PAYMENT_30DPD
-        elif self.dpd < 90:
+        elif dpd < 90:
             return PaymentStatusCodes.PAYMENT_60DPD
-        elif self.dpd < 120:
+        elif dpd < 120:
             return PaymentStatusCodes.PAYMENT_90DPD
-        elif self.dpd < 150:
+        elif dpd < 150:
             return PaymentStatusCodes.PAYMENT_120DPD
-        elif self.dpd < 180:
+        elif dpd < 180:
             return PaymentStatusCodes.PAYMENT_150DPD
-        elif self.dpd >= 180:
+        elif dpd >= 180:
             return PaymentStatusCodes.PAYMENT_180DPD
 
     def change_status(self, status_code):
@@ -1735,59 +1735,87 @@ def process_crm_unpaid_loan_account_details_list(account_payment):
     data = []
     for payment_obj in payments:
         loan = payment_obj.loan
-        if loan and loan.oldest_unpaid_payment:
-            fe_display_name = '-'
-            transaction_date = '-'
-            due_date = '-'
-            loan_amount = '-'
-            calculated_overdue_unpaid_amount = '-'
-            calculated_total_due_amount = '-'
-            transaction_method = payment_obj.loan.transaction_method
-            if transaction_method and transaction_method.fe_display_name:
-                fe_display_name = transaction_method.fe_display_name
-            if loan.fund_transfer_ts:
-                transaction_date = loan.fund_transfer_ts.strftime('%d %b %Y')
-            if loan.oldest_unpaid_payment.due_date:
-                due_date = loan.oldest_unpaid_payment.due_date.strftime('%d %b %Y')
-            if loan.oldest_unpaid_payment.payment_number:
-                installment_count = str(loan.oldest_unpaid_payment.payment_number)
-            else:
-                installment_count = '-'
-            if loan.total_installment_count:
-                installment_count += "/" + str(loan.total_installment_count)
-            else:
-                installment_count += "/-"
-            if loan.loan_amount:
-                loan_amount = format_rupiahs(loan.loan_amount, "no")
-            if loan.calculated_overdue_unpaid_amount:
-                calculated_overdue_unpaid_amount = format_rupiahs(
-                    loan.calculated_overdue_unpaid_amount, "no"
-                )
-            if loan.calculated_total_due_amount:
-                calculated_total_due_amount = format_rupiahs(loan.calculated_total_due_amount, "no")
-            section_data = {
-                "count": count,
-                "transaction_method": fe_display_name,
-                "transaction_date": transaction_date,
-                "due_date": due_date,
-                "installment_count": installment_count,
-                "loan_amount": loan_amount,
-                "calculated_overdue_unpaid_amount": calculated_overdue_unpaid_amount,
-                "calculated_total_due_amount": calculated_total_due_amount,
-                "loan_id": loan.id,
-                "total_paid_amount": loan.calculated_total_paid_amount
-                if loan.calculated_total_paid_amount
-                else '-',
-            }
+        if not loan:
+            continue
 
-            count += 1
-            data.append(section_data)
+        oldest_unpaid_payment = loan.oldest_unpaid_payment
+        if not oldest_unpaid_payment:
+            continue
+
+        data.append(
+            construct_unpaid_loan_account_detail(
+                count,
+                loan,
+                oldest_unpaid_payment,
+                total_installment_count=loan.total_installment_count,
+                calculated_overdue_unpaid_amount=loan.calculated_overdue_unpaid_amount,
+                calculated_total_due_amount=loan.calculated_total_due_amount,
+                calculated_total_paid_amount=loan.calculated_total_paid_amount,
+            )
+        )
+        count += 1
     if data:
         result.append({"attributes": data})
 
     return result
 
 
+def construct_unpaid_loan_account_detail(
+    count,
+    loan,
+    oldest_unpaid_payment,
+    total_installment_count,
+    calculated_overdue_unpaid_amount,
+    calculated_total_due_amount,
+    calculated_total_paid_amount,
+):
+    """
+    The loan amounts are passed in, so the caller can load them for many loans at once.
+    """
+    fe_display_name = '-'
+    transaction_date = '-'
+    due_date = '-'
+    loan_amount = '-'
+    formatted_overdue_unpaid_amount = '-'
+    formatted_total_due_amount = '-'
+    transaction_method = loan.transaction_method
+    if transaction_method and transaction_method.fe_display_name:
+        fe_display_name = transaction_method.fe_display_name
+    if loan.fund_transfer_ts:
+        transaction_date = loan.fund_transfer_ts.strftime('%d %b %Y')
+    if oldest_unpaid_payment.due_date:
+        due_date = oldest_unpaid_payment.due_date.strftime('%d %b %Y')
+    if oldest_unpaid_payment.payment_number:
+        installment_count = str(oldest_unpaid_payment.payment_number)
+    else:
+        installment_count = '-'
+    if total_installment_count:
+        installment_count += "/" + str(total_installment_count)
+    else:
+        installment_count += "/-"
+    if loan.loan_amount:
+        loan_amount = format_rupiahs(loan.loan_amount, "no")
+    if calculated_overdue_unpaid_amount:
+        formatted_overdue_unpaid_amount = format_rupiahs(calculated_overdue_unpaid_amount, "no")
+    if calculated_total_due_amount:
+        formatted_total_due_amount = format_rupiahs(calculated_total_due_amount, "no")
+
+    return {
+        "count": count,
+        "transaction_method": fe_display_name,
+        "transaction_date": transaction_date,
+        "due_date": due_date,
+        "installment_count": installment_count,
+        "loan_amount": loan_amount,
+        "calculated_overdue_unpaid_amount": formatted_overdue_unpaid_amount,
+        "calculated_total_due_amount": formatted_total_due_amount,
+        "loan_id": loan.id,
+        "total_paid_amount": calculated_total_paid_amount
+        if calculated_total_paid_amount
+        else '-',
+    }
+
+
 def get_new_late_fee_calculation(payment_id):
     payment = Payment.objects.get_or_none(pk=payment_id)
     total_late_fee = 0
@@ -0,0 +1,324 @@
+"""
+Set-based nightly account payment status update.
+
+The unpaid account payments are ordered by due date and cut into chunks, so one chunk covers
+a contiguous DPD range. Every chunk is processed in one transaction: the new statuses are
+computed in memory, written with one UPDATE per status code, and the status histories are
+inserted with one bulk_create. The per-row side effects that cannot be done in bulk (account
+status change, old late fee rule, account transaction) are only run for the rows that need them.
+"""
+import logging
+from collections import defaultdict, namedtuple
+from datetime import date
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from juloserver.account.constants import AccountConstant
+from juloserver.account.models import Account
+from juloserver.account.services.account_related import (
+    update_account_status_based_on_account_payment,
+)
+from juloserver.account_payment.constants import FeatureNameConst
+from juloserver.account_payment.models import (
+    AccountPayment,
+    AccountPaymentStatusHistory,
+    LateFeeRule,
+)
+from juloserver.julo.models import Application, FeatureSetting, Payment, PaymentEvent
+from juloserver.julo.services import update_late_fee_amount
+from juloserver.julo.statuses import PaymentStatusCodes
+from juloserver.julo.utils import execute_after_transaction_safely
+from juloserver.julo.constants import WorkflowConst
+from juloserver.moengage.constants import ACCOUNT_PAYMENT_STATUS_CHANGE_EVENTS
+
+logger = logging.getLogger(__name__)
+
+STATUS_CHANGE_REASON = 'update_based_on_dpd'
+DEFAULT_CHUNK_SIZE = 2000
+
+AccountPaymentStatusChange = namedtuple(
+    'AccountPaymentStatusChange',
+    ['account_payment_id', 'account_id', 'dpd', 'old_status_code', 'new_status_code'],
+)
+
+AccountPaymentStatusChunkResult = namedtuple(
+    'AccountPaymentStatusChunkResult',
+    ['changes', 'grab_account_payment_ids', 'payment_ids'],
+)
+
+
+def get_batch_status_update_chunk_size():
+    """
+    Return:
+        the chunk size when the batch engine is enabled, None otherwise
+    """
+    feature_setting = FeatureSetting.objects.get_cached(
+        FeatureNameConst.BATCH_ACCOUNT_PAYMENT_STATUS_UPDATE, is_active=True
+    )
+    if not feature_setting:
+        return None
+
+    return (feature_setting.parameters or {}).get('chunk_size', DEFAULT_CHUNK_SIZE)
+
+
+def get_id_chunks(ids, chunk_size=DEFAULT_CHUNK_SIZE):
+    chunk = []
+    for id in ids:
+        chunk.append(id)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+
+def get_account_payment_id_chunks(queryset, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yield lists of account payment ids ordered by due date,
+    so every chunk covers a contiguous DPD range.
+    """
+    account_payment_ids = queryset.order_by('due_date', 'id').values_list('id', flat=True)
+    return get_id_chunks(account_payment_ids.iterator(), chunk_size)
+
+
+def get_last_application_product_line_ids(account_ids):
+    """Same product line as account.last_application for every account, in one query."""
+    return dict(
+        Application.objects.filter(account_id__in=account_ids)
+        .order_by('account_id', '-id')
+        .distinct('account_id')
+        .values_list('account_id', 'product_line_id')
+    )
+
+
+def get_account_payment_status_changes(account_payments, product_line_ids, today=None):
+    """
+    Compute the new status of every account payment in memory.
+
+    Arguments:
+        account_payments: iterable of dict with id, account_id, due_date and status_id
+        product_line_ids: dict of account id to the product line of its last application
+    Return:
+        list of AccountPaymentStatusChange, including the rows whose status stays the same
+    """
+    today = today or date.today()
+    changes = []
+    for account_payment in account_payments:
+        account_id = account_payment['account_id']
+        due_date = account_payment['due_date']
+        dpd = (today - due_date).days if due_date else 0
+        new_status_code = AccountPayment.get_status_code_by_dpd(
+            dpd, lambda account_id=account_id: product_line_ids.get(account_id)
+        )
+        changes.append(
+            AccountPaymentStatusChange(
+                account_payment_id=account_payment['id'],
+                account_id=account_id,
+                dpd=dpd,
+                old_status_code=account_payment['status_id'],
+                new_status_code=new_status_code,
+            )
+        )
+
+    return changes
+
+
+def is_account_status_affected(change, account_status_id):
+    """
+    Same guards as update_account_status_based_on_account_payment,
+    to skip the call for the rows where it does nothing.
+    """
+    if account_status_id in AccountConstant.NO_CHANGE_BY_DPD_STATUSES:
+        return False
+
+    if account_status_id == AccountConstant.STATUS_CODE.suspended:
+        return False
+
+    return (
+        change.new_status_code == PaymentStatusCodes.PAYMENT_1DPD
+        or PaymentStatusCodes.PAYMENT_5DPD
+        <= change.new_status_code
+        <= PaymentStatusCodes.PAYMENT_180DPD
+    )
+
+
+def process_account_payment_status_chunk(account_payment_ids, dry_run=False):
+    """
+    Update the status of a chunk of account payments, in one transaction.
+
+    Grab account payments are not processed, their ids are returned so the caller can
+    run the per-row task for them. With dry_run the changes are computed and returned
+    without any write or row lock.
+    """
+    with transaction.atomic():
+        account_payments = AccountPayment.objects.filter(
+            id__in=account_payment_ids, status_id__lt=PaymentStatusCodes.PAID_ON_TIME
+        )
+        if not dry_run:
+            account_payments = account_payments.select_for_update()
+        account_payments = list(
+            account_payments.values('id', 'account_id', 'due_date', 'status_id')
+        )
+
+        account_ids = {account_payment['account_id'] for account_payment in account_payments}
+        accounts = {
+            account['id']: account
+            for account in Account.objects.filter(id__in=account_ids).values(
+                'id', 'status_id', 'account_lookup__workflow__name'
+            )
+        }
+
+        grab_account_payment_ids = []
+        non_grab_account_payments = []
+        for account_payment in account_payments:
+            account = accounts[account_payment['account_id']]
+            if account['account_lookup__workflow__name'] == WorkflowConst.GRAB:
+                grab_account_payment_ids.append(account_payment['id'])
+            else:
+                non_grab_account_payments.append(account_payment)
+
+        product_line_ids = get_last_application_product_line_ids(
+            {account_payment['account_id'] for account_payment in non_grab_account_payments}
+        )
+        changes = get_account_payment_status_changes(non_grab_account_payments, product_line_ids)
+        if dry_run or not changes:
+            return AccountPaymentStatusChunkResult(changes, grab_account_payment_ids, [])
+
+        update_account_payment_statuses(changes)
+
+        for change in changes:
+            if is_account_status_affected(change, accounts[change.account_id]['status_id']):
+                account_payment = AccountPayment.objects.select_related('account').get(
+                    pk=change.account_payment_id
+                )
+                update_account_status_based_on_account_payment(account_payment)
+
+        payment_ids = apply_old_rule_late_fees(
+            [change.account_payment_id for change in changes]
+        )
+
+    logger.info(
+        {
+            'action': 'process_account_payment_status_chunk',
+            'account_payment_count': len(changes),
+            'changed_count': sum(
+                1 for change in changes if change.old_status_code != change.new_status_code
+            ),
+            'grab_account_payment_count': len(grab_account_payment_ids),
+        }
+    )
+    return AccountPaymentStatusChunkResult(changes, grab_account_payment_ids, payment_ids)
+
+
+def update_account_payment_statuses(changes):
+    """Write the new statuses with one UPDATE per status code and bulk insert the histories."""
+    now = timezone.localtime(timezone.now())
+    account_payment_ids_by_status = defaultdict(list)
+    for change in changes:
+        account_payment_ids_by_status[change.new_status_code].append(change.account_payment_id)
+
+    for status_code, account_payment_ids in account_payment_ids_by_status.items():
+        AccountPayment.objects.filter(id__in=account_payment_ids).update(
+            status_id=status_code, udate=now
+        )
+
+    status_histories = AccountPaymentStatusHistory.objects.bulk_create(
+        [
+            AccountPaymentStatusHistory(
+                account_payment_id=change.account_payment_id,
+                status_old_id=change.old_status_code,
+                status_new_id=change.new_status_code,
+                change_reason=STATUS_CHANGE_REASON,
+            )
+            for change in changes
+            if change.old_status_code != change.new_status_code
+        ]
+    )
+    send_status_change_to_moengage(status_histories)
+
+
+def send_status_change_to_moengage(status_histories):
+    """
+    bulk_create does not send post_save, so do what
+    account_payment.signals.update_moengage_for_status_change does for every history.
+    """
+    from juloserver.moengage.services.use_cases import (
+        update_moengage_for_account_payment_status_change,
+    )
+
+    event_status_codes = set(
+        ACCOUNT_PAYMENT_STATUS_CHANGE_EVENTS[0] + ACCOUNT_PAYMENT_STATUS_CHANGE_EVENTS[1]
+    )
+    status_histories = [
+        status_history
+        for status_history in status_histories
+        if status_history.status_new_id in event_status_codes
+    ]
+    if not status_histories:
+        return
+
+    account_payments = AccountPayment.objects.select_related('account').in_bulk(
+        [status_history.account_payment_id for status_history in status_histories]
+    )
+    account_ids = {account_payment.account_id for account_payment in account_payments.values()}
+    oldest_account_payment_ids = set(
+        AccountPayment.objects.filter(account_id__in=account_ids)
+        .not_paid_active()
+        .order_by('account_id', 'due_date')
+        .distinct('account_id')
+        .values_list('id', flat=True)
+    )
+    for status_history in status_histories:
+        if status_history.account_payment_id not in oldest_account_payment_ids:
+            continue
+
+        status_history.account_payment = account_payments[status_history.account_payment_id]
+        execute_after_transaction_safely(
+            lambda status_history=status_history: (
+                update_moengage_for_account_payment_status_change.apply_async(
+                    (status_history, status_history.status_new_id),
+                    countdown=settings.DELAY_FOR_REALTIME_EVENTS,
+                )
+            )
+        )
+
+
+def apply_old_rule_late_fees(account_payment_ids):
+    """
+    Run the per-row late fee of the products without LateFeeRule, those with LateFeeRule
+    are handled by new_late_fee_generation_task. Then create the account transactions of
+    today's late fee events.
+
+    Return:
+        list of the unpaid payment ids of the account payments
+    """
+    from juloserver.account.tasks.scheduled_tasks import (
+        update_account_transaction_for_late_fee_event_subtask,
+    )
+
+    payments = list(
+        Payment.objects.not_paid_active()
+        .filter(account_payment_id__in=account_payment_ids)
+        .values_list('id', 'loan__product_id')
+    )
+    new_rule_product_ids = set(
+        LateFeeRule.objects.values_list('product_lookup_id', flat=True).distinct()
+    )
+    for payment_id, product_id in payments:
+        if product_id not in new_rule_product_ids:
+            update_late_fee_amount(payment_id)
+
+    payment_ids = [payment_id for payment_id, _ in payments]
+    late_fee_payment_event_ids = PaymentEvent.objects.filter(
+        event_date=date.today(),
+        event_type='late_fee',
+        payment_id__in=payment_ids,
+        account_transaction__isnull=True,
+    ).values_list('id', flat=True)
+    for payment_event_id in late_fee_payment_event_ids:
+        update_account_transaction_for_late_fee_event_subtask(payment_event_id)
+
+    return payment_ids
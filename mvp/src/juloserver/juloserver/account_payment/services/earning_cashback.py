@@ -312,9 +312,9 @@ def get_cashback_experiment(account_id):
 
 def get_due_date_for_cashback_new_scheme():
     due_date_cashback = -3
-    cashback_feature_setting = FeatureSetting.objects.filter(
-        feature_name=MinisqaudFeatureNameConst.CASHBACK_NEW_SCHEME, is_active=True
-    ).last()
+    cashback_feature_setting = FeatureSetting.objects.get_cached(
+        MinisqaudFeatureNameConst.CASHBACK_NEW_SCHEME, is_active=True
+    )
     if cashback_feature_setting:
         due_date_cashback = cashback_feature_setting.parameters.get('due_date', -3)
 
@@ -325,9 +325,9 @@ def get_paramters_cashback_new_scheme(is_return_all_params: bool = False):
     due_date_cashback = -3
     cashback_counter_map = {'1': 1, '2': 1, '3': 2, '4': 2, '5': 4}
     cashback_new_scheme_params = dict()
-    cashback_feature_setting = FeatureSetting.objects.filter(
-        feature_name=MinisqaudFeatureNameConst.CASHBACK_NEW_SCHEME, is_active=True
-    ).last()
+    cashback_feature_setting = FeatureSetting.objects.get_cached(
+        MinisqaudFeatureNameConst.CASHBACK_NEW_SCHEME, is_active=True
+    )
     if cashback_feature_setting:
         due_date_cashback = cashback_feature_setting.parameters.get('due_date', due_date_cashback)
         cashback_counter_map = cashback_feature_setting.parameters.get(
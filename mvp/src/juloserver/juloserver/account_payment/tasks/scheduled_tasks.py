@@ -17,6 +17,12 @@ from juloserver.account_payment.models import AccountPayment, CheckoutRequest
 from juloserver.account_payment.services.account_payment_history import (
     update_account_payment_status_history,
 )
+from juloserver.account_payment.services.account_payment_status_engine import (
+    get_account_payment_id_chunks,
+    get_batch_status_update_chunk_size,
+    get_id_chunks,
+    process_account_payment_status_chunk,
+)
 from juloserver.grab.constants import GRAB_ACCOUNT_LOOKUP_NAME
 from juloserver.julo.statuses import PaymentStatusCodes
 from juloserver.account_payment.services.collection_related import (
@@ -77,10 +83,47 @@ def update_account_payment_status():
             account__account_lookup__name=GRAB_ACCOUNT_LOOKUP_NAME
         )
 
+    chunk_size = get_batch_status_update_chunk_size()
+    if chunk_size:
+        for account_payment_ids in get_account_payment_id_chunks(
+            unpaid_account_payments, chunk_size
+        ):
+            update_account_payment_status_chunk_subtask.delay(account_payment_ids)
+        return
+
     for unpaid_account_payments_id in unpaid_account_payments.values_list("id", flat=True):
         update_account_payment_status_subtask.delay(unpaid_account_payments_id)
 
 
+@task(queue="update_account_payment", bind=True, max_retries=3)
+def update_account_payment_status_chunk_subtask(self, account_payment_ids):
+    """
+    Batched version of update_account_payment_status_subtask for a DPD-partitioned chunk
+    """
+    from juloserver.julo.tasks import update_payment_status_chunk_subtask
+
+    try:
+        result = process_account_payment_status_chunk(account_payment_ids)
+    except Exception as exc:
+        logger.error(
+            {
+                "task": "update_account_payment_status_chunk_subtask",
+                "first_account_payment_id": account_payment_ids[0],
+                "account_payment_count": len(account_payment_ids),
+                "error": str(exc),
+            }
+        )
+        raise self.retry(countdown=60, exc=exc)
+
+    for account_payment_id in result.grab_account_payment_ids:
+        update_account_payment_status_subtask.delay(account_payment_id)
+
+    if result.payment_ids:
+        update_payment_status_chunk_subtask.apply_async(
+            (result.payment_ids,), queue='update_account_payment'
+        )
+
+
 @task(queue="update_account_payment",
       bind=True,
       max_retries=5,
@@ -547,6 +590,8 @@ def new_late_fee_generation_task():
         .only('id', 'loan_id', 'loan__product_id', 'late_fee_applied', 'payment_status', 'due_date')
     )
     generation_attempt = 0
+    chunk_size = get_batch_status_update_chunk_size()
+    payment_ids = []
     for payment in unpaid_payments.iterator():
         product_late_fee_rules = late_fee_rule_counts_dict.get(payment.loan.product_id)
         if (
@@ -554,9 +599,15 @@ def new_late_fee_generation_task():
             and product_late_fee_rules.get(payment.late_fee_applied + 1)
             and product_late_fee_rules.get(payment.late_fee_applied + 1) <= payment.get_dpd
         ):
-            new_late_fee_generation_subtask.delay(payment.id)
+            if chunk_size:
+                payment_ids.append(payment.id)
+            else:
+                new_late_fee_generation_subtask.delay(payment.id)
             generation_attempt += 1
 
+    for payment_ids_chunk in get_id_chunks(payment_ids, chunk_size):
+        new_late_fee_generation_chunk_subtask.delay(payment_ids_chunk)
+
     logger.info(
         {
             "action": "juloserver.account_payment.tasks."
@@ -575,3 +626,23 @@ def new_late_fee_generation_subtask(payment_id):
     with transaction.atomic():
         new_update_late_fee(payment_id)
         update_account_transaction_for_late_fee_event(payment_id)
+
+
+@task(queue='update_account_payment')
+def new_late_fee_generation_chunk_subtask(payment_ids):
+    """
+    One task for a chunk of payments instead of one new_late_fee_generation_subtask per payment.
+    Every payment still has its own transaction, one failure does not stop the others.
+    """
+    for payment_id in payment_ids:
+        try:
+            new_late_fee_generation_subtask(payment_id)
+        except Exception as e:
+            get_julo_sentry_client().captureException()
+            logger.error(
+                {
+                    "task": "new_late_fee_generation_chunk_subtask",
+                    "payment_id": payment_id,
+                    "error": str(e),
+                }
+            )
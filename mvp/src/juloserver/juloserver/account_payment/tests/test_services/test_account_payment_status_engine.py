@@ -0,0 +1,87 @@
+from datetime import date, timedelta
+
+from django.test import TestCase
+
+from juloserver.account_payment.models import AccountPayment
+from juloserver.account_payment.services.account_payment_status_engine import (
+    AccountPaymentStatusChange,
+    get_account_payment_status_changes,
+    get_id_chunks,
+    is_account_status_affected,
+)
+from juloserver.account.constants import AccountConstant
+from juloserver.julo.product_lines import ProductLineCodes
+from juloserver.julo.statuses import PaymentStatusCodes
+
+
+class TestGetStatusCodeByDpd(TestCase):
+    def get_status_code(self, dpd, product_line_id=ProductLineCodes.J1):
+        return AccountPayment.get_status_code_by_dpd(dpd, lambda: product_line_id)
+
+    def test_not_due(self):
+        self.assertEqual(self.get_status_code(-10), PaymentStatusCodes.PAYMENT_NOT_DUE)
+        self.assertEqual(self.get_status_code(-3), PaymentStatusCodes.PAYMENT_DUE_IN_3_DAYS)
+        self.assertEqual(self.get_status_code(-1), PaymentStatusCodes.PAYMENT_DUE_IN_1_DAYS)
+        self.assertEqual(self.get_status_code(0), PaymentStatusCodes.PAYMENT_DUE_TODAY)
+
+    def test_overdue(self):
+        self.assertEqual(self.get_status_code(4), PaymentStatusCodes.PAYMENT_1DPD)
+        self.assertEqual(self.get_status_code(5), PaymentStatusCodes.PAYMENT_5DPD)
+        self.assertEqual(self.get_status_code(30), PaymentStatusCodes.PAYMENT_30DPD)
+        self.assertEqual(self.get_status_code(179), PaymentStatusCodes.PAYMENT_150DPD)
+        self.assertEqual(self.get_status_code(500), PaymentStatusCodes.PAYMENT_180DPD)
+
+    def test_product_line(self):
+        self.assertEqual(
+            self.get_status_code(4, ProductLineCodes.DAGANGAN), PaymentStatusCodes.PAYMENT_4DPD
+        )
+        self.assertEqual(
+            self.get_status_code(7, ProductLineCodes.KOPERASI_TUNAS),
+            PaymentStatusCodes.PAYMENT_1DPD,
+        )
+        self.assertEqual(
+            self.get_status_code(8, ProductLineCodes.KOPERASI_TUNAS),
+            PaymentStatusCodes.PAYMENT_8DPD,
+        )
+
+    def test_product_line_not_needed(self):
+        get_product_line_id = lambda: self.fail('product line should not be loaded')
+        AccountPayment.get_status_code_by_dpd(-5, get_product_line_id)
+        AccountPayment.get_status_code_by_dpd(100, get_product_line_id)
+
+
+class TestGetAccountPaymentStatusChanges(TestCase):
+    def test_get_account_payment_status_changes(self):
+        today = date(2024, 1, 31)
+        account_payments = [
+            {'id': 1, 'account_id': 10, 'due_date': today, 'status_id': 311},
+            {'id': 2, 'account_id': 11, 'due_date': today - timedelta(days=4), 'status_id': 312},
+            {'id': 3, 'account_id': 12, 'due_date': today - timedelta(days=4), 'status_id': 312},
+        ]
+        product_line_ids = {11: ProductLineCodes.DAGANGAN}
+
+        changes = get_account_payment_status_changes(account_payments, product_line_ids, today)
+
+        self.assertEqual(
+            changes,
+            [
+                AccountPaymentStatusChange(1, 10, 0, 311, PaymentStatusCodes.PAYMENT_DUE_TODAY),
+                AccountPaymentStatusChange(2, 11, 4, 312, PaymentStatusCodes.PAYMENT_4DPD),
+                AccountPaymentStatusChange(3, 12, 4, 312, PaymentStatusCodes.PAYMENT_1DPD),
+            ],
+        )
+
+    def test_is_account_status_affected(self):
+        change = AccountPaymentStatusChange(1, 10, 5, 320, PaymentStatusCodes.PAYMENT_5DPD)
+        self.assertTrue(is_account_status_affected(change, AccountConstant.STATUS_CODE.active))
+        self.assertFalse(
+            is_account_status_affected(change, AccountConstant.STATUS_CODE.suspended)
+        )
+
+        change = change._replace(new_status_code=PaymentStatusCodes.PAYMENT_DUE_TODAY)
+        self.assertFalse(is_account_status_affected(change, AccountConstant.STATUS_CODE.active))
+
+    def test_get_id_chunks(self):
+        self.assertEqual(list(get_id_chunks(range(5), 2)), [[0, 1], [2, 3], [4]])
+        self.assertEqual(list(get_id_chunks([], 2)), [])
+
@@ -1,8 +1,13 @@
+import logging
+import time
+from collections import namedtuple
 from datetime import timedelta
+from functools import lru_cache
 
 import semver
 from cuser.middleware import CuserMiddleware
 from dateutil.relativedelta import relativedelta
+from django.db import router
 from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
 from rest_framework import exceptions
@@ -12,9 +17,12 @@ from juloserver.julo.constants import FeatureNameConst
 from juloserver.julo.models import FeatureSetting
 
 from juloserver.julocore.cache_client import get_token_cache
+from juloserver.julocore.http_transport import TransportMetrics
 from juloserver.api_token.constants import (
     EXPIRY_SETTING_KEYWORD,
-    REFRESH_TOKEN_EXPIRY
+    EXPIRY_TOKEN_RECORD_KEY,
+    REFRESH_TOKEN_EXPIRY,
+    SLOW_AUTHENTICATION_SECONDS,
 )
 from abc import ABC, abstractmethod
 from typing import Dict, Any
@@ -24,6 +32,15 @@ from juloserver.api_token.constants import REFRESH_TOKEN_MIN_APP_VERSION
 from juloserver.api_token.models import ExpiryToken
 from typing import Tuple, Union
 
+logger = logging.getLogger(__name__)
+
+ExpiryTokenPolicy = namedtuple(
+    'ExpiryTokenPolicy', ['expiry_range', 'refresh_token_min_app_version']
+)
+
+# authentication latency per path, "fast_path" or "default"
+authentication_metrics = TransportMetrics()
+
 
 def get_token_version_header(request):
     token_version = request.META.get('HTTP_TOKEN_VERSION', '')
@@ -34,6 +51,19 @@ class ExpiryTokenAuthentication(TokenAuthentication):
     model = ExpiryToken
 
     def authenticate(self, request):
+        self.is_fast_path = self.use_fast_path()
+        start = time.time()
+        try:
+            return self._authenticate(request)
+        finally:
+            record_authentication_latency(
+                'fast_path' if self.is_fast_path else 'default', time.time() - start
+            )
+
+    def use_fast_path(self):
+        return is_authentication_fast_path_enabled()
+
+    def _authenticate(self, request):
         result = super().authenticate(request)
         if not result:
             return result
@@ -56,7 +86,10 @@ class ExpiryTokenAuthentication(TokenAuthentication):
     def authenticate_credentials(self, key):
         model = self.get_model()
         try:
-            token = get_expiry_token(key, model)
+            if getattr(self, 'is_fast_path', False):
+                token = get_expiry_token_from_record(key)
+            else:
+                token = get_expiry_token(key, model)
         except model.DoesNotExist:
             raise exceptions.AuthenticationFailed(_('Invalid token.'))
 
@@ -66,6 +99,49 @@ class ExpiryTokenAuthentication(TokenAuthentication):
         return (token.user, token)
 
 
+def is_authentication_fast_path_enabled():
+    return bool(
+        FeatureSetting.objects.get_cached(
+            FeatureNameConst.EXPIRY_TOKEN_AUTHENTICATION_FAST_PATH, is_active=True
+        )
+    )
+
+
+def record_authentication_latency(path, elapsed):
+    authentication_metrics.record(path, elapsed, is_error=False)
+    if elapsed >= SLOW_AUTHENTICATION_SECONDS:
+        logger.warning(
+            {
+                'action': 'expiry_token_authentication',
+                'path': path,
+                'elapsed_ms': round(elapsed * 1000, 2),
+            }
+        )
+
+
+def get_expiry_token_policy():
+    """
+    The expiry token setting resolved from the process feature setting cache,
+    so it is read from the database only after the setting is changed.
+    """
+    expiry_setting = FeatureSetting.objects.get_cached(
+        FeatureNameConst.EXPIRY_TOKEN_SETTING, is_active=True
+    )
+    if not expiry_setting or not expiry_setting.parameters:
+        return ExpiryTokenPolicy(None, None)
+
+    expiry_hours = expiry_setting.parameters.get(EXPIRY_SETTING_KEYWORD)
+    return ExpiryTokenPolicy(
+        timedelta(hours=expiry_hours) if isinstance(expiry_hours, int) else None,
+        expiry_setting.parameters.get(REFRESH_TOKEN_MIN_APP_VERSION),
+    )
+
+
+@lru_cache(maxsize=1024)
+def is_older_app_version(app_version, min_app_version):
+    return semver.match(app_version, "<{}".format(min_app_version))
+
+
 def is_expired_token(expiry_token: ExpiryToken, app_version: str = None) \
         -> Tuple[Union[bool, None], Union[timedelta, None]]:
     """
@@ -79,17 +155,9 @@ def is_expired_token(expiry_token: ExpiryToken, app_version: str = None) \
     Returns:
         tuple: A tuple containing the processed boolean value and the timedelta obj.
     """
-    expiry_range = get_expiry_range()
-    expiry_setting = FeatureSetting.objects.get_or_none(
-        feature_name=FeatureNameConst.EXPIRY_TOKEN_SETTING, is_active=True
-    )
-    if expiry_setting and expiry_setting.parameters:
-        refresh_token_min_app_version = expiry_setting.parameters.get(REFRESH_TOKEN_MIN_APP_VERSION)
-    else:
-        refresh_token_min_app_version = None
-
+    expiry_range, refresh_token_min_app_version = get_expiry_token_policy()
     if (app_version and refresh_token_min_app_version
-            and semver.match(app_version, "<{}".format(refresh_token_min_app_version))):
+            and is_older_app_version(app_version, refresh_token_min_app_version)):
         return None, None  # Expiry Token from the old app version will not be expired.
 
     if not expiry_token.is_never_expire and expiry_token.is_active and expiry_range is not None:
@@ -106,15 +174,7 @@ def is_expired_token(expiry_token: ExpiryToken, app_version: str = None) \
 
 
 def get_expiry_range():
-    expiry_setting = FeatureSetting.objects.get_or_none(
-        feature_name=FeatureNameConst.EXPIRY_TOKEN_SETTING, is_active=True
-    )
-    if expiry_setting and expiry_setting.parameters:
-        expiry_hours = expiry_setting.parameters.get(EXPIRY_SETTING_KEYWORD)
-        if isinstance(expiry_hours, int):
-            return timedelta(hours=expiry_hours)
-
-    return None
+    return get_expiry_token_policy().expiry_range
 
 
 def generate_new_token(user):
@@ -146,6 +206,56 @@ def get_expiry_token(key, model=ExpiryToken):
     return token
 
 
+def get_model_values(instance):
+    return [
+        getattr(instance, field_instance.attname)
+        for field_instance in instance._meta.concrete_fields
+    ]
+
+
+def build_instance_from_values(model_class, values):
+    field_names = [field_instance.attname for field_instance in model_class._meta.concrete_fields]
+    if len(values) != len(field_names):
+        return None
+    return model_class.from_db(router.db_for_read(model_class), field_names, values)
+
+
+def build_expiry_token_record(expiry_token):
+    return dict(
+        token=get_model_values(expiry_token),
+        user=get_model_values(expiry_token.user),
+    )
+
+
+def build_expiry_token_from_record(record):
+    user_model = ExpiryToken._meta.get_field('user').related_model
+    expiry_token = build_instance_from_values(ExpiryToken, record['token'])
+    user = build_instance_from_values(user_model, record['user'])
+    if not expiry_token or not user:
+        return None
+
+    expiry_token.user = user
+    return expiry_token
+
+
+def get_expiry_token_from_record(key):
+    """
+    Same as get_expiry_token, but the token cache keeps the field values of the token and
+    its user instead of the pickled objects. The signals delete the record on any change.
+    """
+    token_cache = get_token_cache()
+    record_key = EXPIRY_TOKEN_RECORD_KEY.format(key)
+    record = token_cache.get(record_key)
+    if record:
+        expiry_token = build_expiry_token_from_record(record)
+        if expiry_token:
+            return expiry_token
+
+    expiry_token = ExpiryToken.objects.select_related('user').get(key=key)
+    token_cache.set(record_key, build_expiry_token_record(expiry_token))
+    return expiry_token
+
+
 class WebToken(ABC):
     _supported_algorithm = {'HS256': hashlib.sha256}
 
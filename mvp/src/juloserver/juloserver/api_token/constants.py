@@ -4,6 +4,9 @@ CACHE_TIMEOUT = 3600  # 1 hour
 REFRESH_TOKEN_EXPIRY = 'refresh_token_expiry'
 REFRESH_TOKEN_MIN_APP_VERSION = 'refresh_token_min_app_version'
 
+EXPIRY_TOKEN_RECORD_KEY = 'expiry_token_record:v1:{}'
+SLOW_AUTHENTICATION_SECONDS = 0.1
+
 
 class TokenType:
     ACCESS_TOKEN = "access_token"
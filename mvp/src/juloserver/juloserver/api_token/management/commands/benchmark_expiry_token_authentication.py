@@ -0,0 +1,69 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+
+from juloserver.api_token.authentication import ExpiryTokenAuthentication
+from juloserver.api_token.models import ExpiryToken
+from juloserver.julocore.http_transport import get_percentile
+
+
+class BenchmarkExpiryTokenAuthentication(ExpiryTokenAuthentication):
+    def __init__(self, is_fast_path):
+        super().__init__()
+        self.is_fast_path_benchmark = is_fast_path
+
+    def use_fast_path(self):
+        return self.is_fast_path_benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark ExpiryTokenAuthentication.authenticate end to end, with the pickled token '
+        'cache and with the token record fast path: p50/p99 latency and queries per request'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=1000)
+        parser.add_argument('--user-id', type=int)
+        parser.add_argument('--app-version', default='8.13.0')
+
+    def handle(self, *args, **options):
+        expiry_tokens = ExpiryToken.objects.select_related('user').filter(user__is_active=True)
+        if options['user_id']:
+            expiry_tokens = expiry_tokens.filter(user_id=options['user_id'])
+        expiry_token = expiry_tokens.first()
+        if not expiry_token:
+            self.stdout.write(self.style.ERROR('no active user with an expiry token'))
+            return
+
+        request = APIRequestFactory().get(
+            '/api/auth/v1/check-expire-early',
+            HTTP_AUTHORIZATION='Token ' + expiry_token.key,
+            HTTP_X_APP_VERSION=options['app_version'],
+        )
+        for name, is_fast_path in (('default', False), ('fast path', True)):
+            authentication = BenchmarkExpiryTokenAuthentication(is_fast_path)
+            authentication.authenticate(request)  # fill the token cache
+
+            latencies = []
+            with CaptureQueriesContext(connection) as queries:
+                for _ in range(options['requests']):
+                    start = time.time()
+                    authentication.authenticate(request)
+                    latencies.append(time.time() - start)
+
+            latencies.sort()
+            self.stdout.write(
+                self.style.SUCCESS(
+                    '{}: {} requests, p50 {:.3f}ms, p99 {:.3f}ms, {:.2f} queries/request'.format(
+                        name,
+                        options['requests'],
+                        get_percentile(latencies, 50) * 1000,
+                        get_percentile(latencies, 99) * 1000,
+                        len(queries.captured_queries) / float(options['requests']),
+                    )
+                )
+            )
@@ -4,17 +4,22 @@ from django.dispatch import receiver
 
 from juloserver.julo.models import AuthUser
 from .cache_client import get_token_cache
+from .constants import EXPIRY_TOKEN_RECORD_KEY
 from .models import ExpiryToken
 
 
+def delete_token_cache(key):
+    token_cache = get_token_cache()
+    token_cache.delete_many([key, EXPIRY_TOKEN_RECORD_KEY.format(key)])
+
+
 @receiver(post_save, sender=settings.AUTH_USER_MODEL)
 def on_auth_user_updated(sender, instance=None, created=False, **kwargs):
     """A signal is caught after a user is created to create a api token for
     the user.
     """
     if not created and hasattr(instance, "auth_expiry_token"):
-        token_cache = get_token_cache()
-        token_cache.delete(instance.auth_expiry_token.key)
+        delete_token_cache(instance.auth_expiry_token.key)
 
 
 @receiver(post_save, sender=AuthUser)
@@ -23,8 +28,7 @@ def on_auth_user_pii_updated(sender, instance=None, created=False, **kwargs):
     the user.
     """
     if not created and hasattr(instance, "auth_expiry_token"):
-        token_cache = get_token_cache()
-        token_cache.delete(instance.auth_expiry_token.key)
+        delete_token_cache(instance.auth_expiry_token.key)
 
 
 @receiver(post_save, sender=ExpiryToken)
@@ -33,8 +37,7 @@ def on_expiry_token_updated(sender, instance=None, created=False, **kwargs):
     the user.
     """
     if not created:
-        token_cache = get_token_cache()
-        token_cache.delete(instance.initial_key)
+        delete_token_cache(instance.initial_key)
 
 
 @receiver(post_init, sender=ExpiryToken)
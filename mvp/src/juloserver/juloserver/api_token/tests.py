@@ -6,10 +6,13 @@ import mock
 import pytest
 from cuser.middleware import CuserMiddleware
 from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import connection
 from django.test import TestCase
-from django.test.utils import override_settings
+from django.test.utils import CaptureQueriesContext, override_settings
 from django.utils import timezone
 from mock import ANY, patch
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.test import APIClient, APIRequestFactory, APITestCase
 import pytest
 
@@ -135,6 +138,41 @@ class TestExpiryTokenAuthentication(TestCase):
         self.assertEqual(self.user, ret_user)
         self.assertEqual(self.user, CuserMiddleware.get_user())
 
+    @patch('juloserver.api_token.signals.get_token_cache')
+    @patch('juloserver.api_token.authentication.get_token_cache')
+    def test_authenticate_fast_path(self, mock_get_token_cache, mock_signal_get_token_cache):
+        token_cache = caches['loc_mem']
+        token_cache.clear()
+        mock_get_token_cache.return_value = token_cache
+        mock_signal_get_token_cache.return_value = token_cache
+        FeatureSettingFactory(
+            feature_name=FeatureNameConst.EXPIRY_TOKEN_AUTHENTICATION_FAST_PATH, is_active=True
+        )
+        auth = ExpiryTokenAuthentication()
+        auth.authenticate(self.request)
+
+        with CaptureQueriesContext(connection) as queries:
+            ret_user, ret_token = auth.authenticate(self.request)
+
+        self.assertFalse(
+            [
+                query
+                for query in queries.captured_queries
+                if '"expiry_token"' in query['sql'] or '"auth_user"' in query['sql']
+            ]
+        )
+        self.assertEqual(self.user, ret_user)
+        self.assertEqual(self.user.username, ret_user.username)
+        self.assertEqual(self.token.key, ret_token.key)
+        self.assertEqual(self.token.generated_time, ret_token.generated_time)
+        self.assertEqual(self.user, CuserMiddleware.get_user())
+
+        # the record is deleted with any change of the token
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            auth.authenticate(self.request)
+
 
 class TestRetrieveNewAccessToken(TestCase):
     def setUp(self):
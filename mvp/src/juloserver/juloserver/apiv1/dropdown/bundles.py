@@ -0,0 +1,189 @@
+"""
+Prebuilt dropdown artifacts.
+
+Every dropdown is serialized and DEFLATE compressed once per process and version, the
+dropdown zip of a request is then assembled from the compressed entries without any
+compression work. The dropdowns read from the database (banks, loan purposes) are rebuilt
+after DYNAMIC_ARTIFACT_TTL, like the three hours cache of the zip they replace.
+"""
+import hashlib
+import struct
+import threading
+import time
+import zlib
+from collections import namedtuple
+
+from .addresses import AddressDropDown
+from .banks import BankDropDown
+from .birthplace import BirthplaceDropDown
+from .colleges import CollegeDropDown
+from .companies import CompanyDropDown
+from .jobs import JobDropDown, JobDropDownV2
+from .loan_purposes import LoanPurposeDropDown
+from .majors import MajorDropDown
+from .marketing_sources import MarketingSourceDropDown
+from .uker_bri import UkerBriDropDown
+
+DYNAMIC_ARTIFACT_TTL = 60 * 60 * 3
+DYNAMIC_DROPDOWN_CLASSES = (BankDropDown, LoanPurposeDropDown)
+
+ZIP_LOCAL_FILE_HEADER = struct.Struct('<4s2B4HL2L2H')
+ZIP_CENTRAL_DIRECTORY_HEADER = struct.Struct('<4s4B4HL2L5H2L')
+ZIP_END_OF_CENTRAL_DIRECTORY = struct.Struct('<4s4H2LH')
+ZIP_VERSION = 20
+ZIP_DEFLATED = 8
+
+DropdownArtifact = namedtuple(
+    'DropdownArtifact',
+    ['dropdown', 'file_name', 'version', 'crc', 'size', 'compressed_data', 'dos_time', 'etag'],
+)
+
+
+def get_dropdown_classes(api_version=None):
+    return [
+        AddressDropDown,
+        BankDropDown,
+        CollegeDropDown,
+        CompanyDropDown,
+        JobDropDownV2 if api_version == 'v2' else JobDropDown,
+        LoanPurposeDropDown,
+        MajorDropDown,
+        MarketingSourceDropDown,
+        UkerBriDropDown,
+        BirthplaceDropDown,
+    ]
+
+
+def get_dos_time(timestamp):
+    date_time = time.localtime(timestamp)
+    dos_time = date_time.tm_hour << 11 | date_time.tm_min << 5 | date_time.tm_sec // 2
+    dos_date = (date_time.tm_year - 1980) << 9 | date_time.tm_mon << 5 | date_time.tm_mday
+    return dos_time, dos_date
+
+
+def build_dropdown_artifact(dropdown_class, product_line_code):
+    if dropdown_class is LoanPurposeDropDown:
+        sub_dropdown = LoanPurposeDropDown(product_line_code)
+    else:
+        sub_dropdown = dropdown_class()
+
+    # the jobs are always sent in a random order, so only the version tells their content
+    if sub_dropdown.dropdown == JobDropDown.dropdown:
+        data = sub_dropdown._get_data(product_line_code, True).encode()
+        digest = '{}:{}'.format(sub_dropdown.file_name, sub_dropdown.version).encode()
+    else:
+        data = sub_dropdown._get_data(product_line_code).encode()
+        digest = data
+
+    compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return DropdownArtifact(
+        dropdown=sub_dropdown.dropdown,
+        file_name=sub_dropdown.file_name,
+        version=sub_dropdown.version,
+        crc=zlib.crc32(data) & 0xFFFFFFFF,
+        size=len(data),
+        compressed_data=compressor.compress(data) + compressor.flush(),
+        dos_time=get_dos_time(time.time()),
+        etag=hashlib.sha1(digest).hexdigest(),
+    )
+
+
+class DropdownArtifactStore(object):
+    def __init__(self):
+        self.artifacts = {}
+        self.lock = threading.Lock()
+
+    def get(self, dropdown_class, product_line_code):
+        key = (
+            dropdown_class,
+            product_line_code if dropdown_class is LoanPurposeDropDown else None,
+        )
+        entry = self.artifacts.get(key)
+        if entry and (entry[1] is None or entry[1] > time.time()):
+            return entry[0]
+
+        artifact = build_dropdown_artifact(dropdown_class, product_line_code)
+        expired_at = None
+        if dropdown_class in DYNAMIC_DROPDOWN_CLASSES:
+            expired_at = time.time() + DYNAMIC_ARTIFACT_TTL
+        with self.lock:
+            self.artifacts[key] = (artifact, expired_at)
+        return artifact
+
+    def clear(self):
+        with self.lock:
+            self.artifacts.clear()
+
+
+dropdown_artifact_store = DropdownArtifactStore()
+
+
+def is_newer_version(server_version, app_version):
+    try:
+        return int(server_version) > int(app_version)
+    except ValueError:
+        return False
+
+
+def get_outdated_dropdown_artifacts(dropdown_versions, product_line_code, api_version=None):
+    """
+    Same selection as write_dropdowns_to_buffer: the dropdowns newer than the app version,
+    and the jobs whatever the version.
+    """
+    dropdown_classes = {
+        dropdown_class.dropdown: dropdown_class
+        for dropdown_class in get_dropdown_classes(api_version)
+    }
+    artifacts = []
+    for dropdown, version in list(dropdown_versions.items()):
+        dropdown_class = dropdown_classes.get(dropdown)
+        if not dropdown_class:
+            continue
+
+        artifact = dropdown_artifact_store.get(dropdown_class, product_line_code)
+        if dropdown == JobDropDown.dropdown or is_newer_version(artifact.version, version):
+            artifacts.append(artifact)
+
+    return artifacts
+
+
+def get_bundle_etag(artifacts):
+    etags = sorted(artifact.etag for artifact in artifacts)
+    return '"{}"'.format(hashlib.sha1('|'.join(etags).encode()).hexdigest())
+
+
+def build_dropdown_zip(artifacts):
+    """Concatenate the compressed entries into a zip file, nothing is compressed here."""
+    chunks = []
+    central_directory = []
+    offset = 0
+    for artifact in artifacts:
+        file_name = artifact.file_name.encode()
+        dos_time, dos_date = artifact.dos_time
+        compressed_size = len(artifact.compressed_data)
+        local_file_header = ZIP_LOCAL_FILE_HEADER.pack(
+            b'PK\003\004', ZIP_VERSION, 0, 0, ZIP_DEFLATED, dos_time, dos_date,
+            artifact.crc, compressed_size, artifact.size, len(file_name), 0,
+        )
+        chunks.extend([local_file_header, file_name, artifact.compressed_data])
+        central_directory.extend(
+            [
+                ZIP_CENTRAL_DIRECTORY_HEADER.pack(
+                    b'PK\001\002', ZIP_VERSION, 0, ZIP_VERSION, 0, 0, ZIP_DEFLATED,
+                    dos_time, dos_date, artifact.crc, compressed_size, artifact.size,
+                    len(file_name), 0, 0, 0, 0, 0, offset,
+                ),
+                file_name,
+            ]
+        )
+        offset += len(local_file_header) + len(file_name) + compressed_size
+
+    central_directory_size = sum(len(chunk) for chunk in central_directory)
+    chunks.extend(central_directory)
+    chunks.append(
+        ZIP_END_OF_CENTRAL_DIRECTORY.pack(
+            b'PK\005\006', 0, 0, len(artifacts), len(artifacts),
+            central_directory_size, offset, 0,
+        )
+    )
+    return b''.join(chunks)
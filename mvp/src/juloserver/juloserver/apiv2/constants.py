@@ -267,3 +267,4 @@ class DropdownResponseCode:
     PRODUCT_NOT_FOUND = 'product_not_found'
     UP_TO_DATE = 'up_to_date'
     NEW_DATA = 'new_data'
+    NOT_MODIFIED = 'not_modified'
@@ -3,6 +3,7 @@ import logging
 import re
 from builtins import map, str
 from datetime import date, datetime, timedelta
+from functools import lru_cache
 
 import geopy.geocoders
 import requests
@@ -2368,45 +2369,60 @@ def store_device_geolocation(customer, latitude, longitude):
         )
 
 
-def evaluate_custom_logic(parameter_var, data):
+@lru_cache(maxsize=1024)
+def compile_custom_logic(parameter_var):
+    """
+    jsonLogic rules of a credit matrix parameter, the parameters are few and never change so
+    every string is only parsed once per process. None for an empty parameter.
+    The returned rules are shared, do not modify them.
+    """
     regex = re.compile('[<>!=]')
     parameter_split = parameter_var.split()
     rules = {}
     outer_operator = None
-    if len(parameter_split) >= 1:
+    if len(parameter_split) < 1:
+        return None
 
-        for individual_params in parameter_split:
-            if individual_params in ['and', 'or']:
-                outer_operator = individual_params
-                rules = {outer_operator: [rules]}
-                continue
-            [key, value] = individual_params.split(':')
-            if regex.search(value) is None:
-                operator = '=='
-            else:
-                operator = ''.join(regex.findall(value))
-            value = value.lower()
-            alphanumeric = [character for character in value if character.isalnum()]
-            alphanumeric = "".join(alphanumeric)
-            if alphanumeric.isnumeric():
-                alphanumeric = float(alphanumeric)
-            rule = {operator: [{'var': key}, alphanumeric]}
-            if outer_operator:
-                rules[outer_operator].append(rule)
-            else:
-                rules = rule
+    for individual_params in parameter_split:
+        if individual_params in ['and', 'or']:
+            outer_operator = individual_params
+            rules = {outer_operator: [rules]}
+            continue
+        [key, value] = individual_params.split(':')
+        if regex.search(value) is None:
+            operator = '=='
+        else:
+            operator = ''.join(regex.findall(value))
+        value = value.lower()
+        alphanumeric = [character for character in value if character.isalnum()]
+        alphanumeric = "".join(alphanumeric)
+        if alphanumeric.isnumeric():
+            alphanumeric = float(alphanumeric)
+        rule = {operator: [{'var': key}, alphanumeric]}
+        if outer_operator:
+            rules[outer_operator].append(rule)
+        else:
+            rules = rule
+
+    return rules
+
+
+def evaluate_custom_logic(parameter_var, data):
+    rules = compile_custom_logic(parameter_var)
+    if rules is None:
+        return None
 
-        return jsonLogic(rules, data)
+    return jsonLogic(rules, data)
 
 
 def queryset_custom_matrix_processing(query_set, parameter_dict_custom):
     is_complex_matrix = False
     complex_matrix_id_list = []
-    query_set_parameter = query_set.filter(parameter__isnull=False)
-    for credit_matrix in query_set_parameter:
-        if evaluate_custom_logic(credit_matrix.parameter, parameter_dict_custom):
+    query_set_parameter = query_set.filter(parameter__isnull=False).values_list('id', 'parameter')
+    for credit_matrix_id, parameter in query_set_parameter:
+        if evaluate_custom_logic(parameter, parameter_dict_custom):
             is_complex_matrix = True
-            complex_matrix_id_list.append(credit_matrix.id)
+            complex_matrix_id_list.append(credit_matrix_id)
 
     if is_complex_matrix:
         query_set = query_set.filter(pk__in=complex_matrix_id_list)
@@ -1,10 +1,16 @@
 import io
 from cacheops import cached
 from zipfile import ZIP_DEFLATED, ZipFile
-from django.http.response import HttpResponse
-from juloserver.julo.models import ProductLineCodes
+from django.http.response import HttpResponse, HttpResponseNotModified
+from juloserver.julo.constants import FeatureNameConst
+from juloserver.julo.models import FeatureSetting, ProductLineCodes
 from juloserver.apiv2.constants import DropdownResponseCode
 from juloserver.apiv1.dropdown import write_dropdowns_to_buffer
+from juloserver.apiv1.dropdown.bundles import (
+    build_dropdown_zip,
+    get_bundle_etag,
+    get_outdated_dropdown_artifacts,
+)
 
 
 def generate_dropdown_data(product_line_code, request, url, api_version=None):
@@ -14,6 +20,11 @@ def generate_dropdown_data(product_line_code, request, url, api_version=None):
     ):
         return DropdownResponseCode.PRODUCT_NOT_FOUND, 'Product line code not found'
 
+    if FeatureSetting.objects.get_cached(
+        FeatureNameConst.PREBUILT_DROPDOWN_BUNDLE, is_active=True
+    ):
+        return generate_prebuilt_dropdown_data(product_line_code, request, api_version)
+
     in_memory, file_size = generate_dropdown_zip(request, product_line_code, url, api_version)
     if file_size > 22:  # A zip file binary header is 22 bytes
         in_memory.seek(0)
@@ -25,6 +36,30 @@ def generate_dropdown_data(product_line_code, request, url, api_version=None):
     return DropdownResponseCode.UP_TO_DATE, 'Up to date'
 
 
+def generate_prebuilt_dropdown_data(product_line_code, request, api_version=None):
+    """
+    Assemble the dropdown zip from the prebuilt artifacts, no compression per request.
+    The ETag is the hash of the dropdowns sent, a client sending it back in If-None-Match
+    gets a 304 instead of the same zip again.
+    """
+    artifacts = get_outdated_dropdown_artifacts(request.GET, product_line_code, api_version)
+    if not artifacts:
+        return DropdownResponseCode.UP_TO_DATE, 'Up to date'
+
+    etag = get_bundle_etag(artifacts)
+    if etag in request.META.get('HTTP_IF_NONE_MATCH', ''):
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        return DropdownResponseCode.NOT_MODIFIED, response
+
+    content = build_dropdown_zip(artifacts)
+    response = HttpResponse(content=content, content_type="application/zip")
+    response["Content-Disposition"] = "attachment; filename=dropdowns.zip"
+    response['Content-Length'] = len(content)
+    response['ETag'] = etag
+    return DropdownResponseCode.NEW_DATA, response
+
+
 def generate_dropdown_zip(request, product_line_code, url, api_version=None):
     """
     Generate file dropdown in memory
@@ -1,4 +1,6 @@
 import io
+import json
+from zipfile import ZipFile
 from builtins import str
 from datetime import datetime, timedelta
 
@@ -13,7 +15,8 @@ from juloserver.application_flow.models import (
     ApplicationRiskyCheck,
     ApplicationRiskyDecision,
 )
-from juloserver.julo.constants import WorkflowConst
+from juloserver.apiv1.dropdown.majors import MajorDropDown
+from juloserver.julo.constants import FeatureNameConst, WorkflowConst
 from juloserver.julo.models import ApplicationExperiment
 from juloserver.julo.tests.factories import (
     AddressGeolocationFactory,
@@ -1765,3 +1768,25 @@ class TestDropDownApi(APITestCase):
         response = self.client.get('/api/v2/product-line/{}/dropdown_data'.format(1))
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json()['data'], 'Up to date')
+
+    def test_prebuilt_bundle(self):
+        FeatureSettingFactory(
+            feature_name=FeatureNameConst.PREBUILT_DROPDOWN_BUNDLE, is_active=True
+        )
+        url = '/api/v2/product-line/{}/dropdown_data?majors=0&colleges=1'.format(1)
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], "application/zip")
+        zip_file = ZipFile(io.BytesIO(response.content))
+        self.assertEqual(zip_file.namelist(), ['majors.json'])
+        self.assertEqual(json.loads(zip_file.read('majors.json'))['data'], MajorDropDown.DATA)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+        response = self.client.get(
+            '/api/v2/product-line/{}/dropdown_data?majors=1'.format(1)
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data'], 'Up to date')
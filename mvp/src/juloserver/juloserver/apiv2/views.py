@@ -5637,7 +5637,7 @@ class DropDownApi(APIView, StandardizedExceptionHandlerMixinV2):
         if result == DropdownResponseCode.UP_TO_DATE:
             return success_response(response)
 
-        if result == DropdownResponseCode.NEW_DATA:
+        if result in (DropdownResponseCode.NEW_DATA, DropdownResponseCode.NOT_MODIFIED):
             return response
 
 
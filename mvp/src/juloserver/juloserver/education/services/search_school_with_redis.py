@@ -7,6 +7,10 @@ from juloserver.education.constants import (
 )
 from juloserver.julo.clients import get_julo_sentry_client
 from juloserver.julo.models import FeatureSetting
+from juloserver.julocore.autocomplete import (
+    get_in_process_autocomplete_setting,
+    get_redis_completion_index,
+)
 from juloserver.julocore.redis_completion_py3 import RedisEnginePy3
 
 
@@ -20,8 +24,15 @@ def is_search_school_with_redis():
 def search_school_by_name_with_redis(phrase, limit):
     try:
         redis_completion_engine = RedisEnginePy3(prefix=REDIS_SCHOOL_AUTO_COMPLETE_HASH_TABLE_NAME)
+        in_process_autocomplete_setting = get_in_process_autocomplete_setting()
+        if in_process_autocomplete_setting:
+            index = get_redis_completion_index(
+                redis_completion_engine, in_process_autocomplete_setting
+            )
+            schools = index.search(phrase, limit)
+
         # in case search by some letters
-        if redis_completion_engine.clean_phrase(phrase=phrase):
+        elif redis_completion_engine.clean_phrase(phrase=phrase):
             schools = redis_completion_engine.search_json(phrase=phrase, limit=limit)
 
         # in case not search anything -> get school data in hash table
@@ -3,9 +3,11 @@ import os
 from builtins import object
 
 import pysftp
-import requests
 from django.conf import settings
 
+from juloserver.julocore.constants import HttpVendor
+from juloserver.julocore.http_transport import get_http_session
+
 from .exceptions import FDCServerUnavailableException
 
 logger = logging.getLogger(__name__)
@@ -182,12 +184,13 @@ class FDCClient(object):
         self.username = username
         self.password = password
         self.base_url = base_url
+        self.session = get_http_session(HttpVendor.FDC)
 
     def get_fdc_inquiry_data(self, nik, reason, reffid=None):
         url = self.base_url + '/api/v5.2/Inquiry?id=%s&reason=%s' % (nik, reason)
         if reffid:
             url += '&reffid={}'.format(reffid)
-        response = requests.get(url, auth=(self.username, self.password))
+        response = self.session.get(url, auth=(self.username, self.password))
         if response.status_code in {503, 502, 504, 599}:
             raise FDCServerUnavailableException()
         return response
@@ -6,6 +6,7 @@ class FDCTaskConst(object):
     RETRY_INTERVAL = 3600 * 3  # 3 hours
     MAX_RETRY_COUNT = 3
     MAX_PERCENTAGE = 0.05
+    OUTDATED_LOANS_CHUNK_SIZE = 5000
 
 
 class FDCConstant(object):
@@ -28,6 +29,13 @@ class FDCInquiryStatus(object):
     SUCCESS = 'success'
 
 
+class FDCInquiryCacheConst(object):
+    RESPONSE_KEY = 'fdc_inquiry:response:{}'
+    METRICS_KEY = 'fdc_inquiry:metrics'
+    DEFAULT_TTL_SECONDS = 6 * 3600
+    CACHEABLE_STATUSES = (FDCStatus.FOUND, FDCStatus.NOT_FOUND)
+
+
 class FDCFailureReason(object):
     REASON_FILTER = {1: '1 - Applying loan via Platform', 2: '2 - Monitor Outstanding Borrower'}
 
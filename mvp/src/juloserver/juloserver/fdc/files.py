@@ -1,4 +1,5 @@
 import csv
+import io
 import json
 import logging
 import os
@@ -37,18 +38,19 @@ class TempDir(object):
 
 
 def yield_outdated_loans_data_from_file(filepath):
-    dirpath = os.path.dirname(filepath)
+    """
+    Rows of the last csv of the zip file, read from the archive without extracting it so only
+    the current row is in memory.
+    """
     with ZipFile(filepath, 'r') as zip_file:
-        list_of_filenames = zip_file.namelist()
-        for filename in list_of_filenames:
-            if filename.endswith('.csv'):
-                logger.info({'action': 'extracting', 'dir': filepath})
-                extracted_folder = os.path.join(dirpath, filename)
-                extracted_filepath = os.path.join(extracted_folder, filename)
-                zip_file.extract(filename, path=extracted_folder)
-
-    for row in yield_csv_file_fdc_data(extracted_filepath, delimiter=','):
-        yield row
+        csv_filenames = [
+            filename for filename in zip_file.namelist() if filename.endswith('.csv')
+        ]
+        logger.info({'action': 'reading', 'dir': filepath, 'filenames': csv_filenames})
+        with zip_file.open(csv_filenames[-1]) as csv_file:
+            csv_reader = csv.DictReader(io.TextIOWrapper(csv_file), delimiter=',')
+            for row in csv_reader:
+                yield row
 
 
 def yield_csv_file_fdc_data(filepath, delimiter):
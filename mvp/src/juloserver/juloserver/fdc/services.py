@@ -1,4 +1,6 @@
 import csv
+import hashlib
+import json
 import logging
 import os
 import re
@@ -6,6 +8,7 @@ from builtins import str
 from datetime import datetime, date
 import time
 import io
+from functools import lru_cache
 from typing import Dict
 from datetime import timedelta
 from operator import itemgetter
@@ -13,7 +16,7 @@ from operator import itemgetter
 import requests
 from celery import task
 from django.conf import settings
-from django.db import transaction
+from django.db import connections, router, transaction
 from django.db.models import Sum, Q
 from django.utils import timezone
 from dateutil.relativedelta import relativedelta
@@ -23,6 +26,7 @@ from juloserver.fdc.clients import get_julo_fdc_client, get_julo_fdc_ftp_client
 from juloserver.fdc.constants import (
     FDCConstant,
     FDCFailureReason,
+    FDCInquiryCacheConst,
     FDCTaskConst,
     RUN_FDC_INQUIRY_HEADERS,
 )
@@ -41,7 +45,7 @@ from juloserver.fdc.models import (
     FDCOutdatedLoan,
     InitialFDCInquiryLoanData,
 )
-from juloserver.fdc.utils import run_fdc_inquiry_format_data
+from juloserver.fdc.utils import run_fdc_inquiry_format_data, yield_chunks
 from juloserver.fdc.constants import (
     FDCLoanStatus,
     FDCReasonConst,
@@ -52,6 +56,7 @@ from juloserver.julo.constants import (
     FeatureNameConst,
 )
 from juloserver.julo.exceptions import JuloException
+from juloserver.julo.services2 import encrypt, get_redis_client
 from juloserver.julo.models import (
     Application,
     Customer,
@@ -105,61 +110,148 @@ def download_outdated_loans_from_fdc(
     with TempDir() as tempdir:
         local_filepath = fdc_ftp_client.get_outdated_loans_file(tempdir.path)
 
-        outdated_loans_to_save = []
         not_found_count = 0
-        for row in yield_outdated_loans_data_from_file(local_filepath):
-            customer_id = row['id_borrower']
-            id_pinjaman = row['id_pinjaman']
-            report_date = row['tgl_pelaporan_data']
-            reported_status = row['status_pinjaman']
-
-            application = (
-                Application.objects.select_related('customer')
-                .filter(customer_id=customer_id, application_xid=id_pinjaman)
-                .last()
-            )
+        for rows in yield_chunks(
+            yield_outdated_loans_data_from_file(local_filepath),
+            FDCTaskConst.OUTDATED_LOANS_CHUNK_SIZE,
+        ):
+            outdated_loans, chunk_not_found_count = get_outdated_loans_from_rows(rows)
+            copy_fdc_outdated_loans(outdated_loans)
+            not_found_count += chunk_not_found_count
 
-            if application:
-                loan = Loan.objects.filter(customer_id=customer_id, application=application).last()
-                customer = application.customer
+        if not_found_count > 0:
+            msg = "Reported data on FDC not found in DB: {}, ".format(not_found_count)
+            notify_failure(msg, channel='#fdc', label_env=True)
 
-            else:
-                loan = (
-                    Loan.objects.select_related('customer')
-                    .filter(customer_id=customer_id, loan_xid=id_pinjaman)
-                    .last()
-                )
-                if loan:
-                    application = loan.account.application_set.last()
-                    customer = loan.customer
 
-            if not loan and not application:
-                logger.error(
-                    {
-                        "action": "download_outdated_loans_from_fdc",
-                        "message": "data not found on fdc",
-                        "id_pinjaman": id_pinjaman,
-                        "id_borrower": customer_id,
-                    }
-                )
-                not_found_count += 1
-                continue
+def parse_fdc_id(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
 
-            if application and loan and customer:
-                fdc_outdated_loan = FDCOutdatedLoan(
-                    customer_id=customer.id,
-                    application_id=application.id,
-                    report_date=report_date,
-                    reported_status=str(reported_status),
-                    loan=loan.id,
+def get_outdated_loans_from_rows(rows):
+    """
+    Resolve the application and the loan of the rows of the FDC outdated loans file with a
+    fixed number of queries. id_pinjaman is the application_xid, or the loan_xid for the
+    loans without application, and the last application and loan by id are taken like the
+    .last() of the row by row lookup did.
+
+    Return:
+        list of dict of the FDCOutdatedLoan fields, count of the rows not found
+    """
+    keys = [(parse_fdc_id(row['id_borrower']), parse_fdc_id(row['id_pinjaman'])) for row in rows]
+    xids = {xid for _, xid in keys if xid is not None}
+
+    # (customer_id, application_xid): application_id
+    application_ids = {}
+    for application_id, customer_id, application_xid in Application.objects.filter(
+        application_xid__in=xids
+    ).values_list('id', 'customer_id', 'application_xid'):
+        key = (customer_id, application_xid)
+        application_ids[key] = max(application_id, application_ids.get(key, 0))
+
+    # (customer_id, application_id): loan_id
+    application_loan_ids = {}
+    for loan_id, customer_id, application_id in Loan.objects.filter(
+        application_id__in=set(application_ids.values())
+    ).values_list('id', 'customer_id', 'application_id'):
+        key = (customer_id, application_id)
+        application_loan_ids[key] = max(loan_id, application_loan_ids.get(key, 0))
+
+    # (customer_id, loan_xid): (loan_id, account_id), for the rows without application
+    xid_loans = {}
+    loan_xids = {
+        id_pinjaman
+        for customer_id, id_pinjaman in keys
+        if id_pinjaman is not None and (customer_id, id_pinjaman) not in application_ids
+    }
+    for loan_id, customer_id, loan_xid, account_id in Loan.objects.filter(
+        loan_xid__in=loan_xids
+    ).values_list('id', 'customer_id', 'loan_xid', 'account_id'):
+        key = (customer_id, loan_xid)
+        if loan_id > xid_loans.get(key, (0, None))[0]:
+            xid_loans[key] = (loan_id, account_id)
+
+    # account_id: application_id
+    account_application_ids = {}
+    account_ids = {account_id for _, account_id in xid_loans.values() if account_id}
+    for application_id, account_id in Application.objects.filter(
+        account_id__in=account_ids
+    ).values_list('id', 'account_id'):
+        account_application_ids[account_id] = max(
+            application_id, account_application_ids.get(account_id, 0)
+        )
+
+    outdated_loans = []
+    not_found_count = 0
+    for row, (customer_id, id_pinjaman) in zip(rows, keys):
+        application_id = application_ids.get((customer_id, id_pinjaman))
+        if application_id:
+            loan_id = application_loan_ids.get((customer_id, application_id))
+        else:
+            loan_id, account_id = xid_loans.get((customer_id, id_pinjaman), (None, None))
+            application_id = account_application_ids.get(account_id)
+
+        if not application_id and not loan_id:
+            logger.error(
+                {
+                    "action": "download_outdated_loans_from_fdc",
+                    "message": "data not found on fdc",
+                    "id_pinjaman": row['id_pinjaman'],
+                    "id_borrower": row['id_borrower'],
+                }
+            )
+            not_found_count += 1
+            continue
+
+        if application_id and loan_id:
+            outdated_loans.append(
+                dict(
+                    customer_id=customer_id,
+                    application_id=application_id,
+                    report_date=row['tgl_pelaporan_data'],
+                    reported_status=str(row['status_pinjaman']),
+                    loan=loan_id,
                 )
-                outdated_loans_to_save.append(fdc_outdated_loan)
+            )
 
-        FDCOutdatedLoan.objects.bulk_create(outdated_loans_to_save)
+    return outdated_loans, not_found_count
 
-        if not_found_count > 0:
-            msg = "Reported data on FDC not found in DB: {}, ".format(not_found_count)
-            notify_failure(msg, channel='#fdc', label_env=True)
+
+def copy_fdc_outdated_loans(outdated_loans):
+    """Write the FDCOutdatedLoan rows with one COPY instead of the INSERTs of bulk_create."""
+    if not outdated_loans:
+        return
+
+    report_date_field = FDCOutdatedLoan._meta.get_field('report_date')
+    now = timezone.now()
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for outdated_loan in outdated_loans:
+        writer.writerow(
+            [
+                now.isoformat(),
+                now.isoformat(),
+                outdated_loan['customer_id'],
+                outdated_loan['application_id'],
+                report_date_field.to_python(outdated_loan['report_date']),
+                outdated_loan['reported_status'],
+                outdated_loan['loan'],
+            ]
+        )
+    buffer.seek(0)
+
+    connection = connections[router.db_for_write(FDCOutdatedLoan)]
+    with connection.cursor() as cursor:
+        cursor.copy_expert(
+            'COPY {} (cdate, udate, customer_id, application_id, report_date, '
+            'reported_status, loan) FROM STDIN WITH (FORMAT csv)'.format(
+                connection.ops.quote_name(FDCOutdatedLoan._meta.db_table)
+            ),
+            buffer,
+        )
 
 
 @task(name='download_statistic_data_from_fdc')
@@ -434,17 +526,14 @@ def get_clone_fdc_data(fdc_inquiry):
 
     fdc_time_format = "%Y-%m-%d"
     fdc_inquiry_loans = FDCInquiryLoan.objects.filter(fdc_inquiry=fdc_inquiry)
-    for fdc_inquiry_loan in fdc_inquiry_loans:
-
-        detokenized_fdc_inquiry_loan = detokenize_for_model_object(
-            PiiSource.FDC_INQUIRY_LOAN,
-            [{'object': fdc_inquiry_loan}],
-            pii_data_type=PiiVaultDataType.KEY_VALUE,
-            force_get_local_data=True,
-        )
-
-        fdc_inquiry_loan = detokenized_fdc_inquiry_loan[0]
-
+    # one detokenize call for all the loans of the inquiry
+    detokenized_fdc_inquiry_loans = detokenize_for_model_object(
+        PiiSource.FDC_INQUIRY_LOAN,
+        [{'object': fdc_inquiry_loan} for fdc_inquiry_loan in fdc_inquiry_loans],
+        pii_data_type=PiiVaultDataType.KEY_VALUE,
+        force_get_local_data=True,
+    )
+    for fdc_inquiry_loan in detokenized_fdc_inquiry_loans:
         loan_data = {}
         tgl_agunan = None
         if fdc_inquiry_loan.tgl_agunan:
@@ -496,6 +585,148 @@ def get_clone_fdc_data(fdc_inquiry):
     return data
 
 
+def get_fdc_inquiry_response_cache_setting():
+    """
+    Return:
+        dict of ttl_seconds when the bureau responses are reused by nik, None otherwise
+    """
+    feature_setting = FeatureSetting.objects.get_cached(
+        FeatureNameConst.FDC_INQUIRY_RESPONSE_CACHE, is_active=True
+    )
+    if not feature_setting:
+        return None
+
+    parameters = feature_setting.parameters or {}
+    return dict(
+        ttl_seconds=parameters.get('ttl_seconds', FDCInquiryCacheConst.DEFAULT_TTL_SECONDS),
+    )
+
+
+def get_fdc_inquiry_response_cache_key(nik):
+    # the nik is not written to redis as is
+    return FDCInquiryCacheConst.RESPONSE_KEY.format(
+        hashlib.sha256(str(nik).encode()).hexdigest()
+    )
+
+
+def get_cached_fdc_inquiry_response(nik):
+    try:
+        value = get_redis_client().get(get_fdc_inquiry_response_cache_key(nik))
+        if not value:
+            return None
+        decrypted_value = encrypt().decode_string(value)
+        if not decrypted_value:
+            raise ValueError('the cached response can not be decrypted')
+        return json.loads(decrypted_value)
+    except Exception as error:
+        logger.warning(
+            {'action': 'get_cached_fdc_inquiry_response', 'nik': nik, 'error': str(error)}
+        )
+        return None
+
+
+def cache_fdc_inquiry_response(nik, data, setting):
+    """
+    Keep a found or not found bureau response until ttl_seconds or the end of the day,
+    whichever comes first.
+    """
+    if str(data.get('status')).lower() not in FDCInquiryCacheConst.CACHEABLE_STATUSES:
+        return
+
+    now = timezone.localtime(timezone.now())
+    tomorrow = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    ttl_seconds = min(setting['ttl_seconds'], int((tomorrow - now).total_seconds()))
+    if ttl_seconds <= 0:
+        return
+
+    try:
+        get_redis_client().set(
+            get_fdc_inquiry_response_cache_key(nik),
+            # the response carries the PII of the borrower
+            encrypt().encode_string(json.dumps(data)),
+            expire_time=timedelta(seconds=ttl_seconds),
+        )
+    except Exception as error:
+        logger.warning({'action': 'cache_fdc_inquiry_response', 'nik': nik, 'error': str(error)})
+
+
+def record_fdc_inquiry_metrics(is_bureau_call=None, write_seconds=None, row_count=0):
+    """Count the bureau calls made and avoided, and the latency of the inquiry writes."""
+    try:
+        pipe = get_redis_client().pipeline(transaction=False)
+        key = FDCInquiryCacheConst.METRICS_KEY
+        if is_bureau_call is not None:
+            pipe.hincrby(key, 'bureau_calls' if is_bureau_call else 'bureau_calls_avoided', 1)
+        if write_seconds is not None:
+            pipe.hincrby(key, 'write_count', 1)
+            pipe.hincrbyfloat(key, 'write_seconds', write_seconds)
+            pipe.hmset(
+                key,
+                {
+                    'last_write_seconds': round(write_seconds, 4),
+                    'last_write_row_count': row_count,
+                },
+            )
+        pipe.execute()
+    except Exception as error:
+        logger.warning({'action': 'record_fdc_inquiry_metrics', 'error': str(error)})
+
+
+def get_fdc_inquiry_metrics():
+    return get_redis_client().hgetall(FDCInquiryCacheConst.METRICS_KEY)
+
+
+@lru_cache(maxsize=4096)
+def parse_fdc_date(value):
+    """The dates of the inquiry loans repeat a lot between rows and inquiries."""
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def build_fdc_inquiry_loans(fdc_inquiry, pinjaman):
+    fdc_inquiry_loans = []
+    for loan_data in pinjaman:
+        tgl_agunan = None
+        if 'tgl_agunan' in loan_data and loan_data['tgl_agunan']:
+            tgl_agunan = parse_fdc_date(loan_data['tgl_agunan'])
+
+        fdc_inquiry_loans.append(
+            FDCInquiryLoan(
+                fdc_inquiry=fdc_inquiry,
+                dpd_max=loan_data['dpd_max'],
+                dpd_terakhir=loan_data['dpd_terakhir'],
+                id_penyelenggara=loan_data['id_penyelenggara'],
+                jenis_pengguna=loan_data['jenis_pengguna_ket'],
+                kualitas_pinjaman=loan_data['kualitas_pinjaman_ket'],
+                nama_borrower=loan_data['nama_borrower'].strip('\x00')[:100],
+                nilai_pendanaan=loan_data['nilai_pendanaan'],
+                no_identitas=loan_data['no_identitas'],
+                no_npwp=loan_data['no_npwp'],
+                sisa_pinjaman_berjalan=loan_data['sisa_pinjaman_berjalan'],
+                status_pinjaman=loan_data['status_pinjaman_ket'],
+                penyelesaian_w_oleh=loan_data['penyelesaian_w_oleh'],
+                pendanaan_syariah=loan_data['pendanaan_syariah'],
+                tipe_pinjaman=loan_data['tipe_pinjaman'],
+                sub_tipe_pinjaman=loan_data['sub_tipe_pinjaman'],
+                fdc_id=loan_data['id'],
+                reference=loan_data['reference'],
+                tgl_jatuh_tempo_pinjaman=parse_fdc_date(loan_data['tgl_jatuh_tempo_pinjaman']),
+                tgl_pelaporan_data=parse_fdc_date(loan_data['tgl_pelaporan_data']),
+                tgl_penyaluran_dana=parse_fdc_date(loan_data['tgl_penyaluran_dana']),
+                tgl_perjanjian_borrower=parse_fdc_date(loan_data['tgl_perjanjian_borrower']),
+                no_hp=loan_data['no_hp'],
+                email=loan_data['email'],
+                agunan=loan_data['agunan'],
+                tgl_agunan=tgl_agunan,
+                nama_penjamin=loan_data['nama_penjamin'].strip('\x00')[:100],
+                no_agunan=loan_data['no_agunan'],
+                pendapatan=loan_data['pendapatan'] if 'pendapatan' in loan_data else None,
+                is_julo_loan=True if loan_data['id_penyelenggara'] == 'AFDC150' else None,
+            )
+        )
+
+    return fdc_inquiry_loans
+
+
 def get_direct_data(fdc_inquiry_data, reason, is_changed):
     try:
         # add log
@@ -539,9 +770,14 @@ def get_and_save_fdc_data(fdc_inquiry_data, reason, retry):
     reason, is_changed = determine_inquiry_reason(fdc_inquiry_data, reason)
     fdc_inquiry = FDCInquiry.objects.get(id=fdc_inquiry_data['id'])
 
+    response_cache_setting = get_fdc_inquiry_response_cache_setting()
+    cached_data = None
+    if response_cache_setting:
+        cached_data = get_cached_fdc_inquiry_response(fdc_inquiry_data['nik'])
+
     today = timezone.localtime(timezone.now()).date()
-    is_need_direct_data = True
-    if reason == 1:
+    is_need_direct_data = cached_data is None
+    if is_need_direct_data and reason == 1:
         last_fdc_inquiry = (
             FDCInquiry.objects.filter(nik=fdc_inquiry_data['nik'])
             .exclude(pk=fdc_inquiry_data['id'])
@@ -558,10 +794,24 @@ def get_and_save_fdc_data(fdc_inquiry_data, reason, retry):
             is_need_direct_data = False
 
     try:
-        if is_need_direct_data:
+        if cached_data is not None:
+            logger.info(
+                {
+                    'message': 'FDCInquiry: served from the response cache',
+                    'fdc_inquiry_id': fdc_inquiry_data['id'],
+                    'reason': reason,
+                }
+            )
+            # the cached response may come from an inquiry of the other reason
+            data = dict(cached_data, inquiryReason=FDCFailureReason.REASON_FILTER[reason])
+        elif is_need_direct_data:
             data = get_direct_data(fdc_inquiry_data, reason, is_changed)
+            if response_cache_setting:
+                cache_fdc_inquiry_response(fdc_inquiry_data['nik'], data, response_cache_setting)
         else:
             data = get_clone_fdc_data(last_fdc_inquiry)
+        if response_cache_setting:
+            record_fdc_inquiry_metrics(is_bureau_call=is_need_direct_data)
     except JuloException as error:
         (err, message) = error.args
         fdc_inquiry.update_safely(
@@ -582,6 +832,7 @@ def get_and_save_fdc_data(fdc_inquiry_data, reason, retry):
     # add logic if it's passed
     reference_id = data['refferenceId'] if 'refferenceId' in data else None
 
+    write_start = time.time()
     with transaction.atomic(using='bureau_db'):
         fdc_inquiry = FDCInquiry.objects.select_for_update().get(id=fdc_inquiry_data['id'])
         # Prevent overwrite data for a same FDC inquiry result by a concurrent task
@@ -611,67 +862,24 @@ def get_and_save_fdc_data(fdc_inquiry_data, reason, retry):
         if data['pinjaman'] is None:
             return data
 
-        fdc_time_format = "%Y-%m-%d"
-        for loan_data in data['pinjaman']:
-
-            tgl_agunan = None
-            if 'tgl_agunan' in loan_data and loan_data['tgl_agunan']:
-                tgl_agunan = datetime.strptime(loan_data['tgl_agunan'], fdc_time_format)
+        # one insert for every loan so the inquiry row lock is not held for a save per loan
+        fdc_inquiry_loans = build_fdc_inquiry_loans(fdc_inquiry, data['pinjaman'])
+        FDCInquiryLoan.objects.bulk_create(fdc_inquiry_loans)
 
-            pendapatan = loan_data['pendapatan'] if 'pendapatan' in loan_data else None
-
-            inquiry_loan_record = {
-                'fdc_inquiry': fdc_inquiry,
-                'dpd_max': loan_data['dpd_max'],
-                'dpd_terakhir': loan_data['dpd_terakhir'],
-                'id_penyelenggara': loan_data['id_penyelenggara'],
-                'jenis_pengguna': loan_data['jenis_pengguna_ket'],
-                'kualitas_pinjaman': loan_data['kualitas_pinjaman_ket'],
-                'nama_borrower': loan_data['nama_borrower'].strip('\x00')[:100],
-                'nilai_pendanaan': loan_data['nilai_pendanaan'],
-                'no_identitas': loan_data['no_identitas'],
-                'no_npwp': loan_data['no_npwp'],
-                'sisa_pinjaman_berjalan': loan_data['sisa_pinjaman_berjalan'],
-                'status_pinjaman': loan_data['status_pinjaman_ket'],
-                'penyelesaian_w_oleh': loan_data['penyelesaian_w_oleh'],
-                'pendanaan_syariah': loan_data['pendanaan_syariah'],
-                'tipe_pinjaman': loan_data['tipe_pinjaman'],
-                'sub_tipe_pinjaman': loan_data['sub_tipe_pinjaman'],
-                'fdc_id': loan_data['id'],
-                'reference': loan_data['reference'],
-                'tgl_jatuh_tempo_pinjaman': datetime.strptime(
-                    loan_data['tgl_jatuh_tempo_pinjaman'], fdc_time_format
-                ),
-                'tgl_pelaporan_data': datetime.strptime(
-                    loan_data['tgl_pelaporan_data'], fdc_time_format
-                ),
-                'tgl_penyaluran_dana': datetime.strptime(
-                    loan_data['tgl_penyaluran_dana'], fdc_time_format
-                ),
-                'tgl_perjanjian_borrower': datetime.strptime(
-                    loan_data['tgl_perjanjian_borrower'], fdc_time_format
-                ),
-                'no_hp': loan_data['no_hp'],
-                'email': loan_data['email'],
-                'agunan': loan_data['agunan'],
-                'tgl_agunan': tgl_agunan,
-                'nama_penjamin': loan_data['nama_penjamin'].strip('\x00')[:100],
-                'no_agunan': loan_data['no_agunan'],
-                'pendapatan': pendapatan,
-            }
-            fdc_inquiry_loan = FDCInquiryLoan(**inquiry_loan_record)
-
-            if loan_data['id_penyelenggara'] == 'AFDC150':
-                logger.info(
-                    {
-                        'message': 'FDCInquiry: is_julo_loan is True',
-                        'id_penyelenggara': 'AFDC150',
-                        'fdc_inquiry_id': fdc_inquiry_data['id'],
-                    }
-                )
-                fdc_inquiry_loan.is_julo_loan = True
+    write_seconds = time.time() - write_start
+    logger.info(
+        {
+            'message': 'FDCInquiry: result saved',
+            'fdc_inquiry_id': fdc_inquiry_data['id'],
+            'loan_count': len(fdc_inquiry_loans),
+            'julo_loan_count': sum(1 for loan in fdc_inquiry_loans if loan.is_julo_loan),
+            'write_seconds': round(write_seconds, 4),
+            'is_bureau_call': is_need_direct_data,
+        }
+    )
+    if response_cache_setting:
+        record_fdc_inquiry_metrics(write_seconds=write_seconds, row_count=len(fdc_inquiry_loans))
 
-            fdc_inquiry_loan.save()
     fdc_inquiry.refresh_from_db()
     store_initial_fdc_inquiry_loan_data(fdc_inquiry)
 
@@ -722,7 +930,7 @@ def mock_get_and_save_fdc_data(fdc_inquiry_data):
         if data['pinjaman'] is None:
             return
 
-        fdc_time_format = "%Y-%m-%d"
+        fdc_inquiry_loans = []
         for loan_data in data['pinjaman']:
             inquiry_loan_record = {
                 'fdc_inquiry': fdc_inquiry,
@@ -743,25 +951,18 @@ def mock_get_and_save_fdc_data(fdc_inquiry_data):
                 'sub_tipe_pinjaman': loan_data['sub_tipe_pinjaman'],
                 'fdc_id': loan_data['id'],
                 'reference': loan_data['reference'],
-                'tgl_jatuh_tempo_pinjaman': datetime.strptime(
-                    loan_data['tgl_jatuh_tempo_pinjaman'], fdc_time_format
-                ),
-                'tgl_pelaporan_data': datetime.strptime(
-                    loan_data['tgl_pelaporan_data'], fdc_time_format
-                ),
-                'tgl_penyaluran_dana': datetime.strptime(
-                    loan_data['tgl_penyaluran_dana'], fdc_time_format
-                ),
-                'tgl_perjanjian_borrower': datetime.strptime(
-                    loan_data['tgl_perjanjian_borrower'], fdc_time_format
-                ),
+                'tgl_jatuh_tempo_pinjaman': parse_fdc_date(loan_data['tgl_jatuh_tempo_pinjaman']),
+                'tgl_pelaporan_data': parse_fdc_date(loan_data['tgl_pelaporan_data']),
+                'tgl_penyaluran_dana': parse_fdc_date(loan_data['tgl_penyaluran_dana']),
+                'tgl_perjanjian_borrower': parse_fdc_date(loan_data['tgl_perjanjian_borrower']),
             }
             fdc_inquiry_loan = FDCInquiryLoan(**inquiry_loan_record)
 
             if loan_data['id_penyelenggara'] == str(1):
                 fdc_inquiry_loan.is_julo_loan = True
 
-            fdc_inquiry_loan.save()
+            fdc_inquiry_loans.append(fdc_inquiry_loan)
+        FDCInquiryLoan.objects.bulk_create(fdc_inquiry_loans)
     fdc_inquiry.refresh_from_db()
     store_initial_fdc_inquiry_loan_data(fdc_inquiry)
 
@@ -27,7 +27,9 @@ from juloserver.fdc.files import (
 from juloserver.fdc.models import FDCDeliveryReport, FDCOutdatedLoan, FDCInquiry
 from juloserver.fdc.services import (
     FDCFileNotFound,
+    copy_fdc_outdated_loans,
     download_outdated_loans_from_fdc,
+    get_outdated_loans_from_rows,
     download_result_from_fdc,
     download_statistic_data_from_fdc,
     store_to_temporary_table,
@@ -35,7 +37,11 @@ from juloserver.fdc.services import (
     get_info_active_loan_from_platforms,
     get_or_non_fdc_inquiry_not_out_date,
     get_and_call_certain_status,
+    get_cached_fdc_inquiry_response,
+    get_fdc_inquiry_metrics,
+    get_fdc_inquiry_response_cache_key,
     get_fdc_status,
+    parse_fdc_date,
 )
 from juloserver.fdc.utils import create_fdc_filename
 from juloserver.julo.models import (
@@ -103,7 +109,12 @@ import json
 from rest_framework import status
 from rest_framework.test import APIClient
 from juloserver.julovers.tests.factories import UploadAsyncStateFactory
-from juloserver.julo.constants import UploadAsyncStateStatus, UploadAsyncStateType
+from juloserver.julo.constants import (
+    FeatureNameConst,
+    UploadAsyncStateStatus,
+    UploadAsyncStateType,
+)
+from juloserver.julo.services2.redis_helper import MockRedisHelper
 from juloserver.apiv2.tests.factories import PdCreditModelResultFactory, PdWebModelResultFactory
 
 fake = Faker()
@@ -916,7 +927,10 @@ class TestFDCServices(TestCase):
 
     @patch('juloserver.fdc.services.determine_inquiry_reason', return_value=(2, True))
     @patch('juloserver.fdc.services.store_initial_fdc_inquiry_loan_data')
-    @patch('requests.get', side_effect=mock_response_fdc_inquiry)
+    @patch(
+        'juloserver.julocore.http_transport.VendorSession.get',
+        side_effect=mock_response_fdc_inquiry,
+    )
     def test_inquiry_with_please_reason_2(
         self, mock_response, mock_store_initial, mock_determine_reason
     ):
@@ -932,7 +946,10 @@ class TestFDCServices(TestCase):
 
     @patch('juloserver.fdc.services.determine_inquiry_reason', return_value=(2, False))
     @patch('juloserver.fdc.services.store_initial_fdc_inquiry_loan_data')
-    @patch('requests.get', side_effect=mock_response_fdc_inquiry)
+    @patch(
+        'juloserver.julocore.http_transport.VendorSession.get',
+        side_effect=mock_response_fdc_inquiry,
+    )
     def test_inquiry_with_changed_but_the_variable_keep_false(
         self, mock_response, mock_store_initial, mock_determine_reason
     ):
@@ -948,7 +965,10 @@ class TestFDCServices(TestCase):
 
     @patch('juloserver.fdc.services.determine_inquiry_reason', return_value=(2, True))
     @patch('juloserver.fdc.services.store_initial_fdc_inquiry_loan_data')
-    @patch('requests.get', side_effect=mock_response_fdc_inquiry_no_identitas)
+    @patch(
+        'juloserver.julocore.http_transport.VendorSession.get',
+        side_effect=mock_response_fdc_inquiry_no_identitas,
+    )
     def test_inquiry_with_no_identitas_reported(
         self, mock_response, mock_store_initial, mock_determine_reason
     ):
@@ -967,7 +987,10 @@ class TestFDCServices(TestCase):
 
     @patch('juloserver.fdc.services.determine_inquiry_reason', return_value=(1, False))
     @patch('juloserver.fdc.services.store_initial_fdc_inquiry_loan_data')
-    @patch('requests.get', side_effect=mock_response_fdc_inquiry)
+    @patch(
+        'juloserver.julocore.http_transport.VendorSession.get',
+        side_effect=mock_response_fdc_inquiry,
+    )
     def test_inquiry_with_case_reason_1_changed_false(
         self, mock_response, mock_store_initial, mock_determine_reason
     ):
@@ -986,7 +1009,10 @@ class TestFDCServices(TestCase):
 
     @patch('juloserver.fdc.services.determine_inquiry_reason', return_value=(2, True))
     @patch('juloserver.fdc.services.store_initial_fdc_inquiry_loan_data')
-    @patch('requests.get', side_effect=mock_response_fdc_inquiry)
+    @patch(
+        'juloserver.julocore.http_transport.VendorSession.get',
+        side_effect=mock_response_fdc_inquiry,
+    )
     def test_inquiry_with_case_reason_2_changed_true(
         self, mock_response, mock_store_initial, mock_determine_reason
     ):
@@ -1005,7 +1031,10 @@ class TestFDCServices(TestCase):
 
     @patch('juloserver.fdc.services.determine_inquiry_reason', return_value=(2, False))
     @patch('juloserver.fdc.services.store_initial_fdc_inquiry_loan_data')
-    @patch('requests.get', side_effect=mock_response_fdc_inquiry_reason_2)
+    @patch(
+        'juloserver.julocore.http_transport.VendorSession.get',
+        side_effect=mock_response_fdc_inquiry_reason_2,
+    )
     def test_inquiry_with_case_reason_2_changed_false(
         self, mock_response, mock_store_initial, mock_determine_reason
     ):
@@ -1341,3 +1370,224 @@ class TestGetFDCStatus(TestCase):
         # will prioritize credit model, so will be False
         is_fdc = get_fdc_status(self.application)
         self.assertEqual(is_fdc, False)
+
+
+class TestFDCOutdatedLoans(TestCase):
+    def setUp(self):
+        self.account = AccountFactory()
+        self.application = ApplicationFactory(account=self.account, application_xid=1111111111)
+        self.customer = self.application.customer
+        self.loan = LoanFactory(
+            customer=self.customer,
+            account=self.account,
+            application=self.application,
+            loan_xid=2222222222,
+        )
+        self.loan_without_application = LoanFactory(
+            customer=self.customer, account=self.account, application=None, loan_xid=3333333333
+        )
+
+    def get_row(self, id_pinjaman, customer_id=None):
+        return {
+            'id_borrower': str(customer_id or self.customer.id),
+            'id_pinjaman': str(id_pinjaman),
+            'tgl_pelaporan_data': '2024-01-31',
+            'status_pinjaman': 'O',
+        }
+
+    def test_get_outdated_loans_from_rows(self):
+        rows = [
+            self.get_row(self.application.application_xid),
+            self.get_row(self.loan_without_application.loan_xid),
+            self.get_row(4444444444),
+            self.get_row(self.application.application_xid, customer_id=1),
+        ]
+
+        with self.assertNumQueries(4):
+            outdated_loans, not_found_count = get_outdated_loans_from_rows(rows)
+
+        self.assertEqual(not_found_count, 2)
+        self.assertEqual(
+            outdated_loans,
+            [
+                dict(
+                    customer_id=self.customer.id,
+                    application_id=self.application.id,
+                    report_date='2024-01-31',
+                    reported_status='O',
+                    loan=self.loan.id,
+                ),
+                dict(
+                    customer_id=self.customer.id,
+                    application_id=self.application.id,
+                    report_date='2024-01-31',
+                    reported_status='O',
+                    loan=self.loan_without_application.id,
+                ),
+            ],
+        )
+
+    def test_copy_fdc_outdated_loans(self):
+        outdated_loans, _ = get_outdated_loans_from_rows(
+            [self.get_row(self.application.application_xid)]
+        )
+        copy_fdc_outdated_loans(outdated_loans)
+
+        fdc_outdated_loan = FDCOutdatedLoan.objects.get(application_id=self.application.id)
+        self.assertEqual(fdc_outdated_loan.customer_id, self.customer.id)
+        self.assertEqual(fdc_outdated_loan.loan, self.loan.id)
+        self.assertEqual(str(fdc_outdated_loan.report_date), '2024-01-31')
+        self.assertIsNotNone(fdc_outdated_loan.cdate)
+
+
+@patch('juloserver.fdc.services.store_initial_fdc_inquiry_loan_data')
+@patch('juloserver.fdc.services.get_redis_client')
+@patch.object(FDCClient, 'get_fdc_inquiry_data')
+class TestFDCInquiryResponseCache(TestCase):
+    def setUp(self):
+        self.nik = '3524242400000001'
+        self.fdc_inquiry = FDCInquiryFactory(nik=self.nik, status=None)
+        self.redis_client = MockRedisHelper()
+        self.redis_client.client.flushall()
+        self.feature_setting = FeatureSettingFactory(
+            feature_name=FeatureNameConst.FDC_INQUIRY_RESPONSE_CACHE,
+            is_active=True,
+            parameters={'ttl_seconds': 3600},
+        )
+        loan_data = {
+            'id_penyelenggara': 'AFDC150',
+            'nama_borrower': 'MCH\x00',
+            'no_identitas': self.nik,
+            'no_npwp': '',
+            'no_hp': None,
+            'email': None,
+            'tgl_perjanjian_borrower': '2023-03-02',
+            'tgl_penyaluran_dana': '2023-03-02',
+            'nilai_pendanaan': 1150000,
+            'tgl_pelaporan_data': '2023-04-11',
+            'sisa_pinjaman_berjalan': 958330,
+            'tgl_jatuh_tempo_pinjaman': '2023-09-01',
+            'dpd_terakhir': 2,
+            'dpd_max': 7,
+            'jenis_pengguna_ket': 'Individual',
+            'kualitas_pinjaman_ket': 'Lancar',
+            'status_pinjaman_ket': 'Outstanding',
+            'penyelesaian_w_oleh': 'Default',
+            'pendanaan_syariah': False,
+            'tipe_pinjaman': 'Multiguna',
+            'sub_tipe_pinjaman': 'Onetime Loan / Cash Loan',
+            'reference': '',
+            'id': '5ca24c2898c4548390feffe2c3d27be7',
+            'agunan': 'Tidak Memiliki Agunan',
+            'tgl_agunan': None,
+            'nama_penjamin': '',
+            'no_agunan': '',
+        }
+        self.structure_response = {
+            'noHp': '',
+            'mail': '',
+            'inquiryReason': '1 - Applying loan via Platform',
+            'refferenceId': None,
+            'inquiryDate': '2023-08-03',
+            'status': 'Found',
+            'pinjaman': [
+                dict(loan_data, id_penyelenggara='810001', id='a' * 32),
+                loan_data,
+                dict(loan_data, id_penyelenggara='810002', id='b' * 32),
+            ],
+            'historyInquiry': {},
+        }
+
+    def get_response(self, structure_response):
+        response = Response()
+        response.status_code = 200
+        response.headers = {"Content-Type": "application/json"}
+        response._content = json.dumps(structure_response).encode('UTF-8')
+        return response
+
+    def test_same_day_inquiry_reuses_the_response(
+        self, mock_get_fdc_inquiry_data, mock_get_redis_client, _
+    ):
+        mock_get_redis_client.return_value = self.redis_client
+        mock_get_fdc_inquiry_data.return_value = self.get_response(self.structure_response)
+
+        get_and_save_fdc_data({'id': self.fdc_inquiry.id, 'nik': self.nik}, reason=1, retry=0)
+        other_fdc_inquiry = FDCInquiryFactory(nik=self.nik, status=None)
+        get_and_save_fdc_data({'id': other_fdc_inquiry.id, 'nik': self.nik}, reason=2, retry=0)
+
+        mock_get_fdc_inquiry_data.assert_called_once()
+        for fdc_inquiry in (self.fdc_inquiry, other_fdc_inquiry):
+            fdc_inquiry.refresh_from_db()
+            self.assertEqual(fdc_inquiry.status, 'Found')
+            self.assertEqual(fdc_inquiry.inquiry_status, 'success')
+            fdc_inquiry_loans = FDCInquiryLoan.objects.filter(fdc_inquiry=fdc_inquiry).order_by(
+                'id'
+            )
+            self.assertEqual(
+                [fdc_inquiry_loan.is_julo_loan for fdc_inquiry_loan in fdc_inquiry_loans],
+                [None, True, None],
+            )
+            self.assertEqual(fdc_inquiry_loans[0].nama_borrower, 'MCH')
+            self.assertEqual(str(fdc_inquiry_loans[0].tgl_pelaporan_data), '2023-04-11')
+
+        self.assertEqual(self.fdc_inquiry.inquiry_reason, '1 - Applying loan via Platform')
+        self.assertEqual(other_fdc_inquiry.inquiry_reason, '2 - Monitor Outstanding Borrower')
+
+        metrics = get_fdc_inquiry_metrics()
+        self.assertEqual(metrics['bureau_calls'], '1')
+        self.assertEqual(metrics['bureau_calls_avoided'], '1')
+        self.assertEqual(metrics['write_count'], '2')
+        self.assertEqual(metrics['last_write_row_count'], '3')
+
+    def test_cached_response_without_plain_pii(
+        self, mock_get_fdc_inquiry_data, mock_get_redis_client, _
+    ):
+        mock_get_redis_client.return_value = self.redis_client
+        pii = {
+            'nama_borrower': 'Cached Borrower Name',
+            'no_identitas': self.nik,
+            'no_npwp': '091234567890123',
+            'no_hp': '081234567890',
+            'email': 'cached.borrower@example.com',
+            'nama_penjamin': 'Cached Guarantor Name',
+        }
+        self.structure_response['pinjaman'] = [
+            dict(loan_data, **pii) for loan_data in self.structure_response['pinjaman']
+        ]
+        mock_get_fdc_inquiry_data.return_value = self.get_response(self.structure_response)
+
+        get_and_save_fdc_data({'id': self.fdc_inquiry.id, 'nik': self.nik}, reason=1, retry=0)
+
+        value = self.redis_client.get(get_fdc_inquiry_response_cache_key(self.nik))
+        self.assertIsNotNone(value)
+        self.assertEqual(set(pii), set(FDCInquiryLoan.PII_FIELDS))
+        for pii_value in pii.values():
+            self.assertNotIn(pii_value, value)
+        self.assertEqual(
+            get_cached_fdc_inquiry_response(self.nik)['pinjaman'][0]['email'], pii['email']
+        )
+
+    def test_not_cached_response(self, mock_get_fdc_inquiry_data, mock_get_redis_client, _):
+        mock_get_redis_client.return_value = self.redis_client
+        self.structure_response.update(status='Inquiry Function is Disabled', pinjaman=None)
+        mock_get_fdc_inquiry_data.return_value = self.get_response(self.structure_response)
+
+        get_and_save_fdc_data({'id': self.fdc_inquiry.id, 'nik': self.nik}, reason=2, retry=0)
+        other_fdc_inquiry = FDCInquiryFactory(nik=self.nik, status=None)
+        get_and_save_fdc_data({'id': other_fdc_inquiry.id, 'nik': self.nik}, reason=2, retry=0)
+
+        self.assertEqual(mock_get_fdc_inquiry_data.call_count, 2)
+
+    def test_inactive_setting(self, mock_get_fdc_inquiry_data, mock_get_redis_client, _):
+        self.feature_setting.is_active = False
+        self.feature_setting.save()
+        mock_get_fdc_inquiry_data.return_value = self.get_response(self.structure_response)
+
+        get_and_save_fdc_data({'id': self.fdc_inquiry.id, 'nik': self.nik}, reason=2, retry=0)
+
+        mock_get_redis_client.assert_not_called()
+        self.assertEqual(FDCInquiryLoan.objects.filter(fdc_inquiry=self.fdc_inquiry).count(), 3)
+
+    def test_parse_fdc_date(self, *_):
+        self.assertEqual(parse_fdc_date('2023-09-01'), datetime(2023, 9, 1).date())
+        self.assertIs(parse_fdc_date('2023-09-01'), parse_fdc_date('2023-09-01'))
@@ -1,4 +1,5 @@
 from datetime import timedelta
+from itertools import islice
 
 from django.utils import timezone
 from juloserver.fdc.constants import FDCConstant, RUN_FDC_INQUIRY_UPLOAD_MAPPING_FIELDS
@@ -20,3 +21,12 @@ def run_fdc_inquiry_format_data(raw_data):
         formated_data[formated_field] = raw_data.get(raw_field)
 
     return formated_data
+
+
+def yield_chunks(iterable, size):
+    """Lists of up to size items of iterable, without reading it past the current chunk."""
+    iterator = iter(iterable)
+    chunk = list(islice(iterator, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(iterator, size))
@@ -7,6 +7,7 @@ class FraudSecurityConfig(AppConfig):
 
     def ready(self):
         self._init_admin()
+        self._init_signals()
 
     def _init_admin(self):
         from juloserver.fraud_security.admins.swift_limit_drainer_admin import (
@@ -19,3 +20,6 @@ class FraudSecurityConfig(AppConfig):
             FeatureNameConst.SWIFT_LIMIT_DRAINER,
             SwiftLimitDrainerFeatureSettingAdminForm,
         )
+
+    def _init_signals(self):
+        import juloserver.fraud_security.signals  # noqa: F401
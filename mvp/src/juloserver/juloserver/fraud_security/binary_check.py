@@ -13,12 +13,8 @@ from juloserver.fraud_security.tasks import (
 )
 from juloserver.ana_api.models import PdApplicationFraudModelResult
 from juloserver.julo.product_lines import ProductLineCodes
-from juloserver.fraud_security.models import (
-    FraudBlacklistedCompany,
-    FraudBlacklistedPostalCode,
-    FraudBlacklistedGeohash5,
-    FraudBlacklistedEmergencyContact,
-)
+from juloserver.fraud_security.blacklist_index import FraudBlacklist, is_blacklisted
+from juloserver.fraud_security.models import FraudBlacklistedEmergencyContact
 from juloserver.julo.constants import FeatureNameConst
 from juloserver.julo.models import Application, Customer
 from juloserver.julo.services2.feature_setting import FeatureSettingHelper
@@ -62,9 +58,7 @@ class BlacklistedCompanyHandler(AbstractBinaryCheckHandler):
         if not self.setting.is_active:
             return True
 
-        return not FraudBlacklistedCompany.objects.is_blacklisted(
-            company_name=self.application.company_name
-        )
+        return not is_blacklisted(FraudBlacklist.COMPANY, self.application.company_name)
 
 
 class BlacklistedPostalCodeHandler(AbstractBinaryCheckHandler):
@@ -76,8 +70,7 @@ class BlacklistedPostalCodeHandler(AbstractBinaryCheckHandler):
         if not self.setting.is_active:
             return True
 
-        return not FraudBlacklistedPostalCode.objects.filter(
-            postal_code=self.application.address_kodepos).exists()
+        return not is_blacklisted(FraudBlacklist.POSTAL_CODE, self.application.address_kodepos)
 
 
 class BlacklistedGeohash5Handler(AbstractBinaryCheckHandler):
@@ -96,8 +89,9 @@ class BlacklistedGeohash5Handler(AbstractBinaryCheckHandler):
             address_geolocation=self.application.addressgeolocation
         )
 
-        return not FraudBlacklistedGeohash5.objects.filter(
-            geohash5=address_geolocation_geohash.geohash6[:5]).exists()
+        return not is_blacklisted(
+            FraudBlacklist.GEOHASH5, address_geolocation_geohash.geohash6[:5]
+        )
 
 
 class EmergencyContactBlacklistHandler(AbstractBinaryCheckHandler):
@@ -144,7 +138,7 @@ class EmergencyContactBlacklistHandler(AbstractBinaryCheckHandler):
 
         for number in emergency_contact_numbers:
             if (
-                FraudBlacklistedEmergencyContact.objects.filter(phone_number=number).exists()
+                is_blacklisted(FraudBlacklist.EMERGENCY_CONTACT, number)
                 and not referral_code_valid
                 and mycroft_score_passed
             ):
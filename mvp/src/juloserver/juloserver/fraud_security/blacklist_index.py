@@ -0,0 +1,226 @@
+"""
+Process-local index of the fraud blacklists used by the binary checks.
+
+Every blacklist is kept as a sorted array of 64 bit digests of its values, 8 bytes per entry
+instead of the ~100 bytes of a python str in a set, so a multi-million entry blacklist stays
+small in every worker. A value whose digest is not in the array is not blacklisted without any
+query. A digest hit is confirmed with the exists() query the checks used before, which also
+covers a collision and a row deleted since the load.
+
+The index is reloaded when the version key in redis changes, which the blacklist signals bump,
+and at least every max_age_seconds for the rows written without a signal.
+"""
+import hashlib
+import logging
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from typing import Optional
+
+from juloserver.fraud_security.models import (
+    FraudBlacklistedASN,
+    FraudBlacklistedCompany,
+    FraudBlacklistedEmergencyContact,
+    FraudBlacklistedGeohash5,
+    FraudBlacklistedPostalCode,
+)
+from juloserver.julo.constants import FeatureNameConst
+from juloserver.julo.models import FeatureSetting
+from juloserver.julo.services2 import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+FRAUD_BLACKLIST_INDEX_VERSION_KEY = 'fraud_blacklist_index:version'
+DEFAULT_CHECK_INTERVAL_SECONDS = 5
+DEFAULT_MAX_AGE_SECONDS = 60 * 60
+
+
+class FraudBlacklist:
+    COMPANY = 'company'
+    POSTAL_CODE = 'postal_code'
+    GEOHASH5 = 'geohash5'
+    ASN = 'asn'
+    EMERGENCY_CONTACT = 'emergency_contact'
+
+
+def upper(value):
+    # company_name__iexact compares UPPER() of both sides
+    return value.upper()
+
+
+# blacklist: (model, field, lookup of the confirming query, normalization of the value)
+BLACKLIST_SOURCES = {
+    FraudBlacklist.COMPANY: (FraudBlacklistedCompany, 'company_name', 'iexact', upper),
+    FraudBlacklist.POSTAL_CODE: (FraudBlacklistedPostalCode, 'postal_code', 'exact', str),
+    FraudBlacklist.GEOHASH5: (FraudBlacklistedGeohash5, 'geohash5', 'exact', str),
+    FraudBlacklist.ASN: (FraudBlacklistedASN, 'asn_data', 'exact', str),
+    FraudBlacklist.EMERGENCY_CONTACT: (
+        FraudBlacklistedEmergencyContact,
+        'phone_number',
+        'exact',
+        str,
+    ),
+}
+
+
+def get_fraud_blacklist_index_setting():
+    """
+    Return:
+        dict of check_interval_seconds and max_age_seconds when the binary checks read the
+        index, None otherwise
+    """
+    feature_setting = FeatureSetting.objects.get_cached(
+        FeatureNameConst.FRAUD_BLACKLIST_INDEX, is_active=True
+    )
+    if not feature_setting:
+        return None
+
+    parameters = feature_setting.parameters or {}
+    return dict(
+        check_interval_seconds=parameters.get(
+            'check_interval_seconds', DEFAULT_CHECK_INTERVAL_SECONDS
+        ),
+        max_age_seconds=parameters.get('max_age_seconds', DEFAULT_MAX_AGE_SECONDS),
+    )
+
+
+def get_digest(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), 'little')
+
+
+class DigestSet:
+    """Sorted array of the 64 bit digests of a set of values."""
+
+    def __init__(self, values):
+        self.digests = array('Q', sorted({get_digest(value) for value in values}))
+
+    def __len__(self):
+        return len(self.digests)
+
+    def __contains__(self, value: str) -> bool:
+        digest = get_digest(value)
+        index = bisect_left(self.digests, digest)
+        return index < len(self.digests) and self.digests[index] == digest
+
+    @property
+    def nbytes(self):
+        return self.digests.itemsize * len(self.digests)
+
+
+class FraudBlacklistIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._digest_sets = None
+        self._version = None
+        self._loaded_at = 0
+        self._checked_at = 0
+
+    def is_blacklisted(self, blacklist: str, value: Optional[str]) -> bool:
+        """Same result as the exists() query of the blacklist for value."""
+        if value is None:
+            return False
+
+        setting = get_fraud_blacklist_index_setting()
+        if not setting:
+            return self._exists_in_db(blacklist, value)
+
+        try:
+            digest_sets = self._get_digest_sets(setting)
+        except Exception as e:
+            logger.warning({
+                'action': 'FraudBlacklistIndex.is_blacklisted',
+                'blacklist': blacklist,
+                'message': 'fallback to database',
+                'error': str(e),
+            })
+            return self._exists_in_db(blacklist, value)
+
+        _, _, _, normalize = BLACKLIST_SOURCES[blacklist]
+        if normalize(value) not in digest_sets[blacklist]:
+            return False
+
+        return self._exists_in_db(blacklist, value)
+
+    def invalidate(self):
+        """Drop the index of this process and tell the other processes to drop theirs."""
+        self._digest_sets = None
+        get_redis_client().increment(FRAUD_BLACKLIST_INDEX_VERSION_KEY)
+
+    def clear(self):
+        """Drop the index of this process only."""
+        self._digest_sets = None
+
+    def get_sizes(self):
+        """dict of the entries and bytes of every loaded blacklist"""
+        return {
+            blacklist: dict(entries=len(digest_set), nbytes=digest_set.nbytes)
+            for blacklist, digest_set in (self._digest_sets or {}).items()
+        }
+
+    def _exists_in_db(self, blacklist, value):
+        model, field, lookup, _ = BLACKLIST_SOURCES[blacklist]
+        return model.objects.filter(**{'{}__{}'.format(field, lookup): value}).exists()
+
+    def _get_digest_sets(self, setting):
+        digest_sets = self._digest_sets
+        if digest_sets is not None and not self._is_check_due(setting):
+            return digest_sets
+
+        with self._lock:
+            if self._digest_sets is not None and not self._is_check_due(setting):
+                return self._digest_sets
+
+            # read the version before the rows, a change in between only costs one more reload
+            version = get_redis_client().get(FRAUD_BLACKLIST_INDEX_VERSION_KEY)
+            if (
+                self._digest_sets is None
+                or version != self._version
+                or time.monotonic() - self._loaded_at >= setting['max_age_seconds']
+            ):
+                self._digest_sets = self._load()
+                self._version = version
+                self._loaded_at = time.monotonic()
+            self._checked_at = time.monotonic()
+
+            return self._digest_sets
+
+    def _load(self):
+        start = time.monotonic()
+        digest_sets = {}
+        for blacklist, (model, field, _, normalize) in BLACKLIST_SOURCES.items():
+            values = model.objects.values_list(field, flat=True).iterator()
+            digest_sets[blacklist] = DigestSet(
+                normalize(value) for value in values if value is not None
+            )
+
+        logger.info({
+            'action': 'FraudBlacklistIndex._load',
+            'seconds': round(time.monotonic() - start, 3),
+            'entries': {
+                blacklist: len(digest_set) for blacklist, digest_set in digest_sets.items()
+            },
+        })
+        return digest_sets
+
+    def _is_check_due(self, setting):
+        return time.monotonic() - self._checked_at >= setting['check_interval_seconds']
+
+
+fraud_blacklist_index = FraudBlacklistIndex()
+
+
+def is_blacklisted(blacklist: str, value: Optional[str]) -> bool:
+    return fraud_blacklist_index.is_blacklisted(blacklist, value)
+
+
+def invalidate_fraud_blacklist_index():
+    try:
+        fraud_blacklist_index.invalidate()
+    except Exception as e:
+        # the other processes still pick the change up at max_age_seconds
+        fraud_blacklist_index.clear()
+        logger.error({
+            'action': 'invalidate_fraud_blacklist_index',
+            'error': str(e),
+        })
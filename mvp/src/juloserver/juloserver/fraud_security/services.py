@@ -41,6 +41,7 @@ from juloserver.application_flow.constants import JuloOneChangeReason
 from juloserver.application_flow.models import ApplicationRiskyCheck
 from juloserver.customer_module.constants import BankAccountCategoryConst
 from juloserver.customer_module.models import BankAccountDestination
+from juloserver.fraud_security.blacklist_index import FraudBlacklist, is_blacklisted
 from juloserver.fraud_security.constants import (
     FraudFlagSource,
     FraudFlagTrigger,
@@ -49,7 +50,6 @@ from juloserver.fraud_security.constants import (
     FraudBlockAccountConst,
 )
 from juloserver.fraud_security.models import (
-    FraudBlacklistedASN,
     FraudFlag,
     FraudVelocityModelGeohash,
     FraudVelocityModelGeohashBucket,
@@ -1045,9 +1045,9 @@ def blacklisted_asn_check(application):
         bool: True If blacklisted ASN is detected,
               False If not blacklisted ASN or bypass due to insufficient data for the check
     """
-    blocked_asn_feature = FeatureSetting.objects.filter(
-        feature_name=FeatureNameConst.BLACKLISTED_ASN, is_active=True
-    ).last()
+    blocked_asn_feature = FeatureSetting.objects.get_cached(
+        FeatureNameConst.BLACKLISTED_ASN, is_active=True
+    )
     if not blocked_asn_feature:
         return False
 
@@ -1065,7 +1065,7 @@ def blacklisted_asn_check(application):
         asn_data = vpn_detection.extra_data.get('org')
         if not asn_data:
             return False
-        if FraudBlacklistedASN.objects.filter(asn_data=asn_data).exists():
+        if is_blacklisted(FraudBlacklist.ASN, asn_data):
             return True
     return False
 
@@ -1,7 +1,14 @@
 import logging
 
+from django.db.models import signals
+
 from juloserver.antifraud.services.pii_vault import detokenize_pii_antifraud_data
+from juloserver.fraud_security.blacklist_index import (
+    BLACKLIST_SOURCES,
+    invalidate_fraud_blacklist_index,
+)
 from juloserver.fraud_security.services import check_login_for_ato_device_change
+from juloserver.julo.utils import execute_after_transaction_safely
 from juloserver.pii_vault.constants import PiiSource
 from juloserver.pin.models import LoginAttempt
 
@@ -56,3 +63,20 @@ def ato_change_device_on_login_success_handler(sender, **kwargs) -> None:
     ).get(id=login_attempt_id)
 
     check_login_for_ato_device_change(login_attempt)
+
+
+def invalidate_fraud_blacklist_index_after_change(sender, **kwargs):
+    """
+    Make every worker reload its FraudBlacklistIndex after a blacklist row is added or
+    removed from the fraud portal, Django Admin or the binary checks.
+    """
+    execute_after_transaction_safely(invalidate_fraud_blacklist_index)
+
+
+for blacklist_model, _, _, _ in BLACKLIST_SOURCES.values():
+    for model_signal in (signals.post_save, signals.post_delete):
+        model_signal.connect(
+            invalidate_fraud_blacklist_index_after_change,
+            sender=blacklist_model,
+            dispatch_uid='invalidate_fraud_blacklist_index_{}'.format(blacklist_model.__name__),
+        )
@@ -0,0 +1,62 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from juloserver.fraud_security.blacklist_index import (
+    DigestSet,
+    FraudBlacklist,
+    FraudBlacklistIndex,
+)
+from juloserver.fraud_security.tests.factories import (
+    FraudBlacklistedCompanyFactory,
+    FraudBlacklistedPostalCodeFactory,
+)
+from juloserver.julo.constants import FeatureNameConst
+from juloserver.julo.services2.redis_helper import MockRedisHelper
+from juloserver.julo.tests.factories import FeatureSettingFactory
+
+
+class TestDigestSet(TestCase):
+    def test_contains(self):
+        digest_set = DigestSet(['12345', '54321', '12345'])
+
+        self.assertEqual(len(digest_set), 2)
+        self.assertEqual(digest_set.nbytes, 16)
+        self.assertIn('54321', digest_set)
+        self.assertNotIn('11111', digest_set)
+
+
+@mock.patch('juloserver.fraud_security.blacklist_index.get_redis_client')
+class TestFraudBlacklistIndex(TestCase):
+    def setUp(self):
+        self.redis_client = MockRedisHelper()
+        self.index = FraudBlacklistIndex()
+        FeatureSettingFactory(feature_name=FeatureNameConst.FRAUD_BLACKLIST_INDEX)
+        FraudBlacklistedPostalCodeFactory(postal_code='12345')
+        FraudBlacklistedCompanyFactory(company_name='PT Fraud')
+
+    def test_is_blacklisted(self, mock_get_redis_client):
+        mock_get_redis_client.return_value = self.redis_client
+
+        self.assertTrue(self.index.is_blacklisted(FraudBlacklist.POSTAL_CODE, '12345'))
+        self.assertFalse(self.index.is_blacklisted(FraudBlacklist.POSTAL_CODE, '54321'))
+        self.assertTrue(self.index.is_blacklisted(FraudBlacklist.COMPANY, 'pt fraud'))
+        self.assertFalse(self.index.is_blacklisted(FraudBlacklist.COMPANY, None))
+
+    def test_no_blacklist_query_for_a_miss(self, mock_get_redis_client):
+        mock_get_redis_client.return_value = self.redis_client
+        self.index.is_blacklisted(FraudBlacklist.POSTAL_CODE, '12345')
+
+        # the feature setting cache is disabled in the unit test settings
+        with self.assertNumQueries(1):
+            self.assertFalse(self.index.is_blacklisted(FraudBlacklist.POSTAL_CODE, '54321'))
+
+    def test_reload_after_invalidate(self, mock_get_redis_client):
+        mock_get_redis_client.return_value = self.redis_client
+        self.assertFalse(self.index.is_blacklisted(FraudBlacklist.POSTAL_CODE, '54321'))
+
+        FraudBlacklistedPostalCodeFactory(postal_code='54321')
+        self.index.invalidate()
+
+        self.assertTrue(self.index.is_blacklisted(FraudBlacklist.POSTAL_CODE, '54321'))
+        self.assertEqual(self.index.get_sizes()[FraudBlacklist.POSTAL_CODE]['entries'], 2)
@@ -1,9 +1,10 @@
 from builtins import str
 from builtins import object
 import logging
-import requests
 
 from juloserver.julo.exceptions import JuloException
+from juloserver.julocore.constants import HttpVendor
+from juloserver.julocore.http_transport import get_http_session
 
 
 logger = logging.getLogger(__name__)
@@ -14,6 +15,7 @@ class JuloXenditClient(object):
     def __init__(self, api_key, base_url):
         self.api_key = api_key
         self.base_url = base_url
+        self.session = get_http_session(HttpVendor.XENDIT)
 
     def validate_name(self, bank_account_number, bank_code):
         url = self.base_url + '/bank_account_data_requests/'
@@ -22,7 +24,7 @@ class JuloXenditClient(object):
             'bank_code': bank_code
         }
         logger.info(json)
-        response = requests.post(url, auth=(self.api_key, ''), json=json)
+        response = self.session.post(url, auth=(self.api_key, ''), json=json)
         json['status'] = 'name_validated'
         json['response_status'] = response.status_code
         logger.info(json)
@@ -41,7 +43,7 @@ class JuloXenditClient(object):
             'description': description
         }
         logger.info(json)
-        response = requests.post(url, auth=(self.api_key, ''), json=json, headers=headers)
+        response = self.session.post(url, auth=(self.api_key, ''), json=json, headers=headers)
         if response.status_code == 400:
             raise JuloException(
                 'Xendit disbursement failed. reason: %s, message: %s' %
@@ -54,7 +56,7 @@ class JuloXenditClient(object):
 
     def get_balance(self):
         url = self.base_url + '/balance'
-        response = requests.get(url, auth=(self.api_key, ''))
+        response = self.session.get(url, auth=(self.api_key, ''))
         if response.status_code == 400:
             raise JuloException(
                 'Failed to get cash balance on Xendit: %s' % response.json())
@@ -77,7 +79,7 @@ class JuloXenditClient(object):
             'description': description
         }
         logger.info(json)
-        response = requests.post(url, auth=(self.api_key, ''), json=json, headers=headers)
+        response = self.session.post(url, auth=(self.api_key, ''), json=json, headers=headers)
 
         json['status'] = 'cashback_disbursement_triggered'
         json['response_status'] = response.status_code
@@ -558,6 +558,9 @@ class FeatureNameConst(object):
     COLLECTION_OFFER_GENERAL_WEBSITE = 'collection_offer_general_website'
     SENT_EMAIl_AND_TRACKING = 'sent_email_and_tracking'
     MOENGAGE_EVENT = 'moengage_event'
+    MOENGAGE_DAILY_ATTRIBUTE_SYNC = 'moengage_daily_attribute_sync'
+    PREBUILT_DROPDOWN_BUNDLE = 'prebuilt_dropdown_bundle'
+    USER_ACTION_LOG_BUFFERED_INGESTION = 'user_action_log_buffered_ingestion'
     OCR_SETTING = 'ocr_setting'
     ACCOUNTING_CUT_OFF_DATE = 'accounting_cut_off_date'
     PIN_SETTING = 'pin_setting'
@@ -576,6 +579,7 @@ class FeatureNameConst(object):
     CLCS_SCRAPED_SCHEDULE = 'clcs_scraped_schedule'
     CASHBACK_DELAY_LIMIT = 'cashback_delay_limit_threshold'
     EXPIRY_TOKEN_SETTING = 'expiry_token_setting'
+    EXPIRY_TOKEN_AUTHENTICATION_FAST_PATH = 'expiry_token_authentication_fast_path'
     GRAB_STOP_REGISTRATION = 'grabmodal_stop_registration'
     WEB_MODEL_FDC_RETRY_SETTING = 'web_model_fdc_retry_setting'
     CASHBACK_EXPIRED_CONFIGURATION = 'cashback_expired_configuration'
@@ -673,6 +677,8 @@ class FeatureNameConst(object):
     GRAB_DEFENCE_FRAUD_SCORE = 'grab_defence_fraud_score'
     OJK_AUDIT_FEATURE = 'ojk_audit_feature'
     CRM_HIDE_MENU = 'crm_hide_menu'
+    IN_PROCESS_AUTOCOMPLETE = 'in_process_autocomplete'
+    CRM_DASHBOARD_INCREMENTAL_COUNTERS = 'crm_dashboard_incremental_counters'
     GRAB_C_SCORE_FEATURE_FOR_INTELIX = 'grab_c_score_feature_for_intelix'
     FRAUD_VELOCITY_MODEL_GEOHASH = 'fraud_velocity_model_geohash'
     AUTODEBET_BENEFIT_CONTROL = 'autodebet_benefit_control'
@@ -694,6 +700,9 @@ class FeatureNameConst(object):
     HEIMDALL_MOCK_RESPONSE_SET = 'heimdall_mock_response_set'
     BPJS_MOCK_RESPONSE_SET = 'bpjs_mock_response_set'
     FDC_MOCK_RESPONSE_SET = 'fdc_mock_response_set'
+    FDC_INQUIRY_RESPONSE_CACHE = 'fdc_inquiry_response_cache'
+    URL_SHORTENER_ENGINE = 'url_shortener_engine'
+    PDF_RENDERER_POOL = 'pdf_renderer_pool'
     DUKCAPIL_MOCK_RESPONSE_SET = 'dukcapil_mock_response_set'
     CONFIG_FLOW_LIMIT_JSTARTER = 'config_flow_to_limit_jstarter'
     SECOND_CHECK_JSTARTER_MESSAGE = 'second_check_notif_jstarter'
@@ -703,6 +712,7 @@ class FeatureNameConst(object):
     DUKCAPIL_CALLBACK_MOCK_RESPONSE_SET = 'dukcapil_callback_mock_response_set'
     DISABLE_PAYMENT_METHOD = 'disable_payment_method'
     CREDIT_MATRIX_REPEAT_SETTING = 'credit_matrix_repeat_setting'
+    CREDIT_MATRIX_ENGINE = 'credit_matrix_engine'
     SHOPEE_SCORING = "shopee_scoring"
     TRIGGER_RESCRAPE_AND_FORCE_LOGOUT = 'trigger_rescrape_and_force_logout'
     AUTO_RETROFIX = 'auto_retrofix'
@@ -744,6 +754,7 @@ class FeatureNameConst(object):
     FRAUD_BLACKLISTED_COMPANY = 'fraud_blacklisted_company'
     HIGH_RISK_ASN_TOWER_CHECK = 'high_risk_asn_tower_check'
     BLACKLISTED_ASN = 'blacklisted_asn'
+    FRAUD_BLACKLIST_INDEX = 'fraud_blacklist_index'
     SHOPEE_WHITELIST_SCORING = 'shopee_whitelist_scoring'
     FRAUDSTER_FACE_MATCH = 'fraudster_face_match'
     MARKETING_LOAN_PRIZE_CHANCE = 'marketing_loan_prize_chance'
@@ -902,6 +913,7 @@ class FeatureNameConst(object):
     USER_SEGMENT_CHUNK_SIZE = 'user_segment_chunk_size'
     USER_SEGMENT_CHUNK_INTEGRITY_CHECK_TTL = 'user_segment_chunk_integrity_check_ttl'
     SMS_CAMPAIGN_FAILED_PROCESS_CHECK_TTL = 'sms_campaign_failed_process_check_ttl'
+    SMS_CAMPAIGN_BLAST_ENGINE = 'sms_campaign_blast_engine'
     OVO_TOKENIZATION = 'ovo_tokenization'
     OVO_TOKENIZATION_WHITELIST = 'ovo_tokenization_whitelist'
     OVO_TOKENIZATION_ONBOARDING = 'ovo_tokenization_onboarding'
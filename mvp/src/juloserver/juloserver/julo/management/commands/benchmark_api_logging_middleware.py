@@ -0,0 +1,168 @@
+import json
+import logging
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.http import HttpResponse, RawPostDataException
+from django.test.client import RequestFactory
+from rest_framework import status
+
+from juloserver.julocore.http_transport import get_percentile
+from juloserver.julocore.restapi.middleware import ApiLoggingMiddleware
+from juloserver.julocore.utils import get_client_ip
+
+
+class LegacyApiLoggingMiddleware(ApiLoggingMiddleware):
+    """
+    process_response of ApiLoggingMiddleware before the rework, as it was: the body is read
+    and the paths are scanned on every response.
+    """
+
+    def process_response(self, request, response):
+        if not hasattr(request, 'start_time_to_log'):
+            return response
+
+        try:
+            request.post_to_log = request.POST
+            request.body_to_log = request.body
+        except RawPostDataException:
+            request.post_to_log = b''
+            request.body_to_log = b''
+        path = request.path
+
+        if any(
+            p in str(path)
+            for p in [
+                'api/liveness-detection/',
+                'api/application-form/v2/application',
+                'api/application-form/v1/cancel',
+                'api/application-form/v2/reapply',
+                'api/application_flow/v1/bottom-sheet-tutorial',
+                'api/julo-starter/v1/application',
+                'api/otp/v1/validate',
+                'api/otp/v2/validate',
+                'api/otp/v1/request',
+                'api/otp/v2/request',
+                'api/pin/v3/login',
+                'api/pin/v4/login',
+                'api/otp/v1/check-user-allowed',
+                'api/customer-module/v1/appsflyer',
+            ]
+        ):
+            return response
+
+        if response.status_code < status.HTTP_400_BAD_REQUEST:
+            return response
+
+        ip_address = get_client_ip(request)
+
+        request_body = None
+        if request.method in ('POST', 'PATCH', 'PUT'):
+            if request.post_to_log:
+                request_body = request.post_to_log.dict()
+            else:
+                if (
+                    'CONTENT_TYPE' in request.META
+                    and 'json' in request.META['CONTENT_TYPE'].lower()
+                ):
+                    try:
+                        request_body = json.loads(request.body_to_log.decode(errors='replace'))
+                    except json.JSONDecodeError as jde:
+                        request_body = "%s: %s\n %s" % (
+                            jde.__class__.__name__,
+                            str(jde),
+                            request.body_to_log.decode(errors='replace'),
+                        )
+                else:
+                    request_body = request.body_to_log.decode(errors='replace')
+
+        log_content = {
+            'action': 'logging_api_error',
+            'ip_address': ip_address,
+            'method': request.method,
+            'path': path,
+            'request_params': request.GET.dict(),
+            'request_body': request_body,
+            'payload_size': len(response.content),
+            'response_status': response.status_code,
+            'response_body': response.content.decode(errors='replace'),
+            'duration': round(time.time() - request.start_time_to_log, 3),
+        }
+
+        if any(p in str(path) for p in settings.LOGGING_BLACKLISTED_PATHS):
+            del log_content['request_params']
+            del log_content['request_body']
+
+        response_logger = logging.getLogger('api.request')
+        response_logger.error(json.dumps(log_content))
+
+        return response
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure the microseconds ApiLoggingMiddleware adds to a request, before and after '
+        'the rework, for json posts of which a share gets an error response. The api log is '
+        'written to /dev/null.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=20000)
+        parser.add_argument('--error-ratio', type=float, default=0.02)
+        parser.add_argument('--body-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        error_every = int(1 / options['error_ratio']) if options['error_ratio'] else 0
+        body = json.dumps({'data': 'x' * options['body_size']})
+        success_response = HttpResponse(b'{"success":true}', status=200)
+        error_response = HttpResponse(
+            json.dumps({'success': False, 'errors': ['x' * options['body_size']]}), status=400
+        )
+        responses = [
+            error_response if error_every and index % error_every == 0 else success_response
+            for index in range(options['requests'])
+        ]
+
+        api_logger = logging.getLogger('api.request')
+        handlers, propagate = api_logger.handlers, api_logger.propagate
+        with open(os.devnull, 'w') as devnull:
+            api_logger.handlers = [logging.StreamHandler(devnull)]
+            api_logger.propagate = False
+            try:
+                for name, middleware in (
+                    ('legacy', LegacyApiLoggingMiddleware()),
+                    ('reworked', ApiLoggingMiddleware()),
+                ):
+                    self.report(name, middleware, body, responses)
+            finally:
+                api_logger.handlers, api_logger.propagate = handlers, propagate
+
+    def report(self, name, middleware, body, responses):
+        request_factory = RequestFactory()
+        requests = [
+            request_factory.post(
+                '/api/loan/v2/loan/{}'.format(index), data=body, content_type='application/json'
+            )
+            for index in range(len(responses))
+        ]
+
+        latencies = []
+        for request, response in zip(requests, responses):
+            start = time.perf_counter()
+            middleware.process_request(request)
+            middleware.process_response(request, response)
+            latencies.append(time.perf_counter() - start)
+
+        latencies.sort()
+        self.stdout.write(
+            self.style.SUCCESS(
+                '{}: {:.1f}us per request, p50 {:.1f}us, p99 {:.1f}us'.format(
+                    name,
+                    sum(latencies) / len(latencies) * 1000000,
+                    get_percentile(latencies, 50) * 1000000,
+                    get_percentile(latencies, 99) * 1000000,
+                )
+            )
+        )
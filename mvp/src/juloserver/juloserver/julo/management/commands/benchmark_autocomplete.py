@@ -0,0 +1,88 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from juloserver.apiv1.dropdown import BirthplaceDropDown, CompanyDropDown, UkerBriDropDown
+from juloserver.julocore.autocomplete import AutocompleteIndex, tokenize
+from juloserver.julocore.http_transport import get_percentile
+from juloserver.julocore.redis_completion_py3 import RedisEnginePy3
+
+DROPDOWNS = {
+    'companies': CompanyDropDown,
+    'birthplace': BirthplaceDropDown,
+    'uker_bri': UkerBriDropDown,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure the queries per second and the p99 latency of the in-process autocomplete '
+        'index against RedisEnginePy3 on a dropdown list'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dropdown', choices=sorted(DROPDOWNS), default='companies')
+        parser.add_argument('--queries', type=int, default=2000)
+        parser.add_argument('--limit', type=int, default=10)
+        parser.add_argument('--skip-redis', action='store_true')
+
+    def handle(self, *args, **options):
+        titles = DROPDOWNS[options['dropdown']].DATA
+        queries = self.get_queries(titles, options['queries'])
+        limit = options['limit']
+
+        start = time.time()
+        index = AutocompleteIndex((title, title) for title in titles)
+        self.stdout.write(
+            'index of {} titles built in {:.1f}ms'.format(len(index), (time.time() - start) * 1000)
+        )
+        self.report('in-process index', lambda phrase: index.search(phrase, limit), queries)
+
+        if options['skip_redis']:
+            return
+
+        redis_completion_engine = RedisEnginePy3(prefix='benchmark_autocomplete')
+        redis_completion_engine.flush()
+        try:
+            for order, title in enumerate(titles):
+                redis_completion_engine.store(order, title, title, check_exist=False)
+            self.report(
+                'RedisEnginePy3',
+                lambda phrase: redis_completion_engine.search(phrase, limit),
+                queries,
+            )
+        finally:
+            redis_completion_engine.flush()
+
+    def get_queries(self, titles, count):
+        """Prefixes of one to three words of random titles, a tenth of them with a typo."""
+        random.seed(count)
+        queries = []
+        for _ in range(count):
+            words = tokenize(random.choice(titles))
+            words = random.sample(words, random.randint(1, min(3, len(words))))
+            words = [word[:random.randint(1, len(word))] for word in words]
+            if random.random() < 0.1 and len(words[-1]) > 4:
+                words[-1] = words[-1][:2] + words[-1][3] + words[-1][2] + words[-1][4:]
+            queries.append(' '.join(words))
+        return queries
+
+    def report(self, name, search, queries):
+        latencies = []
+        for phrase in queries:
+            start = time.perf_counter()
+            search(phrase)
+            latencies.append(time.perf_counter() - start)
+
+        latencies.sort()
+        self.stdout.write(
+            self.style.SUCCESS(
+                '{}: {:.0f} queries/s, p50 {:.3f}ms, p99 {:.3f}ms'.format(
+                    name,
+                    len(latencies) / max(sum(latencies), 0.000001),
+                    get_percentile(latencies, 50) * 1000,
+                    get_percentile(latencies, 99) * 1000,
+                )
+            )
+        )
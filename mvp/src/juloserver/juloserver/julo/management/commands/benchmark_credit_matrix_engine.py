@@ -0,0 +1,75 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from juloserver.account.services.credit_limit import get_credit_matrix
+from juloserver.account.services.credit_matrix_engine import CreditMatrixEngine
+from juloserver.julo.models import CreditMatrix
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the credit matrix query of get_credit_matrix with the credit matrix engine '
+        'on the current matrices and report any different selection, run it with the '
+        'credit_matrix_engine feature setting off'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lookups', type=int, default=1000)
+        parser.add_argument('--transaction-type', default='self')
+
+    def handle(self, *args, **options):
+        transaction_type = options['transaction_type']
+        credit_matrix_types = list(
+            CreditMatrix.objects.filter(transaction_type=transaction_type)
+            .values_list('credit_matrix_type', flat=True)
+            .distinct()
+        )
+        if not credit_matrix_types:
+            self.stdout.write('no credit matrix for {}'.format(transaction_type))
+            return
+
+        cases = []
+        for _ in range(options['lookups']):
+            pgood = round(random.random(), 4)
+            cases.append(
+                dict(
+                    min_threshold__lte=pgood,
+                    max_threshold__gte=pgood,
+                    credit_matrix_type=random.choice(credit_matrix_types),
+                    is_salaried=random.choice((True, False)),
+                    is_premium_area=random.choice((True, False)),
+                )
+            )
+
+        start = time.time()
+        expected = [get_credit_matrix(parameters, transaction_type) for parameters in cases]
+        orm_seconds = time.time() - start
+
+        engine = CreditMatrixEngine()
+        start = time.time()
+        engine.get_credit_matrix(cases[0], transaction_type)
+        load_seconds = time.time() - start
+
+        start = time.time()
+        results = [engine.get_credit_matrix(parameters, transaction_type) for parameters in cases]
+        engine_seconds = time.time() - start
+
+        mismatches = sum(
+            1
+            for result, credit_matrix in zip(results, expected)
+            if getattr(result, 'id', None) != getattr(credit_matrix, 'id', None)
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                '{} lookups: query {:.3f}ms/lookup, engine {:.1f}us/lookup after a {:.1f}ms '
+                'load, {} different selections'.format(
+                    len(cases),
+                    orm_seconds * 1000 / len(cases),
+                    engine_seconds * 1000000 / len(cases),
+                    load_seconds * 1000,
+                    mismatches,
+                )
+            )
+        )
@@ -0,0 +1,61 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from juloserver.julo.models import DashboardBuckets
+from juloserver.julo.services2.dashboard_counters import (
+    get_dashboard_buckets,
+    get_dashboard_drift,
+)
+from juloserver.julo.tasks import (
+    fill_dashboard_derived_buckets,
+    fill_dashboard_status_buckets,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the CRM dashboard refresh and read of the full scan with the incremental '
+        'dashboard counters. Nothing is saved.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reads', type=int, default=100)
+
+    def handle(self, *args, **options):
+        buckets = DashboardBuckets()
+        start = time.time()
+        fill_dashboard_status_buckets(buckets)
+        status_seconds = time.time() - start
+        start = time.time()
+        fill_dashboard_derived_buckets(buckets)
+        derived_seconds = time.time() - start
+        self.stdout.write(
+            self.style.SUCCESS(
+                'refresh: full scan {:.3f}s, derived buckets only {:.3f}s'.format(
+                    status_seconds + derived_seconds, derived_seconds
+                )
+            )
+        )
+
+        reads = options['reads']
+        start = time.time()
+        for _ in range(reads):
+            # application_priority_dashboard, application_dashboard and loan_dashboard
+            for _ in range(3):
+                DashboardBuckets.objects.last()
+        self._write_read('DashboardBuckets per dashboard', reads, time.time() - start)
+
+        start = time.time()
+        for _ in range(reads):
+            get_dashboard_buckets()
+        self._write_read('get_dashboard_buckets', reads, time.time() - start)
+
+        self.stdout.write('last reconciliation drift: {}'.format(get_dashboard_drift() or '-'))
+
+    def _write_read(self, name, reads, elapsed):
+        self.stdout.write(
+            self.style.SUCCESS(
+                'read {}: {:.2f}ms per request'.format(name, elapsed / reads * 1000)
+            )
+        )
@@ -0,0 +1,63 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from juloserver.account_payment.models import AccountPayment
+from juloserver.julo.models import Payment
+from juloserver.portal.core.pagination import get_keyset_ordering, get_keyset_page
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the OFFSET pagination of the CRM payment lists with the keyset pagination '
+        'on a shallow and a deep page'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-per-page', type=int, default=50)
+        parser.add_argument('--deep-page', type=int, default=500)
+
+    def handle(self, *args, **options):
+        max_per_page = options['max_per_page']
+        deep_page = options['deep_page']
+        for name, queryset in (
+            ('Payment', Payment.objects.exclude(is_restructured=True).order_by('-due_date')),
+            (
+                'AccountPayment',
+                AccountPayment.objects.exclude(is_restructured=True).order_by('-due_date'),
+            ),
+        ):
+            keyset_ordering = get_keyset_ordering(queryset)
+            cursors = self.get_cursors(queryset, keyset_ordering, deep_page, max_per_page)
+            for page in (1, deep_page):
+                if page > len(cursors):
+                    self.stdout.write('{} has less than {} pages'.format(name, page))
+                    continue
+
+                offset = (page - 1) * max_per_page
+                start = time.time()
+                list(queryset.values_list('id', flat=True)[offset:offset + max_per_page])
+                offset_seconds = time.time() - start
+
+                start = time.time()
+                get_keyset_page(queryset, keyset_ordering, cursors[page - 1], max_per_page)
+                keyset_seconds = time.time() - start
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        '{} page {}: offset {:.1f}ms, keyset {:.1f}ms'.format(
+                            name, page, offset_seconds * 1000, keyset_seconds * 1000
+                        )
+                    )
+                )
+
+    def get_cursors(self, queryset, keyset_ordering, pages, max_per_page):
+        """The cursor of every page up to pages, the first page has the empty cursor."""
+        cursors = ['']
+        while len(cursors) < pages:
+            _, next_cursor = get_keyset_page(
+                queryset, keyset_ordering, cursors[-1], max_per_page
+            )
+            if next_cursor is None:
+                break
+            cursors.append(next_cursor)
+        return cursors
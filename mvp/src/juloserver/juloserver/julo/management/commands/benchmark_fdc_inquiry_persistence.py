@@ -0,0 +1,115 @@
+import time
+from datetime import datetime
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from juloserver.fdc.services import build_fdc_inquiry_loans, parse_fdc_date
+from juloserver.julo.models import FDCInquiry, FDCInquiryLoan
+
+
+def get_pinjaman(loan_count):
+    return [
+        {
+            'id_penyelenggara': 'AFDC150' if index % 10 == 0 else str(810000 + index),
+            'nama_borrower': 'Benchmark Borrower',
+            'no_identitas': '3524242400000000',
+            'no_npwp': '',
+            'no_hp': None,
+            'email': None,
+            'tgl_perjanjian_borrower': '2023-03-{:02d}'.format(index % 28 + 1),
+            'tgl_penyaluran_dana': '2023-03-{:02d}'.format(index % 28 + 1),
+            'nilai_pendanaan': 1150000,
+            'tgl_pelaporan_data': '2023-04-11',
+            'sisa_pinjaman_berjalan': 958330,
+            'tgl_jatuh_tempo_pinjaman': '2023-09-{:02d}'.format(index % 28 + 1),
+            'dpd_terakhir': 0,
+            'dpd_max': 0,
+            'jenis_pengguna_ket': 'Individual',
+            'kualitas_pinjaman_ket': 'Lancar',
+            'status_pinjaman_ket': 'Outstanding',
+            'penyelesaian_w_oleh': None,
+            'pendanaan_syariah': False,
+            'tipe_pinjaman': 'Multiguna',
+            'sub_tipe_pinjaman': 'Onetime Loan / Cash Loan',
+            'reference': '',
+            'id': '{:032d}'.format(index),
+            'agunan': None,
+            'tgl_agunan': None,
+            'nama_penjamin': '',
+            'no_agunan': '',
+            'pendapatan': None,
+        }
+        for index in range(loan_count)
+    ]
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare a save per loan with the bulk insert of the FDC inquiry loans of one inquiry. '
+        'The rows are written to the last FDC inquiry and rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loans', type=int, default=50)
+        parser.add_argument('--inquiries', type=int, default=20)
+
+    def handle(self, *args, **options):
+        fdc_inquiry = FDCInquiry.objects.last()
+        if not fdc_inquiry:
+            self.stdout.write(self.style.ERROR('no FDC inquiry to write the loans to'))
+            return
+
+        pinjaman = get_pinjaman(options['loans'])
+        self.report('save per loan', fdc_inquiry, pinjaman, options['inquiries'], self.save_rows)
+        self.report('bulk_create', fdc_inquiry, pinjaman, options['inquiries'], self.bulk_create)
+
+        dates = [loan_data['tgl_jatuh_tempo_pinjaman'] for loan_data in pinjaman] * 1000
+        start = time.time()
+        for value in dates:
+            datetime.strptime(value, "%Y-%m-%d")
+        strptime_seconds = time.time() - start
+        start = time.time()
+        for value in dates:
+            parse_fdc_date(value)
+        self.stdout.write(
+            'date parsing of {} values: strptime {:.1f}ms, parse_fdc_date {:.1f}ms'.format(
+                len(dates), strptime_seconds * 1000, (time.time() - start) * 1000
+            )
+        )
+
+    def save_rows(self, fdc_inquiry_loans):
+        for fdc_inquiry_loan in fdc_inquiry_loans:
+            fdc_inquiry_loan.save()
+
+    def bulk_create(self, fdc_inquiry_loans):
+        FDCInquiryLoan.objects.bulk_create(fdc_inquiry_loans)
+
+    def report(self, name, fdc_inquiry, pinjaman, inquiries, write):
+        latencies = []
+        for _ in range(inquiries):
+            start = time.time()
+            try:
+                with transaction.atomic(using='bureau_db'):
+                    FDCInquiry.objects.select_for_update().get(id=fdc_inquiry.id)
+                    write(build_fdc_inquiry_loans(fdc_inquiry, pinjaman))
+                    latencies.append(time.time() - start)
+                    raise Rollback()
+            except Rollback:
+                pass
+
+        latencies.sort()
+        self.stdout.write(
+            self.style.SUCCESS(
+                '{}: {} loans per inquiry, lock held p50 {:.1f}ms, max {:.1f}ms'.format(
+                    name,
+                    len(pinjaman),
+                    latencies[len(latencies) // 2] * 1000,
+                    latencies[-1] * 1000,
+                )
+            )
+        )
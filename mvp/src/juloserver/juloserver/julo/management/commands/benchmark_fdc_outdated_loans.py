@@ -0,0 +1,162 @@
+import csv
+import io
+import os
+import random
+import time
+import tracemalloc
+from zipfile import ZIP_DEFLATED, ZipFile
+
+from django.core.management.base import BaseCommand
+
+from juloserver.fdc.constants import FDCTaskConst
+from juloserver.fdc.files import TempDir, yield_outdated_loans_data_from_file
+from juloserver.fdc.services import get_outdated_loans_from_rows
+from juloserver.fdc.utils import yield_chunks
+from juloserver.julo.models import Application, Loan
+
+FIELD_NAMES = ['id_borrower', 'id_pinjaman', 'tgl_pelaporan_data', 'status_pinjaman']
+
+
+def get_outdated_loan_by_row(row):
+    """The row by row lookup download_outdated_loans_from_fdc did before the chunks."""
+    customer_id = row['id_borrower']
+    id_pinjaman = row['id_pinjaman']
+    customer = None
+    application = (
+        Application.objects.select_related('customer')
+        .filter(customer_id=customer_id, application_xid=id_pinjaman)
+        .last()
+    )
+    if application:
+        loan = Loan.objects.filter(customer_id=customer_id, application=application).last()
+        customer = application.customer
+    else:
+        loan = (
+            Loan.objects.select_related('customer')
+            .filter(customer_id=customer_id, loan_xid=id_pinjaman)
+            .last()
+        )
+        # the loans without account raised here before, they are skipped now
+        if loan and loan.account:
+            application = loan.account.application_set.last()
+            customer = loan.customer
+
+    if not loan and not application:
+        return None
+    if application and loan and customer:
+        return dict(
+            customer_id=customer.id,
+            application_id=application.id,
+            report_date=row['tgl_pelaporan_data'],
+            reported_status=str(row['status_pinjaman']),
+            loan=loan.id,
+        )
+    return False
+
+
+class Command(BaseCommand):
+    help = (
+        'Resolve a synthetic FDC outdated loans file of existing and unknown loans by chunk, '
+        'and compare the first rows with the row by row lookup. Nothing is written.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=2000000)
+        parser.add_argument('--parity-rows', type=int, default=5000)
+        parser.add_argument('--sample', type=int, default=20000)
+
+    def handle(self, *args, **options):
+        keys = self.get_keys(options['sample'])
+        with TempDir() as tempdir:
+            filepath = os.path.join(tempdir.path, 'outdated_loans.zip')
+            self.write_file(filepath, keys, options['rows'])
+            self.stdout.write(
+                '{} rows, {:.1f}MB zip'.format(
+                    options['rows'], os.path.getsize(filepath) / 1024 / 1024
+                )
+            )
+
+            tracemalloc.start()
+            start = time.time()
+            chunks = resolved = not_found = 0
+            for rows in yield_chunks(
+                yield_outdated_loans_data_from_file(filepath),
+                FDCTaskConst.OUTDATED_LOANS_CHUNK_SIZE,
+            ):
+                outdated_loans, not_found_count = get_outdated_loans_from_rows(rows)
+                chunks += 1
+                resolved += len(outdated_loans)
+                not_found += not_found_count
+            elapsed = max(time.time() - start, 0.001)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            self.stdout.write(
+                self.style.SUCCESS(
+                    'chunked: {:.1f}s, {:.0f} rows/s, {} chunks, at most {} queries, '
+                    '{:.1f}MB peak, {} resolved, {} not found'.format(
+                        elapsed,
+                        options['rows'] / elapsed,
+                        chunks,
+                        chunks * 4,
+                        peak / 1024 / 1024,
+                        resolved,
+                        not_found,
+                    )
+                )
+            )
+
+            self.check_parity(filepath, options['parity_rows'])
+
+    def get_keys(self, sample):
+        """(id_borrower, id_pinjaman) of existing applications and loans, and unknown ones."""
+        keys = list(
+            Application.objects.filter(application_xid__isnull=False)
+            .order_by('-id')
+            .values_list('customer_id', 'application_xid')[:sample]
+        )
+        keys += list(
+            Loan.objects.filter(loan_xid__isnull=False)
+            .order_by('-id')
+            .values_list('customer_id', 'loan_xid')[:sample]
+        )
+        keys += [(1, 9000000000 + index) for index in range(max(len(keys) // 10, 1))]
+        return keys
+
+    def write_file(self, filepath, keys, rows):
+        random.seed(rows)
+        with ZipFile(filepath, 'w', ZIP_DEFLATED) as zip_file:
+            with zip_file.open('outdated_loans.csv', 'w') as csv_file:
+                text_file = io.TextIOWrapper(csv_file, write_through=True)
+                writer = csv.writer(text_file)
+                writer.writerow(FIELD_NAMES)
+                for _ in range(rows):
+                    customer_id, id_pinjaman = random.choice(keys)
+                    writer.writerow([customer_id, id_pinjaman, '2024-01-31', 'O'])
+                text_file.flush()
+                text_file.detach()
+
+    def check_parity(self, filepath, parity_rows):
+        rows = []
+        for row in yield_outdated_loans_data_from_file(filepath):
+            rows.append(row)
+            if len(rows) >= parity_rows:
+                break
+
+        start = time.time()
+        expected = [get_outdated_loan_by_row(row) for row in rows]
+        row_seconds = max(time.time() - start, 0.001)
+
+        outdated_loans, not_found_count = get_outdated_loans_from_rows(rows)
+        expected_outdated_loans = [outdated_loan for outdated_loan in expected if outdated_loan]
+        expected_not_found_count = sum(1 for outdated_loan in expected if outdated_loan is None)
+        is_same = (
+            outdated_loans == expected_outdated_loans
+            and not_found_count == expected_not_found_count
+        )
+        self.stdout.write(
+            (self.style.SUCCESS if is_same else self.style.ERROR)(
+                'row by row on {} rows: {:.0f} rows/s, same result: {}'.format(
+                    len(rows), len(rows) / row_seconds, is_same
+                )
+            )
+        )
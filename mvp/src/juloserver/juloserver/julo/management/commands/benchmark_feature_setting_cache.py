@@ -0,0 +1,43 @@
+import time
+
+from django.db import connection
+from django.core.management.base import BaseCommand
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from juloserver.julo.models import FeatureSetting
+from juloserver.julo.services2.feature_setting import FeatureSettingCache
+
+
+class Command(BaseCommand):
+    help = 'Compare DB queries and time of FeatureSetting lookups with and without the cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rounds', type=int, default=100)
+
+    def handle(self, *args, **options):
+        rounds = options['rounds']
+        feature_names = list(
+            FeatureSetting.objects.values_list('feature_name', flat=True).distinct()
+        )
+        lookups = rounds * len(feature_names)
+
+        for is_cache_enabled in (False, True):
+            feature_setting_cache = FeatureSettingCache()
+            with override_settings(FEATURE_SETTING_CACHE_ENABLED=is_cache_enabled):
+                with CaptureQueriesContext(connection) as queries:
+                    start = time.time()
+                    for _ in range(rounds):
+                        for feature_name in feature_names:
+                            feature_setting_cache.get(feature_name, is_active=True)
+                    elapsed = time.time() - start
+
+            self.stdout.write(
+                self.style.SUCCESS(
+                    '{}: {} lookups, {} queries, {:.1f}us per lookup'.format(
+                        'cache' if is_cache_enabled else 'database',
+                        lookups,
+                        len(queries),
+                        elapsed / max(lookups, 1) * 1000000,
+                    )
+                )
+            )
@@ -0,0 +1,60 @@
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+
+from juloserver.fraud_security.blacklist_index import DigestSet
+from juloserver.fraud_security.models import FraudBlacklistedGeohash5
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure the memory and lookup rate of the fraud blacklist index on a synthetic '
+        'blacklist against a python set and the exists() query'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--entries', type=int, default=3000000)
+        parser.add_argument('--lookups', type=int, default=1000000)
+        parser.add_argument('--db-lookups', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        entries = options['entries']
+        lookups = ['{:012d}'.format(index * 7) for index in range(options['lookups'])]
+
+        for name, build in (('python set', set), ('digest set', DigestSet)):
+            tracemalloc.start()
+            start = time.time()
+            blacklist = build('{:012d}'.format(index * 2) for index in range(entries))
+            build_seconds = time.time() - start
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            start = time.time()
+            hits = sum(1 for value in lookups if value in blacklist)
+            elapsed = max(time.time() - start, 0.001)
+            self.stdout.write(
+                self.style.SUCCESS(
+                    '{}: {} entries, {:.1f}MB held, {:.1f}MB peak, built in {:.1f}s, '
+                    '{:.0f} lookups/s, {} hits'.format(
+                        name,
+                        entries,
+                        current / 1024 / 1024,
+                        peak / 1024 / 1024,
+                        build_seconds,
+                        len(lookups) / elapsed,
+                        hits,
+                    )
+                )
+            )
+            del blacklist
+
+        start = time.time()
+        for value in lookups[:options['db_lookups']]:
+            FraudBlacklistedGeohash5.objects.filter(geohash5=value[:5]).exists()
+        elapsed = max(time.time() - start, 0.001)
+        self.stdout.write(
+            self.style.SUCCESS(
+                'exists() query: {:.0f} lookups/s'.format(options['db_lookups'] / elapsed)
+            )
+        )
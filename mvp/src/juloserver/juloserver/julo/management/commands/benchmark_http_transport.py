@@ -0,0 +1,120 @@
+import os
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from django.core.management.base import BaseCommand
+
+from juloserver.julocore.http_transport import (
+    get_http_session,
+    get_percentile,
+    transport_metrics,
+)
+
+BENCHMARK_VENDOR = 'benchmark_stub'
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        body = b'{"status": "success"}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class CountingHTTPServer(ThreadingHTTPServer):
+    """Count the accepted connections, every one of them is a TLS handshake."""
+
+    daemon_threads = True
+    connection_count = 0
+
+    def get_request(self):
+        request = super().get_request()
+        self.connection_count += 1
+        return request
+
+
+def create_self_signed_certificate(directory):
+    certfile = os.path.join(directory, 'stub.crt')
+    keyfile = os.path.join(directory, 'stub.key')
+    subprocess.check_call(
+        [
+            'openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+            '-subj', '/CN=localhost', '-addext', 'subjectAltName=DNS:localhost',
+            '-keyout', keyfile, '-out', certfile,
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    return certfile, keyfile
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark the TLS handshakes and the p50/p99 latency of the third party calls '
+        'against a local HTTPS stub, with a fresh connection per call and with the '
+        'shared transport of julocore.http_transport'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500)
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as directory:
+            certfile, keyfile = create_self_signed_certificate(directory)
+            server = CountingHTTPServer(('localhost', 0), StubHandler)
+            ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            ssl_context.load_cert_chain(certfile, keyfile)
+            server.socket = ssl_context.wrap_socket(server.socket, server_side=True)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            url = 'https://localhost:{}/'.format(server.server_port)
+
+            try:
+                self.run_benchmark(
+                    'per call', server, options['requests'],
+                    lambda: requests.post(url, json={}, verify=certfile),
+                )
+                session = get_http_session(BENCHMARK_VENDOR)
+                transport_metrics.reset(BENCHMARK_VENDOR)
+                self.run_benchmark(
+                    'shared transport', server, options['requests'],
+                    lambda: session.post(url, json={}, verify=certfile),
+                )
+                self.stdout.write(
+                    'transport metrics: {}'.format(transport_metrics.snapshot(BENCHMARK_VENDOR))
+                )
+            finally:
+                server.shutdown()
+
+    def run_benchmark(self, name, server, request_count, send_request):
+        server.connection_count = 0
+        latencies = []
+        for _ in range(request_count):
+            start = time.time()
+            send_request().raise_for_status()
+            latencies.append(time.time() - start)
+
+        latencies.sort()
+        self.stdout.write(
+            self.style.SUCCESS(
+                '{}: {} requests, {} handshakes, p50 {:.2f}ms, p99 {:.2f}ms'.format(
+                    name,
+                    request_count,
+                    server.connection_count,
+                    get_percentile(latencies, 50) * 1000,
+                    get_percentile(latencies, 99) * 1000,
+                )
+            )
+        )
@@ -0,0 +1,88 @@
+import base64
+import os
+import tempfile
+import time
+
+import pdfkit
+from django.core.management.base import BaseCommand
+from django.template.loader import get_template
+
+from juloserver.julocore.pdf_renderer import (
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_PDF_OPTIONS,
+    DEFAULT_QUEUE_SIZE,
+    pdf_renderer_pool,
+    render_pdf,
+)
+
+
+def get_contexts(count):
+    return [
+        {
+            'name': 'Benchmark Borrower {}'.format(index),
+            'name_only': 'Benchmark',
+            'application_xid': 1000000000 + index,
+            'loan_amount': 3000000,
+            'due_amount_total': 1150000,
+            'virtual_account': '{:016d}'.format(index),
+            'julo_bank_name': 'Bank BCA',
+            'julo_bank_account_number': '{:016d}'.format(index),
+            'due_payment': [
+                {
+                    'payment_number': payment_number,
+                    'due_amount': 1150000,
+                    'late_fee_amount': 50000,
+                    'due_late_days_formatted': '{} hari'.format(5 * payment_number),
+                }
+                for payment_number in range(1, 4)
+            ],
+        }
+        for index in range(count)
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        'Render a warning letter for synthetic borrowers with a temporary file per document, '
+        'in memory one by one and in memory through the worker pool.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--documents', type=int, default=200)
+        parser.add_argument('--template', default='warning_letter1.html')
+        parser.add_argument('--max-workers', type=int, default=DEFAULT_MAX_WORKERS)
+        parser.add_argument('--queue-size', type=int, default=DEFAULT_QUEUE_SIZE)
+
+    def handle(self, *args, **options):
+        template = get_template(options['template'])
+        htmls = [template.render(context) for context in get_contexts(options['documents'])]
+        setting = dict(max_workers=options['max_workers'], queue_size=options['queue_size'])
+
+        self.report('temporary file', lambda: [self.render_to_file(html) for html in htmls])
+        self.report('in memory', lambda: [render_pdf(html) for html in htmls])
+        try:
+            self.report(
+                'worker pool of {}'.format(setting['max_workers']),
+                lambda: list(pdf_renderer_pool.render_many(htmls, setting=setting)),
+            )
+        finally:
+            pdf_renderer_pool.shutdown()
+
+    def render_to_file(self, html):
+        with tempfile.TemporaryDirectory() as tempdir:
+            file_path = os.path.join(tempdir, 'benchmark.pdf')
+            pdfkit.from_string(html, file_path, options=DEFAULT_PDF_OPTIONS)
+            with open(file_path, 'rb') as pdf_file:
+                return base64.b64encode(pdf_file.read()).decode()
+
+    def report(self, name, render):
+        start = time.time()
+        documents = render()
+        elapsed = max(time.time() - start, 0.001)
+        self.stdout.write(
+            self.style.SUCCESS(
+                '{}: {} documents in {:.1f}s, {:.0f} documents/min'.format(
+                    name, len(documents), elapsed, len(documents) * 60 / elapsed
+                )
+            )
+        )
@@ -0,0 +1,69 @@
+import threading
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+
+from juloserver.ratelimit.constants import RateLimitAlgorithm, RateLimitTimeUnit
+from juloserver.ratelimit.service import RateLimitRule, atomic_rate_limit
+
+
+class Command(BaseCommand):
+    help = 'Measure the latency and the counting accuracy of the atomic rate limiter'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=64)
+        parser.add_argument('--calls', type=int, default=200, help='calls per client')
+        parser.add_argument('--max-count', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        clients = options['clients']
+        calls = options['calls']
+        max_count = options['max_count']
+
+        for algo in RateLimitAlgorithm:
+            # a day long window, so the expected number of allowed calls is exactly max_count
+            rule = RateLimitRule(max_count, RateLimitTimeUnit.Days, algo)
+            key_prefix = 'benchmark_rate_limit:{}'.format(uuid.uuid4().hex)
+            latencies = []
+            allowed = []
+
+            def run_client():
+                client_latencies = []
+                client_allowed = 0
+                for _ in range(calls):
+                    start = time.perf_counter()
+                    is_rate_limited = atomic_rate_limit([(key_prefix, rule)])[0]
+                    client_latencies.append(time.perf_counter() - start)
+                    if not is_rate_limited:
+                        client_allowed += 1
+                latencies.extend(client_latencies)
+                allowed.append(client_allowed)
+
+            threads = [threading.Thread(target=run_client) for _ in range(clients)]
+            start = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - start
+
+            latencies.sort()
+            total_allowed = sum(allowed)
+            expected_allowed = min(max_count, clients * calls)
+            style = self.style.SUCCESS if total_allowed == expected_allowed else self.style.ERROR
+            self.stdout.write(
+                style(
+                    '{}: {} calls by {} clients in {:.2f}s, p50 {:.2f}ms, p99 {:.2f}ms, '
+                    'allowed {} (expected {})'.format(
+                        algo.name,
+                        len(latencies),
+                        clients,
+                        elapsed,
+                        latencies[len(latencies) // 2] * 1000,
+                        latencies[int(len(latencies) * 0.99)] * 1000,
+                        total_allowed,
+                        expected_allowed,
+                    )
+                )
+            )
@@ -0,0 +1,61 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from juloserver.julo.services2 import get_redis_client
+from juloserver.julo.services2.redis_helper import (
+    RedisHelper,
+    get_connection_pool,
+    reset_connection_pools,
+)
+
+
+class Command(BaseCommand):
+    help = 'Compare redis connections opened by the per-call client and the pooled client'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--calls', type=int, default=10000)
+
+    def handle(self, *args, **options):
+        calls = options['calls']
+        key = 'benchmark_redis_client:counter'
+
+        # legacy behaviour: a new client, a new pool and a PING for every call
+        opened_connections = 0
+        start = time.time()
+        for _ in range(calls):
+            redis_client = RedisHelper(
+                settings.REDIS_URL,
+                settings.REDIS_PASSWORD,
+                settings.REDIS_PORT,
+                settings.REDIS_DB,
+            )
+            redis_client.increment(key)
+            opened_connections += redis_client.client.connection_pool._created_connections
+            redis_client.client.connection_pool.disconnect()
+        self._write_result('per-call client', calls, opened_connections, time.time() - start)
+
+        reset_connection_pools()
+        start = time.time()
+        for _ in range(calls):
+            redis_client = get_redis_client()
+            redis_client.increment(key)
+        pool = get_connection_pool(
+            settings.REDIS_URL,
+            settings.REDIS_PASSWORD,
+            settings.REDIS_PORT,
+            settings.REDIS_DB,
+        )
+        self._write_result('pooled client', calls, pool._created_connections, time.time() - start)
+
+        get_redis_client().delete_key(key)
+
+    def _write_result(self, name, calls, opened_connections, elapsed):
+        self.stdout.write(
+            self.style.SUCCESS(
+                '{}: {} calls, {} connections opened, {:.3f}s total, {:.1f}us per call'.format(
+                    name, calls, opened_connections, elapsed, elapsed / calls * 1000000
+                )
+            )
+        )
@@ -0,0 +1,102 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import router, transaction
+
+from juloserver.julo.services2 import get_redis_client
+from juloserver.julocore.http_transport import get_percentile
+from juloserver.urlshortener.constants import UrlShortenerConst
+from juloserver.urlshortener.models import ShortenedUrl
+from juloserver.urlshortener.services import (
+    get_full_url,
+    get_url_shortener_engine_setting,
+    short_url_redirect_cache,
+    shorten_many,
+)
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Shorten synthetic urls with shorten_many and resolve a sample of them through the '
+        'database, redis and the process cache. The short urls are rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--urls', type=int, default=1000000)
+        parser.add_argument('--redirects', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        setting = get_url_shortener_engine_setting() or dict(
+            local_cache_ttl_seconds=UrlShortenerConst.DEFAULT_LOCAL_CACHE_TTL_SECONDS,
+            redis_cache_ttl_seconds=UrlShortenerConst.DEFAULT_REDIS_CACHE_TTL_SECONDS,
+        )
+        short_urls = []
+        try:
+            with transaction.atomic(using=router.db_for_write(ShortenedUrl)):
+                full_urls = (
+                    'https://www.julo.co.id/benchmark/{}'.format(index)
+                    for index in range(options['urls'])
+                )
+                start = time.time()
+                created_urls = shorten_many(full_urls)
+                elapsed = max(time.time() - start, 0.001)
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        'shorten_many: {} urls in {:.1f}s, {:.0f} urls/s'.format(
+                            len(created_urls), elapsed, len(created_urls) / elapsed
+                        )
+                    )
+                )
+
+                random.seed(options['redirects'])
+                short_urls = [
+                    created_url.rsplit('/', 1)[-1]
+                    for created_url in random.sample(
+                        created_urls, min(options['redirects'], len(created_urls))
+                    )
+                ]
+                short_url_redirect_cache.clear()
+                self.report(
+                    'database', short_urls, lambda short_url: get_full_url(short_url, setting)
+                )
+                short_url_redirect_cache.clear()
+                self.report(
+                    'redis', short_urls, lambda short_url: get_full_url(short_url, setting)
+                )
+                self.report(
+                    'process cache',
+                    short_urls,
+                    lambda short_url: get_full_url(short_url, setting),
+                )
+                raise Rollback()
+        except Rollback:
+            pass
+        finally:
+            short_url_redirect_cache.clear()
+            get_redis_client().delete_keys(
+                [UrlShortenerConst.REDIRECT_CACHE_KEY.format(short_url) for short_url in short_urls]
+            )
+
+    def report(self, name, short_urls, resolve):
+        latencies = []
+        for short_url in short_urls:
+            start = time.perf_counter()
+            resolve(short_url)
+            latencies.append(time.perf_counter() - start)
+
+        latencies.sort()
+        self.stdout.write(
+            self.style.SUCCESS(
+                '{}: {:.0f} redirects/s, p50 {:.3f}ms, p99 {:.3f}ms'.format(
+                    name,
+                    len(latencies) / max(sum(latencies), 0.000001),
+                    get_percentile(latencies, 50) * 1000,
+                    get_percentile(latencies, 99) * 1000,
+                )
+            )
+        )
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, router
+
+from juloserver.urlshortener.models import ShortenedUrl
+
+INDEX_NAME = 'shortened_url_full_url_hash_idx'
+
+
+class Command(BaseCommand):
+    help = (
+        'Build the hash index of shortened_url.full_url used by the dedupe lookups of '
+        'get_or_shorten_url and shorten_many, on the database shortened_url is routed to '
+        '(logging_db), without locking the table. Not a migration: CREATE INDEX CONCURRENTLY '
+        'can not run in the transaction of a migration. An invalid index left by a failed '
+        'build is dropped and built again.'
+    )
+
+    def handle(self, *args, **options):
+        db = router.db_for_write(ShortenedUrl)
+        connection = connections[db]
+        if not connection.get_autocommit():
+            raise CommandError('CREATE INDEX CONCURRENTLY needs autocommit')
+
+        meta = ShortenedUrl._meta
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT i.indisvalid FROM pg_index i '
+                'JOIN pg_class c ON c.oid = i.indexrelid '
+                'WHERE c.relname = %s',
+                [INDEX_NAME],
+            )
+            row = cursor.fetchone()
+            if row and row[0]:
+                self.stdout.write('{} already exists on {}'.format(INDEX_NAME, db))
+                return
+
+            if row:
+                self.stdout.write('dropping the invalid {} on {}'.format(INDEX_NAME, db))
+                cursor.execute('DROP INDEX CONCURRENTLY IF EXISTS "{}"'.format(INDEX_NAME))
+
+            cursor.execute(
+                'CREATE INDEX CONCURRENTLY "{}" ON "{}" USING hash ("{}")'.format(
+                    INDEX_NAME, meta.db_table, meta.get_field('full_url').column
+                )
+            )
+
+        self.stdout.write(self.style.SUCCESS('{} created on {}'.format(INDEX_NAME, db)))
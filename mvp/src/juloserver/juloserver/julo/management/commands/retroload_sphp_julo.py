@@ -2,7 +2,6 @@ from builtins import str
 import logging
 from datetime import datetime
 import os
-import pdfkit
 import tempfile
 
 from django.core.management.base import BaseCommand
@@ -13,6 +12,7 @@ from juloserver.julo.services import get_sphp_template
 from juloserver.julo.tasks import upload_document
 from juloserver.julo.constants import ApplicationStatusCodes
 from juloserver.julo.product_lines import ProductLineCodes
+from juloserver.julocore.pdf_renderer import render_pdfs
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +35,7 @@ class Command(BaseCommand):
         applications = applications.filter(pk__in=documents)
 
         if applications:
+            sphp_applications = []
             for application in applications:
                 try:
                     body = get_sphp_template(application.id)
@@ -44,24 +45,39 @@ class Command(BaseCommand):
                             'data': {'application_id': application.id},
                             'errors': "Template not found."
                         })
-                        return
+                        break
+                    sphp_applications.append((application, body))
+                except Exception as e:
+                    logger.error({
+                        'action_view': 'retroload_generate_sphp',
+                        'data': {'application_id': application.id},
+                        'errors': str(e)
+                    })
+
+            # the SPHPs are rendered by the pdf renderer pool when it is enabled
+            rendered_pdfs = render_pdfs(
+                (body for _, body in sphp_applications), options={}, return_exceptions=True
+            )
+            for (application, _), rendered_pdf in zip(sphp_applications, rendered_pdfs):
+                if isinstance(rendered_pdf, Exception):
+                    logger.error({
+                        'action_view': 'retroload_generate_sphp',
+                        'data': {'application_id': application.id},
+                        'errors': "Failed to create PDF -{}".format(str(rendered_pdf))
+                    })
+                    return
+
+                try:
                     now = datetime.now()
                     filename = '{}_{}_{}_{}.pdf'.format(
                         application.fullname,
                         application.application_xid,
                         now.strftime("%Y%m%d"),
                         now.strftime("%H%M%S"))
+                    # the upload task reads the file
                     file_path = os.path.join(tempfile.gettempdir(), filename)
-
-                    try:
-                        pdfkit.from_string(body, file_path)
-                    except Exception as e:
-                        logger.error({
-                            'action_view': 'retroload_generate_sphp',
-                            'data': {'application_id': application.id},
-                            'errors': "Failed to create PDF -{}".format(str(e))
-                        })
-                        return
+                    with open(file_path, 'wb') as pdf_file:
+                        pdf_file.write(rendered_pdf.content)
 
                     sphp_julo = Document.objects.create(document_source=application.id,
                                                         document_type='sphp_julo',
@@ -11177,7 +11177,14 @@ class MobileFeatureSetting(TimeStampedModel):
 
 
 class FeatureSettingManager(GetInstanceMixin, JuloModelManager):
-    pass
+    def get_cached(self, feature_name, is_active=None):
+        """
+        Drop-in for filter(feature_name=feature_name, is_active=is_active).last(),
+        served from the process-local feature setting cache.
+        """
+        from juloserver.julo.services2.feature_setting import get_cached_feature_setting
+
+        return get_cached_feature_setting(feature_name, is_active)
 
 
 class FeatureSetting(TimeStampedModel):
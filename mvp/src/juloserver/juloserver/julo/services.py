@@ -17,7 +17,6 @@ from calendar import monthrange
 from datetime import date, datetime, timedelta, time
 from math import ceil
 
-import pdfkit
 import phonenumbers
 import requests
 import semver
@@ -362,7 +361,7 @@ from juloserver.pii_vault.constants import (
 from juloserver.minisquad.utils import collection_detokenize_sync_object_model
 from django.core.files import File
 from io import BytesIO
-from PyPDF2 import PdfFileReader
+from juloserver.julocore.pdf_renderer import DEFAULT_PDF_OPTIONS, render_pdf
 
 
 logger = logging.getLogger(__name__)
@@ -6072,35 +6071,17 @@ def get_and_upload_pdf_content_from_html(
     is_phycical_wl: bool = False,
 ):
     temp_dir = '/media'
-    options = {
-        'page-size': 'A4',
-        'margin-top': '0in',
-        'margin-right': '0in',
-        'margin-bottom': '0in',
-        'margin-left': '0in',
-        'encoding': "UTF-8",
-        'no-outline': None,
-    }
-    file_path = os.path.join(temp_dir, filename)
+    options = dict(DEFAULT_PDF_OPTIONS)
     if is_phycical_wl:
         options['margin-bottom'] = '0.2in'
-        pdfkit.from_string(html_content, file_path, options=options)
-        pdf_bytes_io = BytesIO()
-        with open(file_path, 'rb') as pdf_file:
-            pdf_bytes_io.write(pdf_file.read())
-
-        # get page number of pdf file
-        pdf_reader = PdfFileReader(pdf_bytes_io)
-        num_pages = pdf_reader.getNumPages()
-
-        # delete pdf file from local
-        os.remove(file_path)
-        return pdf_bytes_io, num_pages
+        rendered_pdf = render_pdf(html_content, options=options, with_page_count=True)
+        return BytesIO(rendered_pdf.content), rendered_pdf.page_count
     else:
-        pdfkit.from_string(html_content, file_path, options=options)
-        with open(file_path, 'rb') as f:
-            data = f.read()
-            f.close()
+        data = render_pdf(html_content, options=options).content
+        # the upload task reads the file
+        file_path = os.path.join(temp_dir, filename)
+        with open(file_path, 'wb') as f:
+            f.write(data)
         document = Document.objects.create(
             document_source=application.id,
             document_type=document_type,
@@ -6114,26 +6095,9 @@ def get_and_upload_pdf_content_from_html(
 
 
 def get_pdf_content_from_html(html_content, filename, options=None):
-    temp_dir = tempfile.mkdtemp()
-    if not options:
-        options = {
-            'page-size': 'A4',
-            'margin-top': '0in',
-            'margin-right': '0in',
-            'margin-bottom': '0in',
-            'margin-left': '0in',
-            'encoding': "UTF-8",
-            'no-outline': None,
-        }
-    file_path = os.path.join(temp_dir, filename)
-    pdfkit.from_string(html_content, file_path, options=options)
-    with open(file_path, 'rb') as f:
-        data = f.read()
-        f.close()
-    encoded = base64.b64encode(data)
-    if os.path.exists(file_path):
-        os.remove(file_path)
-    return encoded if isinstance(encoded, str) else encoded.decode()
+    """The base64 of the PDF of the html, filename is not used as the PDF stays in memory."""
+    rendered_pdf = render_pdf(html_content, options=options or DEFAULT_PDF_OPTIONS)
+    return base64.b64encode(rendered_pdf.content).decode()
 
 
 def get_expiry_date(expiry_date, count):
@@ -44,10 +44,17 @@ def get_customer_service():
     return CustomerServices()
 
 def get_redis_client():
-    from .redis_helper import RedisHelper
-    return RedisHelper(
+    from .redis_helper import RedisHelper, get_connection_pool
+    connection_pool = get_connection_pool(
         settings.REDIS_URL,
         settings.REDIS_PASSWORD,
         settings.REDIS_PORT,
         settings.REDIS_DB
     )
+    return RedisHelper(
+        settings.REDIS_URL,
+        settings.REDIS_PASSWORD,
+        settings.REDIS_PORT,
+        settings.REDIS_DB,
+        connection_pool=connection_pool,
+    )
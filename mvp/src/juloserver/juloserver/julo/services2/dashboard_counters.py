@@ -0,0 +1,306 @@
+"""
+Incrementally maintained CRM dashboard buckets.
+
+The GROUP BY status buckets of refresh_crm_dashboard are kept in a redis hash by the
+application and loan status change signals, which move one count from the buckets of the
+old status to the buckets of the new one. The other buckets are still counted every minute.
+The full scan runs every reconcile_interval_minutes as the reconciliation: it records the
+drift of the counters, then overwrites them. The dashboard reads every bucket from the hash.
+"""
+import logging
+
+from django.utils import timezone
+
+from juloserver.application_flow.models import ApplicationPathTag
+from juloserver.julo.constants import (
+    APP_STATUS_GRAB_SKIP_PRIORITY,
+    APP_STATUS_GRAB_WITH_PRIORITY,
+    APP_STATUS_J1_SKIP_PRIORITY,
+    APP_STATUS_J1_WITH_PRIORITY,
+    APP_STATUS_SKIP_PRIORITY,
+    APP_STATUS_SKIP_PRIORITY_NO_J1_NO_GRAB,
+    APP_STATUS_WITH_PRIORITY,
+    APP_STATUS_WITH_PRIORITY_NO_J1_NO_GRAB,
+    LOAN_STATUS,
+    LOAN_STATUS_J1,
+    FeatureNameConst,
+    WorkflowConst,
+)
+from juloserver.julo.models import DashboardBuckets, FeatureSetting
+from juloserver.julo.product_lines import ProductLineCodes
+from juloserver.julo.services2 import get_redis_client
+from juloserver.julo.statuses import ApplicationStatusCodes
+from juloserver.julo.utils import execute_after_transaction_safely
+from juloserver.sdk.constants import LIST_PARTNER
+
+logger = logging.getLogger(__name__)
+
+DASHBOARD_COUNTERS_KEY = 'crm_dashboard:counters'
+DASHBOARD_RECONCILED_AT_KEY = 'crm_dashboard:reconciled_at'
+DASHBOARD_DRIFT_KEY = 'crm_dashboard:drift'
+DEFAULT_RECONCILE_INTERVAL_MINUTES = 15
+
+APP_STATUS_JSTARTER = [
+    ApplicationStatusCodes.SCRAPED_DATA_VERIFIED,
+    ApplicationStatusCodes.JULO_STARTER_TURBO_UPGRADE,
+]
+APP_STATUS_DELETION = [
+    ApplicationStatusCodes.CUSTOMER_ON_DELETION,
+    ApplicationStatusCodes.CUSTOMER_DELETED,
+]
+# counted by status in fill_dashboard_status_buckets, then overwritten by the derived count
+DERIVED_OVERRIDE_BUCKETS = {'app_124', 'app_124_j1', 'app_153'}
+
+
+def get_dashboard_bucket_fields():
+    return [
+        field.attname
+        for field in DashboardBuckets._meta.concrete_fields
+        if not field.primary_key
+    ]
+
+
+def get_status_bucket_fields():
+    """Every bucket fill_dashboard_status_buckets counts, and the deltas keep."""
+    buckets = set()
+    for status in APP_STATUS_WITH_PRIORITY + APP_STATUS_SKIP_PRIORITY:
+        buckets.add('app_priority_{}'.format(status))
+    for status in APP_STATUS_WITH_PRIORITY_NO_J1_NO_GRAB + APP_STATUS_SKIP_PRIORITY_NO_J1_NO_GRAB:
+        buckets.add('app_{}'.format(status))
+    for status in APP_STATUS_J1_WITH_PRIORITY + APP_STATUS_J1_SKIP_PRIORITY:
+        buckets.update({'app_{}'.format(status), 'app_{}_j1'.format(status)})
+    for status in APP_STATUS_GRAB_WITH_PRIORITY + APP_STATUS_GRAB_SKIP_PRIORITY:
+        buckets.update({'app_{}'.format(status), 'app_{}_grab'.format(status)})
+    for status in APP_STATUS_JSTARTER:
+        buckets.add('app_{}_jstarter'.format(status))
+    for status in APP_STATUS_DELETION:
+        buckets.add('app_{}'.format(status))
+    buckets.add('app_{}_mtl'.format(ApplicationStatusCodes.NAME_VALIDATE_FAILED))
+    for status in LOAN_STATUS:
+        buckets.add('loan_{}'.format(status))
+    for status in LOAN_STATUS_J1:
+        buckets.add('loan_{}_j1'.format(status))
+
+    return (buckets - DERIVED_OVERRIDE_BUCKETS) & set(get_dashboard_bucket_fields())
+
+
+STATUS_BUCKET_FIELDS = frozenset(get_status_bucket_fields())
+
+
+def get_dashboard_counter_setting():
+    """
+    Return:
+        dict of reconcile_interval_minutes when the status buckets are kept by the status
+        change deltas, None otherwise
+    """
+    feature_setting = FeatureSetting.objects.get_cached(
+        FeatureNameConst.CRM_DASHBOARD_INCREMENTAL_COUNTERS, is_active=True
+    )
+    if not feature_setting:
+        return None
+
+    parameters = feature_setting.parameters or {}
+    return dict(
+        reconcile_interval_minutes=parameters.get(
+            'reconcile_interval_minutes', DEFAULT_RECONCILE_INTERVAL_MINUTES
+        ),
+    )
+
+
+def is_revive_mtl_application(application_id):
+    return ApplicationPathTag.objects.filter(
+        application_id=application_id,
+        application_path_tag_status__application_tag='is_revive_mtl',
+        application_path_tag_status__status=1,
+    ).exists()
+
+
+def get_application_status_buckets(application, status):
+    """The status buckets of fill_dashboard_status_buckets counting the application at status."""
+    partner_name = application.partner.name if application.partner_id else None
+    workflow_name = application.workflow.name if application.workflow_id else None
+    buckets = set()
+    if partner_name in LIST_PARTNER:
+        if status in APP_STATUS_WITH_PRIORITY or status in APP_STATUS_SKIP_PRIORITY:
+            buckets.add('app_priority_{}'.format(status))
+    else:
+        if (
+            status in APP_STATUS_WITH_PRIORITY_NO_J1_NO_GRAB
+            or status in APP_STATUS_SKIP_PRIORITY_NO_J1_NO_GRAB
+        ):
+            buckets.add('app_{}'.format(status))
+        if status in APP_STATUS_J1_WITH_PRIORITY or status in APP_STATUS_J1_SKIP_PRIORITY:
+            if workflow_name != WorkflowConst.JULO_ONE:
+                buckets.add('app_{}'.format(status))
+            elif not is_revive_mtl_application(application.id):
+                buckets.add('app_{}_j1'.format(status))
+            elif status == ApplicationStatusCodes.NAME_VALIDATE_FAILED:
+                buckets.add('app_{}_mtl'.format(status))
+        if status in APP_STATUS_GRAB_WITH_PRIORITY or status in APP_STATUS_GRAB_SKIP_PRIORITY:
+            if application.product_line_id in ProductLineCodes.grab():
+                buckets.add('app_{}_grab'.format(status))
+            else:
+                buckets.add('app_{}'.format(status))
+
+    if (
+        status in APP_STATUS_JSTARTER
+        and not application.partner_id
+        and workflow_name == WorkflowConst.JULO_STARTER
+    ):
+        buckets.add('app_{}_jstarter'.format(status))
+    if status in APP_STATUS_DELETION:
+        buckets.add('app_{}'.format(status))
+
+    return buckets & STATUS_BUCKET_FIELDS
+
+
+def get_loan_status_buckets(loan, status):
+    """The status buckets of fill_dashboard_status_buckets counting the loan at status."""
+    product_line_code = loan.product.product_line_id if loan.product_id else None
+    if product_line_code == ProductLineCodes.J1:
+        buckets = {'loan_{}_j1'.format(status)} if status in LOAN_STATUS_J1 else set()
+    else:
+        buckets = {'loan_{}'.format(status)} if status in LOAN_STATUS else set()
+
+    return buckets & STATUS_BUCKET_FIELDS
+
+
+def apply_dashboard_counter_deltas(old_buckets, new_buckets):
+    """Move one count from old_buckets to new_buckets once the status change is committed."""
+    deltas = {bucket: -1 for bucket in old_buckets - new_buckets}
+    deltas.update({bucket: 1 for bucket in new_buckets - old_buckets})
+    if not deltas:
+        return
+
+    def increment_counters():
+        try:
+            pipeline = get_redis_client().pipeline(transaction=False)
+            for bucket, delta in deltas.items():
+                pipeline.hincrby(DASHBOARD_COUNTERS_KEY, bucket, delta)
+            pipeline.execute()
+        except Exception:
+            # the drift is corrected by the next reconciliation
+            logger.exception({'action': 'apply_dashboard_counter_deltas', 'deltas': deltas})
+
+    execute_after_transaction_safely(increment_counters)
+
+
+def record_application_status_change(application, status_old, status_new):
+    """Called for every ApplicationHistory, a failure must not fail the status change."""
+    if status_old == status_new or not get_dashboard_counter_setting():
+        return
+
+    try:
+        apply_dashboard_counter_deltas(
+            get_application_status_buckets(application, status_old),
+            get_application_status_buckets(application, status_new),
+        )
+    except Exception:
+        logger.exception(
+            {'action': 'record_application_status_change', 'application_id': application.id}
+        )
+
+
+def record_loan_status_change(loan, status_old, status_new):
+    """Called for every LoanHistory, a failure must not fail the status change."""
+    if status_old == status_new or not get_dashboard_counter_setting():
+        return
+
+    try:
+        apply_dashboard_counter_deltas(
+            get_loan_status_buckets(loan, status_old),
+            get_loan_status_buckets(loan, status_new),
+        )
+    except Exception:
+        logger.exception({'action': 'record_loan_status_change', 'loan_id': loan.id})
+
+
+def get_dashboard_counters():
+    return {
+        bucket: int(count)
+        for bucket, count in get_redis_client().hgetall(DASHBOARD_COUNTERS_KEY).items()
+    }
+
+
+def is_dashboard_reconciliation_due(counter_setting):
+    reconciled_at = get_redis_client().get(DASHBOARD_RECONCILED_AT_KEY)
+    if not reconciled_at:
+        return True
+
+    elapsed_seconds = timezone.now().timestamp() - float(reconciled_at)
+    return elapsed_seconds >= counter_setting['reconcile_interval_minutes'] * 60
+
+
+def reconcile_dashboard_counters(buckets, full_scan_seconds):
+    """
+    Overwrite the counters with the full scan of buckets, after recording how far the
+    status buckets drifted from it.
+
+    Return:
+        dict of the drift
+    """
+    counters = get_dashboard_counters()
+    drifts = {
+        bucket: counters[bucket] - getattr(buckets, bucket)
+        for bucket in STATUS_BUCKET_FIELDS
+        if bucket in counters and counters[bucket] != getattr(buckets, bucket)
+    }
+    drift = dict(
+        reconciled_at=timezone.localtime(timezone.now()).isoformat(),
+        drifted_buckets=len(drifts),
+        total_abs_drift=sum(abs(value) for value in drifts.values()),
+        max_abs_drift=max([abs(value) for value in drifts.values()] or [0]),
+        full_scan_seconds=round(full_scan_seconds, 3),
+    )
+
+    pipeline = get_redis_client().pipeline()
+    pipeline.delete(DASHBOARD_COUNTERS_KEY)
+    pipeline.hmset(
+        DASHBOARD_COUNTERS_KEY,
+        {bucket: getattr(buckets, bucket) for bucket in get_dashboard_bucket_fields()},
+    )
+    pipeline.set(DASHBOARD_RECONCILED_AT_KEY, timezone.now().timestamp())
+    pipeline.hmset(DASHBOARD_DRIFT_KEY, drift)
+    pipeline.execute()
+
+    logger.info({'action': 'reconcile_dashboard_counters', 'drifts': drifts, **drift})
+    return drift
+
+
+def apply_dashboard_status_counters(buckets):
+    counters = get_dashboard_counters()
+    for bucket in STATUS_BUCKET_FIELDS:
+        if bucket in counters:
+            setattr(buckets, bucket, counters[bucket])
+
+
+def set_dashboard_derived_counters(buckets):
+    get_redis_client().hmset(
+        DASHBOARD_COUNTERS_KEY,
+        {
+            bucket: getattr(buckets, bucket)
+            for bucket in get_dashboard_bucket_fields()
+            if bucket not in STATUS_BUCKET_FIELDS
+        },
+    )
+
+
+def get_dashboard_drift():
+    return get_redis_client().hgetall(DASHBOARD_DRIFT_KEY)
+
+
+def get_dashboard_buckets():
+    """
+    Every dashboard bucket with one redis read when the counters are enabled and reconciled,
+    the DashboardBuckets row otherwise.
+    """
+    if get_dashboard_counter_setting():
+        counters = get_dashboard_counters()
+        # deltas applied before the first reconciliation leave a partial hash
+        if counters.keys() >= set(get_dashboard_bucket_fields()):
+            return DashboardBuckets(**counters)
+
+    buckets = DashboardBuckets.objects.last()
+    if not buckets:
+        buckets = DashboardBuckets.objects.create()
+    return buckets
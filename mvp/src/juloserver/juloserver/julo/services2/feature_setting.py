@@ -1,5 +1,118 @@
-from typing import Dict
+import copy
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Optional
+
+from django.conf import settings
+
 from juloserver.julo.models import FeatureSetting
+from juloserver.julo.services2 import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+FEATURE_SETTING_CACHE_VERSION_KEY = 'feature_setting_cache:version'
+
+
+class FeatureSettingCache:
+    """
+    Process-local read-through copy of every feature setting row.
+
+    All rows are loaded with one query and kept until the version key in redis changes.
+    The version key is read at most once per FEATURE_SETTING_CACHE_CHECK_INTERVAL seconds,
+    so every web and celery worker drops its copy within that interval after a change.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._settings = None
+        self._version = None
+        self._checked_at = 0
+
+    def get(self, feature_name: str, is_active: bool = None) -> Optional[FeatureSetting]:
+        """
+        Same result as FeatureSetting.objects.filter(feature_name=..., is_active=...).last().
+        A copy is returned, so changing it does not change the cached row.
+        """
+        if not settings.FEATURE_SETTING_CACHE_ENABLED:
+            return self._get_from_db(feature_name, is_active)
+
+        try:
+            feature_settings = self._get_feature_settings()
+        except Exception as e:
+            logger.warning({
+                'action': 'FeatureSettingCache.get',
+                'feature_name': feature_name,
+                'message': 'fallback to database',
+                'error': str(e),
+            })
+            return self._get_from_db(feature_name, is_active)
+
+        for feature_setting in reversed(feature_settings.get(feature_name, [])):
+            if is_active is None or feature_setting.is_active == is_active:
+                return copy.deepcopy(feature_setting)
+
+        return None
+
+    def invalidate(self):
+        """Drop the copy of this process and tell the other processes to drop theirs."""
+        self._settings = None
+        get_redis_client().increment(FEATURE_SETTING_CACHE_VERSION_KEY)
+
+    def clear(self):
+        """Drop the copy of this process only."""
+        self._settings = None
+
+    def _get_from_db(self, feature_name, is_active):
+        filters = dict(feature_name=feature_name)
+        if is_active is not None:
+            filters['is_active'] = is_active
+        return FeatureSetting.objects.filter(**filters).last()
+
+    def _get_feature_settings(self):
+        feature_settings = self._settings
+        if feature_settings is not None and not self._is_check_due():
+            return feature_settings
+
+        with self._lock:
+            if self._settings is not None and not self._is_check_due():
+                return self._settings
+
+            # read the version before the rows, a change in between only costs one more reload
+            version = get_redis_client().get(FEATURE_SETTING_CACHE_VERSION_KEY)
+            if self._settings is None or version != self._version:
+                feature_settings = defaultdict(list)
+                for feature_setting in FeatureSetting.objects.order_by('id'):
+                    feature_settings[feature_setting.feature_name].append(feature_setting)
+                self._settings = feature_settings
+                self._version = version
+            self._checked_at = time.monotonic()
+
+            return self._settings
+
+    def _is_check_due(self):
+        return time.monotonic() - self._checked_at >= settings.FEATURE_SETTING_CACHE_CHECK_INTERVAL
+
+
+feature_setting_cache = FeatureSettingCache()
+
+
+def get_cached_feature_setting(
+    feature_name: str, is_active: bool = None
+) -> Optional[FeatureSetting]:
+    return feature_setting_cache.get(feature_name, is_active)
+
+
+def invalidate_feature_setting_cache():
+    try:
+        feature_setting_cache.invalidate()
+    except Exception as e:
+        # the other processes still pick the change up once redis is back
+        feature_setting_cache.clear()
+        logger.error({
+            'action': 'invalidate_feature_setting_cache',
+            'error': str(e),
+        })
 
 
 class FeatureSettingHelper:
@@ -16,7 +129,7 @@ class FeatureSettingHelper:
     @property
     def setting(self):
         if not self._setting:
-            self._setting = self.qs.last()
+            self._setting = get_cached_feature_setting(self.feature_name)
 
         return self._setting
 
@@ -1,6 +1,8 @@
 from __future__ import print_function
 
 import logging
+import os
+import threading
 from builtins import object
 import redis
 
@@ -9,9 +11,68 @@ from fakeredis import FakeRedis
 
 logger = logging.getLogger(__name__)
 
+_connection_pools = {}
+_connection_pools_pid = None
+_connection_pools_lock = threading.Lock()
+
+
+def get_connection_pool(url, password, port, db):
+    """to get the process-wide connection pool of a redis server and db
+
+    The pools are dropped whenever the current pid differs from the pid that built them,
+    so a forked celery/gunicorn worker never shares a socket with its parent.
+
+    Arguments:
+        url {string}
+        password {string}
+        port {int}
+        db {int}
+    Return:
+        redis.ConnectionPool
+    """
+    global _connection_pools_pid
+
+    key = (url, int(port), int(db), password)
+    pid = os.getpid()
+    with _connection_pools_lock:
+        if _connection_pools_pid != pid:
+            _connection_pools.clear()
+            _connection_pools_pid = pid
+
+        pool = _connection_pools.get(key)
+        if pool is None:
+            pool = redis.ConnectionPool(
+                host=url,
+                password=password,
+                port=port,
+                db=db,
+                socket_keepalive=True,
+            )
+            _connection_pools[key] = pool
+            logger.debug('created redis connection pool "{}" db {}'.format(url, db))
+
+    return pool
+
+
+def reset_connection_pools():
+    """to disconnect and forget every pool created by this process"""
+    global _connection_pools_pid
+
+    with _connection_pools_lock:
+        for pool in _connection_pools.values():
+            pool.disconnect()
+        _connection_pools.clear()
+        _connection_pools_pid = None
+
 
 class RedisHelper(object):
-    def __init__(self, url, password, port, db):
+    def __init__(self, url, password, port, db, connection_pool=None):
+        if connection_pool is not None:
+            # A pooled client does not ping on construction. A broken pooled connection is
+            # detected on its next command, which redis-py disconnects and retries once.
+            self.client = redis.Redis(connection_pool=connection_pool)
+            return
+
         self.client = redis.Redis(host=url,
                                   password=password,
                                   port=port,
@@ -19,6 +80,107 @@ class RedisHelper(object):
         self.client.ping()
         logger.debug('connected to redis "{}"'.format(url))
 
+    def ping(self):
+        return self.client.ping()
+
+    def pipeline(self, transaction=True):
+        """to get a pipeline that sends the queued commands in one round trip
+
+        Arguments:
+            transaction {boolean}: wrap the commands in MULTI/EXEC
+        Return:
+            redis.client.Pipeline
+        """
+        return self.client.pipeline(transaction=transaction)
+
+    def get_many(self, keys, decode=True):
+        """to get data of many keys with one MGET command in redis
+
+        Arguments:
+            keys {[list of string]}
+        Return:
+            list of string, None for the missing keys
+        """
+        if not keys:
+            return []
+
+        values = self.client.mget(keys)
+        if decode:
+            values = [value.decode() if value else value for value in values]
+        return values
+
+    def set_many(self, mapping, expire_time=None):
+        """to set data of many keys in one pipelined round trip
+
+        Arguments:
+            mapping {dict}: key to value
+            expire_time {[timedelta]}
+        Return:
+            list of boolean
+        """
+        if not mapping:
+            return []
+
+        pipe = self.client.pipeline(transaction=False)
+        for key, value in mapping.items():
+            if expire_time:
+                pipe.setex(key, value, expire_time)
+            else:
+                pipe.set(key, value)
+        return pipe.execute()
+
+    def delete_keys(self, keys):
+        """to delete many keys with one DEL command
+
+        Arguments:
+            keys {[list of string]}
+        Return:
+            int
+        """
+        if not keys:
+            return 0
+
+        return self.client.delete(*keys)
+
+    def increment_many(self, keys, expire_time=None):
+        """to increment many counters, and optionally refresh their expiry, in one round trip
+
+        Arguments:
+            keys {[list of string]}
+            expire_time {[int or timedelta]}
+        Return:
+            list of int, the counter values after increment
+        """
+        if not keys:
+            return []
+
+        pipe = self.client.pipeline(transaction=False)
+        for key in keys:
+            pipe.incr(key)
+            if expire_time:
+                pipe.expire(key, expire_time)
+        results = pipe.execute()
+
+        step = 2 if expire_time else 1
+        return results[::step]
+
+    def sismember_many(self, key, values):
+        """to check the membership of many values of a set in one round trip
+
+        Arguments:
+            key {string}
+            values {[list]}
+        Return:
+            list of boolean
+        """
+        if not values:
+            return []
+
+        pipe = self.client.pipeline(transaction=False)
+        for value in values:
+            pipe.sismember(key, value)
+        return pipe.execute()
+
     def get(self, key, decode=True):
         """to get data with GET command in redis
 
@@ -150,6 +312,26 @@ class RedisHelper(object):
     def lrem(self, key, count, value):
         return self.client.lrem(name=key, num=count, value=value)
 
+    def rpush(self, key, *values):
+        return self.client.rpush(key, *values)
+
+    def llen(self, key):
+        return self.client.llen(key)
+
+    def lpop(self, key, decode=True):
+        value = self.client.lpop(key)
+        if decode:
+            value = value.decode() if value else value
+        return value
+
+    def hmset(self, key, mapping):
+        return self.client.hmset(key, mapping)
+
+    def hgetall(self, key):
+        return {
+            field.decode(): value.decode() for field, value in self.client.hgetall(key).items()
+        }
+
     def lock(
         self,
         name,
@@ -161,6 +343,26 @@ class RedisHelper(object):
     ):
         return self.client.lock(name, timeout, sleep, blocking_timeout, lock_class, thread_local)
 
+    def register_script(self, script):
+        """to register a lua script, the returned object runs it with EVALSHA
+
+        Arguments:
+            script {string}
+        Return:
+            redis.client.Script
+        """
+        return self.client.register_script(script)
+
+    def run_script(self, script, keys, args):
+        """to run a registered lua script with this client's connection
+
+        Arguments:
+            script {redis.client.Script}
+            keys {[list of string]}
+            args {[list]}
+        """
+        return script(keys=keys, args=args, client=self.client)
+
     def rename_key(self, old_name, new_name):
         self.client.rename(
             src=old_name,
@@ -28,6 +28,7 @@ from juloserver.loan.constants import LoanStatusChangeReason, LoanFeatureNameCon
 from juloserver.julo.models import (
     AddressGeolocation,
     Application,
+    ApplicationHistory,
     Workflow,
     Offer,
     LoanPurpose,
@@ -47,6 +48,10 @@ from juloserver.julo.models import (
     PaybackTransaction,
 )
 from juloserver.partnership.constants import PartnershipAccountLookup
+from juloserver.julo.services2.dashboard_counters import (
+    record_application_status_change,
+    record_loan_status_change,
+)
 
 from .services import (
     update_flag_is_broken_ptp_plus_1,
@@ -84,6 +89,7 @@ from juloserver.moengage.services.use_cases import (
 )
 from juloserver.julo.tasks import (send_realtime_ptp_notification,update_skiptrace_number)
 from juloserver.julo.utils import execute_after_transaction_safely
+from juloserver.julo.services2.feature_setting import invalidate_feature_setting_cache
 from juloserver.cfs.tasks import update_graduate_entry_level, \
     tracking_transaction_case_for_action_points, tracking_repayment_case_for_action_points
 from juloserver.customer_module.tasks.customer_related_tasks import sync_customer_data_with_application
@@ -916,6 +922,22 @@ def skiptrace_history_after_save_actions(sender, instance=None, created=False, *
     signals.post_save.connect(skiptrace_history_after_save_actions, sender=SkiptraceHistory)
 
 
+@receiver(signals.post_save, sender=ApplicationHistory)
+def update_dashboard_counters_on_application_status_change(
+    sender, instance, created, **kwargs
+):
+    if created:
+        record_application_status_change(
+            instance.application, instance.status_old, instance.status_new
+        )
+
+
+@receiver(signals.post_save, sender=LoanHistory)
+def update_dashboard_counters_on_loan_status_change(sender, instance, created, **kwargs):
+    if created:
+        record_loan_status_change(instance.loan, instance.status_old, instance.status_new)
+
+
 @receiver(signals.post_save, sender=LoanHistory)
 def track_transact_for_action_points(sender, instance, created, **kwargs):
     # if loan is activated (status 220), we --
@@ -1067,6 +1089,19 @@ def document_data_change_after_model_update(sender, instance=None, created=False
     DjangoAdminLogChanges.objects.bulk_create(changed_list)
 
 
+@receiver(signals.post_save, sender=FeatureSetting)
+@receiver(signals.post_delete, sender=FeatureSetting)
+def invalidate_feature_setting_cache_after_change(sender, instance=None, **kwargs):
+    """
+    Purpose: make every web and celery worker reload its FeatureSetting copy after
+    a change from Django Admin, update_safely() or any other save().
+    """
+    if not settings.FEATURE_SETTING_CACHE_ENABLED:
+        return
+
+    execute_after_transaction_safely(invalidate_feature_setting_cache)
+
+
 @receiver(signals.post_save, sender=AddressGeolocation)
 def fill_address_geolocation_geohash(sender, instance=None, created=False, **kwargs):
     if not created or instance is None:
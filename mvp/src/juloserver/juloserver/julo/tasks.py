@@ -8,6 +8,7 @@ import logging
 import math
 import os
 import random
+import time
 from builtins import next, range, setattr, str
 from collections import namedtuple
 from datetime import date, datetime, timedelta
@@ -201,6 +202,13 @@ from juloserver.julo.models import (
     CommsRetryFlag,
 )
 from juloserver.julo.services import process_application_status_change
+from juloserver.julo.services2.dashboard_counters import (
+    apply_dashboard_status_counters,
+    get_dashboard_counter_setting,
+    is_dashboard_reconciliation_due,
+    reconcile_dashboard_counters,
+    set_dashboard_derived_counters,
+)
 from juloserver.julo.services2 import (
     encrypt,
     get_customer_service,
@@ -561,6 +569,26 @@ def update_payment_status_subtask(payment_id):
     )
 
 
+@task(queue='update_account_payment')
+def update_payment_status_chunk_subtask(payment_ids):
+    """
+    One task for a chunk of payments instead of one update_payment_status_subtask per payment.
+    Every payment still has its own transaction, one failure does not stop the others.
+    """
+    for payment_id in payment_ids:
+        try:
+            update_payment_status_subtask(payment_id)
+        except Exception as e:
+            get_julo_sentry_client().captureException()
+            logger.error(
+                {
+                    "task": "update_payment_status_chunk_subtask",
+                    "payment_id": payment_id,
+                    "error": str(e),
+                }
+            )
+
+
 @task(name='update_payment_status')
 def update_payment_status():
     """
@@ -609,16 +637,46 @@ def update_payment_amount():
     today's date, apply late fee as the rule. now is use just by axiata product lines,
     the rest move to juloserver.account_payment.tasks.scheduled_tasks.update_account_payment_status
     """
+    from juloserver.account_payment.services.account_payment_status_engine import (
+        get_batch_status_update_chunk_size,
+        get_id_chunks,
+    )
+
     unpaid_payments = (
         Payment.objects.not_paid_active_overdue()
         .filter(loan__application__product_line_id__in=ProductLineCodes.axiata())
         .values_list("id", flat=True)
     )
 
+    chunk_size = get_batch_status_update_chunk_size()
+    if chunk_size:
+        for unpaid_payment_ids in get_id_chunks(unpaid_payments.iterator(), chunk_size):
+            update_late_fee_amount_chunk_task.delay(unpaid_payment_ids)
+        return
+
     for unpaid_payment_id in unpaid_payments:
         update_late_fee_amount_task.delay(unpaid_payment_id)
 
 
+@task(queue='collection_normal')
+def update_late_fee_amount_chunk_task(unpaid_payment_ids):
+    """
+    One task for a chunk of payments instead of one update_late_fee_amount_task per payment.
+    """
+    for unpaid_payment_id in unpaid_payment_ids:
+        try:
+            update_late_fee_amount_task(unpaid_payment_id)
+        except Exception as e:
+            get_julo_sentry_client().captureException()
+            logger.error(
+                {
+                    "task": "update_late_fee_amount_chunk_task",
+                    "payment_id": unpaid_payment_id,
+                    "error": str(e),
+                }
+            )
+
+
 @task(name="update_loans_on_141")
 def update_loans_on_141():
     """
@@ -2656,10 +2714,43 @@ def counter_0_turbo_bucket():
 
 @task(queue="application_normal")
 def refresh_crm_dashboard():
+    """
+    Full scan of every dashboard bucket. With the incremental dashboard counters the status
+    buckets are kept by the status change deltas, so the full scan only runs as their
+    reconciliation and the other minutes refresh the other buckets.
+    """
+    counter_setting = get_dashboard_counter_setting()
+    if counter_setting and not is_dashboard_reconciliation_due(counter_setting):
+        refresh_dashboard_derived_buckets()
+        return
+
+    buckets = DashboardBuckets.objects.last()
+    if not buckets:
+        buckets = DashboardBuckets()
+
+    start = time.time()
+    fill_dashboard_status_buckets(buckets)
+    full_scan_seconds = time.time() - start
+    fill_dashboard_derived_buckets(buckets)
+    buckets.save()
+    if counter_setting:
+        reconcile_dashboard_counters(buckets, full_scan_seconds)
+
+
+def refresh_dashboard_derived_buckets():
+    """The buckets the status change deltas do not keep, the status buckets come from redis."""
     buckets = DashboardBuckets.objects.last()
     if not buckets:
         buckets = DashboardBuckets()
 
+    fill_dashboard_derived_buckets(buckets)
+    apply_dashboard_status_counters(buckets)
+    buckets.save()
+    set_dashboard_derived_counters(buckets)
+
+
+def fill_dashboard_status_buckets(buckets):
+    """The GROUP BY status counts, see get_application_status_buckets and get_loan_status_buckets"""
     app_statuses_skip_priority = APP_STATUS_SKIP_PRIORITY
 
     app_statuses_with_priority = APP_STATUS_WITH_PRIORITY
@@ -2678,10 +2769,6 @@ def refresh_crm_dashboard():
 
     partner_list = LIST_PARTNER
 
-    app_status_partnership_agent_assisted = APP_STATUS_PARTNERSHIP_AGENT_ASSISTED
-
-    app_status_j1_agent_assisted = APP_STATUS_J1_AGENT_ASSISTED
-
     count_prio = (
         Application.objects.exclude(partner__name__in=partner_list)
         .filter(application_status_id__in=app_statuses_with_priority_no_julo1_no_grab)
@@ -2881,29 +2968,6 @@ def refresh_crm_dashboard():
         prefix="app_{}",
     )
 
-    # Partnership Agent Assisted Ledgen
-    partnership_application_flag_ids = list(
-        PartnershipApplicationFlag.objects.filter(
-            name=PartnershipPreCheckFlag.APPROVED
-        ).values_list('application_id', flat=True)
-    )
-
-    count_partnership_agent_assisted_ledgen = (
-        Application.objects.filter(
-            application_status_id=ApplicationStatusCodes.FORM_CREATED,
-            pk__in=partnership_application_flag_ids,
-        )
-        .values('application_status_id')
-        .annotate(status_count=Count('application_status_id'))
-    )
-
-    status_codes_counter(
-        buckets=buckets,
-        counter=count_partnership_agent_assisted_ledgen,
-        statuses=app_status_partnership_agent_assisted,
-        prefix="app_partnership_agent_assisted_{}",
-    )
-
     # Julo starter
     count_jstarter = (
         Application.objects.filter(
@@ -2936,6 +3000,83 @@ def refresh_crm_dashboard():
         prefix="app_priority_{}",
     )
 
+    loan_statuses = LOAN_STATUS
+
+    loan_statuses_julo_one = LOAN_STATUS_J1
+
+    count_exclude_j1 = (
+        Loan.objects.filter(loan_status__status_code__in=loan_statuses)
+        .exclude(product__product_line__product_line_code=ProductLineCodes.J1)
+        .values('loan_status__status_code')
+        .annotate(status_count=Count('loan_status__status_code'))
+    )
+
+    status_codes_counter(
+        buckets=buckets,
+        counter=count_exclude_j1,
+        statuses=loan_statuses,
+        prefix="loan_{}",
+        types="loan",
+    )
+
+    count = (
+        Loan.objects.filter(
+            loan_status__status_code__in=loan_statuses_julo_one,
+            product__product_line__product_line_code=ProductLineCodes.J1,
+        )
+        .values('loan_status__status_code')
+        .annotate(status_count=Count('loan_status__status_code'))
+    )
+
+    status_codes_counter(
+        buckets=buckets,
+        counter=count,
+        statuses=loan_statuses_julo_one,
+        prefix="loan_{}_j1",
+        types="loan",
+    )
+
+    customer_on_deletion_count = Application.objects.filter(
+        application_status_id=ApplicationStatusCodes.CUSTOMER_ON_DELETION,
+    ).count()
+    setattr(buckets, "app_185", customer_on_deletion_count)
+
+    deleted_customer_count = Application.objects.filter(
+        application_status_id=ApplicationStatusCodes.CUSTOMER_DELETED,
+    ).count()
+    setattr(buckets, "app_186", deleted_customer_count)
+
+
+def fill_dashboard_derived_buckets(buckets):
+    partner_list = LIST_PARTNER_EXCLUDE_PEDE
+
+    app_status_partnership_agent_assisted = APP_STATUS_PARTNERSHIP_AGENT_ASSISTED
+
+    app_status_j1_agent_assisted = APP_STATUS_J1_AGENT_ASSISTED
+
+    # Partnership Agent Assisted Ledgen
+    partnership_application_flag_ids = list(
+        PartnershipApplicationFlag.objects.filter(
+            name=PartnershipPreCheckFlag.APPROVED
+        ).values_list('application_id', flat=True)
+    )
+
+    count_partnership_agent_assisted_ledgen = (
+        Application.objects.filter(
+            application_status_id=ApplicationStatusCodes.FORM_CREATED,
+            pk__in=partnership_application_flag_ids,
+        )
+        .values('application_status_id')
+        .annotate(status_count=Count('application_status_id'))
+    )
+
+    status_codes_counter(
+        buckets=buckets,
+        counter=count_partnership_agent_assisted_ledgen,
+        statuses=app_status_partnership_agent_assisted,
+        prefix="app_partnership_agent_assisted_{}",
+    )
+
     # separate 124 j1 sonic and hsfbp and regular base on this card
     # https://juloprojects.atlassian.net/browse/ENH-1123
     partner_list_for_124 = LIST_PARTNER_EXCLUDE_PEDE
@@ -3028,54 +3169,8 @@ def refresh_crm_dashboard():
     overpaid_verification_app_count = get_pending_overpaid_apps(return_count=True)
     buckets.app_overpaid_verification = overpaid_verification_app_count
 
-    loan_statuses = LOAN_STATUS
-
-    loan_statuses_julo_one = LOAN_STATUS_J1
-
-    count_exclude_j1 = (
-        Loan.objects.filter(loan_status__status_code__in=loan_statuses)
-        .exclude(product__product_line__product_line_code=ProductLineCodes.J1)
-        .values('loan_status__status_code')
-        .annotate(status_count=Count('loan_status__status_code'))
-    )
-
-    status_codes_counter(
-        buckets=buckets,
-        counter=count_exclude_j1,
-        statuses=loan_statuses,
-        prefix="loan_{}",
-        types="loan",
-    )
-
-    count = (
-        Loan.objects.filter(
-            loan_status__status_code__in=loan_statuses_julo_one,
-            product__product_line__product_line_code=ProductLineCodes.J1,
-        )
-        .values('loan_status__status_code')
-        .annotate(status_count=Count('loan_status__status_code'))
-    )
-
-    status_codes_counter(
-        buckets=buckets,
-        counter=count,
-        statuses=loan_statuses_julo_one,
-        prefix="loan_{}_j1",
-        types="loan",
-    )
-
     buckets.loan_cycle_day_requested = Loan.objects.filter(cycle_day_requested__gte=1).count()
 
-    customer_on_deletion_count = Application.objects.filter(
-        application_status_id=ApplicationStatusCodes.CUSTOMER_ON_DELETION,
-    ).count()
-    setattr(buckets, "app_185", customer_on_deletion_count)
-
-    deleted_customer_count = Application.objects.filter(
-        application_status_id=ApplicationStatusCodes.CUSTOMER_DELETED,
-    ).count()
-    setattr(buckets, "app_186", deleted_customer_count)
-
     application_ids_j1_phone = Application.objects.filter(
         mobile_phone_1__isnull=False,
         ktp__isnull=False,
@@ -3139,8 +3234,6 @@ def refresh_crm_dashboard():
         prefix="app_agent_assisted_{}",
     )
 
-    buckets.save()
-
 
 @task(queue="partnership_global")
 def partner_daily_report_mailer():
@@ -0,0 +1,77 @@
+from django.test import TestCase
+from mock import patch
+
+from juloserver.julo.constants import FeatureNameConst
+from juloserver.julo.models import DashboardBuckets, StatusLookup
+from juloserver.julo.product_lines import ProductLineCodes
+from juloserver.julo.services2.dashboard_counters import (
+    DASHBOARD_COUNTERS_KEY,
+    get_application_status_buckets,
+    get_dashboard_buckets,
+    get_dashboard_counters,
+    get_loan_status_buckets,
+    reconcile_dashboard_counters,
+)
+from juloserver.julo.services2.redis_helper import MockRedisHelper
+from juloserver.julo.statuses import ApplicationStatusCodes, LoanStatusCodes
+from juloserver.julo.tests.factories import (
+    ApplicationJ1Factory,
+    FeatureSettingFactory,
+    LoanFactory,
+    ProductLineFactory,
+    ProductLookupFactory,
+)
+
+
+class TestDashboardStatusBuckets(TestCase):
+    def test_application_status_buckets(self):
+        application = ApplicationJ1Factory()
+
+        self.assertEqual(
+            get_application_status_buckets(
+                application, ApplicationStatusCodes.OFFER_ACCEPTED_BY_CUSTOMER
+            ),
+            {'app_141_j1'},
+        )
+        self.assertEqual(
+            get_application_status_buckets(application, ApplicationStatusCodes.LOC_APPROVED),
+            set(),
+        )
+
+    def test_loan_status_buckets(self):
+        product_line = ProductLineFactory(product_line_code=ProductLineCodes.J1)
+        loan = LoanFactory(
+            product=ProductLookupFactory(product_line=product_line),
+            loan_status=StatusLookup.objects.get(status_code=LoanStatusCodes.CURRENT),
+        )
+
+        self.assertEqual(get_loan_status_buckets(loan, LoanStatusCodes.CURRENT), {'loan_220_j1'})
+        self.assertEqual(get_loan_status_buckets(loan, LoanStatusCodes.PAID_OFF), set())
+
+
+@patch('juloserver.julo.services2.dashboard_counters.get_redis_client')
+class TestReconcileDashboardCounters(TestCase):
+    def setUp(self):
+        self.redis_client = MockRedisHelper()
+        FeatureSettingFactory(feature_name=FeatureNameConst.CRM_DASHBOARD_INCREMENTAL_COUNTERS)
+
+    def test_reconcile_records_drift(self, mock_get_redis_client):
+        mock_get_redis_client.return_value = self.redis_client
+        self.redis_client.hmset(DASHBOARD_COUNTERS_KEY, {'app_141_j1': 5, 'loan_220_j1': 3})
+        buckets = DashboardBuckets(app_141_j1=2, loan_220_j1=3)
+
+        drift = reconcile_dashboard_counters(buckets, 1.5)
+
+        self.assertEqual(drift['drifted_buckets'], 1)
+        self.assertEqual(drift['max_abs_drift'], 3)
+        counters = get_dashboard_counters()
+        self.assertEqual(counters['app_141_j1'], 2)
+        self.assertEqual(counters['loan_220_j1'], 3)
+        self.assertEqual(get_dashboard_buckets().app_141_j1, 2)
+
+    def test_partial_counters_read_database(self, mock_get_redis_client):
+        mock_get_redis_client.return_value = self.redis_client
+        self.redis_client.hmset(DASHBOARD_COUNTERS_KEY, {'app_141_j1': 5})
+        DashboardBuckets.objects.create(app_141_j1=1)
+
+        self.assertEqual(get_dashboard_buckets().app_141_j1, 1)
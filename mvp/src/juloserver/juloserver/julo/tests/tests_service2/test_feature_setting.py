@@ -1,6 +1,13 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from mock import patch
 
-from juloserver.julo.services2.feature_setting import FeatureSettingHelper
+from juloserver.julo.models import FeatureSetting
+from juloserver.julo.services2.feature_setting import (
+    FEATURE_SETTING_CACHE_VERSION_KEY,
+    FeatureSettingCache,
+    FeatureSettingHelper,
+)
+from juloserver.julo.services2.redis_helper import MockRedisHelper
 from juloserver.julo.tests.factories import FeatureSettingFactory
 
 
@@ -37,3 +44,81 @@ class TestFeatureSettingHelper(TestCase):
         FeatureSettingFactory(feature_name='name', is_active=True, parameters=params)
 
         self.assertEqual(params, feature_setting.params)
+
+
+@override_settings(FEATURE_SETTING_CACHE_ENABLED=True, FEATURE_SETTING_CACHE_CHECK_INTERVAL=60)
+class TestFeatureSettingCache(TestCase):
+    def setUp(self):
+        self.fake_redis = MockRedisHelper()
+        self.fake_redis.client.flushall()
+        patcher = patch(
+            'juloserver.julo.services2.feature_setting.get_redis_client',
+            return_value=self.fake_redis,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.cache = FeatureSettingCache()
+
+    def test_get_from_one_query(self):
+        FeatureSettingFactory(feature_name='name_1', is_active=True, parameters={'test': 1})
+        FeatureSettingFactory(feature_name='name_2', is_active=False)
+
+        with self.assertNumQueries(1):
+            self.assertEqual({'test': 1}, self.cache.get('name_1').parameters)
+            self.assertIsNotNone(self.cache.get('name_2'))
+            self.assertIsNone(self.cache.get('name_2', is_active=True))
+            self.assertIsNone(self.cache.get('name_3'))
+
+    def test_get_last_matching_row(self):
+        FeatureSettingFactory(feature_name='name', is_active=True, parameters={'row': 1})
+        FeatureSettingFactory(feature_name='name', is_active=False, parameters={'row': 2})
+
+        self.assertEqual({'row': 2}, self.cache.get('name').parameters)
+        self.assertEqual({'row': 1}, self.cache.get('name', is_active=True).parameters)
+
+    def test_returned_copy_does_not_change_cache(self):
+        FeatureSettingFactory(feature_name='name', is_active=True, parameters={'test': 1})
+
+        self.cache.get('name').parameters['test'] = 2
+        self.assertEqual({'test': 1}, self.cache.get('name').parameters)
+
+    def test_reload_after_version_changed(self):
+        setting = FeatureSettingFactory(feature_name='name', is_active=True)
+        self.assertTrue(self.cache.get('name').is_active)
+
+        FeatureSetting.objects.filter(pk=setting.pk).update(is_active=False)
+        with self.assertNumQueries(0):
+            self.assertTrue(self.cache.get('name').is_active)
+
+        # another process changed the setting
+        self.fake_redis.increment(FEATURE_SETTING_CACHE_VERSION_KEY)
+        with override_settings(FEATURE_SETTING_CACHE_CHECK_INTERVAL=0):
+            self.assertFalse(self.cache.get('name').is_active)
+
+    def test_invalidate(self):
+        setting = FeatureSettingFactory(feature_name='name', is_active=True)
+        self.assertTrue(self.cache.get('name').is_active)
+
+        FeatureSetting.objects.filter(pk=setting.pk).update(is_active=False)
+        self.cache.invalidate()
+
+        self.assertEqual('1', self.fake_redis.get(FEATURE_SETTING_CACHE_VERSION_KEY))
+        self.assertFalse(self.cache.get('name').is_active)
+
+    def test_fallback_to_db_when_redis_is_down(self):
+        FeatureSettingFactory(feature_name='name', is_active=True)
+
+        with patch(
+            'juloserver.julo.services2.feature_setting.get_redis_client',
+            side_effect=ConnectionError,
+        ):
+            self.assertTrue(self.cache.get('name').is_active)
+
+    @override_settings(FEATURE_SETTING_CACHE_ENABLED=False)
+    def test_disabled(self):
+        FeatureSettingFactory(feature_name='name', is_active=True)
+
+        with self.assertNumQueries(2):
+            self.assertTrue(self.cache.get('name').is_active)
+            self.assertTrue(self.cache.get('name').is_active)
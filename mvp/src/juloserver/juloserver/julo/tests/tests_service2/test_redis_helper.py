@@ -0,0 +1,74 @@
+from unittest import TestCase as UnitTestCase
+
+from mock import patch
+
+from juloserver.julo.services2.redis_helper import (
+    MockRedisHelper,
+    RedisHelper,
+    get_connection_pool,
+    reset_connection_pools,
+)
+
+
+class TestRedisConnectionPool(UnitTestCase):
+    def tearDown(self):
+        reset_connection_pools()
+
+    def test_same_pool_for_same_db(self):
+        pool_1 = get_connection_pool('localhost', None, 6379, 0)
+        pool_2 = get_connection_pool('localhost', None, '6379', '0')
+        self.assertIs(pool_1, pool_2)
+
+    def test_different_pool_per_db(self):
+        pool_1 = get_connection_pool('localhost', None, 6379, 0)
+        pool_2 = get_connection_pool('localhost', None, 6379, 1)
+        self.assertIsNot(pool_1, pool_2)
+
+    @patch('juloserver.julo.services2.redis_helper.os.getpid')
+    def test_new_pool_after_fork(self, mock_getpid):
+        mock_getpid.return_value = 100
+        pool_1 = get_connection_pool('localhost', None, 6379, 0)
+
+        mock_getpid.return_value = 101
+        pool_2 = get_connection_pool('localhost', None, 6379, 0)
+        self.assertIsNot(pool_1, pool_2)
+
+    @patch('juloserver.julo.services2.redis_helper.redis.Redis.ping')
+    def test_pooled_client_does_not_ping(self, mock_ping):
+        pool = get_connection_pool('localhost', None, 6379, 0)
+        helper = RedisHelper('localhost', None, 6379, 0, connection_pool=pool)
+
+        mock_ping.assert_not_called()
+        self.assertIs(helper.client.connection_pool, pool)
+
+
+class TestRedisHelperBatch(UnitTestCase):
+    def setUp(self):
+        self.redis_helper = MockRedisHelper()
+        self.redis_helper.client.flushall()
+
+    def test_get_many_and_set_many(self):
+        self.redis_helper.set_many({'key_1': 'value_1', 'key_2': 'value_2'}, expire_time=60)
+
+        result = self.redis_helper.get_many(['key_1', 'key_missing', 'key_2'])
+        self.assertEqual(result, ['value_1', None, 'value_2'])
+        self.assertTrue(0 < self.redis_helper.get_ttl('key_1') <= 60)
+
+    def test_delete_keys(self):
+        self.redis_helper.set_many({'key_1': 'value_1', 'key_2': 'value_2'})
+
+        self.assertEqual(self.redis_helper.delete_keys(['key_1', 'key_2']), 2)
+        self.assertEqual(self.redis_helper.delete_keys([]), 0)
+
+    def test_increment_many(self):
+        self.redis_helper.increment('counter_1')
+
+        result = self.redis_helper.increment_many(['counter_1', 'counter_2'], expire_time=60)
+        self.assertEqual(result, [2, 1])
+        self.assertTrue(0 < self.redis_helper.get_ttl('counter_2') <= 60)
+
+    def test_sismember_many(self):
+        self.redis_helper.sadd('set_key', ['1', '2'])
+
+        result = self.redis_helper.sismember_many('set_key', ['1', '3', '2'])
+        self.assertEqual(result, [True, False, True])
@@ -0,0 +1,325 @@
+"""
+In-process autocomplete over the dropdown lists and the lists stored for RedisEnginePy3.
+
+The words of the titles are kept in one sorted list, so the titles matching a typed prefix
+are a bisect away, and the titles are sorted by their words so the titles starting with the
+prefix are a single range. A query matches the titles having a word starting with every one
+of its words. A query word without any match of at least MIN_TYPO_LENGTH characters matches
+the words with a prefix one edit away instead.
+
+The matches are ranked by the position in the title of the word matching the first query
+word, then by title, and only the top limit are kept with a heap.
+"""
+import heapq
+import json
+import logging
+import re
+import threading
+import time
+from bisect import bisect_left
+
+from juloserver.julo.constants import FeatureNameConst
+from juloserver.julo.models import FeatureSetting
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECK_INTERVAL_SECONDS = 30
+DEFAULT_MAX_AGE_SECONDS = 10 * 60
+MIN_TYPO_LENGTH = 4
+# titles of the prefix range checked for the other query words before the full search
+MAX_RANGE_SCAN_FACTOR = 50
+# matches of the other query words ranked one by one instead of by position
+MAX_DIRECT_RANK_CANDIDATES = 2000
+# titles of a query word union kept for the next queries
+MIN_WIDE_ITEMS = 5000
+
+
+def get_in_process_autocomplete_setting():
+    """
+    Return:
+        dict of check_interval_seconds and max_age_seconds when the searches read the
+        in-process indexes, None otherwise
+    """
+    feature_setting = FeatureSetting.objects.get_cached(
+        FeatureNameConst.IN_PROCESS_AUTOCOMPLETE, is_active=True
+    )
+    if not feature_setting:
+        return None
+
+    parameters = feature_setting.parameters or {}
+    return dict(
+        check_interval_seconds=parameters.get(
+            'check_interval_seconds', DEFAULT_CHECK_INTERVAL_SECONDS
+        ),
+        max_age_seconds=parameters.get('max_age_seconds', DEFAULT_MAX_AGE_SECONDS),
+    )
+
+
+def tokenize(phrase):
+    """Same cleaning as RedisEngine.clean_phrase without the stop words."""
+    return re.sub(r'[^a-z0-9_\-\s]', '', phrase.lower()).split()
+
+
+def is_one_edit_away(first, second):
+    """True when one substitution, insertion, deletion or transposition turns first to second"""
+    if abs(len(first) - len(second)) > 1 or first == second:
+        return False
+
+    index = 0
+    while index < min(len(first), len(second)) and first[index] == second[index]:
+        index += 1
+
+    if len(first) == len(second):
+        return first[index + 1:] == second[index + 1:] or (
+            first[index + 2:] == second[index + 2:]
+            and first[index:index + 2] == second[index:index + 2][::-1]
+        )
+    if len(first) > len(second):
+        return first[index + 1:] == second[index:]
+    return first[index:] == second[index + 1:]
+
+
+class AutocompleteIndex:
+    def __init__(self, items, tokenizer=tokenize):
+        """
+        Args:
+            items: iterable of (title, data), data is what the search returns
+            tokenizer: function splitting a title or a query to its words
+        """
+        self.tokenizer = tokenizer
+        # the original order breaks the ties of the same words, data may not be comparable
+        entries = sorted(
+            (' '.join(tokenizer(title)), order, data)
+            for order, (title, data) in enumerate(items)
+        )
+        self.keys = [key for key, _, _ in entries]
+        self.data = [data for _, _, data in entries]
+
+        self.words = sorted({word for key in self.keys for word in key.split()})
+        word_ids = {word: word_id for word_id, word in enumerate(self.words)}
+        self.item_word_ids = []
+        # item ids of every word by the position of the word in the titles
+        position_postings = [{} for _ in self.words]
+        for item_id, key in enumerate(self.keys):
+            item_word_ids = tuple(word_ids[word] for word in key.split())
+            self.item_word_ids.append(item_word_ids)
+            for position, word_id in enumerate(item_word_ids):
+                position_postings[word_id].setdefault(position, []).append(item_id)
+        self.position_postings = [
+            {position: tuple(item_ids) for position, item_ids in postings.items()}
+            for postings in position_postings
+        ]
+        # the unions of the query words matching many titles, built once
+        self._wide_item_ids = {}
+
+    def __len__(self):
+        return len(self.data)
+
+    def search(self, phrase, limit=None):
+        """The data of the best matching titles, the first limit titles for an empty phrase."""
+        tokens = self.tokenizer(phrase or '')
+        if not tokens:
+            return self.data[:limit]
+
+        matchers = [self._get_matcher(token) for token in tokens]
+        if any(matcher is None for matcher in matchers):
+            return []
+
+        item_ids = None
+        if limit is not None:
+            item_ids = self._search_first_word_range(tokens[0], matchers, limit)
+        if item_ids is None:
+            item_ids = self._search_by_position(matchers, limit)
+        return [self.data[item_id] for item_id in item_ids]
+
+    def _get_matcher(self, token):
+        """(ids of the words matching the token, is typo)"""
+        start = bisect_left(self.words, token)
+        end = bisect_left(self.words, token + '\uffff', start)
+        if start < end:
+            return range(start, end), False
+        if len(token) < MIN_TYPO_LENGTH:
+            return None
+
+        # a typo is rarely on the first letter, so only the words sharing it are checked
+        first_start = bisect_left(self.words, token[0])
+        first_end = bisect_left(self.words, token[0] + '\uffff', first_start)
+        typo_word_ids = frozenset(
+            word_id
+            for word_id in range(first_start, first_end)
+            if any(
+                is_one_edit_away(token, self.words[word_id][:length])
+                for length in (len(token) - 1, len(token), len(token) + 1)
+            )
+        )
+        if not typo_word_ids:
+            return None
+        return typo_word_ids, True
+
+    def _search_first_word_range(self, token, matchers, limit):
+        """
+        The titles starting with the first query word rank first and are already in rank
+        order in their range. None when the range does not give limit titles quickly.
+        """
+        if matchers[0][1]:
+            return None
+
+        start = bisect_left(self.keys, token)
+        end = bisect_left(self.keys, token + '\uffff', start)
+        item_ids = []
+        for item_id in range(start, min(end, start + limit * MAX_RANGE_SCAN_FACTOR)):
+            if all(
+                any(word_id in word_ids for word_id in self.item_word_ids[item_id])
+                for word_ids, _ in matchers[1:]
+            ):
+                item_ids.append(item_id)
+                if len(item_ids) >= limit:
+                    return item_ids
+
+        return None
+
+    def _search_by_position(self, matchers, limit):
+        """
+        The matching titles by the position of the word matching the first query word, the
+        positions after the one giving limit titles are not read.
+        """
+        first_word_ids, _ = matchers[0]
+        others = matchers[1:]
+        other_item_ids = sorted(
+            (self._get_item_ids(word_ids) for word_ids, _ in others), key=len
+        )
+        if other_item_ids:
+            candidates = set(other_item_ids[0])
+            for matching_item_ids in other_item_ids[1:]:
+                candidates &= matching_item_ids
+            if len(candidates) <= MAX_DIRECT_RANK_CANDIDATES:
+                return self._rank_candidates(first_word_ids, candidates, limit)
+
+        by_position = {}
+        for word_id in first_word_ids:
+            for position, item_ids in self.position_postings[word_id].items():
+                by_position.setdefault(position, []).append(item_ids)
+
+        found = set()
+        result = []
+        for position in sorted(by_position):
+            item_ids = set().union(*by_position[position])
+            for matching_item_ids in other_item_ids:
+                item_ids &= matching_item_ids
+            item_ids -= found
+            found |= item_ids
+            if limit is None:
+                result.extend(sorted(item_ids))
+                continue
+
+            result.extend(heapq.nsmallest(limit - len(result), item_ids))
+            if len(result) >= limit:
+                break
+
+        return result
+
+    def _rank_candidates(self, first_word_ids, candidates, limit):
+        ranked = []
+        for item_id in candidates:
+            for position, word_id in enumerate(self.item_word_ids[item_id]):
+                if word_id in first_word_ids:
+                    ranked.append((position, item_id))
+                    break
+
+        ranked = sorted(ranked) if limit is None else heapq.nsmallest(limit, ranked)
+        return [item_id for _, item_id in ranked]
+
+    def _get_item_ids(self, word_ids):
+        """The ids of the titles having one of the words, do not modify it."""
+        is_range = isinstance(word_ids, range)
+        if is_range and (word_ids.start, word_ids.stop) in self._wide_item_ids:
+            return self._wide_item_ids[(word_ids.start, word_ids.stop)]
+
+        item_ids = set()
+        for word_id in word_ids:
+            for position_item_ids in self.position_postings[word_id].values():
+                item_ids.update(position_item_ids)
+
+        if is_range and len(item_ids) >= MIN_WIDE_ITEMS:
+            self._wide_item_ids[(word_ids.start, word_ids.stop)] = frozenset(item_ids)
+        return item_ids
+
+
+class AutocompleteIndexCache:
+    """
+    The indexes of this process by name. An index is rebuilt at most every
+    check_interval_seconds when its loader sees a new version, and every max_age_seconds.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._indexes = {}
+
+    def get(self, name, load_items, get_version, setting, tokenizer=tokenize):
+        """
+        Args:
+            name: key of the index
+            load_items: function returning the (title, data) of the index
+            get_version: function returning a value changing with the items
+            setting: dict from get_in_process_autocomplete_setting
+        """
+        entry = self._indexes.get(name)
+        now = time.monotonic()
+        if entry and now - entry['checked_at'] < setting['check_interval_seconds']:
+            return entry['index']
+
+        with self._lock:
+            entry = self._indexes.get(name)
+            now = time.monotonic()
+            if entry and now - entry['checked_at'] < setting['check_interval_seconds']:
+                return entry['index']
+
+            version = get_version()
+            if (
+                not entry
+                or entry['version'] != version
+                or now - entry['loaded_at'] >= setting['max_age_seconds']
+            ):
+                index = AutocompleteIndex(load_items(), tokenizer)
+                logger.info({
+                    'action': 'AutocompleteIndexCache.get',
+                    'name': name,
+                    'items': len(index),
+                    'seconds': round(time.monotonic() - now, 3),
+                })
+                entry = dict(index=index, version=version, loaded_at=now)
+                self._indexes[name] = entry
+            entry['checked_at'] = time.monotonic()
+
+            return entry['index']
+
+    def clear(self):
+        self._indexes = {}
+
+
+autocomplete_index_cache = AutocompleteIndexCache()
+
+
+def get_redis_completion_index(redis_completion_engine, setting):
+    """
+    The index of the titles and the json data stored by a RedisEnginePy3, rebuilt when the
+    number of stored titles changes.
+    """
+    client = redis_completion_engine.client
+
+    def load_items():
+        titles = client.hgetall(redis_completion_engine.title_key)
+        data = client.hgetall(redis_completion_engine.data_key)
+        return [
+            (title.decode(), json.loads(data[combined_id].decode()))
+            for combined_id, title in titles.items()
+            if combined_id in data
+        ]
+
+    return autocomplete_index_cache.get(
+        'redis_completion:{}'.format(redis_completion_engine.prefix),
+        load_items,
+        lambda: client.hlen(redis_completion_engine.data_key),
+        setting,
+        redis_completion_engine.clean_phrase,
+    )
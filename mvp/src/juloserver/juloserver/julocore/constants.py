@@ -78,3 +78,11 @@ class AllConstMixin:
             for field_name, value in vars(cls).items()
             if (not field_name.startswith('_') and not callable(value) and isinstance(value, str))
         }
+
+
+class HttpVendor(AllConstMixin):
+    AI_RUDDER_PDS = 'ai_rudder_pds'
+    FDC = 'fdc'
+    MOENGAGE = 'moengage'
+    PII_VAULT = 'pii_vault'
+    XENDIT = 'xendit'
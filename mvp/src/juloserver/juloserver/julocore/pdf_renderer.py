@@ -0,0 +1,163 @@
+"""
+PDF rendering with wkhtmltopdf through pdfkit, returning the PDF bytes from the stdout of
+wkhtmltopdf instead of a file written and read back.
+
+wkhtmltopdf has no server mode, every document still runs its own wkhtmltopdf. The
+renderer keeps a pool of worker threads per process so a batch of documents keeps
+max_workers conversions running, and bounds the documents a batch has in flight so a
+large batch does not hold every rendered document in memory.
+"""
+import logging
+import os
+import threading
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import pdfkit
+from PyPDF2 import PdfFileReader
+
+from juloserver.julo.constants import FeatureNameConst
+from juloserver.julo.models import FeatureSetting
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_QUEUE_SIZE = 16
+DEFAULT_PDF_OPTIONS = {
+    'page-size': 'A4',
+    'margin-top': '0in',
+    'margin-right': '0in',
+    'margin-bottom': '0in',
+    'margin-left': '0in',
+    'encoding': "UTF-8",
+    'no-outline': None,
+}
+
+RenderedPdf = namedtuple('RenderedPdf', ['content', 'page_count'])
+
+
+def get_pdf_renderer_pool_setting():
+    """
+    Return:
+        dict of max_workers and queue_size when the documents are rendered by the pool,
+        None otherwise
+    """
+    feature_setting = FeatureSetting.objects.get_cached(
+        FeatureNameConst.PDF_RENDERER_POOL, is_active=True
+    )
+    if not feature_setting:
+        return None
+
+    parameters = feature_setting.parameters or {}
+    return dict(
+        max_workers=parameters.get('max_workers', DEFAULT_MAX_WORKERS),
+        queue_size=parameters.get('queue_size', DEFAULT_QUEUE_SIZE),
+    )
+
+
+def get_page_count(content):
+    return PdfFileReader(BytesIO(content)).getNumPages()
+
+
+def render_pdf(html, options=None, with_page_count=False):
+    """
+    RenderedPdf of one html from one wkhtmltopdf run, the PDF is read from its stdout.
+    options None is DEFAULT_PDF_OPTIONS, {} is the defaults of wkhtmltopdf.
+    """
+    content = pdfkit.from_string(
+        html, False, options=DEFAULT_PDF_OPTIONS if options is None else options
+    )
+    return RenderedPdf(content, get_page_count(content) if with_page_count else None)
+
+
+def render_pdf_or_exception(html, options=None, with_page_count=False):
+    try:
+        return render_pdf(html, options, with_page_count)
+    except Exception as error:
+        return error
+
+
+class PdfRendererPool(object):
+    """
+    Worker threads of this process rendering PDFs, created with the max_workers of the
+    first batch. A batch keeps at most max_workers + queue_size documents submitted and
+    not yet taken by its caller. The pool is created again after a fork, the threads of
+    the parent do not exist in the child.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+
+    def get_executor(self, setting):
+        with self._lock:
+            if not self._executor or self._pid != os.getpid():
+                self._executor = ThreadPoolExecutor(
+                    max_workers=setting['max_workers'], thread_name_prefix='pdf_renderer'
+                )
+                self._pid = os.getpid()
+                logger.info(
+                    {
+                        'action': 'PdfRendererPool.get_executor',
+                        'max_workers': setting['max_workers'],
+                    }
+                )
+            return self._executor
+
+    def render_many(
+        self, htmls, options=None, with_page_count=False, setting=None, return_exceptions=False
+    ):
+        """
+        Yield the RenderedPdf of every html in order, the next documents are rendered while
+        the caller handles the current one.
+        """
+        render = render_pdf_or_exception if return_exceptions else render_pdf
+        executor = self.get_executor(setting)
+        window = setting['max_workers'] + setting['queue_size']
+        futures = deque()
+        try:
+            for html in htmls:
+                if len(futures) >= window:
+                    yield futures.popleft().result()
+                futures.append(
+                    executor.submit(render, html, options, with_page_count)
+                )
+            while futures:
+                yield futures.popleft().result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor and self._pid == os.getpid():
+                self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+pdf_renderer_pool = PdfRendererPool()
+
+
+def render_pdfs(htmls, options=None, with_page_count=False, return_exceptions=False):
+    """
+    Yield the RenderedPdf of every html in order, with the pool when it is enabled and one
+    by one in the caller otherwise.
+
+    Args:
+        htmls: iterable of html, read as the documents are rendered
+        return_exceptions: yield the exception of an html that fails instead of raising
+            it, the other documents of the batch are still rendered
+    """
+    setting = get_pdf_renderer_pool_setting()
+    if not setting:
+        render = render_pdf_or_exception if return_exceptions else render_pdf
+        for html in htmls:
+            yield render(html, options, with_page_count)
+        return
+
+    for rendered_pdf in pdf_renderer_pool.render_many(
+        htmls, options, with_page_count, setting, return_exceptions
+    ):
+        yield rendered_pdf
@@ -1,6 +1,7 @@
 from builtins import object, str
 
 
+import re
 import time
 import logging
 import json
@@ -9,9 +10,31 @@ from django.http import RawPostDataException
 from rest_framework import status
 
 from juloserver.julocore.utils import get_client_ip
+from juloserver.julolog.julolog import JsonLogMessage
+
+api_logger = logging.getLogger('api.request')
+
+
+def compile_path_pattern(paths):
+    """One regex finding any of the paths in a request path, None when there is no path."""
+    if not paths:
+        return None
+    return re.compile('|'.join(re.escape(path) for path in sorted(set(paths))))
 
 
 class ApiLoggingMiddleware(object):
+    """
+    Log the error responses of the api to the api.request logger. The path patterns are
+    compiled once from settings, the request body is only read for a response that is
+    logged and the logged bodies are cut to API_LOGGING_MAX_BODY_SIZE. The log content is
+    serialized by the handler, on its listener thread when the handler is an AsyncHandler.
+    """
+
+    def __init__(self):
+        self.excluded_path_pattern = compile_path_pattern(settings.API_LOGGING_EXCLUDED_PATHS)
+        self.blacklisted_path_pattern = compile_path_pattern(settings.LOGGING_BLACKLISTED_PATHS)
+        self.max_body_size = settings.API_LOGGING_MAX_BODY_SIZE
+
     def process_request(self, request):
         request.start_time_to_log = time.time()
 
@@ -19,78 +42,65 @@ class ApiLoggingMiddleware(object):
         if not hasattr(request, 'start_time_to_log'):
             return response
 
-        try:
-            request.post_to_log = request.POST
-            request.body_to_log = request.body
-        except RawPostDataException:
-            request.post_to_log = b''
-            request.body_to_log = b''
-        path = request.path
-
-        if any(
-            p in str(path)
-            for p in [
-                'api/liveness-detection/',
-                'api/application-form/v2/application',
-                'api/application-form/v1/cancel',
-                'api/application-form/v2/reapply',
-                'api/application_flow/v1/bottom-sheet-tutorial',
-                'api/julo-starter/v1/application',
-                'api/otp/v1/validate',
-                'api/otp/v2/validate',
-                'api/otp/v1/request',
-                'api/otp/v2/request',
-                'api/pin/v3/login',
-                'api/pin/v4/login',
-                'api/otp/v1/check-user-allowed',
-                'api/customer-module/v1/appsflyer',
-            ]
-        ):
-            return response
-
         if response.status_code < status.HTTP_400_BAD_REQUEST:
             return response
 
-        ip_address = get_client_ip(request)
-
-        request_body = None
-        if request.method in ('POST', 'PATCH', 'PUT'):
-            if request.post_to_log:
-                request_body = request.post_to_log.dict()
-            else:
-                if (
-                    'CONTENT_TYPE' in request.META
-                    and 'json' in request.META['CONTENT_TYPE'].lower()
-                ):
-                    try:
-                        request_body = json.loads(request.body_to_log.decode(errors='replace'))
-                    except json.JSONDecodeError as jde:
-                        request_body = "%s: %s\n %s" % (
-                            jde.__class__.__name__,
-                            str(jde),
-                            request.body_to_log.decode(errors='replace'),
-                        )
-                else:
-                    request_body = request.body_to_log.decode(errors='replace')
+        path = request.path
+        if self.excluded_path_pattern and self.excluded_path_pattern.search(str(path)):
+            return response
 
+        content = response.content
         log_content = {
             'action': 'logging_api_error',
-            'ip_address': ip_address,
+            'ip_address': get_client_ip(request),
             'method': request.method,
             'path': path,
-            'request_params': request.GET.dict(),
-            'request_body': request_body,
-            'payload_size': len(response.content),
+            'payload_size': len(content),
             'response_status': response.status_code,
-            'response_body': response.content.decode(errors='replace'),
+            'response_body': self.cut_body(content).decode(errors='replace'),
             'duration': round(time.time() - request.start_time_to_log, 3),
         }
 
-        if any(p in str(path) for p in settings.LOGGING_BLACKLISTED_PATHS):
-            del log_content['request_params']
-            del log_content['request_body']
+        if not self.blacklisted_path_pattern or not self.blacklisted_path_pattern.search(
+            str(path)
+        ):
+            log_content['request_params'] = request.GET.dict()
+            log_content['request_body'] = self.get_request_body(request)
 
-        response_logger = logging.getLogger('api.request')
-        response_logger.error(json.dumps(log_content))
+        api_logger.error(JsonLogMessage(log_content))
 
         return response
+
+    def cut_body(self, body):
+        if len(body) > self.max_body_size:
+            return body[: self.max_body_size]
+        return body
+
+    def get_request_body(self, request):
+        if request.method not in ('POST', 'PATCH', 'PUT'):
+            return None
+
+        try:
+            post = request.POST
+            body = request.body
+        except RawPostDataException:
+            post = b''
+            body = b''
+
+        if post:
+            return post.dict()
+
+        # a cut json body can not be parsed, it is logged as text
+        if len(body) > self.max_body_size:
+            return self.cut_body(body).decode(errors='replace')
+
+        if 'CONTENT_TYPE' in request.META and 'json' in request.META['CONTENT_TYPE'].lower():
+            try:
+                return json.loads(body.decode(errors='replace'))
+            except json.JSONDecodeError as jde:
+                return "%s: %s\n %s" % (
+                    jde.__class__.__name__,
+                    str(jde),
+                    body.decode(errors='replace'),
+                )
+        return body.decode(errors='replace')
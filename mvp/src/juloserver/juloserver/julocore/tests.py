@@ -7,10 +7,22 @@ from django.db.transaction import get_connection
 from django.test.testcases import TestCase, SimpleTestCase
 from django.test import override_settings
 
+from juloserver.julocore.autocomplete import AutocompleteIndex
+from juloserver.julocore.http_transport import (
+    TransportMetrics,
+    get_http_session,
+    get_percentile,
+)
+from juloserver.julocore.pdf_renderer import (
+    DEFAULT_PDF_OPTIONS,
+    render_pdf,
+    render_pdfs,
+)
 from juloserver.julocore.python2.utils import py2round
 from juloserver.julocore.restapi.middleware import ApiLoggingMiddleware
 from django.http import QueryDict
 from juloserver.julocore.utils import get_client_ip
+from juloserver.julolog.julolog import JsonLogMessage
 
 
 def force_run_on_commit_hook():
@@ -116,9 +128,8 @@ class TestApiLoggingMiddleware(TestCase):
         self.response = mock.MagicMock()
         self.response.status_code = 200
 
-    @mock.patch('juloserver.julocore.restapi.middleware.json.dumps')
-    def test_api_error_logging(self, mocked_json):
-        mocked_json.return_value = None
+    @mock.patch('juloserver.julocore.restapi.middleware.api_logger')
+    def test_api_error_logging(self, mocked_logger):
         self.middleware.process_request(self.request)
         response = self.middleware.process_response(self.request, self.response)
         self.assertEqual(response, self.response)
@@ -126,11 +137,11 @@ class TestApiLoggingMiddleware(TestCase):
         self.response.status_code = 400
         response = self.middleware.process_response(self.request, self.response)
         self.assertEqual(response, self.response)
-        mocked_json.assert_called_once()
+        mocked_logger.error.assert_called_once()
 
     @mock.patch('juloserver.julocore.restapi.middleware.round')
-    @mock.patch('juloserver.julocore.restapi.middleware.json.dumps')
-    def test_ip_address_scenario(self, mocked_json, mocked_round):
+    @mock.patch('juloserver.julocore.restapi.middleware.api_logger')
+    def test_ip_address_scenario(self, mocked_logger, mocked_round):
         mocked_round.return_value = 0.002
         ip_log = {
             'action': 'logging_api_error',
@@ -145,14 +156,13 @@ class TestApiLoggingMiddleware(TestCase):
             'duration': 0.002,
         }
 
-        mocked_json.return_value = None
         self.response.status_code = 400
         response = self.middleware.process_response(self.request, self.response)
         self.assertEqual(response, self.response)
-        mocked_json.assert_called_once()
-        mocked_json.assert_called_with(ip_log)
+        mocked_logger.error.assert_called_once()
+        mocked_logger.error.assert_called_with(JsonLogMessage(ip_log))
 
-        mocked_json.reset_mock()
+        mocked_logger.reset_mock()
 
         self.request.META = {
             'HTTP_X_FORWARDED_FOR': '127.0.0.1',
@@ -169,10 +179,10 @@ class TestApiLoggingMiddleware(TestCase):
         self.response.status_code = 400
         response = self.middleware.process_response(self.request, self.response)
         self.assertEqual(response, self.response)
-        mocked_json.assert_called_once()
-        mocked_json.assert_called_with(ip_log)
+        mocked_logger.error.assert_called_once()
+        mocked_logger.error.assert_called_with(JsonLogMessage(ip_log))
 
-        mocked_json.reset_mock()
+        mocked_logger.reset_mock()
 
         self.request.META = {
             'HTTP_X_REAL_IP': '127.0.0.1',
@@ -189,12 +199,12 @@ class TestApiLoggingMiddleware(TestCase):
         self.response.status_code = 400
         response = self.middleware.process_response(self.request, self.response)
         self.assertEqual(response, self.response)
-        mocked_json.assert_called_once()
-        mocked_json.assert_called_with(ip_log)
+        mocked_logger.error.assert_called_once()
+        mocked_logger.error.assert_called_with(JsonLogMessage(ip_log))
 
     @mock.patch('juloserver.julocore.restapi.middleware.round')
-    @mock.patch('juloserver.julocore.restapi.middleware.json.dumps')
-    def test_form_data(self, mocked_dumps, mocked_round):
+    @mock.patch('juloserver.julocore.restapi.middleware.api_logger')
+    def test_form_data(self, mocked_logger, mocked_round):
         mocked_round.return_value = 0.002
         ip_log = {
             'action': 'logging_api_error',
@@ -246,13 +256,13 @@ class TestApiLoggingMiddleware(TestCase):
         self.response.content = b'{"success":false,"data":null,"errors":["Unauthorized request"]}'
         ip_log['payload_size'] = len(self.response.content)
         response = self.middleware.process_response(self.request, self.response)
-        mocked_dumps.assert_called_with(ip_log)
+        mocked_logger.error.assert_called_with(JsonLogMessage(ip_log))
         self.assertEqual(response.status_code, 400)
         self.assertEqual(response, self.response)
 
     @mock.patch('juloserver.julocore.restapi.middleware.round')
-    @mock.patch('juloserver.julocore.restapi.middleware.json.dumps')
-    def test_raw_json(self, mocked_dumps, mocked_round):
+    @mock.patch('juloserver.julocore.restapi.middleware.api_logger')
+    def test_raw_json(self, mocked_logger, mocked_round):
         mocked_round.return_value = 0.002
         ip_log = {
             'action': 'logging_api_error',
@@ -306,7 +316,7 @@ class TestApiLoggingMiddleware(TestCase):
         self.response.content = b'{"success":false,"data":null,"errors":["Unauthorized request"]}'
         ip_log['payload_size'] = len(self.response.content)
         response = self.middleware.process_response(self.request, self.response)
-        mocked_dumps.assert_called_with(ip_log)
+        mocked_logger.error.assert_called_with(JsonLogMessage(ip_log))
         self.assertEqual(response.status_code, 401)
 
         self.request.body = None
@@ -326,13 +336,13 @@ class TestApiLoggingMiddleware(TestCase):
         )
         self.request.POST = post_params
         response = self.middleware.process_response(self.request, self.response)
-        mocked_dumps.assert_called_with(ip_log)
+        mocked_logger.error.assert_called_with(JsonLogMessage(ip_log))
         self.assertEqual(response.status_code, 401)
         self.assertEqual(response, self.response)
 
     @mock.patch('juloserver.julocore.restapi.middleware.round')
-    @mock.patch('juloserver.julocore.restapi.middleware.json.dumps')
-    def test_blacklisted_api(self, mocked_dumps, mocked_round):
+    @mock.patch('juloserver.julocore.restapi.middleware.api_logger')
+    def test_blacklisted_api(self, mocked_logger, mocked_round):
         mocked_round.return_value = 0.002
         ip_log = {
             'action': 'logging_api_error',
@@ -374,7 +384,7 @@ class TestApiLoggingMiddleware(TestCase):
         self.response.content = b'{"success":false,"data":null,"errors":["Unauthorized request"]}'
         ip_log['payload_size'] = len(self.response.content)
         response = self.middleware.process_response(self.request, self.response)
-        mocked_dumps.assert_called_with(ip_log)
+        mocked_logger.error.assert_called_with(JsonLogMessage(ip_log))
         self.assertEqual(response.status_code, 401)
 
         self.request.body = None
@@ -394,10 +404,42 @@ class TestApiLoggingMiddleware(TestCase):
         )
         self.request.POST = post_params
         response = self.middleware.process_response(self.request, self.response)
-        mocked_dumps.assert_called_with(ip_log)
+        mocked_logger.error.assert_called_with(JsonLogMessage(ip_log))
         self.assertEqual(response.status_code, 401)
         self.assertEqual(response, self.response)
 
+    @mock.patch('juloserver.julocore.restapi.middleware.api_logger')
+    def test_success_response_not_reading_body(self, mocked_logger):
+        type(self.request).body = mock.PropertyMock(side_effect=AssertionError)
+        type(self.request).POST = mock.PropertyMock(side_effect=AssertionError)
+        self.middleware.process_request(self.request)
+        response = self.middleware.process_response(self.request, self.response)
+        self.assertEqual(response, self.response)
+        mocked_logger.error.assert_not_called()
+
+    @mock.patch('juloserver.julocore.restapi.middleware.api_logger')
+    def test_excluded_path(self, mocked_logger):
+        self.request.path = '/api/otp/v1/request'
+        self.response.status_code = 400
+        response = self.middleware.process_response(self.request, self.response)
+        self.assertEqual(response, self.response)
+        mocked_logger.error.assert_not_called()
+
+    @override_settings(API_LOGGING_MAX_BODY_SIZE=10)
+    @mock.patch('juloserver.julocore.restapi.middleware.api_logger')
+    def test_body_size_cap(self, mocked_logger):
+        middleware = ApiLoggingMiddleware()
+        self.request.POST = None
+        self.request.body = b'{"phone_number": "62811027376454"}'
+        self.response.status_code = 400
+        self.response.content = b'{"success":false,"data":null}'
+        middleware.process_response(self.request, self.response)
+
+        log_content = mocked_logger.error.call_args[0][0].data
+        self.assertEqual(log_content['request_body'], '{"phone_nu')
+        self.assertEqual(log_content['response_body'], '{"success"')
+        self.assertEqual(log_content['payload_size'], len(self.response.content))
+
 
 class TestGetClientIP(SimpleTestCase):
     def setUp(self):
@@ -443,3 +485,135 @@ class TestGetClientIP(SimpleTestCase):
 
         ret_val = get_client_ip(request)
         self.assertEqual('127.0.0.3', ret_val)
+
+
+class TestHttpTransport(SimpleTestCase):
+    @override_settings(HTTP_TRANSPORT_VENDOR_CONFIG={'test_vendor': {'pool_maxsize': 3}})
+    def test_one_session_per_vendor(self):
+        session = get_http_session('test_vendor')
+
+        self.assertIs(session, get_http_session('test_vendor'))
+        self.assertIsNot(session, get_http_session('other_test_vendor'))
+        self.assertEqual(session.get_adapter('https://example.com')._pool_maxsize, 3)
+
+    def test_transport_metrics(self):
+        transport_metrics = TransportMetrics()
+        for elapsed in range(1, 101):
+            transport_metrics.record('test_vendor', elapsed / 1000, is_error=elapsed > 98)
+
+        snapshot = transport_metrics.snapshot('test_vendor')
+        self.assertEqual(snapshot['request_count'], 100)
+        self.assertEqual(snapshot['error_count'], 2)
+        self.assertEqual(snapshot['p50_ms'], 51)
+        self.assertEqual(snapshot['p99_ms'], 100)
+
+        transport_metrics.reset('test_vendor')
+        self.assertEqual(transport_metrics.snapshot('test_vendor')['request_count'], 0)
+
+    def test_get_percentile_empty(self):
+        self.assertEqual(get_percentile([], 99), 0)
+
+
+class TestAutocompleteIndex(SimpleTestCase):
+    def setUp(self):
+        self.index = AutocompleteIndex(
+            (title, {'name': title})
+            for title in (
+                'PT. Bank Mandiri',
+                'Bank Syariah Mandiri',
+                'PT. Mandiri Sekuritas',
+                'Telkom Indonesia',
+                'PT. Bank Rakyat Indonesia',
+            )
+        )
+
+    def test_prefix_ranked_by_position(self):
+        self.assertEqual(
+            [data['name'] for data in self.index.search('mand', 10)],
+            ['PT. Mandiri Sekuritas', 'Bank Syariah Mandiri', 'PT. Bank Mandiri'],
+        )
+
+    def test_multi_word(self):
+        self.assertEqual(
+            [data['name'] for data in self.index.search('bank indo')],
+            ['PT. Bank Rakyat Indonesia'],
+        )
+        self.assertEqual(
+            [data['name'] for data in self.index.search('bank mandiri', 1)],
+            ['Bank Syariah Mandiri'],
+        )
+
+    def test_typo(self):
+        self.assertEqual(
+            [data['name'] for data in self.index.search('telkmo')], ['Telkom Indonesia']
+        )
+        self.assertEqual(self.index.search('tlk'), [])
+
+    def test_empty_phrase(self):
+        self.assertEqual(len(self.index.search('', 2)), 2)
+        self.assertEqual(self.index.search('xyz', 2), [])
+
+
+@mock.patch('juloserver.julocore.pdf_renderer.get_page_count', side_effect=len)
+@mock.patch('juloserver.julocore.pdf_renderer.pdfkit')
+class TestPdfRenderer(SimpleTestCase):
+    def setUp(self):
+        self.setting = dict(max_workers=2, queue_size=1)
+
+    def test_render_pdf(self, mock_pdfkit, _):
+        mock_pdfkit.from_string.return_value = b'%PDF'
+
+        rendered_pdf = render_pdf('<p>a</p>', with_page_count=True)
+
+        mock_pdfkit.from_string.assert_called_once_with(
+            '<p>a</p>', False, options=DEFAULT_PDF_OPTIONS
+        )
+        self.assertEqual(rendered_pdf.content, b'%PDF')
+        self.assertEqual(rendered_pdf.page_count, 4)
+
+    @mock.patch('juloserver.julocore.pdf_renderer.get_pdf_renderer_pool_setting')
+    def test_render_pdfs_in_order(self, mock_get_setting, mock_pdfkit, _):
+        mock_get_setting.return_value = self.setting
+        mock_pdfkit.from_string.side_effect = lambda html, *args, **kwargs: html.encode()
+        htmls = ['<p>{}</p>'.format('a' * index) for index in range(20)]
+
+        rendered_pdfs = list(render_pdfs(htmls, with_page_count=True))
+
+        self.assertEqual([rendered_pdf.content for rendered_pdf in rendered_pdfs], [
+            html.encode() for html in htmls
+        ])
+        self.assertEqual(rendered_pdfs[3].page_count, len('<p>aaa</p>'))
+
+    @mock.patch('juloserver.julocore.pdf_renderer.get_pdf_renderer_pool_setting')
+    def test_render_pdfs_error(self, mock_get_setting, mock_pdfkit, _):
+        mock_get_setting.return_value = self.setting
+        mock_pdfkit.from_string.side_effect = IOError('wkhtmltopdf exited with non-zero code')
+
+        with self.assertRaises(IOError):
+            list(render_pdfs(['<p>a</p>', '<p>b</p>']))
+
+    def test_render_pdf_wkhtmltopdf_options(self, mock_pdfkit, _):
+        render_pdf('<p>a</p>', options={})
+
+        mock_pdfkit.from_string.assert_called_once_with('<p>a</p>', False, options={})
+
+    @mock.patch('juloserver.julocore.pdf_renderer.get_pdf_renderer_pool_setting')
+    def test_render_pdfs_return_exceptions(self, mock_get_setting, mock_pdfkit, _):
+        error = IOError('wkhtmltopdf exited with non-zero code')
+
+        def from_string(html, *args, **kwargs):
+            if html == '<p>b</p>':
+                raise error
+            return html.encode()
+
+        mock_pdfkit.from_string.side_effect = from_string
+        for setting in (self.setting, None):
+            mock_get_setting.return_value = setting
+
+            rendered_pdfs = list(
+                render_pdfs(['<p>a</p>', '<p>b</p>', '<p>c</p>'], return_exceptions=True)
+            )
+
+            self.assertEqual(rendered_pdfs[0].content, b'<p>a</p>')
+            self.assertIs(rendered_pdfs[1], error)
+            self.assertEqual(rendered_pdfs[2].content, b'<p>c</p>')
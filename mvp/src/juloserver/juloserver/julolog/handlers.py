@@ -0,0 +1,84 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+from logging.handlers import QueueListener
+
+from django.utils.module_loading import import_string
+
+
+class AsyncHandler(logging.Handler):
+    """
+    Hand the records to a listener thread, which formats and writes them with the target
+    handler, so the request thread does not pay for the serialization and the write.
+
+    Configured in LOGGING like the handler it wraps:
+
+        'logfile_server': {
+            'class': 'juloserver.julolog.handlers.AsyncHandler',
+            'target': 'juloserver.settings.base.RequestIDHandler',
+            'filename': os.path.join(LOGS_PATH, 'julo_server.log'),
+            'formatter': 'verbose',
+            'level': 'INFO',
+        },
+
+    The request id is read on the calling thread. When the queue is full the record is
+    written by the calling thread instead of being dropped.
+    """
+
+    def __init__(self, target, queue_size=10000, level=logging.NOTSET, **target_kwargs):
+        super().__init__(level)
+        self.target = import_string(target)(**target_kwargs)
+        self.queue_size = queue_size
+        self.queue = queue.Queue(queue_size)
+        self.listener = None
+        self.listener_pid = None
+        self.listener_lock = threading.Lock()
+
+    def setFormatter(self, fmt):
+        super().setFormatter(fmt)
+        self.target.setFormatter(fmt)
+
+    def emit(self, record):
+        self.start_listener()
+        self.prepare(record)
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.target.handle(record)
+
+    def prepare(self, record):
+        from juloserver.julo.middleware import get_request_id
+
+        if not getattr(record, 'request_id', None):
+            record.request_id = get_request_id() or 'NO_REQUEST_ID'
+        # the traceback is rendered now, the frames may be gone when the listener runs
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+
+    def start_listener(self):
+        """The listener thread does not survive a fork, every worker starts its own."""
+        if self.listener_pid == os.getpid():
+            return
+
+        with self.listener_lock:
+            if self.listener_pid == os.getpid():
+                return
+            if self.listener_pid is not None:
+                self.queue = queue.Queue(self.queue_size)
+            self.listener = QueueListener(self.queue, self.target, respect_handler_level=True)
+            self.listener.start()
+            self.listener_pid = os.getpid()
+            atexit.register(self.stop_listener)
+
+    def stop_listener(self):
+        """Write the records left in the queue."""
+        if self.listener and self.listener_pid == os.getpid():
+            self.listener.stop()
+            self.listener_pid = None
+
+    def close(self):
+        self.stop_listener()
+        self.target.close()
+        super().close()
@@ -1,6 +1,6 @@
 import logging
 import json
-import inspect
+import sys
 
 from juloserver.julo.services2.fraud_check import get_client_ip_from_request
 
@@ -62,15 +62,11 @@ class JuloLog:
 
     def info(self, message, request=None, *args, **kwargs):
 
-        self.log_level = "INFO"
-        log_data = self._construct_log_data(message, request)
-        self.log.info(log_data, *args, **kwargs)
+        self._log(logging.INFO, message, request, *args, **kwargs)
 
     def warning(self, message, request=None, *args, **kwargs):
 
-        self.log_level = "WARNING"
-        log_data = self._construct_log_data(message, request)
-        self.log.warning(log_data, *args, **kwargs)
+        self._log(logging.WARNING, message, request, *args, **kwargs)
 
     def warn(self, message, request=None, *args, **kwargs):
 
@@ -78,34 +74,42 @@ class JuloLog:
 
     def debug(self, message, request=None, *args, **kwargs):
 
-        self.log_level = "DEBUG"
-        log_data = self._construct_log_data(message, request)
-        self.log.debug(log_data, *args, **kwargs)
+        self._log(logging.DEBUG, message, request, *args, **kwargs)
 
     def error(self, message, request=None, *args, **kwargs):
 
-        self.log_level = "ERROR"
-        log_data = self._construct_log_data(message, request)
-        self.log.error(log_data, *args, **kwargs)
+        self._log(logging.ERROR, message, request, *args, **kwargs)
 
     def critical(self, message, request=None, *args, **kwargs):
 
-        self.log_level = "CRITICAL"
-        log_data = self._construct_log_data(message, request)
-        self.log.critical(log_data, *args, **kwargs)
+        self._log(logging.CRITICAL, message, request, *args, **kwargs)
 
-    def _construct_log_data(self, message, request=None):
+    def _log(self, level, message, request=None, *args, **kwargs):
+        """
+        Nothing is constructed when the level is disabled.
+        The message is serialized by the handler, not by the caller.
+        """
+        if not self.log.isEnabledFor(level):
+            return
+
+        self.log_level = logging.getLevelName(level)
+        log_data = self._construct_log_data(
+            message, request, log_level=self.log_level, func_name=get_caller_name(2)
+        )
+        getattr(self.log, self.log_level.lower())(log_data, *args, **kwargs)
+
+    def _construct_log_data(self, message, request=None, log_level=None, func_name=None):
         """
         Re-structure log data
         """
 
         basic_dict = {
             "action": self.name,
-            "level": self.log_level,
+            "level": log_level or self.log_level,
             "message": message,
             "url": get_url_logging(request),
             "ip_address": get_ip_address(request),
-            "func_name": self.set_func_name()
+            "func_name": func_name,
         }
 
         # check for message is dict
@@ -118,18 +122,48 @@ class JuloLog:
             basic_dict['message'] = message
             full_dict = {**basic_dict}
 
-        log_data = json.dumps(full_dict, default=str)
-        return log_data
+        return JsonLogMessage(full_dict)
 
-    @staticmethod
-    def set_func_name():
-        """
-        For generate function_name by execution process / call function
-        """
-        try:
-            return inspect.stack()[3][3] if inspect.stack()[3] else None
-        except IndexError:
-            return None
+
+class JsonLogMessage(object):
+    """
+    Log message serialized with json.dumps the first time a handler formats the record,
+    so on the listener thread when the handler is an AsyncHandler.
+    It is equal to its serialized string.
+    """
+
+    __slots__ = ('data', 'text')
+
+    def __init__(self, data):
+        self.data = data
+        self.text = None
+
+    def __str__(self):
+        if self.text is None:
+            self.text = json.dumps(self.data, default=str)
+        return self.text
+
+    def __eq__(self, other):
+        if isinstance(other, JsonLogMessage):
+            return self.data == other.data
+        if isinstance(other, str):
+            return str(self) == other
+        return NotImplemented
+
+    __repr__ = __str__
+    __hash__ = None
+
+
+def get_caller_name(depth):
+    """
+    Function name depth frames above the caller, read from the code object of the frame.
+    inspect.stack() is not used because it builds every frame of the stack and reads
+    their source lines from disk.
+    """
+    try:
+        return sys._getframe(depth + 1).f_code.co_name
+    except ValueError:
+        return None
 
 
 def get_url_logging(request):
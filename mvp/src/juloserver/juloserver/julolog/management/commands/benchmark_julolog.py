@@ -0,0 +1,96 @@
+import inspect
+import json
+import logging
+import os
+import time
+
+from django.core.management.base import BaseCommand
+
+from juloserver.julolog.handlers import AsyncHandler
+from juloserver.julolog.julolog import JuloLog
+
+BENCHMARK_LOGGER = 'juloserver.julolog.benchmark'
+
+
+class LegacyJuloLog(JuloLog):
+    """JuloLog before the lazy message: inspect.stack() and json.dumps on every call."""
+
+    def _log(self, level, message, request=None, *args, **kwargs):
+        self.log_level = logging.getLevelName(level)
+        try:
+            func_name = inspect.stack()[2][3]
+        except IndexError:
+            func_name = None
+        log_data = json.dumps(
+            self._construct_log_data(
+                message, request, log_level=self.log_level, func_name=func_name
+            ).data,
+            default=str,
+        )
+        getattr(self.log, self.log_level.lower())(log_data, *args, **kwargs)
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark the CPU cost of a JuloLog call on the calling thread, before and after the '
+        'lazy message and the AsyncHandler, at a target of 10k log lines per second'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lines', type=int, default=10000)
+        parser.add_argument(
+            '--logs-per-request',
+            type=int,
+            default=15,
+            help='JuloLog calls of one request, about what a registration request logs',
+        )
+
+    def handle(self, *args, **options):
+        logger = logging.getLogger(BENCHMARK_LOGGER)
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        formatter = logging.Formatter('%(asctime)s %(levelname)s %(message)s')
+        with open(os.devnull, 'w') as devnull:
+            sync_handler = logging.StreamHandler(devnull)
+            async_handler = AsyncHandler('logging.StreamHandler', stream=devnull)
+            for handler in (sync_handler, async_handler):
+                handler.setFormatter(formatter)
+
+            results = []
+            for name, julolog_class, handler in (
+                ('legacy', LegacyJuloLog, sync_handler),
+                ('lazy message', JuloLog, sync_handler),
+                ('lazy message + async handler', JuloLog, async_handler),
+            ):
+                logger.handlers = [handler]
+                results.append(
+                    (name, self.run_benchmark(julolog_class(BENCHMARK_LOGGER), options['lines']))
+                )
+            async_handler.stop_listener()
+            logger.handlers = []
+
+        legacy_cost = results[0][1]
+        for name, cost in results:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    '{}: {:.1f}us per call, {:.1f}% of a core at 10k lines/s, '
+                    '{:.2f}ms CPU saved per request'.format(
+                        name,
+                        cost * 1e6,
+                        cost * 10000 * 100,
+                        (legacy_cost - cost) * options['logs_per_request'] * 1000,
+                    )
+                )
+            )
+
+        # a disabled level costs only the isEnabledFor check
+        logger.setLevel(logging.WARNING)
+        cost = self.run_benchmark(JuloLog(BENCHMARK_LOGGER), options['lines'])
+        self.stdout.write('disabled level: {:.2f}us per call'.format(cost * 1e6))
+
+    def run_benchmark(self, julolog, lines):
+        log_data = {'message': 'benchmark', 'application': 1, 'customer': 2, 'step': 'form'}
+        start = time.thread_time()
+        for _ in range(lines):
+            julolog.info(dict(log_data))
+        return (time.thread_time() - start) / lines
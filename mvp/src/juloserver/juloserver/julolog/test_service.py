@@ -1,10 +1,12 @@
+import io
 import logging
 import json
 
 from django.test import TestCase
 from mock import patch, mock
 
-from juloserver.julolog.julolog import JuloLog
+from juloserver.julolog.handlers import AsyncHandler
+from juloserver.julolog.julolog import JsonLogMessage, JuloLog
 
 julolog = JuloLog(__name__)
 logger = logging.getLogger(__name__)
@@ -15,6 +17,10 @@ class TestFuncJuloLog(TestCase):
     def setUp(self):
 
         self.action = "juloserver.julolog.test_service"
+        # the unit test settings disable logging, JuloLog skips the disabled levels
+        patcher = patch('logging.Logger.isEnabledFor', return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
 
     @patch('logging.Logger.info')
     def test_log_for_case_info(self, mock):
@@ -106,3 +112,28 @@ class TestFuncJuloLog(TestCase):
         expected_result = json.dumps(full_dict)
         julolog.critical(message=log_data)
         mock.assert_called_with(expected_result)
+
+    @patch('logging.Logger.info')
+    def test_log_for_disabled_level(self, mock):
+        with patch('logging.Logger.isEnabledFor', return_value=False), patch(
+            'juloserver.julolog.julolog.get_url_logging'
+        ) as mock_get_url_logging:
+            julolog.info(message="test")
+
+        mock.assert_not_called()
+        mock_get_url_logging.assert_not_called()
+
+
+class TestAsyncHandler(TestCase):
+    def test_write_from_listener_thread(self):
+        stream = io.StringIO()
+        handler = AsyncHandler('logging.StreamHandler', stream=stream)
+        handler.setFormatter(logging.Formatter('%(message)s [%(request_id)s]'))
+        record = logging.LogRecord(
+            'test', logging.INFO, __file__, 1, JsonLogMessage({'message': 'test'}), None, None
+        )
+
+        handler.handle(record)
+        handler.stop_listener()
+
+        self.assertEqual(stream.getvalue(), '{"message": "test"} [NO_REQUEST_ID]\n')
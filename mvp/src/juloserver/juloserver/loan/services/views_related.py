@@ -143,6 +143,10 @@ from juloserver.loan.models import (
 from juloserver.healthcare.models import HealthcareUser
 from django.contrib.contenttypes.models import ContentType
 from juloserver.loan.services.dbr_ratio import LoanDbrSetting
+from juloserver.julocore.autocomplete import (
+    get_in_process_autocomplete_setting,
+    get_redis_completion_index,
+)
 from juloserver.julocore.redis_completion_py3 import RedisEnginePy3
 from juloserver.payment_point.services.ewallet_related import populate_xfers_or_ayc_ewallet_details
 from juloserver.julo.services2.feature_setting import FeatureSettingHelper
@@ -1379,8 +1383,15 @@ def is_search_feature_with_redis(feature_name):
 def search_data_by_name_with_redis(prefix, phrase, limit):
     try:
         redis_completion_engine = RedisEnginePy3(prefix=prefix)
+        in_process_autocomplete_setting = get_in_process_autocomplete_setting()
+        if in_process_autocomplete_setting:
+            index = get_redis_completion_index(
+                redis_completion_engine, in_process_autocomplete_setting
+            )
+            response_data = index.search(phrase, limit)
+
         # in case search by some letters
-        if redis_completion_engine.clean_phrase(phrase=phrase):
+        elif redis_completion_engine.clean_phrase(phrase=phrase):
             response_data = redis_completion_engine.search_json(phrase=phrase, limit=limit)
 
         # in case not search anything -> get data in hash table
@@ -1396,7 +1407,7 @@ def search_data_by_name_with_redis(prefix, phrase, limit):
 
         return True, response_data
     except redis.exceptions.RedisError:
-        sentry_client = ()
+        sentry_client = get_julo_sentry_client()
         sentry_client.captureException()
         return False, None
 
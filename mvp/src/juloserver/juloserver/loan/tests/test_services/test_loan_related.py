@@ -4073,7 +4073,7 @@ class TestLoanCreationWithFDCChecking(TestCase):
 
     @patch(
         'juloserver.loan.tasks.lender_related.fdc_inquiry_other_active_loans_from_platforms_task')
-    @patch('juloserver.fdc.clients.requests.get')
+    @patch('juloserver.julocore.http_transport.VendorSession.get')
     def test_fdc_inquiry_other_active_loans_from_platforms_task_failed_and_retry(
         self, mock_get_info_fdc_data_request, mock_fdc_inquiry_task):
         FDCActiveLoanChecking.objects.create(customer=self.customer)
@@ -4098,7 +4098,7 @@ class TestLoanCreationWithFDCChecking(TestCase):
     @patch('juloserver.loan.services.loan_related.get_info_active_loan_from_platforms')
     @patch(
         'juloserver.loan.tasks.lender_related.fdc_inquiry_other_active_loans_from_platforms_task')
-    @patch('juloserver.fdc.clients.requests.get')
+    @patch('juloserver.julocore.http_transport.VendorSession.get')
     def test_fdc_inquiry_other_from_platforms_task_failed_and_retry_max_times_and_ineligible(
         self, mock_get_info_fdc_data_request, mock_fdc_inquiry_task, mock_get_info_fdc):
         # will reject when the cusomter is still ineligible
@@ -4130,7 +4130,7 @@ class TestLoanCreationWithFDCChecking(TestCase):
     @patch('juloserver.loan.services.loan_related.get_info_active_loan_from_platforms')
     @patch(
         'juloserver.loan.tasks.lender_related.fdc_inquiry_other_active_loans_from_platforms_task')
-    @patch('juloserver.fdc.clients.requests.get')
+    @patch('juloserver.julocore.http_transport.VendorSession.get')
     def test_fdc_inquiry_other_from_platforms_task_failed_and_retry_max_times_and_eligible(
         self, mock_get_info_fdc_data_request, mock_fdc_inquiry_task, mock_get_info_fdc, mock_lender_approval_task):
         # will reject when the cusomter is still ineligible
@@ -11,6 +11,8 @@ import requests
 import json
 from juloserver.julo.services2 import get_redis_client
 from juloserver.julo.exceptions import JuloException
+from juloserver.julocore.constants import HttpVendor
+from juloserver.julocore.http_transport import get_http_session
 from datetime import timedelta, datetime
 
 from juloserver.minisquad.constants import (
@@ -225,6 +227,7 @@ class AIRudderPDSClient(object):
         self.api_key = api_key
         self.api_secret_key = api_secret_key
         self.base_url = base_url
+        self.session = get_http_session(HttpVendor.AI_RUDDER_PDS)
         self.token = self.__get_token_from_redis()
         self.logger = logging.getLogger(__name__)
 
@@ -242,7 +245,7 @@ class AIRudderPDSClient(object):
             'APPSecret': self.api_secret_key
         }
 
-        response = requests.post(auth_api, data=app_info)
+        response = self.session.post(auth_api, data=app_info)
         parsed_response = json.loads(response.text)
         self.logger.info({
             'action': 'refresh_token',
@@ -270,7 +273,7 @@ class AIRudderPDSClient(object):
                 'Authorization': 'Token ' + self.token,
                 'Content-Type': 'application/json'
             }
-            response = requests.request(
+            response = self.session.request(
                 method, url, headers=headers, **kwargs)
 
             if response.status_code == requests.codes.unauthorized:
@@ -21,6 +21,9 @@ class SquadNames(object):
 
 
 class RedisKey(object):
+    DIALER_UPLOAD_PENDING_PAGES = 'minisquad:dialer_upload_pending_pages:{}'
+    DIALER_UPLOAD_STATE = 'minisquad:dialer_upload_state:{}'
+    AI_RUDDER_CREATE_TASK_RATE_LIMIT = 'minisquad:ai_rudder_create_task'
     ASSIGNED_LOAN_IDS = 'minisquad:assigned_loan_ids'
     OLDEST_PAYMENT_IDS = 'minisquad:oldest_payment_ids'
     EXCLUDED_BUCKET_LEVEL_PAYMENT_IDS = 'minisquad:excluded_payment_ids'
@@ -291,6 +294,8 @@ class DialerTaskStatus(object):
     TRIGGER_SENT_BATCHING = 'trigger_sent_batch_{}'
     UPLOADING_PER_BATCH = 'uploading_pages_{}_retries_{}'
     UPLOADED_PER_BATCH = 'uploaded_pages_{}'
+    UPLOAD_FINISHED = 'upload_finished'
+    UPLOAD_FINISHED_WITH_FAILURE = 'upload_finished_with_{}_failed_pages'
     PROCESS_FAILED_ON_PROCESS_RETRYING = 'process_failed_on_process_retrying'
     BATCHING_PROCESS_FAILURE = 'batching_process_failure'
     FAILED_UPDATE_TASKS_ID = 'failed_update_tasks_id'
@@ -699,6 +704,8 @@ class FeatureNameConst(object):
     MANUAL_DC_AGENT_ASSIGNMENT = 'manual_dc_agent_assignment'
     KANGTAU_CUSTOMER_BUCKET_QUOTA = 'kangtau_customer_bucket_quota'
     PHYSICAL_WARNING_LETTER_BUCKET_B5_PLUS = 'physical_warning_letter_bucket_b5_plus'
+    AI_RUDDER_BULK_PAYLOAD_CONSTRUCTION = 'ai_rudder_bulk_payload_construction'
+    AI_RUDDER_CONCURRENT_UPLOAD = 'ai_rudder_concurrent_upload'
 
 
 class ExperimentConst(object):
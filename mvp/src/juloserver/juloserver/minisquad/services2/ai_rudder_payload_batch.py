@@ -0,0 +1,697 @@
+"""
+Set-based construction of AIRudderPayloadTemp rows.
+
+AIRudderPDSServices.construct_payload looks up the application, the account totals, the last
+PTP, the refinancing request and so on for every CollectionDialerTemporaryData row.
+AIRudderPayloadBatchBuilder loads the same data for a whole batch with a fixed number of queries
+and builds the payloads from in-memory dicts.
+"""
+import logging
+import re
+from collections import defaultdict
+from datetime import datetime
+
+from babel.dates import format_date
+from django.db import connection
+from django.db.models import Case, Max, Q, Sum, When
+
+from juloserver.account.constants import AccountLookupName
+from juloserver.account_payment.models import AccountPayment
+from juloserver.account_payment.services.account_payment_related import (
+    construct_unpaid_loan_account_detail,
+    get_potential_cashback_by_account_payment,
+)
+from juloserver.account_payment.services.earning_cashback import (
+    get_paramters_cashback_new_scheme,
+)
+from juloserver.apiv2.models import PdCollectionModelResult
+from juloserver.cashback.models import CashbackEarned
+from juloserver.julo.models import (
+    PTP,
+    Application,
+    FDCRiskyHistory,
+    Payment,
+    Skiptrace,
+)
+from juloserver.julo.partners import PartnerConstant
+from juloserver.julo.product_lines import ProductLineCodes
+from juloserver.julo.statuses import LoanStatusCodes, PaymentStatusCodes
+from juloserver.julo.utils import format_e164_indo_phone_number
+from juloserver.loan_refinancing.models import LoanRefinancingRequest
+from juloserver.loan_refinancing.services.customer_related import get_refinancing_status_display
+from juloserver.minisquad.constants import DialerSystemConst, ICARE_DEFAULT_ZIP_CODE
+from juloserver.minisquad.models import (
+    AIRudderPayloadTemp,
+    CollectionIneffectivePhoneNumber,
+    intelixBlacklist,
+)
+from juloserver.minisquad.services import get_bucket_status, get_other_numbers_to_pds
+from juloserver.minisquad.services2.dialer_related import extract_bucket_number
+from juloserver.moengage.models import MoengageCustomerInstallHistory
+
+logger = logging.getLogger(__name__)
+
+OLDEST_UNPAID_PAYMENT_EXCLUDED_LOAN_STATUSES = (
+    LoanStatusCodes.INACTIVE,
+    LoanStatusCodes.DRAFT,
+    LoanStatusCodes.PAID_OFF,
+    LoanStatusCodes.RENEGOTIATED,
+)
+
+
+def rank_b4_payloads_by_due_date_and_outstanding(bucket_name):
+    """
+    Same ranking as ordering the bucket by -tanggal_jatuh_tempo, -total_outstanding
+    and numbering the rows, done by the database in one statement.
+    """
+    db_table = AIRudderPayloadTemp._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            UPDATE {db_table} AS payload SET sort_order = ranked.sort_rank
+            FROM (
+                SELECT ai_rudder_payload_temp_id, ROW_NUMBER() OVER (
+                    ORDER BY tanggal_jatuh_tempo DESC, total_outstanding DESC,
+                    ai_rudder_payload_temp_id
+                ) AS sort_rank
+                FROM {db_table}
+                WHERE bucket_name = %s
+            ) AS ranked
+            WHERE payload.ai_rudder_payload_temp_id = ranked.ai_rudder_payload_temp_id
+            """.format(
+                db_table=db_table
+            ),
+            [bucket_name],
+        )
+        return cursor.rowcount
+
+
+class AIRudderPayloadBatchBuilder(object):
+    """
+    Build AIRudderPayloadTemp from CollectionDialerTemporaryData, one batch at a time.
+
+    load() runs the set-based queries for a batch, construct_payload() then works like
+    AIRudderPDSServices.construct_payload without any query for the common case. The
+    ineffective phone number side effects are collected and sent once per batch by flush().
+    Only rare or optional paths still query per row: refinancing requests, other numbers for
+    PDS, potential cashback of not yet due account payments and the B5/B6 active application.
+    """
+
+    def __init__(self, services, max_sent_other_number=0):
+        self.services = services
+        self.max_sent_other_number = max_sent_other_number
+        self.current_date = services.current_date
+        self._reset()
+
+    def _reset(self):
+        self.applications = {}
+        self.late_fees = {}
+        self.total_due_amounts = {}
+        self.total_outstandings = {}
+        self.last_paid_account_payments = {}
+        self.previous_paid_account_payments = defaultdict(list)
+        self.last_ptps = {}
+        self.loan_refinancing_requests = {}
+        self.refinancing_eligible_account_ids = set()
+        self.uninstall_indicators = {}
+        self.fdc_risky_histories = {}
+        self.risk_scores = {}
+        self.total_cashback_earned = {}
+        self.blacklisted_phone_numbers = defaultdict(set)
+        self.customer_skiptraces = defaultdict(list)
+        self.ineffective_phone_numbers = {}
+        self.unpaid_loan_details = {}
+        self.cashback_parameters = None
+
+        self.flagged_ineffective_ids = set()
+        self.refresh_skiptrace_ids = defaultdict(set)
+        self.record_skiptrace_ids = defaultdict(set)
+
+    def get_application_product_line(self, bucket_name, account):
+        if re.search(r'JTURBO', bucket_name):
+            return ProductLineCodes.TURBO
+
+        if account.account_lookup.name in [AccountLookupName.JULO1, AccountLookupName.JULOIOS]:
+            return ProductLineCodes.J1
+
+        return ProductLineCodes.TURBO
+
+    def load(self, populated_datas, load_ineffective_phone_numbers=False):
+        """
+        populated_datas is a list of CollectionDialerTemporaryData with account_payment,
+        account_payment__account, account_payment__account__account_lookup and customer
+        already selected.
+        """
+        from juloserver.waiver.services.account_related import (
+            get_refinancing_centralized_eligible_account_ids,
+        )
+
+        self._reset()
+        if not populated_datas:
+            return
+
+        account_payments = [item.account_payment for item in populated_datas]
+        account_payment_ids = [account_payment.id for account_payment in account_payments]
+        account_ids = {account_payment.account_id for account_payment in account_payments}
+        customer_ids = {item.customer_id for item in populated_datas}
+        account_customer_ids = {
+            account_payment.account.customer_id for account_payment in account_payments
+        }
+
+        for application in (
+            Application.objects.select_related('partner')
+            .filter(
+                customer_id__in=customer_ids,
+                product_line_id__in=[ProductLineCodes.J1, ProductLineCodes.TURBO],
+            )
+            .order_by('id')
+        ):
+            self.applications[(application.customer_id, application.product_line_id)] = application
+
+        for row in (
+            AccountPayment.objects.not_paid_active()
+            .filter(account_id__in=account_ids)
+            .values('account_id')
+            .annotate(total_late_fee=Sum('late_fee_amount'), paid_late_fee=Sum('paid_late_fee'))
+        ):
+            self.late_fees[row['account_id']] = (row['total_late_fee'] or 0) - (
+                row['paid_late_fee'] or 0
+            )
+
+        self.total_due_amounts = dict(
+            AccountPayment.objects.normal()
+            .not_paid_active()
+            .filter(account_id__in=account_ids, due_date__lte=self.current_date)
+            .values('account_id')
+            .annotate(total=Sum('due_amount'))
+            .values_list('account_id', 'total')
+        )
+        self.total_outstandings = dict(
+            AccountPayment.objects.normal()
+            .filter(account_id__in=account_ids, status_id__lte=PaymentStatusCodes.PAID_ON_TIME)
+            .values('account_id')
+            .annotate(total=Sum('due_amount'))
+            .values_list('account_id', 'total')
+        )
+
+        for account_id, paid_date, paid_amount in (
+            AccountPayment.objects.normal()
+            .filter(account_id__in=account_ids, paid_amount__gt=0)
+            .exclude(paid_date__isnull=True)
+            .order_by('account_id', '-paid_date', '-id')
+            .distinct('account_id')
+            .values_list('account_id', 'paid_date', 'paid_amount')
+        ):
+            self.last_paid_account_payments[account_id] = (paid_date, paid_amount)
+
+        for account_id, account_payment_id, paid_date, due_date in AccountPayment.objects.filter(
+            account_id__in=account_ids,
+            status_id__gt=PaymentStatusCodes.PAID_ON_TIME,
+            paid_date__isnull=False,
+        ).values_list('account_id', 'id', 'paid_date', 'due_date'):
+            self.previous_paid_account_payments[account_id].append(
+                (account_payment_id, paid_date, due_date)
+            )
+
+        self.last_ptps = {
+            ptp.account_payment_id: ptp
+            for ptp in PTP.objects.select_related('agent_assigned')
+            .filter(account_payment_id__in=account_payment_ids)
+            .order_by('account_payment_id', '-id')
+            .distinct('account_payment_id')
+        }
+
+        self.loan_refinancing_requests = {
+            loan_refinancing_request.account_id: loan_refinancing_request
+            for loan_refinancing_request in LoanRefinancingRequest.objects.filter(
+                account_id__in=account_ids
+            )
+            .order_by('account_id', '-id')
+            .distinct('account_id')
+        }
+        self.refinancing_eligible_account_ids = get_refinancing_centralized_eligible_account_ids(
+            account_ids
+        )
+
+        self.uninstall_indicators = dict(
+            MoengageCustomerInstallHistory.objects.filter(customer_id__in=customer_ids)
+            .order_by('customer_id', '-id')
+            .distinct('customer_id')
+            .values_list('customer_id', 'event_code')
+        )
+
+        application_ids = [application.id for application in self.applications.values()]
+        for application_id, is_fdc_risky, udate in (
+            FDCRiskyHistory.objects.filter(application_id__in=application_ids)
+            .order_by('application_id', '-id')
+            .distinct('application_id')
+            .values_list('application_id', 'is_fdc_risky', 'udate')
+        ):
+            self.fdc_risky_histories[application_id] = (is_fdc_risky, udate)
+
+        self.risk_scores = dict(
+            PdCollectionModelResult.objects.filter(account_payment_id__in=account_payment_ids)
+            .order_by('account_payment_id', '-id')
+            .distinct('account_payment_id')
+            .values_list('account_payment_id', 'segment_name')
+        )
+
+        self.total_cashback_earned = dict(
+            CashbackEarned.objects.filter(
+                verified=True, customerwallethistory__customer_id__in=account_customer_ids
+            )
+            .values('customerwallethistory__customer_id')
+            .annotate(total_current_balance=Sum('current_balance'))
+            .values_list('customerwallethistory__customer_id', 'total_current_balance')
+        )
+
+        for customer_id, phone_number in (
+            intelixBlacklist.objects.filter(skiptrace__customer_id__in=customer_ids)
+            .filter(Q(expire_date__gte=self.current_date) | Q(expire_date__isnull=True))
+            .values_list('skiptrace__customer_id', 'skiptrace__phone_number')
+        ):
+            self.blacklisted_phone_numbers[customer_id].add(
+                format_e164_indo_phone_number(phone_number)
+            )
+
+        if load_ineffective_phone_numbers:
+            self._load_ineffective_phone_numbers(customer_ids)
+
+        self._load_unpaid_loan_details(account_payment_ids)
+
+    def _load_ineffective_phone_numbers(self, customer_ids):
+        skiptrace_ids = []
+        for skiptrace_id, customer_id, phone_number in Skiptrace.objects.filter(
+            customer_id__in=customer_ids
+        ).values_list('pk', 'customer_id', 'phone_number'):
+            self.customer_skiptraces[customer_id].append((skiptrace_id, str(phone_number)))
+            skiptrace_ids.append(skiptrace_id)
+
+        for ineffective_id, skiptrace_id, ineffective_days in (
+            CollectionIneffectivePhoneNumber.objects.filter(
+                skiptrace_id__in=skiptrace_ids
+            ).values_list('pk', 'skiptrace_id', 'ineffective_days')
+        ):
+            self.ineffective_phone_numbers[skiptrace_id] = (ineffective_id, ineffective_days)
+
+    def _load_unpaid_loan_details(self, account_payment_ids):
+        payments = list(
+            Payment.objects.select_related('loan', 'loan__transaction_method')
+            .filter(account_payment_id__in=account_payment_ids)
+            .normal()
+            .order_by('account_payment_id', 'id')
+        )
+        loan_ids = {
+            payment.loan_id
+            for payment in payments
+            if payment.loan
+            and payment.loan.status not in OLDEST_UNPAID_PAYMENT_EXCLUDED_LOAN_STATUSES
+        }
+        if not loan_ids:
+            return
+
+        oldest_unpaid_payments = {
+            payment.loan_id: payment
+            for payment in Payment.objects.not_paid_active()
+            .filter(loan_id__in=loan_ids)
+            .order_by('loan_id', 'payment_number')
+            .distinct('loan_id')
+        }
+        loan_totals = {
+            row['loan_id']: row
+            for row in Payment.objects.filter(loan_id__in=loan_ids)
+            .values('loan_id')
+            .annotate(
+                total_installment_count=Max('payment_number'),
+                total_paid_amount=Sum('paid_amount'),
+            )
+        }
+        loan_outstandings = {
+            row['loan_id']: row
+            for row in Payment.objects.not_paid_active()
+            .filter(loan_id__in=loan_ids)
+            .values('loan_id')
+            .annotate(
+                total_due_amount=Sum('due_amount'),
+                overdue_unpaid_amount=Sum(
+                    Case(When(due_date__lte=self.current_date, then='due_amount'), default=0)
+                ),
+            )
+        }
+
+        counts = defaultdict(int)
+        for payment in payments:
+            oldest_unpaid_payment = oldest_unpaid_payments.get(payment.loan_id)
+            if not oldest_unpaid_payment or payment.loan_id not in loan_ids:
+                continue
+
+            loan_total = loan_totals.get(payment.loan_id, {})
+            loan_outstanding = loan_outstandings.get(payment.loan_id, {})
+            counts[payment.account_payment_id] += 1
+            self.unpaid_loan_details.setdefault(payment.account_payment_id, []).append(
+                construct_unpaid_loan_account_detail(
+                    counts[payment.account_payment_id],
+                    payment.loan,
+                    oldest_unpaid_payment,
+                    total_installment_count=loan_total.get('total_installment_count'),
+                    calculated_overdue_unpaid_amount=(
+                        loan_outstanding.get('overdue_unpaid_amount') or 0
+                    ),
+                    calculated_total_due_amount=loan_outstanding.get('total_due_amount') or 0,
+                    calculated_total_paid_amount=loan_total.get('total_paid_amount') or 0,
+                )
+            )
+
+    def get_eligible_phone_number_list(
+        self,
+        application,
+        populated_data,
+        ineffective_consecutive_days=0,
+        bucket_number=0,
+        ineffective_refresh_days=0,
+    ):
+        """Same result as AIRudderPDSServices.get_eligible_phone_number_list."""
+        mobile_phone_1 = populated_data.mobile_phone_1 or application.mobile_phone_1
+        phone_numbers = dict(
+            company_phone_number=format_e164_indo_phone_number(
+                str(application.company_phone_number or '')
+            ),
+            kin_mobile_phone=format_e164_indo_phone_number(str(application.kin_mobile_phone or '')),
+            spouse_mobile_phone=format_e164_indo_phone_number(
+                str(application.spouse_mobile_phone or '')
+            ),
+            mobile_phone_1=format_e164_indo_phone_number(str(mobile_phone_1 or '')),
+            mobile_phone_2=format_e164_indo_phone_number(str(application.mobile_phone_2 or '')),
+            phonenumber=format_e164_indo_phone_number(str(mobile_phone_1 or '')),
+        )
+        for blacklisted_phone_number in self.blacklisted_phone_numbers.get(
+            application.customer_id, ()
+        ):
+            for index in phone_numbers:
+                if phone_numbers[index] == blacklisted_phone_number:
+                    phone_numbers[index] = ''
+                    break
+
+        if not ineffective_consecutive_days or bucket_number < 1:
+            return phone_numbers, []
+
+        phone_number_list = set(phone_numbers.values())
+        skiptrace_dict = {
+            skiptrace_id: phone_number
+            for skiptrace_id, phone_number in self.customer_skiptraces.get(
+                application.customer_id, ()
+            )
+            if phone_number in phone_number_list
+        }
+        if ineffective_refresh_days:
+            self.refresh_skiptrace_ids[ineffective_refresh_days].update(skiptrace_dict)
+
+        ineffective_skiptrace_ids = []
+        for skiptrace_id in skiptrace_dict:
+            ineffective_id, ineffective_days = self.ineffective_phone_numbers.get(
+                skiptrace_id, (None, 0)
+            )
+            if ineffective_id and ineffective_days >= ineffective_consecutive_days:
+                self.flagged_ineffective_ids.add(ineffective_id)
+                ineffective_skiptrace_ids.append(skiptrace_id)
+
+        if not ineffective_skiptrace_ids:
+            return phone_numbers, []
+
+        self.record_skiptrace_ids[
+            (ineffective_refresh_days, ineffective_consecutive_days, bucket_number)
+        ].update(ineffective_skiptrace_ids)
+        ineffective_phone_numbers = [
+            skiptrace_dict[skiptrace_id] for skiptrace_id in ineffective_skiptrace_ids
+        ]
+        phone_number_filtered = {
+            key: '' if val in ineffective_phone_numbers else val
+            for key, val in phone_numbers.items()
+        }
+        phone_number = (
+            phone_number_filtered.get('mobile_phone_1')
+            or phone_number_filtered.get('mobile_phone_2')
+            or phone_number_filtered.get('spouse_mobile_phone')
+            or phone_number_filtered.get('company_phone_number')
+        )
+        phone_number_filtered.update(phonenumber=phone_number)
+        return phone_number_filtered, ineffective_phone_numbers
+
+    def flush(self):
+        """Send the ineffective phone number side effects collected by the batch."""
+        from juloserver.minisquad.tasks2.dialer_system_task import (
+            record_skiptrace_event_history_task,
+            reset_count_ineffective_phone_numbers_by_skiptrace_ids,
+        )
+
+        for ineffective_refresh_days, skiptrace_ids in self.refresh_skiptrace_ids.items():
+            reset_count_ineffective_phone_numbers_by_skiptrace_ids.delay(
+                list(skiptrace_ids), ineffective_refresh_days
+            )
+
+        if self.flagged_ineffective_ids:
+            CollectionIneffectivePhoneNumber.objects.filter(
+                pk__in=self.flagged_ineffective_ids,
+                flag_as_unreachable_date__isnull=True,
+            ).update(flag_as_unreachable_date=self.current_date)
+
+        for (
+            ineffective_refresh_days,
+            ineffective_consecutive_days,
+            bucket_number,
+        ), skiptrace_ids in self.record_skiptrace_ids.items():
+            record_skiptrace_event_history_task.delay(
+                list(skiptrace_ids),
+                ineffective_refresh_days,
+                ineffective_consecutive_days,
+                bucket_number,
+            )
+
+        self.refresh_skiptrace_ids = defaultdict(set)
+        self.flagged_ineffective_ids = set()
+        self.record_skiptrace_ids = defaultdict(set)
+
+    def get_customer_bucket_type(self, account_payment, dpd):
+        """Same result as AIRudderPDSServices.get_customer_bucket_type."""
+        if account_payment.is_paid and account_payment.status_id == PaymentStatusCodes.PAID_ON_TIME:
+            return 'NA'
+        if dpd <= 0 and not account_payment.is_paid:
+            return 'NA'
+        current_payment_bucket = get_bucket_status(dpd)
+        biggest_entered_bucket = 0
+        for previous_payment_id, paid_date, due_date in self.previous_paid_account_payments.get(
+            account_payment.account_id, ()
+        ):
+            if previous_payment_id >= account_payment.id:
+                continue
+            previous_bucket = get_bucket_status((paid_date - due_date).days)
+            if previous_bucket > biggest_entered_bucket:
+                biggest_entered_bucket = previous_bucket
+
+        if current_payment_bucket <= biggest_entered_bucket:
+            return 'Stabilized'
+
+        return 'Fresh'
+
+    def check_last_call_agent_and_status(self, account_payment):
+        ptp = self.last_ptps.get(account_payment.id)
+        if not ptp:
+            return '', ''
+
+        if ptp.ptp_date in [self.services.current_date, self.services.tommorow_date]:
+            agent = ptp.agent_assigned
+            return '' if not agent else agent.username, 'RPC-PTP'
+        elif ptp.ptp_date == self.services.yesterday:
+            agent = ptp.agent_assigned
+            return '' if not agent else agent.username, 'RPC-Broken PTP'
+
+        return '', ''
+
+    def get_loan_refinancing_data_for_dialer(self, account):
+        loan_refinancing = self.loan_refinancing_requests.get(account.id)
+        if not loan_refinancing:
+            return '', 0, ''
+
+        return (
+            get_refinancing_status_display(loan_refinancing),
+            loan_refinancing.last_prerequisite_amount,
+            loan_refinancing.expire_date,
+        )
+
+    def get_potential_cashback(self, account_payment, account):
+        if account_payment.due_date < self.current_date:
+            return 0
+
+        if self.cashback_parameters is None:
+            due_date, percentage_mapping = get_paramters_cashback_new_scheme()
+            self.cashback_parameters = dict(
+                due_date=due_date, percentage_mapping=percentage_mapping
+            )
+        potensi_cashback = get_potential_cashback_by_account_payment(
+            account_payment=account_payment,
+            cashback_counter=account.cashback_counter or 0,
+            cashback_parameters=dict(
+                self.cashback_parameters,
+                is_eligible_new_cashback=account.is_cashback_new_scheme,
+                account_status=account.status_id,
+            ),
+        )
+        if type(potensi_cashback) is tuple:
+            potensi_cashback = potensi_cashback[0]
+
+        return potensi_cashback
+
+    def construct_payload(
+        self,
+        populated_data,
+        bucket_name,
+        sorted_account=None,
+        is_jturbo_merge=False,
+        ineffective_consecutive_days=0,
+        ineffective_refresh_days=0,
+    ):
+        """
+        Same payload as AIRudderPDSServices.construct_payload for a
+        CollectionDialerTemporaryData, from the data of load().
+        """
+        account_payment = populated_data.account_payment
+        customer = populated_data.customer
+        account = account_payment.account
+
+        if bucket_name in (DialerSystemConst.DIALER_BUCKET_6_1, DialerSystemConst.DIALER_BUCKET_5):
+            application = account.get_active_application()
+        else:
+            product_line = self.get_application_product_line(bucket_name, account)
+            application = self.applications.get((customer.id, product_line))
+
+        zip_code = application.address_kodepos
+        if (
+            application.partner
+            and application.partner.name in PartnerConstant.ICARE_PARTNER
+            and not application.address_kodepos
+        ):
+            zip_code = ICARE_DEFAULT_ZIP_CODE
+
+        bucket_name_to_store = (
+            bucket_name.replace('JTURBO', 'JULO') if is_jturbo_merge else bucket_name
+        )
+
+        sort_order = populated_data.sort_order or sorted_account or None
+        dpd = populated_data.dpd
+        payload = AIRudderPayloadTemp(
+            account_payment_id=account_payment.id,
+            account_id=account_payment.account_id,
+            customer=customer,
+            nama_customer=populated_data.nama_customer,
+            nama_perusahaan=populated_data.nama_perusahaan,
+            posisi_karyawan=populated_data.posisi_karyawan,
+            nama_pasangan=populated_data.nama_pasangan,
+            nama_kerabat=populated_data.nama_kerabat,
+            hubungan_kerabat=populated_data.hubungan_kerabat,
+            jenis_kelamin=populated_data.jenis_kelamin,
+            tgl_lahir=populated_data.tgl_lahir,
+            tgl_gajian=populated_data.tgl_gajian,
+            tujuan_pinjaman=populated_data.tujuan_pinjaman,
+            tanggal_jatuh_tempo=populated_data.tanggal_jatuh_tempo,
+            alamat=populated_data.alamat,
+            kota=populated_data.kota,
+            dpd=populated_data.dpd,
+            partner_name=populated_data.partner_name,
+            sort_order=sort_order,
+            tgl_upload=datetime.strftime(self.current_date, "%Y-%m-%d"),
+            tipe_produk=populated_data.tipe_produk,
+            zip_code=zip_code,
+            bucket_name=bucket_name_to_store,
+            total_denda=abs(self.late_fees.get(account.id, 0)),
+            total_due_amount=self.total_due_amounts.get(account.id) or 0,
+            total_outstanding=self.total_outstandings.get(account.id) or 0,
+            angsuran_per_bulan=account_payment.due_amount,
+            va_indomaret=populated_data.va_indomaret,
+            va_alfamart=populated_data.va_alfamart,
+            va_maybank=populated_data.va_maybank,
+            va_permata=populated_data.va_permata,
+            va_bca=populated_data.va_bca,
+            va_mandiri=populated_data.va_mandiri,
+        )
+        is_bttc = 'bttc' in bucket_name_to_store.lower()
+        bucket_number = extract_bucket_number(bucket_name_to_store, is_bttc, populated_data.dpd)
+        phone_numbers, ineffective_phone_numbers = self.get_eligible_phone_number_list(
+            application,
+            populated_data,
+            ineffective_consecutive_days,
+            bucket_number=bucket_number,
+            ineffective_refresh_days=ineffective_refresh_days,
+        )
+        payload.phonenumber = phone_numbers['phonenumber']
+        payload.mobile_phone_1_2 = phone_numbers['mobile_phone_1']
+        payload.mobile_phone_1_3 = phone_numbers['mobile_phone_1']
+        payload.mobile_phone_1_4 = phone_numbers['mobile_phone_1']
+        payload.mobile_phone_2 = phone_numbers['mobile_phone_2']
+        payload.mobile_phone_2_2 = phone_numbers['mobile_phone_2']
+        payload.mobile_phone_2_3 = phone_numbers['mobile_phone_2']
+        payload.mobile_phone_2_4 = phone_numbers['mobile_phone_2']
+        payload.telp_perusahaan = phone_numbers['company_phone_number']
+        payload.no_telp_kerabat = ''
+        payload.no_telp_pasangan = phone_numbers['spouse_mobile_phone']
+
+        other_numbers = None
+        if self.max_sent_other_number:
+            other_numbers = get_other_numbers_to_pds(
+                account,
+                list(phone_numbers.values()),
+                self.max_sent_other_number,
+                ineffective_phone_numbers,
+            )
+            payload.other_numbers = other_numbers
+        if not phone_numbers['phonenumber']:
+            if not other_numbers:
+                raise Exception('all phone number indicated as ineffective')
+            else:
+                payload.phonenumber = other_numbers[0]
+
+        payload.last_pay_date, payload.last_pay_amount = self.last_paid_account_payments.get(
+            account.id, ("", 0)
+        )
+        payload.last_agent, payload.last_call_status = self.check_last_call_agent_and_status(
+            account_payment
+        )
+
+        (
+            refinancing_status,
+            refinancing_prerequisite_amount,
+            refinancing_expire_date,
+        ) = self.get_loan_refinancing_data_for_dialer(account)
+        bss_refinancing_status = ''
+        if account.id in self.refinancing_eligible_account_ids:
+            bss_refinancing_status = "Pinjaman BSS aktif - bisa ditawarkan R4"
+        payload.status_refinancing_lain = bss_refinancing_status
+        payload.refinancing_status = refinancing_status
+        payload.activation_amount = refinancing_prerequisite_amount
+        payload.program_expiry_date = refinancing_expire_date
+        payload.promo_untuk_customer = ''
+        payload.customer_bucket_type = self.get_customer_bucket_type(account_payment, dpd)
+        payload.uninstall_indicator = self.uninstall_indicators.get(customer.id, '-')
+
+        fdc_risky, fdc_risky_udate = None, '-'
+        fdc_risky_history = self.fdc_risky_histories.get(application.id)
+        if fdc_risky_history:
+            fdc_risky = fdc_risky_history[0]
+            fdc_risky_udate = format_date(fdc_risky_history[1], "d MMM yyyy", locale="id_ID")
+        payload.fdc_risky = {
+            True: "Yes {}".format(fdc_risky_udate),
+            False: "No {}".format(fdc_risky_udate),
+            None: "-",
+        }.get(fdc_risky, "-")
+
+        payload.risk_score = self.risk_scores.get(account_payment.id)
+        payload.potensi_cashback = self.get_potential_cashback(account_payment, account)
+        payload.total_seluruh_perolehan_cashback = (
+            self.total_cashback_earned.get(account.customer_id) or 0
+        )
+
+        unpaid_loan_details = self.unpaid_loan_details.get(account_payment.id)
+        payload.unpaid_loan_account_details = self.services.format_unpaid_loan_description_list_pds(
+            [{"attributes": unpaid_loan_details}] if unpaid_loan_details else []
+        )
+
+        return payload
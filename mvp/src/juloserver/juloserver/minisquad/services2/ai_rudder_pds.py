@@ -119,6 +119,10 @@ from juloserver.minisquad.services import (
 from juloserver.minisquad.services2.airudder import (
     airudder_construct_status_and_status_group,
 )
+from juloserver.minisquad.services2.ai_rudder_payload_batch import (
+    AIRudderPayloadBatchBuilder,
+    rank_b4_payloads_by_due_date_and_outstanding,
+)
 from juloserver.minisquad.services2.dialer_related import (
     get_populated_data_for_calling,
     get_uninstall_indicator_from_moengage_by_customer_id,
@@ -141,7 +145,7 @@ from juloserver.grab.models import (
 )
 from juloserver.julo.product_lines import ProductLineCodes
 from juloserver.minisquad.constants import ReasonNotSentToDialer
-from juloserver.minisquad.utils import get_feature_setting_parameters
+from juloserver.minisquad.utils import chunked, get_feature_setting_parameters
 from juloserver.omnichannel.services.utils import (
     get_omnichannel_comms_block_active,
     is_omnichannel_account,
@@ -1173,12 +1177,26 @@ class AIRudderPDSServices(object):
             'state': 'queried',
             'total_data': data_count
         })
-        populated_dialer_call_data = populated_dialer_call_data.select_related(
-            'account_payment', 'customer', 'account_payment__account'
-        ).prefetch_related(
-            'customer__application_set', 'account_payment__ptp_set',
-            'account_payment__account__accountpayment_set'
+        is_bulk_construction = (
+            FeatureSetting.objects.get_cached(
+                FeatureNameConst.AI_RUDDER_BULK_PAYLOAD_CONSTRUCTION, is_active=True
+            )
+            is not None
         )
+        if is_bulk_construction:
+            populated_dialer_call_data = populated_dialer_call_data.select_related(
+                'account_payment',
+                'customer',
+                'account_payment__account',
+                'account_payment__account__account_lookup',
+            )
+        else:
+            populated_dialer_call_data = populated_dialer_call_data.select_related(
+                'account_payment', 'customer', 'account_payment__account'
+            ).prefetch_related(
+                'customer__application_set', 'account_payment__ptp_set',
+                'account_payment__account__accountpayment_set'
+            )
         # bathing data creation prevent full memory
         batch_size = 500
         counter = 0
@@ -1261,10 +1279,24 @@ class AIRudderPDSServices(object):
         ).last()
 
         # check ineffective number
-        fs = FeatureSetting.objects.filter(
-            feature_name=FeatureNameConst.AI_RUDDER_TASKS_STRATEGY_CONFIG, is_active=True
-        ).last()
+        fs = FeatureSetting.objects.get_cached(
+            FeatureNameConst.AI_RUDDER_TASKS_STRATEGY_CONFIG, is_active=True
+        )
         params = fs.parameters if fs else {}
+        if is_bulk_construction:
+            processed_data_count = self.bulk_construct_data_for_dialer(
+                populated_dialer_call_data,
+                bucket_name,
+                batch_size,
+                group_bucket=group_bucket,
+                sorted_account_payment_dict=sorted_account_payment_dict,
+                is_merge_jturbo=is_merge_jturbo,
+                max_sent_other_number=max_sent_other_number,
+                strategy_params=params,
+                dialer_task=dialer_task,
+            )
+            # the payloads are already created, skip the per-row construction below
+            populated_dialer_call_data = populated_dialer_call_data.none()
         for item in populated_dialer_call_data:
             try:
                 bucket_name_for_construct = bucket_name
@@ -1344,15 +1376,8 @@ class AIRudderPDSServices(object):
 
         # update sort order for B3 and B4
         lower_bucket_name = bucket_name.lower()
-        if ('julo_b4' in lower_bucket_name) and populated_dialer_call_data:
-            payload_datas = AIRudderPayloadTemp.objects.filter(bucket_name=bucket_name).order_by(
-                '-tanggal_jatuh_tempo', '-total_outstanding'
-            )
-            sort_rank = 1
-            for payload_data in payload_datas:
-                payload_data.sort_order = sort_rank
-                sort_rank += 1
-            bulk_update(payload_datas, update_fields=['sort_order'], batch_size=500)
+        if ('julo_b4' in lower_bucket_name) and processed_data_count:
+            rank_b4_payloads_by_due_date_and_outstanding(bucket_name)
 
         if not processed_data_count:
             raise Exception("error when construct the data")
@@ -1364,6 +1389,103 @@ class AIRudderPDSServices(object):
         })
         return processed_data_count
 
+    def bulk_construct_data_for_dialer(
+        self,
+        populated_dialer_call_data,
+        bucket_name: str,
+        batch_size: int,
+        group_bucket: dict,
+        sorted_account_payment_dict: Optional[dict],
+        is_merge_jturbo: bool,
+        max_sent_other_number: int,
+        strategy_params: dict,
+        dialer_task: Optional[DialerTask],
+    ) -> int:
+        """
+        Same payloads as the construct_payload loop of process_construction_data_for_dialer,
+        with the lookups of every batch done by AIRudderPayloadBatchBuilder.
+        """
+        from juloserver.minisquad.tasks2 import write_not_sent_to_dialer_async
+
+        fn_name = 'bulk_construct_data_for_dialer'
+        payload_builder = AIRudderPayloadBatchBuilder(self, max_sent_other_number)
+        processed_data_count = 0
+        for items in chunked(populated_dialer_call_data.iterator(), batch_size):
+            construct_params = []
+            for item in items:
+                bucket_name_for_construct = bucket_name
+                group = group_bucket.get(item.account_payment.account.cycle_day, '')
+                if group:
+                    bucket_name_for_construct = bucket_name + '_' + group
+                param_per_bucket = strategy_params.get(bucket_name_for_construct, {})
+                construct_params.append(
+                    (
+                        bucket_name_for_construct,
+                        param_per_bucket.get('consecutive_days', 0),
+                        param_per_bucket.get('threshold_refresh_days')
+                        if param_per_bucket.get('is_ineffective_refresh', False)
+                        else 0,
+                    )
+                )
+
+            payload_builder.load(
+                items,
+                load_ineffective_phone_numbers=any(
+                    consecutive_days for _, consecutive_days, _ in construct_params
+                ),
+            )
+            payloads = []
+            for item, (bucket_name_for_construct, consecutive_days, refresh_days) in zip(
+                items, construct_params
+            ):
+                try:
+                    payloads.append(
+                        payload_builder.construct_payload(
+                            item,
+                            bucket_name_for_construct,
+                            sorted_account=(sorted_account_payment_dict or {}).get(
+                                item.account_payment_id
+                            ),
+                            is_jturbo_merge=is_merge_jturbo,
+                            ineffective_consecutive_days=consecutive_days,
+                            ineffective_refresh_days=refresh_days,
+                        )
+                    )
+                except Exception as e:
+                    if 'ineffective' in str(e):
+                        write_not_sent_to_dialer_async.delay(
+                            bucket_name=(
+                                bucket_name_for_construct.replace('JTURBO', 'JULO')
+                                if is_merge_jturbo
+                                else bucket_name_for_construct
+                            ),
+                            reason=ReasonNotSentToDialer.UNSENT_REASON[
+                                'INEFFECTIVE_PHONE_NUMBER'
+                            ].strip("'"),
+                            account_payment_ids=[item.account_payment_id],
+                            dialer_task_id=dialer_task.id,
+                        )
+                        continue
+                    get_julo_sentry_client().captureException()
+                    logger.error(
+                        {'action': fn_name, 'state': 'payload generation', 'error': str(e)}
+                    )
+
+            payload_builder.flush()
+            if payloads:
+                AIRudderPayloadTemp.objects.bulk_create(payloads)
+                processed_data_count += len(payloads)
+            logger.info(
+                {
+                    'action': fn_name,
+                    'bucket_name': bucket_name,
+                    'state': 'bulk_create',
+                    'counter': len(payloads),
+                }
+            )
+
+        return processed_data_count
+
     def get_group_name_by_bucket(self, bucket_name: str):
         group_name_mapping = {
             DialerSystemConst.DIALER_BUCKET_3: 'Group_Bucket3',
@@ -4173,6 +4295,9 @@ class AIRudderPDSServices(object):
 
     def get_unpaid_loan_description_list_pds(self, account_payment: AccountPayment):
         data = process_crm_unpaid_loan_account_details_list(account_payment)
+        return self.format_unpaid_loan_description_list_pds(data)
+
+    def format_unpaid_loan_description_list_pds(self, data):
         if not data:
             return ''
 
@@ -4224,9 +4349,9 @@ class AIRudderPDSServices(object):
                 'message': 'task start',
             }
         )
-        fs = FeatureSetting.objects.filter(
-            feature_name=FeatureNameConst.AI_RUDDER_TASKS_STRATEGY_CONFIG, is_active=True
-        ).last()
+        fs = FeatureSetting.objects.get_cached(
+            FeatureNameConst.AI_RUDDER_TASKS_STRATEGY_CONFIG, is_active=True
+        )
         params = fs.parameters if fs else {}
         if not fs or not params:
             logger.warning(
@@ -0,0 +1,140 @@
+"""
+Concurrent upload of AIRudderPayloadTemp pages to the dialer.
+
+The pages of a bucket used to be sent by one celery chain, so a slow or retried page held back
+every page after it. DialerUploadFanOut keeps the state of an upload in redis instead: the first
+pages are sent at once up to the concurrency limit, and every page that finishes (uploaded or
+failed for good) sends the next pending page. The page that finishes last triggers the
+completion callback, once.
+"""
+import json
+import logging
+import time
+from typing import List, Optional, Tuple
+
+from juloserver.julo.models import FeatureSetting
+from juloserver.julo.services2 import get_redis_client
+from juloserver.minisquad.constants import FeatureNameConst, RedisKey
+from juloserver.ratelimit.constants import RateLimitTimeUnit
+from juloserver.ratelimit.service import token_bucket_rate_limit
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_RATE_LIMIT_PER_MINUTE = 30
+UPLOAD_STATE_EXPIRE_SECONDS = 24 * 60 * 60
+
+
+def get_concurrent_upload_setting() -> Optional[dict]:
+    """
+    Return:
+        the parameters of the ai_rudder_concurrent_upload feature setting,
+        None when the pages should be sent by the serial chain
+    """
+    feature_setting = FeatureSetting.objects.get_cached(
+        FeatureNameConst.AI_RUDDER_CONCURRENT_UPLOAD, is_active=True
+    )
+    if not feature_setting:
+        return None
+
+    parameters = feature_setting.parameters or {}
+    return dict(
+        concurrency=parameters.get('concurrency', DEFAULT_CONCURRENCY),
+        rate_limit_per_minute=parameters.get(
+            'rate_limit_per_minute', DEFAULT_RATE_LIMIT_PER_MINUTE
+        ),
+    )
+
+
+def acquire_create_task_token(rate_limit_per_minute: int) -> Optional[int]:
+    """
+    Take one token of the AI Rudder create task quota, shared by every bucket.
+
+    Return:
+        None when the page can be sent now, otherwise the seconds to wait
+    """
+    is_rate_limited = token_bucket_rate_limit(
+        key_prefix=RedisKey.AI_RUDDER_CREATE_TASK_RATE_LIMIT,
+        max_count=rate_limit_per_minute,
+        time_unit=RateLimitTimeUnit.Minutes,
+    )
+    if not is_rate_limited:
+        return None
+
+    return max(1, int(60 / rate_limit_per_minute))
+
+
+class DialerUploadFanOut(object):
+    def __init__(self, dialer_task_id: int, redis_client=None):
+        self.dialer_task_id = dialer_task_id
+        self.redis_client = redis_client or get_redis_client()
+        self.pending_pages_key = RedisKey.DIALER_UPLOAD_PENDING_PAGES.format(dialer_task_id)
+        self.state_key = RedisKey.DIALER_UPLOAD_STATE.format(dialer_task_id)
+
+    def start(self, pages: List[Tuple[int, List[int]]], concurrency: int) -> List:
+        """
+        Store the state of the upload and the pages that have to wait for a free slot.
+
+        Arguments:
+            pages: list of (page_number, payload_ids)
+        Return:
+            the pages to send now
+        """
+        self.redis_client.delete_keys([self.pending_pages_key, self.state_key])
+        self.redis_client.hmset(
+            self.state_key,
+            dict(total=len(pages), finished=0, failed=0, started_at=time.time()),
+        )
+        self.redis_client.expire(self.state_key, UPLOAD_STATE_EXPIRE_SECONDS)
+
+        pending_pages = pages[concurrency:]
+        if pending_pages:
+            self.redis_client.rpush(
+                self.pending_pages_key, *[json.dumps(page) for page in pending_pages]
+            )
+            self.redis_client.expire(self.pending_pages_key, UPLOAD_STATE_EXPIRE_SECONDS)
+
+        return pages[:concurrency]
+
+    def pop_next_page(self) -> Optional[Tuple[int, List[int]]]:
+        page = self.redis_client.lpop(self.pending_pages_key)
+        if not page:
+            return None
+
+        page_number, payload_ids = json.loads(page)
+        return page_number, payload_ids
+
+    def finish_page(self, is_success: bool) -> bool:
+        """
+        Count one finished page.
+
+        Return:
+            True for the call that finishes the last page of the upload
+        """
+        pipeline = self.redis_client.pipeline()
+        pipeline.hincrby(self.state_key, 'finished', 1)
+        pipeline.hincrby(self.state_key, 'failed', 0 if is_success else 1)
+        pipeline.hget(self.state_key, 'total')
+        finished, _, total = pipeline.execute()
+        return total is not None and finished == int(total)
+
+    def get_summary(self) -> dict:
+        """
+        Return:
+            dict of total, failed and pages_per_minute of the upload
+        """
+        state = self.redis_client.hgetall(self.state_key)
+        if not state:
+            return {}
+
+        total = int(state['total'])
+        elapsed_minutes = max(time.time() - float(state['started_at']), 1) / 60
+        return dict(
+            total=total,
+            failed=int(state['failed']),
+            elapsed_minutes=round(elapsed_minutes, 2),
+            pages_per_minute=round(total / elapsed_minutes, 2),
+        )
+
+    def clear(self):
+        self.redis_client.delete_keys([self.pending_pages_key, self.state_key])
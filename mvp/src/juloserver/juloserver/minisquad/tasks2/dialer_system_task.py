@@ -158,6 +158,12 @@ from juloserver.minisquad.services2.dialer_related import (
     determine_julo_gold_customers,
     get_exclude_b5_ids_bucket_recovery_distribution,
 )
+from juloserver.minisquad.services2.dialer_upload import (
+    DEFAULT_RATE_LIMIT_PER_MINUTE,
+    DialerUploadFanOut,
+    acquire_create_task_token,
+    get_concurrent_upload_setting,
+)
 from juloserver.minisquad.utils import (
     validate_activate_feature_setting,
     validate_eligible_bucket_for_ai_rudder,
@@ -231,6 +237,7 @@ from juloserver.minisquad.utils import (
 from juloserver.apiv2.models import PdBTTCModelResult
 from dateutil import rrule
 from juloserver.julo.services2.experiment import get_experiment_setting_by_code
+from juloserver.julo.services2.feature_setting import invalidate_feature_setting_cache
 from itertools import cycle
 from django.contrib.auth.models import User
 from juloserver.streamlined_communication.models import Holiday
@@ -2505,20 +2512,11 @@ def batch_data_per_bucket_for_send_to_dialer(
 
         split_into = math.ceil(len(ai_rudder_payload_ids) / split_threshold)
         batched_payload_ids = np.array_split(ai_rudder_payload_ids, split_into)
-        index_page_number = 1
-        total_page = len(batched_payload_ids)
         record_history_dialer_task_event(
             dict(dialer_task=dialer_task, status=DialerTaskStatus.BATCHING_PROCESS,
                  data_count=split_into))
-        task_list = []
-        for index in range(0, total_page):
-            task_list.append(send_data_to_dialer.si(
-                bucket_name=bucket_name, page_number=index_page_number,
-                payload_ids=batched_payload_ids[index].tolist(),
-                is_mandatory_to_alert=is_mandatory_to_alert, dialer_task_id=dialer_task_id))
-            index_page_number += 1
-        task_list = tuple(task_list)
-        chain(task_list).apply_async()
+        dispatch_send_data_to_dialer(
+            bucket_name, batched_payload_ids, is_mandatory_to_alert, dialer_task_id)
         record_history_dialer_task_event(
             dict(dialer_task=dialer_task, status=DialerTaskStatus.BATCHING_PROCESSED,
                  data_count=split_into))
@@ -2667,20 +2665,11 @@ def batch_data_per_bucket_for_send_to_dialer_t0(
         ai_rudder_payload_ids = [item[0] for item in payload_need_to_sent]
         split_into = math.ceil(len(ai_rudder_payload_ids) / split_threshold)
         batched_payload_ids = np.array_split(ai_rudder_payload_ids, split_into)
-        index_page_number = 1
-        total_page = len(batched_payload_ids)
         record_history_dialer_task_event(
             dict(dialer_task=dialer_task, status=DialerTaskStatus.BATCHING_PROCESS,
                  data_count=split_into))
-        task_list = []
-        for index in range(0, total_page):
-            task_list.append(send_data_to_dialer.si(
-                bucket_name=bucket_name, page_number=index_page_number,
-                payload_ids=batched_payload_ids[index].tolist(),
-                is_mandatory_to_alert=is_mandatory_to_alert, dialer_task_id=dialer_task_id))
-            index_page_number += 1
-        task_list = tuple(task_list)
-        chain(task_list).apply_async()
+        dispatch_send_data_to_dialer(
+            bucket_name, batched_payload_ids, is_mandatory_to_alert, dialer_task_id)
         record_history_dialer_task_event(
             dict(dialer_task=dialer_task, status=DialerTaskStatus.BATCHING_PROCESSED,
                  data_count=split_into))
@@ -2825,6 +2814,162 @@ def send_data_to_dialer(
     return
 
 
+def dispatch_send_data_to_dialer(
+        bucket_name, batched_payload_ids, is_mandatory_to_alert, dialer_task_id):
+    """
+    Send the pages of a bucket by one serial chain, or concurrently with
+    send_data_to_dialer_page when ai_rudder_concurrent_upload is active.
+    """
+    concurrent_upload_setting = get_concurrent_upload_setting()
+    if not concurrent_upload_setting:
+        task_list = []
+        for index, payload_ids in enumerate(batched_payload_ids):
+            task_list.append(send_data_to_dialer.si(
+                bucket_name=bucket_name, page_number=index + 1,
+                payload_ids=payload_ids.tolist(),
+                is_mandatory_to_alert=is_mandatory_to_alert, dialer_task_id=dialer_task_id))
+        chain(tuple(task_list)).apply_async()
+        return
+
+    pages = [
+        (index + 1, payload_ids.tolist()) for index, payload_ids in enumerate(batched_payload_ids)
+    ]
+    fan_out = DialerUploadFanOut(dialer_task_id)
+    for page_number, payload_ids in fan_out.start(
+            pages, concurrent_upload_setting['concurrency']):
+        send_data_to_dialer_page.delay(
+            bucket_name=bucket_name, page_number=page_number, payload_ids=payload_ids,
+            is_mandatory_to_alert=is_mandatory_to_alert, dialer_task_id=dialer_task_id)
+
+
+@task(queue="collection_dialer_high")
+def send_data_to_dialer_page(
+        bucket_name, page_number, payload_ids, is_mandatory_to_alert, dialer_task_id, attempt=0
+):
+    """
+    Upload one page of a concurrent dialer upload. The page waits for the AI Rudder create task
+    quota and is retried on its own, so the other pages of the bucket are not held back.
+    Not gated by validate_activate_feature_setting, a page that silently returns would
+    never finish the upload.
+    """
+    fn_name = 'send_data_to_dialer_page_{}'.format(bucket_name)
+    page_kwargs = dict(
+        bucket_name=bucket_name, page_number=page_number, payload_ids=payload_ids,
+        is_mandatory_to_alert=is_mandatory_to_alert, dialer_task_id=dialer_task_id)
+    dialer_task = DialerTask.objects.filter(pk=dialer_task_id).last()
+    if not dialer_task:
+        logger.error({
+            'action': fn_name,
+            'identifier': bucket_name,
+            'info': "there's no dialer task data for id {}".format(dialer_task_id)
+        })
+        return
+
+    concurrent_upload_setting = get_concurrent_upload_setting() or {}
+    wait_seconds = acquire_create_task_token(
+        concurrent_upload_setting.get('rate_limit_per_minute', DEFAULT_RATE_LIMIT_PER_MINUTE))
+    if wait_seconds:
+        send_data_to_dialer_page.apply_async(
+            kwargs=dict(page_kwargs, attempt=attempt), countdown=wait_seconds)
+        return
+
+    record_history_dialer_task_event(
+        dict(
+            dialer_task=dialer_task,
+            status=DialerTaskStatus.UPLOADING_PER_BATCH.format(page_number, attempt),
+        ),
+        is_update_status_for_dialer_task=False,
+    )
+    services = AIRudderPDSServices()
+    is_success = True
+    try:
+        task_id, account_payment_ids = services.create_new_task(
+            bucket_name, ai_rudder_payload_ids=payload_ids, page_number=page_number)
+        write_log_for_report_async.delay(
+            bucket_name=bucket_name,
+            task_id=task_id,
+            account_payment_ids=list(account_payment_ids),
+            dialer_task_id=dialer_task_id,
+        )
+        record_history_dialer_task_event(
+            dict(dialer_task=dialer_task,
+                 status=DialerTaskStatus.UPLOADED_PER_BATCH.format(page_number),),
+            is_update_status_for_dialer_task=False)
+    except Exception as error:
+        if attempt < send_data_to_dialer.max_retries:
+            record_history_dialer_task_event(
+                dict(dialer_task=dialer_task,
+                     status=DialerTaskStatus.PROCESS_FAILED_ON_PROCESS_RETRYING,
+                     error=str(error)
+                     ),
+                error_message=str(error), is_update_status_for_dialer_task=False
+            )
+            send_data_to_dialer_page.apply_async(
+                kwargs=dict(page_kwargs, attempt=attempt + 1), countdown=300)
+            return
+
+        record_history_dialer_task_event(
+            dict(dialer_task=dialer_task,
+                 status=DialerTaskStatus.FAILURE_BATCH.format(page_number),
+                 error=str(error)
+                 ),
+            is_update_status_for_dialer_task=False,
+        )
+        if is_mandatory_to_alert:
+            get_julo_sentry_client().captureException()
+        is_success = False
+
+    fan_out = DialerUploadFanOut(dialer_task_id)
+    is_last_page = fan_out.finish_page(is_success)
+    next_page = fan_out.pop_next_page()
+    if next_page:
+        next_page_number, next_payload_ids = next_page
+        send_data_to_dialer_page.delay(
+            bucket_name=bucket_name, page_number=next_page_number,
+            payload_ids=next_payload_ids, is_mandatory_to_alert=is_mandatory_to_alert,
+            dialer_task_id=dialer_task_id)
+    if is_last_page:
+        finish_send_data_to_dialer.delay(bucket_name=bucket_name, dialer_task_id=dialer_task_id)
+
+    logger.info({
+        'action': fn_name,
+        'state': 'finish',
+        'page_number': page_number,
+        'is_success': is_success,
+        'attempt': attempt,
+    })
+
+
+@task(queue="collection_dialer_high")
+def finish_send_data_to_dialer(bucket_name, dialer_task_id):
+    """
+    Completion callback of a concurrent dialer upload,
+    sent once by the page that finishes last.
+    """
+    fan_out = DialerUploadFanOut(dialer_task_id)
+    summary = fan_out.get_summary()
+    fan_out.clear()
+    dialer_task = DialerTask.objects.filter(pk=dialer_task_id).last()
+    if not dialer_task or not summary:
+        return
+
+    status = DialerTaskStatus.UPLOAD_FINISHED
+    if summary['failed']:
+        status = DialerTaskStatus.UPLOAD_FINISHED_WITH_FAILURE.format(summary['failed'])
+    record_history_dialer_task_event(
+        dict(dialer_task=dialer_task, status=status,
+             data_count=summary['total'] - summary['failed']))
+    logger.info({
+        'action': 'finish_send_data_to_dialer',
+        'identifier': bucket_name,
+        'dialer_task_id': dialer_task_id,
+        'total_page': summary['total'],
+        'failed_page': summary['failed'],
+        'elapsed_minutes': summary['elapsed_minutes'],
+        'pages_per_minute': summary['pages_per_minute'],
+    })
+
+
 @task(queue="collection_dialer_high")
 def update_task_id_sent_to_dialer(
         bucket_name, page_number, account_payment_ids, third_party_task_id,
@@ -4083,6 +4228,8 @@ def process_retroload_sent_to_dialer(feature_setting_params=None):
             FeatureSetting.objects.filter(
                 feature_name=FeatureNameConst.SENT_TO_DIALER_RETROLOAD
             ).update(is_active=False)
+            # update() sends no post_save, the cached copies are dropped here
+            execute_after_transaction_safely(invalidate_feature_setting_cache)
             return
 
         services = AIRudderPDSServices()
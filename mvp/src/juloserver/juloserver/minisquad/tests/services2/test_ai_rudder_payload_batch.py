@@ -0,0 +1,114 @@
+from datetime import date, timedelta
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from juloserver.account.constants import AccountLookupName
+from juloserver.account.tests.factories import AccountFactory, AccountLookupFactory
+from juloserver.account_payment.tests.factories import AccountPaymentFactory
+from juloserver.julo.statuses import PaymentStatusCodes
+from juloserver.julo.tests.factories import ApplicationJ1Factory, CustomerFactory
+from juloserver.minisquad.constants import DialerSystemConst
+from juloserver.minisquad.models import CollectionDialerTemporaryData
+from juloserver.minisquad.services2.ai_rudder_payload_batch import AIRudderPayloadBatchBuilder
+from juloserver.minisquad.services2.ai_rudder_pds import AIRudderPDSServices
+from juloserver.minisquad.tests.factories import CollectionDialerTemporaryDataFactory
+
+
+@mock.patch('juloserver.minisquad.services2.ai_rudder_pds.get_julo_ai_rudder_pds_client')
+class TestAIRudderPayloadBatchBuilder(TestCase):
+    def setUp(self):
+        self.bucket_name = DialerSystemConst.DIALER_BUCKET_3
+        self.account_lookup = AccountLookupFactory(name=AccountLookupName.JULO1)
+
+    def create_populated_data(self, count):
+        for _ in range(count):
+            customer = CustomerFactory()
+            account = AccountFactory(customer=customer, account_lookup=self.account_lookup)
+            ApplicationJ1Factory(
+                customer=customer, account=account, mobile_phone_1='081234567890'
+            )
+            account_payment = AccountPaymentFactory(
+                account=account,
+                due_date=date.today() - timedelta(days=45),
+                status_id=PaymentStatusCodes.PAYMENT_30DPD,
+            )
+            CollectionDialerTemporaryDataFactory(
+                customer=customer,
+                account_payment=account_payment,
+                team=self.bucket_name,
+                dpd=45,
+            )
+
+    def get_populated_data(self):
+        return list(
+            CollectionDialerTemporaryData.objects.select_related(
+                'account_payment',
+                'customer',
+                'account_payment__account',
+                'account_payment__account__account_lookup',
+            ).filter(team=self.bucket_name)
+        )
+
+    def construct_payloads(self, populated_datas):
+        payload_builder = AIRudderPayloadBatchBuilder(AIRudderPDSServices())
+        with CaptureQueriesContext(connection) as queries:
+            payload_builder.load(populated_datas)
+            payloads = [
+                payload_builder.construct_payload(item, self.bucket_name)
+                for item in populated_datas
+            ]
+        return payloads, len(queries)
+
+    def test_query_count_does_not_grow_with_batch_size(self, _):
+        self.create_populated_data(2)
+        payloads, small_batch_query_count = self.construct_payloads(self.get_populated_data())
+        self.assertEqual(len(payloads), 2)
+
+        self.create_populated_data(8)
+        payloads, large_batch_query_count = self.construct_payloads(self.get_populated_data())
+        self.assertEqual(len(payloads), 10)
+
+        self.assertEqual(small_batch_query_count, large_batch_query_count)
+
+    def test_same_payload_as_construct_payload(self, _):
+        self.create_populated_data(1)
+        populated_data = self.get_populated_data()[0]
+
+        payloads, _ = self.construct_payloads([populated_data])
+        payload = payloads[0]
+        expected_payload = AIRudderPDSServices().construct_payload(
+            populated_data, self.bucket_name
+        )
+
+        for field in (
+            'account_payment_id',
+            'account_id',
+            'customer_id',
+            'bucket_name',
+            'dpd',
+            'total_denda',
+            'total_due_amount',
+            'total_outstanding',
+            'angsuran_per_bulan',
+            'phonenumber',
+            'mobile_phone_1_2',
+            'last_pay_date',
+            'last_pay_amount',
+            'last_agent',
+            'last_call_status',
+            'refinancing_status',
+            'status_refinancing_lain',
+            'customer_bucket_type',
+            'uninstall_indicator',
+            'fdc_risky',
+            'risk_score',
+            'potensi_cashback',
+            'total_seluruh_perolehan_cashback',
+            'unpaid_loan_account_details',
+        ):
+            self.assertEqual(
+                getattr(payload, field), getattr(expected_payload, field), field
+            )
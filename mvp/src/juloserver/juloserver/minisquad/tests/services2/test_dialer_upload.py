@@ -0,0 +1,38 @@
+from django.test import TestCase
+
+from juloserver.julo.services2.redis_helper import MockRedisHelper
+from juloserver.minisquad.services2.dialer_upload import DialerUploadFanOut
+
+
+class TestDialerUploadFanOut(TestCase):
+    def setUp(self):
+        self.fan_out = DialerUploadFanOut(1, redis_client=MockRedisHelper())
+        self.pages = [(page_number, [page_number * 10]) for page_number in range(1, 6)]
+
+    def test_start_sends_pages_up_to_concurrency(self):
+        pages_to_send = self.fan_out.start(self.pages, 2)
+        self.assertEqual(pages_to_send, self.pages[:2])
+
+        self.assertEqual(self.fan_out.pop_next_page(), (3, [30]))
+        self.assertEqual(self.fan_out.pop_next_page(), (4, [40]))
+        self.assertEqual(self.fan_out.pop_next_page(), (5, [50]))
+        self.assertIsNone(self.fan_out.pop_next_page())
+
+    def test_only_last_finished_page_completes_upload(self):
+        self.fan_out.start(self.pages, 2)
+
+        is_last_pages = [self.fan_out.finish_page(is_success=True) for _ in range(4)]
+        self.assertEqual(is_last_pages, [False] * 4)
+        self.assertTrue(self.fan_out.finish_page(is_success=False))
+
+        summary = self.fan_out.get_summary()
+        self.assertEqual(summary['total'], 5)
+        self.assertEqual(summary['failed'], 1)
+        self.assertGreater(summary['pages_per_minute'], 0)
+
+    def test_clear(self):
+        self.fan_out.start(self.pages, 2)
+        self.fan_out.clear()
+
+        self.assertIsNone(self.fan_out.pop_next_page())
+        self.assertEqual(self.fan_out.get_summary(), {})
@@ -10,12 +10,13 @@ import json
 from django.conf import settings
 from requests.auth import HTTPBasicAuth
 from juloserver.moengage.exceptions import MoengageApiError
+from juloserver.julocore.constants import HttpVendor
+from juloserver.julocore.http_transport import get_http_session
 from juloserver.moengage.constants import MAX_RETRY, MAX_RETRY_FOR_TIMEOUT
 
 
 logger = logging.getLogger(__name__)
 
-
 def get_julo_moengage_client():
     return MoEngageClient(
         settings.MOENGAGE_API_ID,
@@ -25,10 +26,11 @@ def get_julo_moengage_client():
 
 
 class MoEngageClient(object):
-    def __init__(self, data_api_id, data_api_key, api_base_url):
+    def __init__(self, data_api_id, data_api_key, api_base_url, session=None):
         self.data_api_id = data_api_id
         self.data_api_key = data_api_key
         self.api_base_url = api_base_url
+        self.session = session or get_http_session(HttpVendor.MOENGAGE)
 
     def send_event(self, elements, retry_count=0, timeout_retry_count=0):
         headers = {
@@ -59,7 +61,7 @@ class MoEngageClient(object):
         })
 
         try:
-            response = requests.post(
+            response = self.session.post(
                 url, auth=HTTPBasicAuth(self.data_api_id, self.data_api_key),
                 headers=headers, json=data, timeout=60)
 
@@ -0,0 +1,102 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand
+from django.db import router, transaction
+
+from juloserver.account.models import Account
+from juloserver.moengage.clients import MoEngageClient
+from juloserver.moengage.constants import MAX_EVENT, MoengageTaskStatus
+from juloserver.moengage.models import MoengageUpload, MoengageUploadBatch
+from juloserver.moengage.services.daily_attribute_sync import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_MAX_WORKERS,
+    MoengageDailyAttributeSync,
+)
+
+
+def get_stub_handler(latency_seconds):
+    class MoengageStubHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            time.sleep(latency_seconds)
+            body = json.dumps({'status': MoengageTaskStatus.SUCCESS}).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return MoengageStubHandler
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark the daily MoEngage attribute sync in customers per second against a local '
+        'stub of the MoEngage endpoint. Every MoengageUpload row is rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--customers', type=int, default=1000)
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument('--max-workers', type=int, default=DEFAULT_MAX_WORKERS)
+        parser.add_argument('--latency-ms', type=int, default=200)
+
+    def handle(self, *args, **options):
+        server = ThreadingHTTPServer(
+            ('127.0.0.1', 0), get_stub_handler(options['latency_ms'] / 1000.0)
+        )
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        moengage_client = MoEngageClient(
+            'benchmark', 'benchmark', 'http://127.0.0.1:{}/'.format(server.server_port)
+        )
+        customer_ids = list(
+            Account.objects.distinct()
+            .values_list('customer_id', flat=True)[: options['customers']]
+        )
+
+        try:
+            for name, batch_size, max_workers in (
+                ('serial', MAX_EVENT, 1),
+                ('streaming', options['batch_size'], options['max_workers']),
+            ):
+                summary = self.run_sync(
+                    customer_ids, options['chunk_size'], batch_size, max_workers, moengage_client
+                )
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        '{}: batch_size={} max_workers={} {} customers, '
+                        '{} customers/s'.format(
+                            name,
+                            batch_size,
+                            max_workers,
+                            summary['sent_count'] + summary['failed_count'],
+                            summary['customers_per_second'],
+                        )
+                    )
+                )
+        finally:
+            server.shutdown()
+
+    def run_sync(self, customer_ids, chunk_size, batch_size, max_workers, moengage_client):
+        using = router.db_for_write(MoengageUpload)
+        with transaction.atomic(using=using):
+            moengage_upload_batch = MoengageUploadBatch.objects.create(
+                type='benchmark', data_count=len(customer_ids)
+            )
+            summary = MoengageDailyAttributeSync(
+                moengage_upload_batch.id,
+                batch_size=batch_size,
+                max_workers=max_workers,
+                moengage_client=moengage_client,
+            ).run(customer_ids, chunk_size=chunk_size)
+            transaction.set_rollback(True, using=using)
+
+        return summary
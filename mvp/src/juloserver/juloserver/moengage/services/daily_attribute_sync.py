@@ -0,0 +1,180 @@
+"""
+Streaming pipeline for the daily customer attribute sync to MoEngage.
+
+The customers of a task are read in chunks. For every chunk the MoengageUpload rows are
+bulk created and the attributes are constructed, then the chunk is cut into batches that are
+posted to MoEngage from a bounded thread pool over the shared MoEngage session. The threads
+only do HTTP, the status of every batch is written back by the calling thread with one UPDATE.
+"""
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.utils import timezone
+
+from juloserver.julo.clients import get_julo_sentry_client
+from juloserver.julo.constants import FeatureNameConst
+from juloserver.julo.models import Customer, FeatureSetting
+from juloserver.moengage.clients import get_julo_moengage_client
+from juloserver.moengage.constants import MoengageEventType, MoengageTaskStatus
+from juloserver.moengage.models import MoengageUpload
+from juloserver.moengage.services.data_constructors import (
+    construct_user_attributes_for_realtime_basis,
+)
+from juloserver.moengage.utils import chunks
+from juloserver.streamlined_communication.models import Holiday
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1000
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_MAX_WORKERS = 4
+
+
+def get_daily_attribute_sync_setting():
+    """
+    Return:
+        dict of chunk_size, batch_size and max_workers when the streaming sync is enabled,
+        None otherwise
+    """
+    feature_setting = FeatureSetting.objects.get_cached(
+        FeatureNameConst.MOENGAGE_DAILY_ATTRIBUTE_SYNC, is_active=True
+    )
+    if not feature_setting:
+        return None
+
+    parameters = feature_setting.parameters or {}
+    return dict(
+        chunk_size=parameters.get('chunk_size', DEFAULT_CHUNK_SIZE),
+        batch_size=parameters.get('batch_size', DEFAULT_BATCH_SIZE),
+        max_workers=parameters.get('max_workers', DEFAULT_MAX_WORKERS),
+    )
+
+
+def update_moengage_upload_statuses(moengage_upload_ids, status, error, time_sent):
+    """Same fields as MoengageUpload.update_safely, for every upload in one UPDATE."""
+    fields_to_update = dict(status=status, time_sent=time_sent, udate=timezone.now())
+    if status != MoengageTaskStatus.SUCCESS:
+        fields_to_update['error'] = error
+
+    return MoengageUpload.objects.filter(id__in=moengage_upload_ids).update(**fields_to_update)
+
+
+class MoengageDailyAttributeSync(object):
+    def __init__(
+        self,
+        moengage_upload_batch_id,
+        batch_size=DEFAULT_BATCH_SIZE,
+        max_workers=DEFAULT_MAX_WORKERS,
+        moengage_client=None,
+    ):
+        self.moengage_upload_batch_id = moengage_upload_batch_id
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.moengage_client = moengage_client or get_julo_moengage_client()
+        self.is_religious_holiday = Holiday.check_is_religious_holiday()
+        self.sent_count = 0
+        self.failed_count = 0
+
+    def run(self, customer_ids, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Send the attributes of every customer, with at most max_workers batches in flight.
+
+        Return:
+            dict of the sent and failed customer count and the customers per second
+        """
+        start = time.time()
+        futures = set()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for customer_id_chunk in chunks(list(customer_ids), chunk_size):
+                for moengage_upload_ids, data_to_send in self.construct_batches(
+                    customer_id_chunk
+                ):
+                    if len(futures) >= self.max_workers:
+                        done, futures = wait(futures, return_when=FIRST_COMPLETED)
+                        self.record_results(done)
+                    futures.add(
+                        executor.submit(self.send_batch, moengage_upload_ids, data_to_send)
+                    )
+
+            self.record_results(wait(futures).done)
+
+        elapsed = max(time.time() - start, 0.001)
+        summary = dict(
+            sent_count=self.sent_count,
+            failed_count=self.failed_count,
+            customers_per_second=round((self.sent_count + self.failed_count) / elapsed, 2),
+        )
+        logger.info(
+            {
+                'action': 'moengage_daily_attribute_sync',
+                'moengage_upload_batch_id': self.moengage_upload_batch_id,
+                **summary,
+            }
+        )
+        return summary
+
+    def construct_batches(self, customer_ids):
+        """
+        Yield (moengage_upload_ids, data_to_send) of at most batch_size customers.
+        A customer whose attributes can not be constructed is marked construct_data_failed
+        and left out of the batch, like exception_captured does.
+        """
+        customers = Customer.objects.in_bulk(customer_ids)
+        moengage_uploads = MoengageUpload.objects.bulk_create(
+            [
+                MoengageUpload(
+                    type=MoengageEventType.REALTIME_BASIS,
+                    customer_id=customer_id,
+                    moengage_upload_batch_id=self.moengage_upload_batch_id,
+                )
+                for customer_id in customer_ids
+                if customer_id in customers
+            ]
+        )
+
+        moengage_upload_ids = []
+        data_to_send = []
+        for moengage_upload in moengage_uploads:
+            try:
+                user_attributes = construct_user_attributes_for_realtime_basis(
+                    customers[moengage_upload.customer_id],
+                    daily_update=True,
+                    is_religious_holiday=self.is_religious_holiday,
+                )
+            except Exception as e:
+                MoengageUpload.objects.filter(id=moengage_upload.id).update(
+                    status='construct_data_failed',
+                    error="%s: %s" % (type(e).__name__, str(e)),
+                )
+                get_julo_sentry_client().captureException()
+                self.failed_count += 1
+                continue
+
+            moengage_upload_ids.append(moengage_upload.id)
+            data_to_send.append(user_attributes)
+            if len(data_to_send) >= self.batch_size:
+                yield moengage_upload_ids, data_to_send
+                moengage_upload_ids, data_to_send = [], []
+
+        if data_to_send:
+            yield moengage_upload_ids, data_to_send
+
+    def send_batch(self, moengage_upload_ids, data_to_send):
+        """Runs in the thread pool, so no database access here."""
+        time_sent = timezone.localtime(timezone.now())
+        try:
+            response = self.moengage_client.send_event(data_to_send)
+        except Exception as e:
+            return moengage_upload_ids, MoengageTaskStatus.FAILURE, str(e), time_sent
+
+        return moengage_upload_ids, response.get('status'), response.get('error'), time_sent
+
+    def record_results(self, futures):
+        for future in futures:
+            moengage_upload_ids, status, error, time_sent = future.result()
+            update_moengage_upload_statuses(moengage_upload_ids, status, error, time_sent)
+            if status == MoengageTaskStatus.SUCCESS:
+                self.sent_count += len(moengage_upload_ids)
+            else:
+                self.failed_count += len(moengage_upload_ids)
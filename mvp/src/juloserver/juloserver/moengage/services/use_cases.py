@@ -25,6 +25,11 @@ from juloserver.julo.exceptions import JuloException
 from juloserver.qris.models import QrisPartnerLinkage
 from ..models import (MoengageUpload, MoengageUploadBatch)
 from juloserver.moengage.clients import get_julo_moengage_client
+from juloserver.moengage.services.daily_attribute_sync import (
+    MoengageDailyAttributeSync,
+    get_daily_attribute_sync_setting,
+    update_moengage_upload_statuses,
+)
 from juloserver.moengage.utils import (
     SendToMoengageManager,
     chunks,
@@ -213,16 +218,7 @@ def send_to_moengage(moengage_upload_ids, data_to_send, caller_name=None):
 
 @task(name='update_data_after_send_to_moengage', queue='moengage_low')
 def update_data_after_send_to_moengage(moengage_upload_ids, status, error, time_sent):
-    moengage_uploads = MoengageUpload.objects.filter(
-        id__in=moengage_upload_ids)
-    for moengage_upload in moengage_uploads:
-        fields_to_update = dict(
-            status=status,
-            time_sent=time_sent
-        )
-        if status != MoengageTaskStatus.SUCCESS:
-            fields_to_update['error'] = error
-        moengage_upload.update_safely(**fields_to_update)
+    update_moengage_upload_statuses(moengage_upload_ids, status, error, time_sent)
 
 
 @task(queue='moengage_io_skrtp_regeneration_queue')
@@ -1101,8 +1097,18 @@ def send_user_attributes_to_moengage_in_bulk_daily(
         customer_list (Tuple): A tuple of customers' ids.
         moengage_upload_batch_id (int): The id of MoengageUploadBatch that runs this process.
     """
+    daily_attribute_sync_setting = get_daily_attribute_sync_setting()
+    if daily_attribute_sync_setting:
+        MoengageDailyAttributeSync(
+            moengage_upload_batch_id,
+            batch_size=daily_attribute_sync_setting['batch_size'],
+            max_workers=daily_attribute_sync_setting['max_workers'],
+        ).run(customer_list, chunk_size=daily_attribute_sync_setting['chunk_size'])
+        return
+
     data_to_send = []
     moengage_upload_ids = []
+    is_today_religious_holiday = Holiday.check_is_religious_holiday()
 
     for customer_id in customer_list:
         customer = Customer.objects.get(pk=customer_id)
@@ -1113,8 +1119,6 @@ def send_user_attributes_to_moengage_in_bulk_daily(
             moengage_upload_batch_id=moengage_upload_batch_id,
         )
 
-        is_today_religious_holiday = Holiday.check_is_religious_holiday()
-
         with exception_captured(moengage_upload.id, "construct_data_failed", reraise=False):
             user_attributes = construct_user_attributes_for_realtime_basis(
                 customer, daily_update=True, is_religious_holiday=is_today_religious_holiday
@@ -50,6 +50,7 @@ from juloserver.moengage.models import (
     MoengageUploadBatch,
     MoengageCustomerInstallHistory,
 )
+from juloserver.moengage.services.daily_attribute_sync import get_daily_attribute_sync_setting
 from juloserver.moengage.services.inapp_notif_services import update_inapp_notif_details
 from juloserver.moengage.services.parser import parse_stream_data
 from juloserver.moengage.services.pn_services import send_pn_details_from_moengage_streams
@@ -194,7 +195,13 @@ def trigger_to_update_data_on_moengage():
         type=MoengageEventType.CUSTOMER_DAILY_UPDATE,
         data_count=len(moengage_uploads_customer_ids))
 
-    for customer_list in chunks(moengage_uploads_customer_ids, MAX_EVENT):
+    # the streaming sync cuts its own batches, so a task can take a larger chunk
+    daily_attribute_sync_setting = get_daily_attribute_sync_setting()
+    chunk_size = MAX_EVENT
+    if daily_attribute_sync_setting:
+        chunk_size = daily_attribute_sync_setting['chunk_size']
+
+    for customer_list in chunks(moengage_uploads_customer_ids, chunk_size):
         send_user_attributes_to_moengage_in_bulk_daily.delay(
             customer_list, moengage_upload_batch.id)
     moengage_upload_batch.update_safely(status="all_dispatched")
@@ -0,0 +1,78 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from juloserver.julo.tests.factories import CustomerFactory
+from juloserver.moengage.constants import MoengageTaskStatus
+from juloserver.moengage.exceptions import MoengageApiError
+from juloserver.moengage.models import MoengageUpload
+from juloserver.moengage.services.daily_attribute_sync import MoengageDailyAttributeSync
+from juloserver.moengage.tests.factories import MoengageUploadBatchFactory
+
+
+@mock.patch(
+    'juloserver.moengage.services.daily_attribute_sync.construct_user_attributes_for_realtime_basis'
+)
+class TestMoengageDailyAttributeSync(TestCase):
+    def setUp(self):
+        self.moengage_upload_batch = MoengageUploadBatchFactory()
+        self.customer_ids = [CustomerFactory().id for _ in range(5)]
+        self.moengage_client = mock.MagicMock()
+        self.moengage_client.send_event.return_value = {'status': MoengageTaskStatus.SUCCESS}
+
+    def get_sync(self):
+        return MoengageDailyAttributeSync(
+            self.moengage_upload_batch.id,
+            batch_size=2,
+            max_workers=2,
+            moengage_client=self.moengage_client,
+        )
+
+    def test_send_in_batches(self, mock_construct_user_attributes):
+        mock_construct_user_attributes.side_effect = lambda customer, **kwargs: {
+            'customer_id': customer.id
+        }
+
+        summary = self.get_sync().run(self.customer_ids, chunk_size=3)
+
+        self.assertEqual(summary['sent_count'], 5)
+        self.assertEqual(self.moengage_client.send_event.call_count, 3)
+        sent_customer_ids = sorted(
+            element['customer_id']
+            for call in self.moengage_client.send_event.call_args_list
+            for element in call[0][0]
+        )
+        self.assertEqual(sent_customer_ids, sorted(self.customer_ids))
+        moengage_uploads = MoengageUpload.objects.filter(
+            moengage_upload_batch_id=self.moengage_upload_batch.id
+        )
+        self.assertEqual(moengage_uploads.count(), 5)
+        self.assertFalse(
+            moengage_uploads.exclude(status=MoengageTaskStatus.SUCCESS).exists()
+        )
+
+    def test_failed_batch_and_construct_error(self, mock_construct_user_attributes):
+        failed_customer_id = self.customer_ids[0]
+
+        def construct_user_attributes(customer, **kwargs):
+            if customer.id == failed_customer_id:
+                raise ValueError('no application')
+            return {'customer_id': customer.id}
+
+        mock_construct_user_attributes.side_effect = construct_user_attributes
+        self.moengage_client.send_event.side_effect = MoengageApiError('service unavailable')
+
+        summary = self.get_sync().run(self.customer_ids)
+
+        self.assertEqual(summary['sent_count'], 0)
+        self.assertEqual(summary['failed_count'], 5)
+        moengage_uploads = MoengageUpload.objects.filter(
+            moengage_upload_batch_id=self.moengage_upload_batch.id
+        )
+        self.assertEqual(
+            moengage_uploads.get(customer_id=failed_customer_id).status,
+            'construct_data_failed',
+        )
+        self.assertEqual(
+            moengage_uploads.filter(status=MoengageTaskStatus.FAILURE).count(), 4
+        )
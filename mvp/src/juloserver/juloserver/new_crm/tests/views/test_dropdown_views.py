@@ -6,10 +6,12 @@ from rest_framework.test import (
     APITestCase,
 )
 
+from juloserver.julo.constants import FeatureNameConst
 from juloserver.julo.tests.factories import (
     AuthUserFactory,
     CityLookupFactory,
     DistrictLookupFactory,
+    FeatureSettingFactory,
     ProvinceLookupFactory,
     SubDistrictLookupFactory,
 )
@@ -69,6 +71,18 @@ class TestDropDownApi(APITestCase):
         ]
         self.assertEqual(expected_data, response.data['data'], str(response.content))
 
+    def test_job_search_in_process(self):
+        FeatureSettingFactory(feature_name=FeatureNameConst.IN_PROCESS_AUTOCOMPLETE)
+        url = '/new_crm/v1/dropdown/job/'
+        response = self.client.get(url, {'search': 'pegawi'})
+        self.assertEqual(200, response.status_code, str(response.content))
+
+        expected_data = [
+            "Pegawai negeri",
+            "Pegawai swasta",
+        ]
+        self.assertEqual(expected_data, response.data['data'], str(response.content))
+
 
 class DropdownAddressApi(APITestCase):
     def setUp(self):
@@ -1,7 +1,8 @@
 from django.conf import settings
 from juloserver.julo.exceptions import JuloException
+from juloserver.julocore.constants import HttpVendor
+from juloserver.julocore.http_transport import get_http_session
 
-import requests
 import json
 from juloserver.pii_vault.constants import PiiVaultService
 from juloserver.pii_vault.exceptions import PIIDataNotFound
@@ -19,6 +20,12 @@ class PIIVaultClient:
     def __init__(self, authentication):
         self.authentication = authentication
 
+    @property
+    def session(self):
+        # the clients are created at import time, so the session is looked up per call
+        # to get the one of the current process
+        return get_http_session(HttpVendor.PII_VAULT)
+
     def tokenize(self, data, schema="customer"):
         url = f"{settings.PII_VAULT_BASE_URL}/transform/{schema}/tokenize"
         body = {"records": data}
@@ -32,7 +39,7 @@ class PIIVaultClient:
         return result["records"]
 
     def post_request_call(self, url, body, timeout=None):
-        response = requests.request(
+        response = self.session.request(
             "POST",
             url,
             headers={"Content-Type": "application/json", "authentication": self.authentication},
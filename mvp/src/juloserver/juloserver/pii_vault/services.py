@@ -1,6 +1,7 @@
 import json
 import logging
 import time
+from collections import defaultdict
 from datetime import timedelta
 
 from django.contrib.postgres.fields import JSONField
@@ -105,7 +106,7 @@ from juloserver.pii_vault.exceptions import (
     DetokenizeValueDifferent,
 )
 from juloserver.pii_vault.models import PiiVaultEvent
-from juloserver.pii_vault.utils import CacheUtils
+from juloserver.pii_vault.utils import CacheUtils, detokenized_value_cache
 from juloserver.julo.utils import execute_after_transaction_safely
 from juloserver.sdk.models import AxiataCustomerData, AxiataTemporaryData
 from juloserver.pii_vault.collection.services import (
@@ -161,6 +162,9 @@ pii_vault_client_platform = get_pii_vault_client(PiiVaultService.PLATFORM)
 sentry_client = get_julo_sentry_client()
 logger = logging.getLogger(__name__)
 
+DETOKENIZE_BATCH_SIZE = 500
+DETOKENIZE_BATCH_REQUEST_TIMEOUT = 5
+
 
 def get_resource_with_select_for_update(source, resource_id):
     """This function must be called in an atomic transaction"""
@@ -577,6 +581,9 @@ def tokenize_pii_data_by_client(vault_xid, payload, source, resource, pii_data):
     cache_utils = CacheUtils()
     for tokenize_field, value in tokenized_data.items():
         cache_utils.delete(CacheUtils.CacheKeyConfig.primary, value)
+    detokenized_value_cache.invalidate(
+        str(vault_xid), [tokenize_field[:-10] for tokenize_field in tokenized_data]
+    )
 
     return tokenized_data
 
@@ -1451,6 +1458,113 @@ def kv_detokenize_pii_data_by_client(payload, back_map_keys, source_class):
     return detokenized_data
 
 
+def request_batch_detokenize(payload, feature_setting_params, pii_data_type):
+    # a batch holds up to batch_size tokens, request_timeout is sized for one resource
+    request_timeout = feature_setting_params.get(
+        'batch_request_timeout', DETOKENIZE_BATCH_REQUEST_TIMEOUT
+    )
+    retry = feature_setting_params.get('retry', 3)
+    while retry:
+        retry -= 1
+        try:
+            start_time = time.time()
+            if pii_data_type == PiiVaultDataType.PRIMARY:
+                result = pii_vault_client.detokenize(payload, timeout=request_timeout)
+            else:
+                result = pii_vault_client.general_detokenize(payload, timeout=request_timeout)
+            logger.info(
+                'batch_detokenize_request_finished|'
+                'retry_time={}, elapsed={}, token_count={}'.format(
+                    retry, time.time() - start_time, len(payload)
+                )
+            )
+            return result
+        except JuloException:
+            sentry_client.captureException()
+        except Exception as e:
+            logger.warning(
+                'batch_detokenize_timeout|'
+                'retry_time={}, token_count={}, err={}'.format(retry, len(payload), str(e))
+            )
+
+    return []
+
+
+def batch_detokenize_pii_data_by_client(
+    resources, feature_setting_params, source_class, pii_data_type=PiiVaultDataType.PRIMARY
+):
+    """
+    Detokenize the tokenized values of every resource with one vault call per schema,
+    instead of one call per resource. The tokens found in the process memory cache or in
+    the redis cache are not sent, a token shared by several resources is sent once.
+
+    Return:
+        list of the detokenized data of every resource, in the order of resources
+    """
+    is_primary = pii_data_type == PiiVaultDataType.PRIMARY
+    key_conf = (
+        CacheUtils.CacheKeyConfig.primary if is_primary else CacheUtils.CacheKeyConfig.key_value
+    )
+    use_memory_cache = is_primary and feature_setting_params.get('memory_cache')
+    cache_utils = CacheUtils()
+    detokenized_data_list = [{} for _ in resources]
+    token_fields = defaultdict(list)
+    payload = []
+    for index, resource in enumerate(resources):
+        for item in resource['tokenized_values']:
+            token = item['token']
+            field_name = resource['back_map'][token]
+            vault_xid = str(item['vault_xid']) if is_primary else None
+            if use_memory_cache:
+                client_value = detokenized_value_cache.get(vault_xid, field_name, token)
+                if client_value is not None:
+                    detokenized_data_list[index][field_name] = (
+                        convert_client_detokenize_value_to_raw_format(
+                            source_class, client_value, field_name
+                        )
+                    )
+                    continue
+
+            if token not in token_fields:
+                payload.append(item)
+            token_fields[token].append((index, field_name, vault_xid))
+
+    cached_values = cache_utils.get_many(key_conf, list(token_fields))
+    for token, value in cached_values.items():
+        if not value:
+            continue
+        for index, field_name, _ in token_fields.pop(token):
+            detokenized_data_list[index][field_name] = value
+    payload = [item for item in payload if item['token'] in token_fields]
+
+    batch_size = max(feature_setting_params.get('batch_size', DETOKENIZE_BATCH_SIZE), 1)
+    for start in range(0, len(payload), batch_size):
+        result = request_batch_detokenize(
+            payload[start:start + batch_size], feature_setting_params, pii_data_type
+        )
+        for row in result:
+            token = row["token"]
+            client_value = row.get("value")
+            for index, field_name, vault_xid in token_fields.get(token, []):
+                try:
+                    raw_data = convert_client_detokenize_value_to_raw_format(
+                        source_class, client_value, field_name
+                    )
+                except Exception as e:
+                    logger.warning(
+                        'batch_detokenize_convert_client_detokenize_value_to_raw_format_error|'
+                        'field_name={}, err={}'.format(field_name, str(e))
+                    )
+                    raw_data = client_value
+
+                detokenized_data_list[index][field_name] = raw_data
+                if use_memory_cache:
+                    detokenized_value_cache.set(vault_xid, field_name, token, client_value)
+                cache_utils.set(raw_data, key_conf, token)
+
+    return detokenized_data_list
+
+
 def get_direct_detokenize_data(object_data, dict_data, tokenized_fields):
     if object_data:
         return {field: get_attribute(object_data, field) for field in tokenized_fields}
@@ -1623,14 +1737,23 @@ def _detokenize_data(
         source, detokenize_resource_type, resources, fields, get_all, pii_data_type
     )
     model_class = PiiSource.get_type_from_source(source)
+    batch_detokenized_data = None
+    if feature_setting_params.get('batch_detokenize'):
+        batch_detokenized_data = batch_detokenize_pii_data_by_client(
+            resources_tokenized, feature_setting_params, model_class, pii_data_type
+        )
+
     if pii_data_type == PiiVaultDataType.PRIMARY:
-        for resource in resources_tokenized:
-            detokenized_data = detokenize_pii_data_by_client(
-                resource['tokenized_values'],
-                resource['back_map'],
-                feature_setting_params,
-                source_class=model_class,
-            )
+        for index, resource in enumerate(resources_tokenized):
+            if batch_detokenized_data is not None:
+                detokenized_data = batch_detokenized_data[index]
+            else:
+                detokenized_data = detokenize_pii_data_by_client(
+                    resource['tokenized_values'],
+                    resource['back_map'],
+                    feature_setting_params,
+                    source_class=model_class,
+                )
             is_direct = True if (force_get_local_data or not detokenized_data) else False
             data_dict, data_obj = None, None
             if detokenize_resource_type == DetokenizeResourceType.OBJECT:
@@ -1667,10 +1790,13 @@ def _detokenize_data(
         if return_value:
             return resources_tokenized
     elif pii_data_type == PiiVaultDataType.KEY_VALUE:
-        for resource in resources_tokenized:
-            detokenized_data = kv_detokenize_pii_data_by_client(
-                resource['tokenized_values'], resource['back_map'], model_class
-            )
+        for index, resource in enumerate(resources_tokenized):
+            if batch_detokenized_data is not None:
+                detokenized_data = batch_detokenized_data[index]
+            else:
+                detokenized_data = kv_detokenize_pii_data_by_client(
+                    resource['tokenized_values'], resource['back_map'], model_class
+                )
             is_direct = True if (force_get_local_data or not detokenized_data) else False
             data_dict, data_obj = None, None
             if detokenize_resource_type == DetokenizeResourceType.OBJECT:
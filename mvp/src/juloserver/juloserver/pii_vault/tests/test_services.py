@@ -1,4 +1,5 @@
 import copy
+import time
 import mock
 from unittest.mock import ANY
 from datetime import timedelta, datetime
@@ -54,8 +55,16 @@ from juloserver.pii_vault.services import (
     detokenize_pii_data,
     detokenize_pii_data_by_client,
     detokenize_for_model_object,
+    batch_detokenize_pii_data_by_client,
+    tokenize_pii_data_by_client,
+)
+from juloserver.pii_vault.utils import DetokenizedValueCache, detokenized_value_cache
+from juloserver.pii_vault.constants import (
+    DetokenizeResourceType,
+    PiiSource,
+    PiiVaultDataType,
+    PiiVaultEventStatus,
 )
-from juloserver.pii_vault.constants import PiiSource, PiiVaultEventStatus, DetokenizeResourceType
 from juloserver.pii_vault.models import PiiVaultEvent
 from juloserver.pii_vault.exceptions import PIIDataIsEmpty
 
@@ -1725,3 +1734,149 @@ class TestDetokenize(TestCase):
         self.assertEqual(self.application.fullname, mock_detokenize_data['fullname'])
         self.assertEqual(self.application.email, mock_detokenize_data['email'])
         self.assertEqual(self.application.mobile_phone_1, mock_detokenize_data['mobile_phone_1'])
+
+
+class StubPiiVaultClient(object):
+    def __init__(self, values):
+        self.values = values
+        self.detokenize_calls = []
+        self.timeouts = []
+
+    def detokenize(self, payload, timeout=None):
+        self.detokenize_calls.append(payload)
+        self.timeouts.append(timeout)
+        return [{'token': item['token'], 'value': self.values[item['token']]} for item in payload]
+
+    general_detokenize = detokenize
+
+
+class TestBatchDetokenize(TestCase):
+    def setUp(self):
+        detokenized_value_cache.clear()
+        self.values = {}
+        self.resources = []
+        for index in range(20):
+            fullname_token = 'fullname-token-{}'.format(index)
+            email_token = 'email-token-{}'.format(index)
+            self.values[fullname_token] = 'customer {}'.format(index)
+            self.values[email_token] = 'customer{}@julo.co.id'.format(index)
+            vault_xid = 'vault-xid-{}'.format(index)
+            self.resources.append(
+                {
+                    'tokenized_values': [
+                        {'vault_xid': vault_xid, 'token': fullname_token},
+                        {'vault_xid': vault_xid, 'token': email_token},
+                    ],
+                    'back_map': {fullname_token: 'fullname', email_token: 'email'},
+                }
+            )
+        self.pii_vault_client = StubPiiVaultClient(self.values)
+        self.feature_setting_params = {'batch_detokenize': True, 'memory_cache': True}
+
+    def tearDown(self):
+        detokenized_value_cache.clear()
+
+    def test_one_request_for_all_resources(self):
+        with patch('juloserver.pii_vault.services.pii_vault_client', self.pii_vault_client):
+            result = batch_detokenize_pii_data_by_client(
+                self.resources, self.feature_setting_params, Customer
+            )
+            self.assertEqual(len(self.pii_vault_client.detokenize_calls), 1)
+            self.assertEqual(len(self.pii_vault_client.detokenize_calls[0]), 40)
+            self.assertEqual(result[3], {'fullname': 'customer 3', 'email': 'customer3@julo.co.id'})
+
+            # served from the memory cache
+            self.assertEqual(
+                batch_detokenize_pii_data_by_client(
+                    self.resources, self.feature_setting_params, Customer
+                ),
+                result,
+            )
+            self.assertEqual(len(self.pii_vault_client.detokenize_calls), 1)
+
+            # a re-tokenized field is requested again
+            self.resources[3]['tokenized_values'][0]['token'] = 'fullname-token-new'
+            self.resources[3]['back_map']['fullname-token-new'] = 'fullname'
+            self.values['fullname-token-new'] = 'new customer 3'
+            result = batch_detokenize_pii_data_by_client(
+                self.resources, self.feature_setting_params, Customer
+            )
+            self.assertEqual(
+                self.pii_vault_client.detokenize_calls[1],
+                [{'vault_xid': 'vault-xid-3', 'token': 'fullname-token-new'}],
+            )
+            self.assertEqual(result[3]['fullname'], 'new customer 3')
+
+    def test_batch_size(self):
+        self.feature_setting_params['batch_size'] = 15
+        with patch('juloserver.pii_vault.services.pii_vault_client', self.pii_vault_client):
+            batch_detokenize_pii_data_by_client(
+                self.resources, self.feature_setting_params, Customer
+            )
+
+        self.assertEqual(
+            [len(payload) for payload in self.pii_vault_client.detokenize_calls], [15, 15, 10]
+        )
+
+    def test_batch_size_zero(self):
+        self.feature_setting_params['batch_size'] = 0
+        with patch('juloserver.pii_vault.services.pii_vault_client', self.pii_vault_client):
+            result = batch_detokenize_pii_data_by_client(
+                self.resources, self.feature_setting_params, Customer
+            )
+
+        self.assertEqual(len(self.pii_vault_client.detokenize_calls), 40)
+        self.assertEqual(result[3], {'fullname': 'customer 3', 'email': 'customer3@julo.co.id'})
+
+    def test_batch_request_timeout(self):
+        self.feature_setting_params.update(request_timeout=1, batch_request_timeout=10)
+        with patch('juloserver.pii_vault.services.pii_vault_client', self.pii_vault_client):
+            batch_detokenize_pii_data_by_client(
+                self.resources,
+                self.feature_setting_params,
+                Customer,
+                pii_data_type=PiiVaultDataType.KEY_VALUE,
+            )
+
+        self.assertEqual(self.pii_vault_client.timeouts, [10])
+
+    @patch('juloserver.pii_vault.services.pii_vault_client')
+    def test_tokenize_invalidates_memory_cache(self, mock_pii_vault_client):
+        detokenized_value_cache.set('vault-xid-1', 'fullname', 'fullname-token-1', 'customer 1')
+        detokenized_value_cache.set('vault-xid-1', 'email', 'email-token-1', 'customer1@julo.co.id')
+        mock_pii_vault_client.tokenize.return_value = [
+            {'fields': {'name': 'fullname-token-2'}}
+        ]
+
+        tokenize_pii_data_by_client(
+            'vault-xid-1',
+            {'name': 'customer 2'},
+            PiiSource.CUSTOMER,
+            None,
+            {'fields': ['fullname']},
+        )
+
+        self.assertIsNone(
+            detokenized_value_cache.get('vault-xid-1', 'fullname', 'fullname-token-1')
+        )
+        self.assertEqual(
+            detokenized_value_cache.get('vault-xid-1', 'email', 'email-token-1'),
+            'customer1@julo.co.id',
+        )
+
+
+class TestDetokenizedValueCache(TestCase):
+    def test_token_mismatch_expiry_and_size(self):
+        cache = DetokenizedValueCache(max_size=2, ttl=60)
+        cache.set('vault-xid-1', 'fullname', 'token-1', 'customer 1')
+        self.assertEqual(cache.get('vault-xid-1', 'fullname', 'token-1'), 'customer 1')
+        self.assertIsNone(cache.get('vault-xid-1', 'fullname', 'token-2'))
+
+        cache.set('vault-xid-1', 'fullname', 'token-1', 'customer 1')
+        cache.set('vault-xid-2', 'fullname', 'token-2', 'customer 2')
+        cache.set('vault-xid-3', 'fullname', 'token-3', 'customer 3')
+        self.assertIsNone(cache.get('vault-xid-1', 'fullname', 'token-1'))
+        self.assertEqual(cache.get('vault-xid-3', 'fullname', 'token-3'), 'customer 3')
+
+        with patch('juloserver.pii_vault.utils.time.time', return_value=time.time() + 61):
+            self.assertIsNone(cache.get('vault-xid-3', 'fullname', 'token-3'))
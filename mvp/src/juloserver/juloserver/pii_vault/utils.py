@@ -1,3 +1,9 @@
+import threading
+import time
+from collections import OrderedDict
+
+from cryptography.fernet import Fernet
+
 from juloserver.julocore.cache_client import get_redis_cache
 
 
@@ -55,5 +61,77 @@ class CacheUtils:
             return None
         return self.cache.get(key_conf['key_converter'](*args))
 
+    def get_many(self, key_conf, keys):
+        """
+        Return:
+            dict of key to the cached value, only for the keys found in the cache
+        """
+        if not self.config.get('cache_data') or not keys:
+            return {}
+        cache_keys = {key_conf['key_converter'](key): key for key in keys}
+        return {
+            cache_keys[cache_key]: value
+            for cache_key, value in self.cache.get_many(list(cache_keys)).items()
+        }
+
     def delete(self, key_conf, *args):
         self.cache.delete(key_conf['key_converter'](*args))
+
+
+class DetokenizedValueCache:
+    """
+    Process local cache of the values returned by the vault, keyed by vault xid and field.
+
+    The values are encrypted with a key generated by the process, so they are not kept as
+    plain text in memory. Every entry also holds the token it was detokenized from and only
+    matches that token, a re-tokenized field is a miss even in the processes that did not
+    see the invalidation. Entries expire after ttl seconds, the least recently used entry
+    is dropped when the cache is full.
+    """
+
+    def __init__(self, max_size=10000, ttl=60):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.fernet = Fernet(Fernet.generate_key())
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, vault_xid, field, token):
+        key = (vault_xid, field)
+        with self.lock:
+            entry = self.entries.get(key)
+            if not entry:
+                return None
+
+            cached_token, encrypted_value, expired_at = entry
+            if cached_token != token or expired_at < time.time():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+
+        return self.fernet.decrypt(encrypted_value).decode()
+
+    def set(self, vault_xid, field, token, value):
+        if value is None:
+            return
+
+        encrypted_value = self.fernet.encrypt(str(value).encode())
+        key = (vault_xid, field)
+        with self.lock:
+            self.entries[key] = (token, encrypted_value, time.time() + self.ttl)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, vault_xid, fields=None):
+        with self.lock:
+            for key in list(self.entries):
+                if key[0] == vault_xid and (fields is None or key[1] in fields):
+                    del self.entries[key]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+detokenized_value_cache = DetokenizedValueCache()
@@ -0,0 +1,127 @@
+"""
+Keyset pagination of the CRM list views.
+
+A page is read as the rows after the sort key of the last row of the previous page, the
+cursor, instead of an OFFSET of every row before it. Page 500 of a bucket costs the same
+index range read as page 1, where the OFFSET of the page number makes postgres sort and
+skip every earlier row.
+"""
+import base64
+import json
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+
+# the extra select aliases of the list views that only alias a model field
+EXTRA_SORT_FIELDS = {'dpd_sort': 'due_date'}
+
+
+def get_keyset_ordering(queryset, extra_sort_fields=EXTRA_SORT_FIELDS):
+    """
+    Return:
+        list of (field_name, descending) of the ordering of queryset ending with the primary
+        key, None when the ordering is not on fields of the model itself
+    """
+    query = queryset.query
+    if query.extra_order_by:
+        ordering = query.extra_order_by
+    elif not query.default_ordering:
+        ordering = query.order_by
+    else:
+        ordering = query.order_by or queryset.model._meta.ordering
+
+    pk_name = queryset.model._meta.pk.name
+    keyset_ordering = []
+    for order in ordering:
+        if not isinstance(order, str) or order == '?':
+            return None
+        descending = order.startswith('-')
+        field_name = order.lstrip('-')
+        field_name = extra_sort_fields.get(field_name, field_name)
+        if field_name == 'pk':
+            field_name = pk_name
+        try:
+            field = queryset.model._meta.get_field(field_name)
+        except FieldDoesNotExist:
+            return None
+        if not field.concrete or field.is_relation:
+            return None
+        keyset_ordering.append((field_name, descending))
+        if field_name == pk_name:
+            return keyset_ordering
+
+    descending = keyset_ordering[-1][1] if keyset_ordering else False
+    keyset_ordering.append((pk_name, descending))
+    return keyset_ordering
+
+
+def encode_cursor(values):
+    # str keeps the microseconds of a datetime, DjangoJSONEncoder cuts them to milliseconds
+    return base64.urlsafe_b64encode(json.dumps(list(values), default=str).encode()).decode()
+
+
+def decode_cursor(model, keyset_ordering, cursor):
+    """
+    Return:
+        list of the sort key values of cursor, raise ValueError when the cursor does not
+        belong to keyset_ordering
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except (TypeError, UnicodeError, ValueError):
+        raise ValueError('invalid cursor')
+
+    if not isinstance(values, list) or len(values) != len(keyset_ordering):
+        raise ValueError('invalid cursor')
+
+    try:
+        return [
+            None if value is None else model._meta.get_field(field_name).to_python(value)
+            for (field_name, _), value in zip(keyset_ordering, values)
+        ]
+    except ValidationError:
+        raise ValueError('invalid cursor')
+
+
+def get_after_value_filter(field_name, descending, value):
+    """The rows sorted after value on field_name, postgres sorts the nulls as the largest."""
+    if value is None:
+        return Q(**{field_name + '__isnull': False}) if descending else None
+
+    after_filter = Q(**{'{}__{}'.format(field_name, 'lt' if descending else 'gt'): value})
+    if not descending:
+        after_filter |= Q(**{field_name + '__isnull': True})
+    return after_filter
+
+
+def get_keyset_filter(keyset_ordering, values):
+    keyset_filter = Q()
+    equal_filter = Q()
+    for (field_name, descending), value in zip(keyset_ordering, values):
+        after_filter = get_after_value_filter(field_name, descending, value)
+        if after_filter:
+            keyset_filter |= equal_filter & after_filter
+        if value is None:
+            equal_filter &= Q(**{field_name + '__isnull': True})
+        else:
+            equal_filter &= Q(**{field_name: value})
+
+    return keyset_filter
+
+
+def get_keyset_page(queryset, keyset_ordering, cursor, per_page):
+    """
+    Return:
+        (primary keys of the page after cursor, cursor of the next page or None on the last
+        page), the first page when cursor is empty
+    """
+    queryset = queryset.order_by(
+        *['{}{}'.format('-' if descending else '', name) for name, descending in keyset_ordering]
+    )
+    if cursor:
+        values = decode_cursor(queryset.model, keyset_ordering, cursor)
+        queryset = queryset.filter(get_keyset_filter(keyset_ordering, values))
+
+    rows = list(queryset.values_list(*[name for name, _ in keyset_ordering])[:per_page + 1])
+    next_cursor = encode_cursor(rows[per_page - 1]) if len(rows) > per_page else None
+    return [row[-1] for row in rows[:per_page]], next_cursor
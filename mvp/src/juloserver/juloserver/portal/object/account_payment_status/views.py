@@ -136,6 +136,7 @@ from juloserver.julo.statuses import (JuloOneCodes, PaymentStatusCodes)
 from loan_app.forms import ImageUploadForm
 
 from juloserver.portal.object.loan_app.constants import ImageUploadType
+from juloserver.portal.core.pagination import get_keyset_ordering, get_keyset_page
 from payment_status.services import check_change_due_date_active
 from payment_status.services import check_first_installment_btn_active
 from payment_status.utils import (get_list_history,
@@ -1486,22 +1487,41 @@ def ajax_account_payment_list_view(request):
     processed_model = qs.model
     primary_key = 'id'
 
-    three_next_pages = max_per_page * (page + 2) + 1
-    limit = max_per_page * page
-    offset = limit - max_per_page
-
-    result = qs.values_list(primary_key, flat=True)
-    result = result[offset:three_next_pages]
-    account_payment_ids = list(result)
-    account_payment_ids_1page = account_payment_ids[:max_per_page]
-    count_account_payment = len(account_payment_ids)
-    count_page = page + (count_account_payment // max_per_page) + (
-                count_account_payment % max_per_page > 0) - 1
-    if count_account_payment == 0:
-        count_page = page
+    # an empty cursor asks for the first page of the keyset pagination
+    cursor = request.GET.get('cursor')
+    keyset_ordering = get_keyset_ordering(qs) if cursor is not None else None
+    next_cursor = None
+    if keyset_ordering:
+        try:
+            account_payment_ids_1page, next_cursor = get_keyset_page(
+                qs, keyset_ordering, cursor, max_per_page
+            )
+        except ValueError:
+            return JsonResponse({"status": "failed", "message": "Cursor tidak valid"})
+        count_page = page + 1 if next_cursor else page
+    else:
+        three_next_pages = max_per_page * (page + 2) + 1
+        limit = max_per_page * page
+        offset = limit - max_per_page
+
+        result = qs.values_list(primary_key, flat=True)
+        result = result[offset:three_next_pages]
+        account_payment_ids = list(result)
+        account_payment_ids_1page = account_payment_ids[:max_per_page]
+        count_account_payment = len(account_payment_ids)
+        count_page = (
+            page
+            + (count_account_payment // max_per_page)
+            + (count_account_payment % max_per_page > 0)
+            - 1
+        )
+        if count_account_payment == 0:
+            count_page = page
 
     # this preserved is needed because random order by postgresql/django
-    preserved = Case(*[When(pk=pk, then=pos) for pos, pk in enumerate(result)])
+    preserved = Case(
+        *[When(pk=pk, then=pos) for pos, pk in enumerate(account_payment_ids_1page)]
+    )
 
     account_payments = processed_model.objects\
         .filter(**{primary_key + '__in': account_payment_ids_1page})\
@@ -1547,6 +1567,7 @@ def ajax_account_payment_list_view(request):
         'data': account_payments_values,
         'count_page': count_page,
         'current_page': page,
+        'next_cursor': next_cursor,
         'list_status': list(list_status),
         'list_agent': list(list_agent),
         'autodialer_result': list(autodialer_result),
@@ -16,6 +16,7 @@ from juloserver.julo.models import DashboardBuckets
 from juloserver.julo.models import Payment, Document
 from juloserver.julo.partners import PartnerConstant
 from juloserver.julo.services2 import get_redis_client
+from juloserver.julo.services2.dashboard_counters import get_dashboard_buckets
 from juloserver.julo.statuses import ApplicationStatusCodes
 from juloserver.julo.statuses import LoanStatusCodes
 from juloserver.julo.statuses import PaymentStatusCodes
@@ -25,7 +26,7 @@ from .models import ApplicationLocked
 from .models import ApplicationLockedMaster
 
 
-def application_priority_dashboard():
+def application_priority_dashboard(buckets=None):
     """
     get count data for each application status on the list
     """
@@ -91,9 +92,8 @@ def application_priority_dashboard():
         'partner_app': {}
     }
 
-    buckets = DashboardBuckets.objects.last()
     if not buckets:
-        buckets = DashboardBuckets.objects.create()
+        buckets = get_dashboard_buckets()
 
     for status in status_to_do:
         key = 'app_priority_{}'.format(status)
@@ -118,7 +118,7 @@ def application_priority_dashboard():
     return count_data
 
 
-def application_dashboard():
+def application_dashboard(buckets=None):
     """
     get count data for each application status on the list
     """
@@ -220,9 +220,8 @@ def application_dashboard():
         'deletion': {},
     }
 
-    buckets = DashboardBuckets.objects.last()
     if not buckets:
-        buckets = DashboardBuckets.objects.create()
+        buckets = get_dashboard_buckets()
 
     for status in status_to_do:
         key = 'app_{}'.format(status)
@@ -276,7 +275,7 @@ def lender_bucket():
         count=LenderBucket.objects.filter(is_active=True).count()
     )
 
-def loan_dashboard():
+def loan_dashboard(buckets=None):
     """
     get count data for each application status on the list
     [210, 211, 212, 213, 215, 216, 218, 220, 240, 250]
@@ -300,9 +299,8 @@ def loan_dashboard():
         LoanStatusCodes.CURRENT
     ]
 
-    buckets = DashboardBuckets.objects.last()
     if not buckets:
-        buckets = DashboardBuckets.objects.create()
+        buckets = get_dashboard_buckets()
 
     count_data = {}
     for status in status_arr:
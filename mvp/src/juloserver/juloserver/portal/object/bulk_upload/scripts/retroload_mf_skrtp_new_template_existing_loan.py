@@ -1,6 +1,5 @@
 import os
 import tempfile
-import pdfkit
 import logging
 
 from babel.dates import format_date, format_datetime
@@ -26,6 +25,7 @@ from juloserver.julo.tasks import upload_document
 
 from juloserver.julo.utils import display_rupiah
 
+from juloserver.julocore.pdf_renderer import render_pdfs
 from juloserver.julocore.python2.utils import py2round
 
 from juloserver.partnership.constants import (
@@ -215,6 +215,7 @@ def get_new_mf_skrtp_content(loan):
 
 def create_new_mf_skrtp(loans):
     errors = []
+    skrtp_loans = []
 
     for loan in loans:
         try:
@@ -226,35 +227,46 @@ def create_new_mf_skrtp(loans):
                 ):
                     errors.append("Account data not found for loan ID {}".format(loan.id))
                     continue
-                partner_name = loan.application.partner.name
-                application = loan.application
                 template = get_new_mf_skrtp_content(loan)
                 if not template:
                     errors.append("SKRTP template not found for loan ID {}".format(loan.id))
                     continue
 
-                now = timezone.localtime(timezone.now()).date()
-                filename = '{}_{}_{}_{}.pdf'.format(
-                    application.fullname,
-                    loan.loan_xid,
-                    now.strftime("%Y%m%d"),
-                    now.strftime("%H%M%S"),
-                )
-                file_path = os.path.join(tempfile.gettempdir(), filename)
-
-                try:
-                    pdfkit.from_string(template, file_path)
-                except Exception:
-                    errors.append("Failed to create PDF for loan ID {}".format(loan.id))
-                    continue
+                skrtp_loans.append((loan, template))
+        except Exception as e:
+            errors.append("Error processing loan ID {}: {}".format(loan.id, str(e)))
+
+    # the SKRTPs of the batch are rendered by the pdf renderer pool when it is enabled
+    rendered_pdfs = render_pdfs(
+        (template for _, template in skrtp_loans), options={}, return_exceptions=True
+    )
+    for (loan, _), rendered_pdf in zip(skrtp_loans, rendered_pdfs):
+        if isinstance(rendered_pdf, Exception):
+            errors.append("Failed to create PDF for loan ID {}".format(loan.id))
+            continue
 
-                sphp_julo = Document.objects.create(
-                    document_source=loan.id,
-                    document_type=f"{partner_name.lower()}_skrtp",
-                    filename=filename,
-                    loan_xid=loan.loan_xid,
-                )
-                upload_document(sphp_julo.id, file_path, is_loan=True)
+        try:
+            application = loan.application
+            partner_name = application.partner.name
+            now = timezone.localtime(timezone.now()).date()
+            filename = '{}_{}_{}_{}.pdf'.format(
+                application.fullname,
+                loan.loan_xid,
+                now.strftime("%Y%m%d"),
+                now.strftime("%H%M%S"),
+            )
+            # the upload task reads the file
+            file_path = os.path.join(tempfile.gettempdir(), filename)
+            with open(file_path, 'wb') as pdf_file:
+                pdf_file.write(rendered_pdf.content)
+
+            sphp_julo = Document.objects.create(
+                document_source=loan.id,
+                document_type=f"{partner_name.lower()}_skrtp",
+                filename=filename,
+                loan_xid=loan.loan_xid,
+            )
+            upload_document(sphp_julo.id, file_path, is_loan=True)
         except Exception as e:
             errors.append("Error processing loan ID {}: {}".format(loan.id, str(e)))
 
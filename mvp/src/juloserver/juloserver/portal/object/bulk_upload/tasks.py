@@ -20,8 +20,6 @@ import logging
 import string
 import random
 import pytz
-import tempfile
-import pdfkit
 import base64
 
 from babel.dates import format_date
@@ -41,6 +39,7 @@ from celery import task
 
 from juloserver.julo.constants import EmailDeliveryAddress, FeatureNameConst
 from juloserver.julo.services2 import get_advance_ai_service
+from juloserver.julocore.pdf_renderer import DEFAULT_PDF_OPTIONS, render_pdf
 from juloserver.julo.clients import get_julo_email_client
 from juloserver.julo.clients.constants import BlacklistCheckStatus
 
@@ -840,25 +839,8 @@ def get_sphp_template(application):
 
 
 def get_pdf_content_from_html(html_content, filename):
-    temp_dir = tempfile.mkdtemp()
-    options = {
-        'page-size': 'A4',
-        'margin-top': '0in',
-        'margin-right': '0in',
-        'margin-bottom': '0in',
-        'margin-left': '0in',
-        'encoding': "UTF-8",
-        'no-outline': None,
-    }
-    file_path = os.path.join(temp_dir, filename)
-    pdfkit.from_string(html_content, file_path, options=options)
-    with open(file_path, 'rb') as f:
-        data = f.read()
-        f.close()
-    encoded = base64.b64encode(data)
-    if os.path.exists(file_path):
-        os.remove(file_path)
-    return encoded.decode()
+    rendered_pdf = render_pdf(html_content, options=DEFAULT_PDF_OPTIONS)
+    return base64.b64encode(rendered_pdf.content).decode()
 
 
 @task(name='loan_halt_task', queue='grab_halt_queue')
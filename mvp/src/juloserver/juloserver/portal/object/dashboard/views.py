@@ -102,6 +102,7 @@ from juloserver.julo.services import (
 from juloserver.julo.services2 import get_agent_service, get_redis_client
 from juloserver.julo.services2.activity_dialer import UploadDialerActivityForm
 from juloserver.julo.services2.agent import convert_usergroup_to_agentassignment_type
+from juloserver.julo.services2.dashboard_counters import get_dashboard_buckets
 from juloserver.julo.services2.experiment import check_cootek_experiment
 from juloserver.julo.services2.ops_team_leader import SubmitOPSStatusForm
 from juloserver.julo.statuses import (
@@ -1072,12 +1073,13 @@ def get_dashboard_bucket_count(request):
     if request.method != 'GET':
         return HttpResponseNotAllowed(["GET"])
 
+    buckets = get_dashboard_buckets()
     return JsonResponse(
         {
             "status": "success",
-            'app_priority_dashboard': application_priority_dashboard(),
-            'app_dashboard': application_dashboard(),
-            'loan_dashboard': loan_dashboard(),
+            'app_priority_dashboard': application_priority_dashboard(buckets),
+            'app_dashboard': application_dashboard(buckets),
+            'loan_dashboard': loan_dashboard(buckets),
             'payment_dashboard': {},  # This is kept for backward compatibility in FE
         }
     )
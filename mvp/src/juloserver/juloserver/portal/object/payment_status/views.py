@@ -125,6 +125,7 @@ from juloserver.warning_letter.services import get_current_mtl_wl_web_url
 from juloserver.minisquad.tasks2 import delete_paid_payment_from_intelix_if_exists_async
 from juloserver.collection_vendor.task import assign_agent_for_bucket_5
 from juloserver.portal.object.loan_app.constants import ImageUploadType
+from juloserver.portal.core.pagination import get_keyset_ordering, get_keyset_page
 from .services import check_change_due_date_active
 from .services import check_first_installment_btn_active
 from .utils import (get_list_history,
@@ -2600,20 +2601,33 @@ def ajax_payment_list_view(request):
     processed_model = qs.model
     primary_key = 'id'
 
-    three_next_pages = max_per_page * (page+2) + 1
-    limit = max_per_page * page
-    offset = limit - max_per_page
-    result = qs.values_list(primary_key, flat=True)
-    result = result[offset:three_next_pages]
-    payment_ids = list(result)
-    payment_ids_1page = payment_ids[:max_per_page]
-    count_payment = len(payment_ids)
-    count_page = page + (count_payment // max_per_page) + (count_payment % max_per_page > 0) - 1
-    if count_payment == 0:
-        count_page = page
+    # an empty cursor asks for the first page of the keyset pagination
+    cursor = request.GET.get('cursor')
+    keyset_ordering = get_keyset_ordering(qs) if cursor is not None else None
+    next_cursor = None
+    if keyset_ordering:
+        try:
+            payment_ids_1page, next_cursor = get_keyset_page(
+                qs, keyset_ordering, cursor, max_per_page
+            )
+        except ValueError:
+            return JsonResponse({"status": "failed", "message": "Cursor tidak valid"})
+        count_page = page + 1 if next_cursor else page
+    else:
+        three_next_pages = max_per_page * (page + 2) + 1
+        limit = max_per_page * page
+        offset = limit - max_per_page
+        result = qs.values_list(primary_key, flat=True)
+        result = result[offset:three_next_pages]
+        payment_ids = list(result)
+        payment_ids_1page = payment_ids[:max_per_page]
+        count_payment = len(payment_ids)
+        count_page = page + (count_payment // max_per_page) + (count_payment % max_per_page > 0) - 1
+        if count_payment == 0:
+            count_page = page
 
     # this preserved is needed because random order by postgresql/django
-    preserved = Case(*[When(pk=pk, then=pos) for pos, pk in enumerate(result)])
+    preserved = Case(*[When(pk=pk, then=pos) for pos, pk in enumerate(payment_ids_1page)])
     payments = processed_model.objects.filter(**{primary_key+'__in':payment_ids_1page})\
                                       .order_by(preserved)\
                                       .values(*collection_values)
@@ -2632,6 +2646,7 @@ def ajax_payment_list_view(request):
         'data': payments,
         'count_page': count_page,
         'current_page': page,
+        'next_cursor': next_cursor,
         'payment_lock_list': payment_lock_list(),
         'list_status': list(list_status),
         'list_agent': list(list_agent),
@@ -0,0 +1,49 @@
+from datetime import date
+
+from django.test import TestCase
+
+from juloserver.account.tests.factories import AccountFactory
+from juloserver.account_payment.models import AccountPayment
+from juloserver.account_payment.tests.factories import AccountPaymentFactory
+from juloserver.portal.core.pagination import get_keyset_ordering, get_keyset_page
+
+
+class TestKeysetPagination(TestCase):
+    def setUp(self):
+        account = AccountFactory()
+        for due_date in (
+            date(2026, 10, 1),
+            date(2026, 10, 1),
+            date(2026, 10, 5),
+            date(2026, 10, 5),
+            date(2026, 10, 9),
+        ):
+            AccountPaymentFactory(account=account, due_date=due_date)
+        self.queryset = AccountPayment.objects.filter(account=account)
+
+    def test_keyset_ordering(self):
+        self.assertEqual(
+            get_keyset_ordering(self.queryset.order_by('-due_date')),
+            [('due_date', True), ('id', True)],
+        )
+        self.assertEqual(get_keyset_ordering(self.queryset.order_by('id')), [('id', False)])
+        self.assertIsNone(get_keyset_ordering(self.queryset.order_by('account__status')))
+
+    def test_pages_follow_the_offset_order(self):
+        queryset = self.queryset.order_by('-due_date', '-id')
+        keyset_ordering = get_keyset_ordering(queryset)
+        ids = []
+        cursor = ''
+        pages = 0
+        while cursor is not None:
+            page_ids, cursor = get_keyset_page(queryset, keyset_ordering, cursor, 2)
+            ids.extend(page_ids)
+            pages += 1
+
+        self.assertEqual(pages, 3)
+        self.assertEqual(ids, list(queryset.values_list('id', flat=True)))
+
+    def test_invalid_cursor(self):
+        queryset = self.queryset.order_by('due_date')
+        with self.assertRaises(ValueError):
+            get_keyset_page(queryset, get_keyset_ordering(queryset), 'not-a-cursor', 2)
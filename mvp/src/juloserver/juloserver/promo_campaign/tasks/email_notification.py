@@ -9,7 +9,7 @@ from juloserver.julo.models import (
 )
 from juloserver.julo.clients import get_julo_email_client
 from juloserver.urlshortener.models import ShortenedUrl
-from juloserver.urlshortener.services import shorten_url
+from juloserver.urlshortener.services import get_or_shorten_url
 from juloserver.julo.services2 import encrypt
 
 from ..constants import (
@@ -58,12 +58,7 @@ def send_ramadan_email(payment_id, initiative, reminder_type):
     encrypttext = encrypt()
     encoded_payment_id = encrypttext.encode_string(str(payment.id))
     url = settings.PAYMENT_DETAILS + str(encoded_payment_id)
-    shortened_url = ShortenedUrl.objects.filter(full_url=url).last()
-
-    if not shortened_url:
-        payment_short_url = shorten_url(url)
-    else:
-        payment_short_url = settings.URL_SHORTENER_BASE + shortened_url.short_url
+    payment_short_url = get_or_shorten_url(url)
 
     customer = payment.loan.customer
     promo_history, _ = PromoHistory.objects.get_or_create(
@@ -6,11 +6,10 @@ from celery import task
 
 from juloserver.julo.models import (
     Payment)
-from juloserver.urlshortener.models import ShortenedUrl
 from juloserver.julo.clients import (
     get_julo_email_client,
     get_julo_sms_client)
-from juloserver.urlshortener.services import shorten_url
+from juloserver.urlshortener.services import get_or_shorten_url
 from juloserver.julo.services2 import encrypt
 from ..constants import (
     RamadanCampaign,
@@ -43,12 +42,7 @@ def send_ramadan_sms(payment_id, initiative, reminder_type):
     encrypttext = encrypt()
     encoded_payment_id = encrypttext.encode_string(str(payment.id))
     url = settings.PAYMENT_DETAILS + str(encoded_payment_id)
-    shortened_url = ShortenedUrl.objects.filter(full_url=url).last()
-
-    if not shortened_url:
-        payment_short_url = shorten_url(url)
-    else:
-        payment_short_url = settings.URL_SHORTENER_BASE + shortened_url.short_url
+    payment_short_url = get_or_shorten_url(url)
 
     cust_info = dict(
         customer=customer,
@@ -8,6 +8,7 @@ class RateLimitMessages(Enum):
 class RateLimitAlgorithm(Enum):
     FixedWindow = 0
     SlidingWindow = 1
+    TokenBucket = 2
 
 
 class RateLimitParameter(Enum):
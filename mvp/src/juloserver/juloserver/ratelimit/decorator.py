@@ -11,9 +11,12 @@ from juloserver.ratelimit.constants import (
     RateLimitMessages,
 )
 from juloserver.ratelimit.service import (
+    RateLimitRule,
+    atomic_rate_limit,
     get_key_prefix_from_request,
     fixed_window_rate_limit,
     sliding_window_rate_limit,
+    token_bucket_rate_limit,
 )
 
 from juloserver.standardized_api_response.utils import (
@@ -30,6 +33,7 @@ def rate_limit_incoming_http(
     message: str = RateLimitMessages.Default.value,
     parameters: List[str] = RateLimitParameter.get_default(),
     custom_parameter_values: list = None,
+    additional_limits: List[RateLimitRule] = None,
 ):
     """
     Decorator to ease rate limiting for incoming HTTP requests.
@@ -41,6 +45,8 @@ def rate_limit_incoming_http(
         message (str): The message to be returned when the rate limit is exceeded.
         parameters (List[str]): The list of parameters used to generate the rate limit key.
         custom_parameter_values (list): List of custom parameter values.
+        additional_limits (List[RateLimitRule]): Other limits checked together with the main one
+            in a single Redis round trip. A rule without `parameters` uses the default ones.
 
     Returns:
         The decorated function.
@@ -49,6 +55,17 @@ def rate_limit_incoming_http(
         @rate_limit_incoming_http(max_count=100, time_unit=RateLimitTimeUnit.Minutes)
         def some_view(request):
             pass
+
+        @rate_limit_incoming_http(
+            max_count=100,
+            parameters=[RateLimitParameter.IP],
+            additional_limits=[
+                RateLimitRule(max_count=10, parameters=[RateLimitParameter.AuthenticatedUser]),
+                RateLimitRule(max_count=1000, parameters=[RateLimitParameter.Path]),
+            ],
+        )
+        def some_view(request):
+            pass
     """
 
     def _rate_limit(func):
@@ -58,10 +75,22 @@ def rate_limit_incoming_http(
             key_prefix = get_key_prefix_from_request(request, parameters, custom_parameter_values)
             is_rate_limited = False
 
-            if algo is RateLimitAlgorithm.FixedWindow:
+            if additional_limits:
+                limits = [(key_prefix, RateLimitRule(max_count, time_unit, algo))]
+                for rule in additional_limits:
+                    rule_key_prefix = get_key_prefix_from_request(
+                        request,
+                        rule.parameters or RateLimitParameter.get_default(),
+                        rule.custom_parameter_values,
+                    )
+                    limits.append((rule_key_prefix, rule))
+                is_rate_limited = any(atomic_rate_limit(limits))
+            elif algo is RateLimitAlgorithm.FixedWindow:
                 is_rate_limited = fixed_window_rate_limit(key_prefix, max_count, time_unit)
             elif algo is RateLimitAlgorithm.SlidingWindow:
                 is_rate_limited = sliding_window_rate_limit(key_prefix, max_count, time_unit)
+            elif algo is RateLimitAlgorithm.TokenBucket:
+                is_rate_limited = token_bucket_rate_limit(key_prefix, max_count, time_unit)
 
             if is_rate_limited:
                 logger.info({
@@ -0,0 +1,61 @@
+# Evaluates every requested limit in one atomic call, so neither a lock nor a second
+# round trip is needed between reading and updating a counter.
+#
+# KEYS[i]: the redis key of the i-th limit
+# ARGV[1]: current unix time in milliseconds
+# ARGV[2]: unique id of the call, used as the sliding window member
+# ARGV[3i], ARGV[3i + 1], ARGV[3i + 2]: algorithm, max count and window in milliseconds
+#     of the i-th limit. The algorithm follows RateLimitAlgorithm values.
+#
+# Returns a list with 1 for every limit that is exceeded and 0 otherwise.
+ATOMIC_RATE_LIMIT_SCRIPT = """
+local now = tonumber(ARGV[1])
+local request_id = ARGV[2]
+local results = {}
+
+for i, key in ipairs(KEYS) do
+    local algorithm = tonumber(ARGV[3 * i])
+    local max_count = tonumber(ARGV[3 * i + 1])
+    local window = tonumber(ARGV[3 * i + 2])
+    local is_limited = 0
+
+    if algorithm == 0 then
+        -- fixed window, the key already contains the window number
+        local count = redis.call('INCR', key)
+        if count == 1 then
+            redis.call('PEXPIRE', key, window)
+        end
+        if count > max_count then
+            is_limited = 1
+        end
+
+    elseif algorithm == 1 then
+        -- sliding window log
+        redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+        if redis.call('ZCARD', key) >= max_count then
+            is_limited = 1
+        else
+            redis.call('ZADD', key, now, request_id .. ':' .. i)
+            redis.call('PEXPIRE', key, window)
+        end
+
+    elseif algorithm == 2 then
+        -- token bucket as GCRA, the key stores the theoretical arrival time
+        local emission_interval = window / max_count
+        local tat = tonumber(redis.call('GET', key)) or now
+        if tat < now then
+            tat = now
+        end
+        local new_tat = tat + emission_interval
+        if new_tat - window > now then
+            is_limited = 1
+        else
+            redis.call('SET', key, string.format('%.3f', new_tat), 'PX', math.ceil(new_tat - now))
+        end
+    end
+
+    results[i] = is_limited
+end
+
+return results
+"""
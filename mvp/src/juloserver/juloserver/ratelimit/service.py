@@ -1,4 +1,7 @@
+import uuid
+from dataclasses import dataclass
 from datetime import datetime
+from typing import List, Tuple
 
 from django.http import HttpRequest
 
@@ -6,13 +9,23 @@ from juloserver.julo.services2 import get_redis_client
 from juloserver.julocore.utils import get_client_ip
 
 from .constants import (
+    RateLimitAlgorithm,
     RateLimitCount,
     RateLimitParameter,
     RateLimitTimeUnit,
 )
-from juloserver.julo.constants import RedisLockKeyName
-from juloserver.julo.context_managers import redis_lock_for_update
-from juloserver.julo.exceptions import RetryTimeOutRedis
+from .scripts import ATOMIC_RATE_LIMIT_SCRIPT
+
+_atomic_rate_limit_script = None
+
+
+@dataclass
+class RateLimitRule:
+    max_count: int = RateLimitCount.DefaultPerMinute
+    time_unit: RateLimitTimeUnit = RateLimitTimeUnit.Minutes
+    algo: RateLimitAlgorithm = RateLimitAlgorithm.FixedWindow
+    parameters: list = None
+    custom_parameter_values: list = None
 
 
 def get_key_prefix_from_request(
@@ -87,6 +100,79 @@ def get_time_window(
     return
 
 
+def get_rate_limit_key(
+    key_prefix: str,
+    algo: RateLimitAlgorithm,
+    time_unit: RateLimitTimeUnit,
+    unix_timestamp: int,
+) -> str:
+    """
+    Construct the Redis key of a rate limit.
+
+    Args:
+        key_prefix (str): Prefix for the Redis key.
+        algo (RateLimitAlgorithm): The rate limiting algorithm.
+        time_unit (RateLimitTimeUnit): Time unit for the rate limit.
+        unix_timestamp (int): The Unix timestamp representing the current time.
+
+    Returns:
+        str: The Redis key.
+    """
+
+    if algo is RateLimitAlgorithm.FixedWindow:
+        window = get_time_window(unix_timestamp, time_unit)
+        return 'fixed_window:{}:{}:{}'.format(key_prefix, time_unit.value, window)
+
+    elif algo is RateLimitAlgorithm.SlidingWindow:
+        return 'sliding_window:{}:{}'.format(key_prefix, time_unit.value)
+
+    return 'token_bucket:{}:{}'.format(key_prefix, time_unit.value)
+
+
+def get_atomic_rate_limit_script(redis_client):
+    global _atomic_rate_limit_script
+
+    if _atomic_rate_limit_script is None:
+        _atomic_rate_limit_script = redis_client.register_script(ATOMIC_RATE_LIMIT_SCRIPT)
+
+    return _atomic_rate_limit_script
+
+
+def atomic_rate_limit(limits: List[Tuple[str, RateLimitRule]]) -> List[bool]:
+    """
+    Check and count several rate limits in one atomic Redis script call.
+    Every limit is counted independently of the others.
+
+    Args:
+        limits (List[Tuple[str, RateLimitRule]]): Pairs of key's prefix and the rule to apply.
+
+    Returns:
+        List[bool]: True for every limit that is exceeded, in the same order as `limits`.
+    """
+
+    if not limits:
+        return []
+
+    redis_client = get_redis_client()
+    now = datetime.now().timestamp()
+    unix_timestamp = int(now)
+
+    keys = []
+    args = [int(now * 1000), uuid.uuid4().hex]
+    for key_prefix, rule in limits:
+        keys.append(get_rate_limit_key(key_prefix, rule.algo, rule.time_unit, unix_timestamp))
+        args += [
+            rule.algo.value,
+            rule.max_count,
+            RateLimitTimeUnit.get_ttl(rule.time_unit) * 1000,
+        ]
+
+    script = get_atomic_rate_limit_script(redis_client)
+    results = redis_client.run_script(script, keys, args)
+
+    return [bool(is_limited) for is_limited in results]
+
+
 def fixed_window_rate_limit(
     key_prefix: str = None,
     max_count: int = RateLimitCount.DefaultPerMinute,
@@ -107,21 +193,8 @@ def fixed_window_rate_limit(
         bool: True if the rate limit is exceeded, False otherwise.
     """
 
-    redis_client = get_redis_client()
-    unix_timestamp = int(datetime.now().timestamp())
-    ttl = RateLimitTimeUnit.get_ttl(time_unit)
-    window = get_time_window(unix_timestamp, time_unit)
-
-    # construct the Redis key
-    key = 'fixed_window:{}:{}:{}'.format(key_prefix, time_unit.value, window)
-
-    # increment to current window
-    count = redis_client.increment(key)
-
-    # set expiration
-    redis_client.expire(key, ttl)  # TODO: explore NX's compatibility
-
-    return count > max_count
+    rule = RateLimitRule(max_count, time_unit, RateLimitAlgorithm.FixedWindow)
+    return atomic_rate_limit([(key_prefix, rule)])[0]
 
 
 def sliding_window_rate_limit(
@@ -143,30 +216,29 @@ def sliding_window_rate_limit(
         bool: True if the rate limit is exceeded, False otherwise.
     """
 
-    redis_client = get_redis_client()
-    now = datetime.now()
-    unix_timestamp = now.timestamp()
-    ttl = RateLimitTimeUnit.get_ttl(time_unit)
-
-    # construct the Redis key
-    key = 'sliding_window:{}'.format(key_prefix)
-
-    try:
-        with redis_lock_for_update(RedisLockKeyName.RATE_LIMITER, key, timeout_second=5):
-            # remove timestamps outside the sliding window
-            min_score = unix_timestamp - RateLimitTimeUnit.get_ttl(time_unit)
-            redis_client.zremrangebyscore(key, '-inf', min_score)
-
-            count = redis_client.zcard(key)
-            is_rate_limited = count >= max_count
-
-            if not is_rate_limited:
-                # increment the current sliding window
-                redis_client.zadd(key, **{str(unix_timestamp): unix_timestamp})
-
-                # set expiration
-                redis_client.expire(key, ttl)
-            return is_rate_limited
-    except RetryTimeOutRedis:
-        # By pass if the lock is not acquired because of timeout
-        return False
+    rule = RateLimitRule(max_count, time_unit, RateLimitAlgorithm.SlidingWindow)
+    return atomic_rate_limit([(key_prefix, rule)])[0]
+
+
+def token_bucket_rate_limit(
+    key_prefix: str = None,
+    max_count: int = RateLimitCount.DefaultPerMinute,
+    time_unit: RateLimitTimeUnit = RateLimitTimeUnit.Minutes,
+) -> bool:
+    """
+    Token bucket rate limiting using GCRA in Redis. The bucket holds `max_count` tokens
+    and is refilled evenly over one time unit.
+
+    Args:
+        key_prefix (str, optional): Prefix for the Redis key. Defaults to None.
+        max_count (int, optional): Size of the bucket and number of tokens refilled per time unit.
+            Defaults to RateLimitCount.DefaultPerMinute.
+        time_unit (RateLimitTimeUnit, optional): Time unit for the refill rate.
+            Defaults to RateLimitTimeUnit.Minutes.
+
+    Returns:
+        bool: True if the rate limit is exceeded, False otherwise.
+    """
+
+    rule = RateLimitRule(max_count, time_unit, RateLimitAlgorithm.TokenBucket)
+    return atomic_rate_limit([(key_prefix, rule)])[0]
@@ -6,7 +6,9 @@ from juloserver.ratelimit.decorator import rate_limit_incoming_http
 
 from juloserver.ratelimit.constants import (
     RateLimitAlgorithm,
+    RateLimitParameter,
 )
+from juloserver.ratelimit.service import RateLimitRule
 
 
 class TestRateLimitDecorator(TestCase):
@@ -60,3 +62,46 @@ class TestRateLimitDecorator(TestCase):
 
         resp = mock_call(mock.MagicMock(), mock.MagicMock())
         self.assertEqual(resp.status_code, 429)
+
+    @patch('juloserver.ratelimit.decorator.token_bucket_rate_limit')
+    @patch('juloserver.ratelimit.decorator.get_key_prefix_from_request')
+    def test_rate_limit_exceeded_decorator_token_bucket(
+        self,
+        mock_get_key_prefix_from_request,
+        mock_token_bucket_rate_limit,
+    ):
+        mock_get_key_prefix_from_request.return_value = 'some_key'
+        mock_token_bucket_rate_limit.return_value = True
+
+        @rate_limit_incoming_http(algo=RateLimitAlgorithm.TokenBucket)
+        def mock_call(view, request):
+            return None
+
+        resp = mock_call(mock.MagicMock(), mock.MagicMock())
+        self.assertEqual(resp.status_code, 429)
+
+    @patch('juloserver.ratelimit.decorator.atomic_rate_limit')
+    @patch('juloserver.ratelimit.decorator.get_key_prefix_from_request')
+    def test_rate_limit_exceeded_additional_limits(
+        self,
+        mock_get_key_prefix_from_request,
+        mock_atomic_rate_limit,
+    ):
+        mock_get_key_prefix_from_request.side_effect = ['ip_key', 'user_key']
+        mock_atomic_rate_limit.return_value = [False, True]
+
+        user_rule = RateLimitRule(max_count=5, parameters=[RateLimitParameter.AuthenticatedUser])
+
+        @rate_limit_incoming_http(
+            parameters=[RateLimitParameter.IP],
+            additional_limits=[user_rule],
+        )
+        def mock_call(view, request):
+            return None
+
+        resp = mock_call(mock.MagicMock(), mock.MagicMock())
+        self.assertEqual(resp.status_code, 429)
+
+        limits = mock_atomic_rate_limit.call_args[0][0]
+        self.assertEqual([key_prefix for key_prefix, _ in limits], ['ip_key', 'user_key'])
+        self.assertIs(limits[1][1], user_rule)
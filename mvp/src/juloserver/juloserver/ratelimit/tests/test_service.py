@@ -3,13 +3,21 @@ from django.test import TestCase
 import mock
 from unittest.mock import patch
 
-from juloserver.ratelimit.constants import RateLimitParameter, RateLimitTimeUnit
+from juloserver.ratelimit.constants import (
+    RateLimitAlgorithm,
+    RateLimitParameter,
+    RateLimitTimeUnit,
+)
 
 from juloserver.ratelimit.service import (
+    RateLimitRule,
+    atomic_rate_limit,
     get_key_prefix_from_request,
+    get_rate_limit_key,
     get_time_window,
     fixed_window_rate_limit,
     sliding_window_rate_limit,
+    token_bucket_rate_limit,
 )
 
 
@@ -126,7 +134,7 @@ class TestFixedWindowRateLimit(TestCase):
         mock_datetime.now.return_value.timestamp.return_value = 123456789
 
         mock_redis_client = mock.MagicMock()
-        mock_redis_client.increment.return_value = 69
+        mock_redis_client.run_script.return_value = [0]
         mock_get_redis_client.return_value = mock_redis_client
 
         resp = fixed_window_rate_limit('some prefix', 96, RateLimitTimeUnit.Seconds)
@@ -142,7 +150,7 @@ class TestFixedWindowRateLimit(TestCase):
         mock_datetime.now.return_value.timestamp.return_value = 123456789
 
         mock_redis_client = mock.MagicMock()
-        mock_redis_client.increment.return_value = 96
+        mock_redis_client.run_script.return_value = [1]
         mock_get_redis_client.return_value = mock_redis_client
 
         resp = fixed_window_rate_limit('some prefix', 69, RateLimitTimeUnit.Seconds)
@@ -160,7 +168,7 @@ class TestSlidingWindowRateLimit(TestCase):
         mock_datetime.now.return_value.timestamp.return_value = 123456789
 
         mock_redis_client = mock.MagicMock()
-        mock_redis_client.zcard.return_value = 69
+        mock_redis_client.run_script.return_value = [0]
         mock_get_redis_client.return_value = mock_redis_client
 
         resp = sliding_window_rate_limit('some prefix', 96, RateLimitTimeUnit.Seconds)
@@ -176,8 +184,96 @@ class TestSlidingWindowRateLimit(TestCase):
         mock_datetime.now.return_value.timestamp.return_value = 123456789
 
         mock_redis_client = mock.MagicMock()
-        mock_redis_client.zcard.return_value = 96
+        mock_redis_client.run_script.return_value = [1]
         mock_get_redis_client.return_value = mock_redis_client
 
         resp = sliding_window_rate_limit('some prefix', 69, RateLimitTimeUnit.Seconds)
         self.assertTrue(resp)
+
+
+class TestTokenBucketRateLimit(TestCase):
+    @patch('juloserver.ratelimit.service.get_redis_client')
+    @patch('juloserver.ratelimit.service.datetime')
+    def test_rate_limit_not_exceeded(
+        self,
+        mock_datetime,
+        mock_get_redis_client,
+    ):
+        mock_datetime.now.return_value.timestamp.return_value = 123456789
+
+        mock_redis_client = mock.MagicMock()
+        mock_redis_client.run_script.return_value = [0]
+        mock_get_redis_client.return_value = mock_redis_client
+
+        resp = token_bucket_rate_limit('some prefix', 96, RateLimitTimeUnit.Seconds)
+        self.assertFalse(resp)
+
+    @patch('juloserver.ratelimit.service.get_redis_client')
+    @patch('juloserver.ratelimit.service.datetime')
+    def test_rate_limit_exceeded(
+        self,
+        mock_datetime,
+        mock_get_redis_client,
+    ):
+        mock_datetime.now.return_value.timestamp.return_value = 123456789
+
+        mock_redis_client = mock.MagicMock()
+        mock_redis_client.run_script.return_value = [1]
+        mock_get_redis_client.return_value = mock_redis_client
+
+        resp = token_bucket_rate_limit('some prefix', 69, RateLimitTimeUnit.Seconds)
+        self.assertTrue(resp)
+
+
+class TestGetRateLimitKey(TestCase):
+    def test_fixed_window(self):
+        resp = get_rate_limit_key(
+            'prefix', RateLimitAlgorithm.FixedWindow, RateLimitTimeUnit.Minutes, 69
+        )
+        self.assertEqual(resp, 'fixed_window:prefix:1:1')
+
+    def test_sliding_window(self):
+        resp = get_rate_limit_key(
+            'prefix', RateLimitAlgorithm.SlidingWindow, RateLimitTimeUnit.Hours, 69
+        )
+        self.assertEqual(resp, 'sliding_window:prefix:2')
+
+    def test_token_bucket(self):
+        resp = get_rate_limit_key(
+            'prefix', RateLimitAlgorithm.TokenBucket, RateLimitTimeUnit.Seconds, 69
+        )
+        self.assertEqual(resp, 'token_bucket:prefix:0')
+
+
+class TestAtomicRateLimit(TestCase):
+    def test_no_limit(self):
+        self.assertEqual(atomic_rate_limit([]), [])
+
+    @patch('juloserver.ratelimit.service.uuid')
+    @patch('juloserver.ratelimit.service.get_redis_client')
+    @patch('juloserver.ratelimit.service.datetime')
+    def test_all_limits_in_one_script_call(
+        self,
+        mock_datetime,
+        mock_get_redis_client,
+        mock_uuid,
+    ):
+        mock_datetime.now.return_value.timestamp.return_value = 69.5
+        mock_uuid.uuid4.return_value.hex = 'request-id'
+
+        mock_redis_client = mock.MagicMock()
+        mock_redis_client.run_script.return_value = [0, 1, 0]
+        mock_get_redis_client.return_value = mock_redis_client
+
+        resp = atomic_rate_limit([
+            ('ip', RateLimitRule(10, RateLimitTimeUnit.Minutes, RateLimitAlgorithm.FixedWindow)),
+            ('user', RateLimitRule(5, RateLimitTimeUnit.Seconds, RateLimitAlgorithm.SlidingWindow)),
+            ('path', RateLimitRule(100, RateLimitTimeUnit.Hours, RateLimitAlgorithm.TokenBucket)),
+        ])
+
+        self.assertEqual(resp, [False, True, False])
+        mock_redis_client.run_script.assert_called_once_with(
+            mock.ANY,
+            ['fixed_window:ip:1:1', 'sliding_window:user:0', 'token_bucket:path:2'],
+            [69500, 'request-id', 0, 10, 60000, 1, 5, 1000, 2, 100, 3600000],
+        )
@@ -31,7 +31,7 @@ class GeneralAIRudderPDSClient(AIRudderPDSClient):
             'APPSecret': self.api_secret_key
         }
 
-        response = requests.post(auth_api, data=app_info)
+        response = self.session.post(auth_api, data=app_info)
         parsed_response = json.loads(response.text)
         self.logger.info({
             'action': 'refresh_token',
@@ -567,6 +567,11 @@ CACHEOPS_ENABLED = os.getenv("CACHEOPS_ENABLED", True)
 
 CACHEOPS_LRU = os.getenv("CACHEOPS_LRU", True)
 
+# process-local FeatureSetting copy, see juloserver.julo.services2.feature_setting
+FEATURE_SETTING_CACHE_ENABLED = os.getenv("FEATURE_SETTING_CACHE_ENABLED", True)
+
+FEATURE_SETTING_CACHE_CHECK_INTERVAL = float(os.getenv("FEATURE_SETTING_CACHE_CHECK_INTERVAL", 1))
+
 CACHEOPS = {
     'androidcard.AndroidCard': {'ops': 'all', 'timeout': 60 * 60 * 24 * 14},
     'application_flow.EmulatorCheck': {'ops': 'all', 'timeout': 60 * 60 * 24 * 14},
@@ -828,6 +833,10 @@ DOGSLOW_LOG_TO_FILE = False
 class RequestIDHandler(WatchedFileHandler):
     def emit(self, record):
         from juloserver.julo.middleware import get_request_id
+        if getattr(record, 'request_id', None):
+            # already read by the AsyncHandler on the thread of the request
+            return super().emit(record)
+
         try:
             request_id = get_request_id()
             if request_id:
@@ -919,6 +928,17 @@ LOGGING = {
     },
 }
 
+# write the server and the api log from a listener thread instead of the request thread
+JULOLOG_ASYNC_HANDLER = os.getenv('JULOLOG_ASYNC_HANDLER', 'false').lower() == 'true'
+if JULOLOG_ASYNC_HANDLER:
+    for handler_name in ('logfile_server', 'logfile_api'):
+        LOGGING['handlers'][handler_name].update(
+            {
+                'class': 'juloserver.julolog.handlers.AsyncHandler',
+                'target': 'juloserver.settings.base.RequestIDHandler',
+            }
+        )
+
 EMAIL_USE_TLS = True
 EMAIL_HOST = 'smtp.gmail.com'
 EMAIL_HOST_USER = 'cs@julofinance.com'
@@ -23,6 +23,7 @@ from juloserver.customer_module.settings import (
 from juloserver.autodebet.settings import AUTODEBET_SCHEDULE
 from juloserver.sales_ops.settings import SALES_OPS_SCHEDULE
 from juloserver.julovers.settings import JULOVERS_SCHEDULE
+from juloserver.user_action_logs.settings import USER_ACTION_LOG_SCHEDULE
 from juloserver.channeling_loan.settings import CHANNELING_SCHEDULE
 from juloserver.account.settings import ACCOUNT_SCHEDULE
 from juloserver.account_payment.settings import ACCOUNT_PAYMENT_SCHEDULE
@@ -1074,6 +1075,7 @@ CELERYBEAT_SCHEDULE.update(FDC_CELERYBEAT_SCHEDULE)
 CELERYBEAT_SCHEDULE.update(AUTODEBET_SCHEDULE)
 CELERYBEAT_SCHEDULE.update(SALES_OPS_SCHEDULE)
 CELERYBEAT_SCHEDULE.update(JULOVERS_SCHEDULE)
+CELERYBEAT_SCHEDULE.update(USER_ACTION_LOG_SCHEDULE)
 CELERYBEAT_SCHEDULE.update(CHANNELING_SCHEDULE)
 CELERYBEAT_SCHEDULE.update(ACCOUNT_SCHEDULE)
 CELERYBEAT_SCHEDULE.update(ACCOUNT_PAYMENT_SCHEDULE)
@@ -24,7 +24,28 @@ LOGGING_BLACKLISTED_PATHS = [
     'api/v2/otp/change-password/',
     'api/v1/rest-auth/password/',
     'api/v1/applications/external-data-imports/',
-    'api/pin/v1/check-strong-pin'
+    'api/pin/v1/check-strong-pin',
     'api/registration-flow/v1/register',
     'api/registration-flow/v2/register',
 ]
+
+# api paths of which the error responses are not logged by ApiLoggingMiddleware
+API_LOGGING_EXCLUDED_PATHS = [
+    'api/liveness-detection/',
+    'api/application-form/v2/application',
+    'api/application-form/v1/cancel',
+    'api/application-form/v2/reapply',
+    'api/application_flow/v1/bottom-sheet-tutorial',
+    'api/julo-starter/v1/application',
+    'api/otp/v1/validate',
+    'api/otp/v2/validate',
+    'api/otp/v1/request',
+    'api/otp/v2/request',
+    'api/pin/v3/login',
+    'api/pin/v4/login',
+    'api/otp/v1/check-user-allowed',
+    'api/customer-module/v1/appsflyer',
+]
+
+# bytes of the request and the response body kept in an api error log
+API_LOGGING_MAX_BODY_SIZE = 10000
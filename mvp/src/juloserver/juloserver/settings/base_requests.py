@@ -1,3 +1,5 @@
+import os
+
 import requests
 
 REQUEST_CONNECT_TIMEOUT = 20
@@ -16,3 +18,16 @@ class JuloRequestSession(requests.Session):
         return super().request(*args, timeout=timeout, **kwargs)
 
 requests.sessions.Session = JuloRequestSession
+
+# julocore.http_transport, one keep-alive pool per host for every vendor session
+HTTP_TRANSPORT_CONFIG = {
+    'pool_connections': 10,
+    'pool_maxsize': int(os.getenv('HTTP_TRANSPORT_POOL_MAXSIZE', 10)),
+    'max_retries': 2,
+    'backoff_factor': 0.5,
+    'status_forcelist': [],
+    'timeout': TIMEOUT_SET,
+}
+HTTP_TRANSPORT_VENDOR_CONFIG = {
+    'pii_vault': {'pool_maxsize': int(os.getenv('HTTP_TRANSPORT_PII_VAULT_POOL_MAXSIZE', 20))},
+}
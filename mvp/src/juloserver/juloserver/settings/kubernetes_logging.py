@@ -1,3 +1,5 @@
+import os
+
 
 LOGGING = {
     'version': 1,
@@ -40,4 +42,10 @@ LOGGING = {
             'propagate': True
         }
     },
-}
\ No newline at end of file
+}
+
+# write the log from a listener thread instead of the request thread
+if os.getenv('JULOLOG_ASYNC_HANDLER', 'false').lower() == 'true':
+    LOGGING['handlers']['console'].update(
+        {'class': 'juloserver.julolog.handlers.AsyncHandler', 'target': 'logging.StreamHandler'}
+    )
@@ -8,6 +8,8 @@ CELERY_ALWAYS_EAGER = True
 
 CACHEOPS_ENABLED = False
 
+FEATURE_SETTING_CACHE_ENABLED = False
+
 DATABASES = {
     'default': {
         'ENGINE': 'juloserver.julocore.customized_psycopg2',
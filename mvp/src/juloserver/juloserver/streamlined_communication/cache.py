@@ -1,8 +1,14 @@
+import threading
 from abc import (
     ABC,
     abstractmethod,
 )
+from collections import OrderedDict
 from datetime import timedelta
+from functools import lru_cache
+from operator import attrgetter
+
+from django.template import Context, Template
 
 from juloserver.julo.services2 import get_redis_client
 
@@ -57,3 +63,65 @@ class RedisCache(BaseCache):
 
     def remove_element(self, start, end):
         return self.redis_client.remove_element(self.key, start, end)
+
+
+class CompiledTemplateCache(object):
+    """
+    Process-local LRU of the compiled django Templates of the streamlined messages, so a
+    message rendered for every customer of a blast is parsed once per process.
+
+    A StreamlinedMessage is keyed by its id and udate, any other template by its content.
+    The content is kept with the compiled template and compared on a hit, a message
+    changed by a queryset update without a new udate is compiled again.
+    """
+
+    def __init__(self, max_size=1024):
+        self.max_size = max_size
+        self.templates = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, template_string, key=None):
+        key = key or template_string
+        with self.lock:
+            cached = self.templates.get(key)
+            if cached and cached[0] == template_string:
+                self.templates.move_to_end(key)
+                return cached[1]
+
+        template = Template(template_string)
+        with self.lock:
+            self.templates[key] = (template_string, template)
+            self.templates.move_to_end(key)
+            while len(self.templates) > self.max_size:
+                self.templates.popitem(last=False)
+        return template
+
+    def clear(self):
+        with self.lock:
+            self.templates.clear()
+
+
+compiled_template_cache = CompiledTemplateCache()
+
+
+def get_compiled_template(template_string, streamlined_message=None):
+    key = None
+    if streamlined_message is not None and streamlined_message.id:
+        key = ('streamlined_message', streamlined_message.id, streamlined_message.udate)
+    return compiled_template_cache.get(template_string, key)
+
+
+def render_template(template_string, context, streamlined_message=None):
+    return get_compiled_template(template_string, streamlined_message).render(Context(context))
+
+
+def render_templates(template_string, contexts, streamlined_message=None):
+    """Render one template with every context, the template is compiled at most once."""
+    template = get_compiled_template(template_string, streamlined_message)
+    return [template.render(Context(context)) for context in contexts]
+
+
+@lru_cache(maxsize=None)
+def get_parameter_getter(parameter):
+    """attrgetter of a message parameter, what eval("models.<parameter>") returned."""
+    return attrgetter(parameter)
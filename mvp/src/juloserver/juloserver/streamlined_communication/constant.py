@@ -628,6 +628,7 @@ class RedisKey(object):
     STREAMLINE_SMS_AFTER_ROBOCALL_EXPERIMENT = 'STREAMLINE_SMS_AFTER_ROBOCALL_EXPERIMENT_{}_{}'
 
     EMAIL_UNSENT_MOENGAGE = 'EMAIL_UNSENT_MOENGAGE_STREAMLINED_ID_{}'
+    SMS_CAMPAIGN_PROGRESS = 'streamlined_communication:sms_campaign_progress:{}'
 
 
 class ImageType(object):
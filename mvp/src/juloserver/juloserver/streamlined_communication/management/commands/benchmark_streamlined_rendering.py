@@ -0,0 +1,74 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.template import Context, Template
+
+from juloserver.streamlined_communication.cache import (
+    compiled_template_cache,
+    render_template,
+    render_templates,
+)
+from juloserver.streamlined_communication.models import StreamlinedMessage
+
+SAMPLE_MESSAGE = (
+    '{{ name_with_title }}, tagihan JULO Anda sebesar {{ due_amount }} jatuh tempo pada '
+    '{{ due_date }}. Bayar sekarang melalui {{ bank_name }} VA {{ account_number }} '
+    'dan dapatkan cashback {{ cashback_amount }}. {% if payment_details_url %}Detail: '
+    '{{ payment_details_url }}{% endif %}'
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark the renders per second of a streamlined message before and after the '
+        'compiled template cache'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--renders', type=int, default=100000)
+        parser.add_argument(
+            '--streamlined-message-id', type=int, help='render this message instead of a sample'
+        )
+
+    def handle(self, *args, **options):
+        streamlined_message = None
+        message = SAMPLE_MESSAGE
+        if options['streamlined_message_id']:
+            streamlined_message = StreamlinedMessage.objects.get(
+                pk=options['streamlined_message_id']
+            )
+            message = streamlined_message.message_content
+
+        contexts = [
+            dict(
+                name_with_title='Bapak Customer {}'.format(index),
+                due_amount='Rp {}'.format(index * 1000),
+                due_date='18-10-2026',
+                bank_name='BCA',
+                account_number='10994{:08d}'.format(index),
+                cashback_amount='Rp 5.000',
+                payment_details_url='https://julo.co.id/p/{}'.format(index),
+            )
+            for index in range(options['renders'])
+        ]
+
+        compiled_template_cache.clear()
+        for name, render in (
+            ('template per render', self.render_uncached),
+            ('cached template', self.render_cached),
+            ('batch render', render_templates),
+        ):
+            start = time.time()
+            render(message, contexts, streamlined_message)
+            elapsed = max(time.time() - start, 0.001)
+            self.stdout.write(
+                self.style.SUCCESS(
+                    '{}: {:.0f} renders/s'.format(name, options['renders'] / elapsed)
+                )
+            )
+
+    def render_uncached(self, message, contexts, streamlined_message):
+        return [Template(message).render(Context(context)) for context in contexts]
+
+    def render_cached(self, message, contexts, streamlined_message):
+        return [render_template(message, context, streamlined_message) for context in contexts]
@@ -0,0 +1,85 @@
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import router, transaction
+
+from juloserver.julo.models import CommsProviderLookup
+from juloserver.streamlined_communication.models import (
+    CommsCampaignSmsHistory,
+    StreamlinedCommunicationCampaign,
+)
+from juloserver.streamlined_communication.services2.sms_campaign import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_MAX_WORKERS,
+    SmsCampaignBlast,
+)
+
+STUB_VENDOR = 'nexmo'
+
+
+class StubSmsClient(object):
+    """Answers like a vendor after the given latency, nothing is sent."""
+
+    def __init__(self, latency):
+        self.latency = latency
+
+    def send_sms(self, phone_number, message):
+        time.sleep(self.latency)
+        return message, {
+            'messages': [
+                {
+                    'status': '0',
+                    'message-id': uuid.uuid4().hex,
+                    'to': phone_number,
+                    'julo_sms_vendor': STUB_VENDOR,
+                    'is_comms_campaign_sms': True,
+                }
+            ]
+        }
+
+
+class Command(BaseCommand):
+    help = (
+        'Send a campaign to synthetic phone numbers through SmsCampaignBlast with a stub SMS '
+        'vendor. The histories are rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('campaign_id', type=int)
+        parser.add_argument('--recipients', type=int, default=500000)
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument('--max-workers', type=int, default=DEFAULT_MAX_WORKERS)
+        parser.add_argument(
+            '--latency', type=float, default=0.005, help='stub vendor latency in seconds'
+        )
+
+    def handle(self, *args, **options):
+        campaign = StreamlinedCommunicationCampaign.objects.get(pk=options['campaign_id'])
+        recipients = (
+            (None, '+62812{:08d}'.format(index)) for index in range(options['recipients'])
+        )
+        using = router.db_for_write(CommsCampaignSmsHistory)
+        with transaction.atomic(using=using):
+            CommsProviderLookup.objects.get_or_create(provider_name=STUB_VENDOR)
+            blast = SmsCampaignBlast(
+                campaign,
+                'phone_number',
+                batch_size=options['batch_size'],
+                max_workers=options['max_workers'],
+                sms_client=StubSmsClient(options['latency']),
+            )
+            # a dry run must not show up in the progress of the real campaign
+            blast.progress_key = '{}:dry_run'.format(blast.progress_key)
+            start = time.time()
+            summary = blast.run(recipients)
+            elapsed = time.time() - start
+            transaction.set_rollback(True, using=using)
+
+        blast.redis_client.delete_key(blast.progress_key)
+        self.stdout.write(
+            self.style.SUCCESS(
+                '{sent_count} sent, {failed_count} failed in {elapsed:.1f}s, '
+                '{messages_per_second} messages/s'.format(elapsed=elapsed, **summary)
+            )
+        )
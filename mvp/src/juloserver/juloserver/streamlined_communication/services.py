@@ -10,7 +10,6 @@ from django.db.models import (
     Count,
     Sum,
 )
-from django.template import Template, Context
 from django.forms.models import model_to_dict
 from babel.numbers import format_decimal
 
@@ -92,7 +91,11 @@ from juloserver.julo.utils import (
 )
 from juloserver.payback.constants import GopayAccountStatusConst
 from juloserver.payment_point.constants import TransactionMethodCode
-from juloserver.streamlined_communication.cache import RedisCache
+from juloserver.streamlined_communication.cache import (
+    RedisCache,
+    get_parameter_getter,
+    render_template,
+)
 from juloserver.referral.services import show_referral_code
 from juloserver.streamlined_communication.constant import (
     CardProperty,
@@ -183,24 +186,19 @@ def process_streamlined_comm(filter_, replaced_data=None):
     message = streamlined_comm.message.message_content
     parameter = streamlined_comm.message.parameter
     if parameter and replaced_data:
-        template = Template(message)
-        message = template.render(Context(replaced_data))
+        message = render_template(message, replaced_data, streamlined_comm.message)
     return message
 
 
 def process_streamlined_comm_without_filter(streamlined_comm, available_context):
     message = streamlined_comm.message.message_content
-    template = Template(message)
-    message = template.render(Context(available_context))
-    return message
+    return render_template(message, available_context, streamlined_comm.message)
 
 
 def process_streamlined_comm_context_base_on_model(streamlined_comm, models):
     context = model_to_dict(models)
     message = streamlined_comm.message.message_content
-    template = Template(message)
-    message = template.render(Context(context))
-    return message
+    return render_template(message, context, streamlined_comm.message)
 
 
 def process_streamlined_comm_context_base_on_model_and_parameter(
@@ -210,27 +208,22 @@ def process_streamlined_comm_context_base_on_model_and_parameter(
     parameters = streamlined_comm.message.parameter
     for parameter in parameters:
         if hasattr(models, parameter):
-            key = "models.{}".format(parameter)
-            context[parameter] = eval(key)
+            context[parameter] = get_parameter_getter(parameter)(models)
             if parameter == 'current_balance' and context[parameter]:
                 context[parameter] = format_decimal(context[parameter], locale='id_ID')
         if parameter == 'fullname':
             context[parameter] = models.loan.application.full_name_only
 
-    template = Template(message)
-    message = template.render(Context(context))
+    message = render_template(message, context, streamlined_comm.message)
     if is_with_header:
-        template_header = Template(streamlined_comm.heading_title)
-        heading_title = template_header.render(Context(context))
+        heading_title = render_template(streamlined_comm.heading_title, context)
         return message, heading_title
 
     return message
 
 
 def process_streamlined_comm_email_subject(subject_title, context):
-    template = Template(subject_title)
-    rendered_subject = template.render(Context(context))
-    return rendered_subject
+    return render_template(subject_title, context)
 
 
 def get_pn_action_buttons(streamlined_communication_id):
@@ -251,9 +244,7 @@ def get_pn_action_buttons(streamlined_communication_id):
 
 
 def process_convert_params_to_data(message, available_context):
-    template = Template(message)
-    message = template.render(Context(available_context))
-    return message
+    return render_template(message, available_context)
 
 
 def format_info_card_data(qs):
@@ -644,9 +635,7 @@ def process_sms_message_j1(message, model, is_have_account_payment=False):
             available_context[sms_parameter.replace_symbols] = final_value
         except Exception:
             continue
-    template = Template(message)
-    message = template.render(Context(available_context))
-    return message
+    return render_template(message, available_context)
 
 
 def is_first_time_user_paid_for_first_installment(application):
@@ -934,9 +923,7 @@ def process_partner_sms_message(message, model):
         except Exception:
             continue
 
-    template = Template(message)
-    message = template.render(Context(available_context))
-    return message
+    return render_template(message, available_context)
 
 
 def exclude_experiment_excellent_customer_from_robocall(account_payments, record_type=None):
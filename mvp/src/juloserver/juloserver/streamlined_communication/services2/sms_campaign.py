@@ -0,0 +1,332 @@
+"""
+Execution engine of the approved SMS campaigns.
+
+The recipients of the user segment are resolved in chunks with one query per chunk, then cut
+into batches that are sent from a bounded thread pool. The threads only talk to the SMS
+vendor, the calling thread bulk creates the CommsCampaignSmsHistory of every batch with the
+campaign set and counts the progress in a redis hash, so no campaign row is locked.
+"""
+import csv
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from io import StringIO
+
+from django.db import connection
+
+from juloserver.julo.clients import get_julo_sms_client
+from juloserver.julo.constants import FeatureNameConst
+from juloserver.julo.exceptions import InvalidPhoneNumberError
+from juloserver.julo.models import Application, CommsProviderLookup, FeatureSetting
+from juloserver.julo.services2 import get_redis_client
+from juloserver.julo.utils import (
+    format_e164_indo_phone_number,
+    format_valid_e164_indo_phone_number,
+)
+from juloserver.account.models import Account
+from juloserver.streamlined_communication.constant import RedisKey
+from juloserver.streamlined_communication.models import (
+    CommsCampaignSmsHistory,
+    TelcoServiceProvider,
+)
+from juloserver.streamlined_communication.utils import identify_telco_code_and_tsp_name
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 5000
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_MAX_WORKERS = 8
+PROGRESS_EXPIRE_SECONDS = 7 * 24 * 60 * 60
+CSV_HEADERS = ('application_id', 'account_id', 'customer_id', 'phone_number')
+# the vendors whose failed responses still have a history, see create_sms_history
+FAILED_HISTORY_VENDORS = ('infobip', 'alicloud', 'whatsapp_service')
+
+
+def get_sms_campaign_blast_setting():
+    """
+    Return:
+        dict of chunk_size, batch_size and max_workers when the campaigns are sent by the
+        engine, None otherwise
+    """
+    feature_setting = FeatureSetting.objects.get_cached(
+        FeatureNameConst.SMS_CAMPAIGN_BLAST_ENGINE, is_active=True
+    )
+    if not feature_setting:
+        return None
+
+    parameters = feature_setting.parameters or {}
+    return dict(
+        chunk_size=parameters.get('chunk_size', DEFAULT_CHUNK_SIZE),
+        batch_size=parameters.get('batch_size', DEFAULT_BATCH_SIZE),
+        max_workers=parameters.get('max_workers', DEFAULT_MAX_WORKERS),
+    )
+
+
+def get_user_segment_csv_data(downloadable_response):
+    """
+    Return:
+        (header, csv_data_list) of a user segment csv, (None, None) when the header is not
+        one of CSV_HEADERS
+    """
+    csv_content = b''.join(downloadable_response.streaming_content)
+    csv_reader = csv.reader(StringIO(csv_content.decode('utf-8')))
+    try:
+        header = next(csv_reader)
+    except StopIteration:
+        return None, None
+
+    if header[0] not in CSV_HEADERS:
+        return None, None
+
+    csv_data_list = []
+    for row in csv_reader:
+        if row[0].strip():
+            try:
+                csv_data_list.append(int(row[0].strip()))
+            except ValueError:
+                logger.warning(
+                    {
+                        'message': 'Skipping invalid value',
+                        'method_name': 'get_user_segment_csv_data',
+                        'value': row[0],
+                    }
+                )
+    return header[0], csv_data_list
+
+
+def get_latest_mobile_phones(customer_ids):
+    """mobile_phone_1 of the last application of every customer, like application_set.last()"""
+    return dict(
+        Application.objects.filter(customer_id__in=customer_ids)
+        .order_by('customer_id', '-id')
+        .distinct('customer_id')
+        .values_list('customer_id', 'mobile_phone_1')
+    )
+
+
+def resolve_recipient_chunk(column_header, csv_data_list):
+    """
+    Return:
+        list of (csv_item_id, mobile_phone) of the csv items found, one query per model
+        instead of the application_set.last() per row of get_mobile_numbers_list
+    """
+    if column_header == 'account_id':
+        account_customers = list(
+            Account.objects.filter(pk__in=csv_data_list).values_list('id', 'customer_id')
+        )
+        mobile_phones = get_latest_mobile_phones(
+            [customer_id for _, customer_id in account_customers]
+        )
+        return [
+            (account_id, mobile_phones[customer_id])
+            for account_id, customer_id in account_customers
+            if customer_id in mobile_phones
+        ]
+    elif column_header == 'application_id':
+        return list(
+            Application.objects.filter(pk__in=csv_data_list).values_list('id', 'mobile_phone_1')
+        )
+    elif column_header == 'customer_id':
+        return list(get_latest_mobile_phones(csv_data_list).items())
+    elif column_header == 'phone_number':
+        return [(None, str(phone_number)) for phone_number in csv_data_list]
+    return []
+
+
+def resolve_campaign_recipients(column_header, csv_data_list, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yield (csv_item_id, phone_number) of every csv item with a valid mobile phone, the
+    phone number formatted like get_mobile_numbers_list does.
+    """
+    for start in range(0, len(csv_data_list), chunk_size):
+        chunk = csv_data_list[start:start + chunk_size]
+        for csv_item_id, mobile_phone in resolve_recipient_chunk(column_header, chunk):
+            try:
+                format_valid_e164_indo_phone_number(mobile_phone)
+            except InvalidPhoneNumberError:
+                logger.warning(
+                    {
+                        'message': 'Invalid phone number.',
+                        'method_name': 'resolve_campaign_recipients',
+                        'mobile_number': mobile_phone,
+                    }
+                )
+                continue
+            yield csv_item_id, format_e164_indo_phone_number(mobile_phone)
+
+
+def get_sms_campaign_progress(campaign_id):
+    return get_redis_client().hgetall(RedisKey.SMS_CAMPAIGN_PROGRESS.format(campaign_id))
+
+
+class SmsCampaignBlast(object):
+    csv_item_fields = {
+        'account_id': 'account_id',
+        'application_id': 'application_id',
+        'customer_id': 'customer_id',
+    }
+
+    def __init__(
+        self,
+        campaign,
+        column_header,
+        batch_size=DEFAULT_BATCH_SIZE,
+        max_workers=DEFAULT_MAX_WORKERS,
+        sms_client=None,
+    ):
+        self.campaign = campaign
+        self.column_header = column_header
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.sms_client = sms_client or get_julo_sms_client()
+        self.template_code = 'J1_sms_{}'.format(campaign.name)
+        self.message = campaign.content.message_content
+        self.telco_code_values_list = list(
+            TelcoServiceProvider.objects.values_list('provider_name', 'telco_code')
+        )
+        self.comms_providers = {}
+        self.redis_client = get_redis_client()
+        self.progress_key = RedisKey.SMS_CAMPAIGN_PROGRESS.format(campaign.id)
+        self.sent_count = 0
+        self.failed_count = 0
+
+    def run(self, recipients):
+        """
+        Send the campaign to every (csv_item_id, phone_number), with at most max_workers
+        batches in flight.
+
+        Return:
+            dict of the sent and failed count and the messages per second
+        """
+        start = time.time()
+        futures = set()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for batch in self.construct_batches(recipients):
+                if len(futures) >= self.max_workers:
+                    done, futures = wait(futures, return_when=FIRST_COMPLETED)
+                    self.record_results(done)
+                futures.add(executor.submit(self.send_batch, batch))
+
+            self.record_results(wait(futures).done)
+
+        elapsed = max(time.time() - start, 0.001)
+        summary = dict(
+            sent_count=self.sent_count,
+            failed_count=self.failed_count,
+            messages_per_second=round((self.sent_count + self.failed_count) / elapsed, 2),
+        )
+        logger.info(
+            {
+                'action': 'sms_campaign_blast',
+                'campaign_id': self.campaign.id,
+                **summary,
+            }
+        )
+        return summary
+
+    def construct_batches(self, recipients):
+        batch = []
+        for recipient in recipients:
+            batch.append(recipient)
+            if len(batch) >= self.batch_size:
+                self.increment_progress(total=len(batch))
+                yield batch
+                batch = []
+
+        if batch:
+            self.increment_progress(total=len(batch))
+            yield batch
+
+    def send_batch(self, batch):
+        """
+        Runs in the thread pool. The vendor selection of the sms client reads the database,
+        the connection of the thread is closed before the thread is reused.
+        """
+        results = []
+        try:
+            for csv_item_id, phone_number in batch:
+                try:
+                    _, response = self.sms_client.send_sms(phone_number, self.message)
+                except Exception as e:
+                    logger.exception(
+                        {
+                            'error': str(e),
+                            'sms_client_method_name': 'send_sms_campaign_async',
+                        }
+                    )
+                    response = None
+                results.append((csv_item_id, phone_number, response))
+        finally:
+            connection.close()
+        return results
+
+    def record_results(self, futures):
+        sms_histories = []
+        failed_count = 0
+        for future in futures:
+            for csv_item_id, phone_number, response in future.result():
+                sms_history = self.build_sms_history(csv_item_id, phone_number, response)
+                if sms_history:
+                    sms_histories.append(sms_history)
+                else:
+                    failed_count += 1
+
+        CommsCampaignSmsHistory.objects.bulk_create(sms_histories)
+        self.sent_count += len(sms_histories)
+        self.failed_count += failed_count
+        self.increment_progress(sent=len(sms_histories), failed=failed_count)
+
+    def build_sms_history(self, csv_item_id, phone_number, response):
+        """The CommsCampaignSmsHistory create_sms_history would save, None when it would not."""
+        if not response:
+            return None
+
+        response = response['messages'][0]
+        if response['status'] != '0':
+            logger.warning(
+                {
+                    'message': 'Failed to send SMS',
+                    'campaign_id': self.campaign.id,
+                    'send_status': response['status'],
+                    'message_id': response.get('message-id'),
+                    'error_text': response.get('error-text'),
+                }
+            )
+            if response['julo_sms_vendor'] not in FAILED_HISTORY_VENDORS:
+                return None
+
+        comms_provider = self.get_comms_provider(response['julo_sms_vendor'])
+        if not comms_provider:
+            return None
+
+        _, tsp = identify_telco_code_and_tsp_name(phone_number, self.telco_code_values_list)
+        sms_history = CommsCampaignSmsHistory(
+            campaign_id=self.campaign.id,
+            message_content=self.message,
+            template_code=self.template_code,
+            to_mobile_phone=phone_number,
+            phone_number_type='mobile_phone_1',
+            message_id=response['message-id'],
+            tsp=tsp,
+            comms_provider=comms_provider,
+        )
+        if response.get('vendor_status'):
+            sms_history.status = response['vendor_status']
+        csv_item_field = self.csv_item_fields.get(self.column_header)
+        if csv_item_field:
+            setattr(sms_history, csv_item_field, csv_item_id)
+        return sms_history
+
+    def get_comms_provider(self, vendor_name):
+        if vendor_name not in self.comms_providers:
+            self.comms_providers[vendor_name] = CommsProviderLookup.objects.get_or_none(
+                provider_name__iexact=vendor_name
+            )
+        return self.comms_providers[vendor_name]
+
+    def increment_progress(self, **counts):
+        pipeline = self.redis_client.pipeline()
+        for name, count in counts.items():
+            pipeline.hincrby(self.progress_key, name, count)
+        pipeline.expire(self.progress_key, PROGRESS_EXPIRE_SECONDS)
+        pipeline.execute()
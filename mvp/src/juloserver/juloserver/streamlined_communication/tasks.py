@@ -10,7 +10,6 @@ from celery import task
 from dateutil.relativedelta import relativedelta
 
 from django.conf import settings
-from django.db import transaction
 from django.db.models import Q
 from django.template.loader import render_to_string
 from babel.numbers import format_currency
@@ -57,6 +56,13 @@ from juloserver.streamlined_communication.services import (
     render_kaliedoscope_image_as_bytes,
     render_kaliedoscope22_image_as_bytes, process_sms_message_j1,
 )
+from juloserver.streamlined_communication.services2.sms_campaign import (
+    DEFAULT_CHUNK_SIZE as DEFAULT_CAMPAIGN_CHUNK_SIZE,
+    SmsCampaignBlast,
+    get_sms_campaign_blast_setting,
+    get_user_segment_csv_data,
+    resolve_campaign_recipients,
+)
 from juloserver.julo.utils import (
     format_valid_e164_indo_phone_number,
     upload_file_as_bytes_to_oss,
@@ -497,15 +503,10 @@ def send_sms_campaign_async(phone_number, msg, template_code, csv_item_id, colum
             customer=customer,
         )
         if campaign_sms_history_obj:
-            with transaction.atomic():
-                history_obj = CommsCampaignSmsHistory.objects.select_for_update().get(
-                    pk=campaign_sms_history_obj.id
-                )
-                campaign_obj = StreamlinedCommunicationCampaign.objects.select_for_update().get(
-                    pk=campaign.id
-                )
-                history_obj.campaign = campaign_obj
-                history_obj.save()
+            # set by id, locking the campaign row serialized every worker of the campaign
+            CommsCampaignSmsHistory.objects.filter(pk=campaign_sms_history_obj.id).update(
+                campaign_id=campaign.id
+            )
 
         if not campaign_sms_history_obj:
             logger.exception(
@@ -536,6 +537,57 @@ def send_sms_campaign_async(phone_number, msg, template_code, csv_item_id, colum
         )
 
 
+@task(queue='platform_campaign_sms_send')
+def process_sms_campaign(campaign_id):
+    """
+    Send an approved campaign with SmsCampaignBlast, the recipients are resolved here
+    instead of in the approval request.
+    """
+    from juloserver.new_crm.services.streamlined_services import StreamlinedImportUserClient
+
+    blast_setting = get_sms_campaign_blast_setting() or {}
+    chunk_size = blast_setting.pop('chunk_size', DEFAULT_CAMPAIGN_CHUNK_SIZE)
+    campaign = StreamlinedCommunicationCampaign.objects.get(pk=campaign_id)
+    import_user_client = StreamlinedImportUserClient(segment_obj=campaign.user_segment)
+    sent_count = failed_count = 0
+    for response in import_user_client.get_downloadable_response():
+        column_header, csv_data_list = get_user_segment_csv_data(response)
+        if not column_header or not csv_data_list:
+            StreamlinedCommunicationCampaign.objects.filter(pk=campaign_id).update(
+                status=StreamlinedCommCampaignConstants.CampaignStatus.FAILED
+            )
+            logger.warning(
+                {
+                    'message': 'Failed to process CSV data',
+                    'action': 'process_sms_campaign',
+                    'campaign_id': campaign_id,
+                }
+            )
+            return
+
+        blast = SmsCampaignBlast(campaign, column_header, **blast_setting)
+        summary = blast.run(resolve_campaign_recipients(column_header, csv_data_list, chunk_size))
+        sent_count += summary['sent_count']
+        failed_count += summary['failed_count']
+
+    if not sent_count and not failed_count:
+        StreamlinedCommunicationCampaign.objects.filter(pk=campaign_id).update(
+            status=StreamlinedCommCampaignConstants.CampaignStatus.FAILED
+        )
+        logger.warning(
+            {
+                'message': 'No mobile numbers found',
+                'action': 'process_sms_campaign',
+                'campaign_id': campaign_id,
+            }
+        )
+        return
+
+    # every message is sent by now, no need for the countdowns of the per number tasks
+    set_campaign_status_partial_or_done(campaign)
+    handle_failed_campaign_and_notify_slack(campaign)
+
+
 @task(queue='platform_campaign_sms_send')
 def handle_failed_campaign_and_notify_slack(campaign):
     """
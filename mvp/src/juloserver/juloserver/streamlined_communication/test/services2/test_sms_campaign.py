@@ -0,0 +1,84 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from juloserver.julo.services2.redis_helper import MockRedisHelper
+from juloserver.julo.tests.factories import ApplicationJ1Factory, CustomerFactory
+from juloserver.streamlined_communication.models import CommsCampaignSmsHistory
+from juloserver.streamlined_communication.services2.sms_campaign import (
+    SmsCampaignBlast,
+    get_sms_campaign_progress,
+    resolve_campaign_recipients,
+)
+from juloserver.streamlined_communication.test.factories import (
+    StreamlinedCommunicationCampaignFactory,
+)
+
+FAILED_PHONE_NUMBER = '+6281234567803'
+
+
+def send_sms(phone_number, message):
+    status = '1' if phone_number == FAILED_PHONE_NUMBER else '0'
+    return message, {
+        'messages': [
+            {
+                'status': status,
+                'message-id': 'message-{}'.format(phone_number),
+                'to': phone_number,
+                'julo_sms_vendor': 'nexmo',
+                'is_comms_campaign_sms': True,
+            }
+        ]
+    }
+
+
+@mock.patch('juloserver.streamlined_communication.services2.sms_campaign.get_redis_client')
+class TestSmsCampaignBlast(TestCase):
+    def setUp(self):
+        self.redis_client = MockRedisHelper()
+        self.campaign = StreamlinedCommunicationCampaignFactory()
+        self.customers = []
+        for index in range(1, 4):
+            customer = CustomerFactory()
+            ApplicationJ1Factory(customer=customer, mobile_phone_1='0811111111{}'.format(index))
+            ApplicationJ1Factory(customer=customer, mobile_phone_1='08123456780{}'.format(index))
+            self.customers.append(customer)
+        self.sms_client = mock.MagicMock()
+        self.sms_client.send_sms.side_effect = send_sms
+
+    def test_resolve_campaign_recipients(self, mock_get_redis_client):
+        customer_ids = [customer.id for customer in self.customers] + [0]
+        recipients = list(resolve_campaign_recipients('customer_id', customer_ids, chunk_size=2))
+
+        self.assertEqual(
+            sorted(recipients),
+            [
+                (customer.id, '+62812345678{:02d}'.format(index))
+                for index, customer in enumerate(self.customers, 1)
+            ],
+        )
+
+    def test_run(self, mock_get_redis_client):
+        mock_get_redis_client.return_value = self.redis_client
+        customer_ids = [customer.id for customer in self.customers]
+        blast = SmsCampaignBlast(
+            self.campaign, 'customer_id', batch_size=2, max_workers=2, sms_client=self.sms_client
+        )
+
+        summary = blast.run(resolve_campaign_recipients('customer_id', customer_ids))
+
+        self.assertEqual(summary['sent_count'], 2)
+        self.assertEqual(summary['failed_count'], 1)
+        sms_histories = CommsCampaignSmsHistory.objects.filter(campaign=self.campaign)
+        self.assertEqual(
+            set(sms_histories.values_list('customer_id', flat=True)),
+            {self.customers[0].id, self.customers[1].id},
+        )
+        sms_history = sms_histories.get(customer=self.customers[0])
+        self.assertEqual(sms_history.template_code, 'J1_sms_{}'.format(self.campaign.name))
+        self.assertEqual(sms_history.message_content, self.campaign.content.message_content)
+        self.assertEqual(sms_history.message_id, 'message-+6281234567801')
+        self.assertEqual(
+            get_sms_campaign_progress(self.campaign.id),
+            {'total': '3', 'sent': '2', 'failed': '1'},
+        )
@@ -6,7 +6,12 @@ from unittest.mock import (
 
 from django.test import SimpleTestCase
 
-from juloserver.streamlined_communication.cache import RedisCache
+from juloserver.streamlined_communication.cache import (
+    CompiledTemplateCache,
+    RedisCache,
+    compiled_template_cache,
+    render_templates,
+)
 
 PACKAGE_NAME = 'juloserver.streamlined_communication.cache'
 
@@ -96,3 +101,36 @@ class TestRedisCache(SimpleTestCase):
 
         self.assertTrue(ret_value)
         mock_redis_client.remove_element.assert_called_once_with('key-name', 1, 2)
+
+
+class TestCompiledTemplateCache(SimpleTestCase):
+    def setUp(self):
+        compiled_template_cache.clear()
+
+    def test_get_message_template(self):
+        template_cache = CompiledTemplateCache(max_size=2)
+        key = ('streamlined_message', 1, 'udate')
+        template = template_cache.get('Halo {{ fullname }}', key)
+
+        self.assertIs(template_cache.get('Halo {{ fullname }}', key), template)
+        # the content changed without a new udate
+        self.assertIsNot(template_cache.get('Hai {{ fullname }}', key), template)
+
+    def test_lru_eviction(self):
+        template_cache = CompiledTemplateCache(max_size=2)
+        first_template = template_cache.get('{{ a }}')
+        template_cache.get('{{ b }}')
+        template_cache.get('{{ a }}')
+        template_cache.get('{{ c }}')
+
+        self.assertEqual(list(template_cache.templates), ['{{ a }}', '{{ c }}'])
+        self.assertIs(template_cache.get('{{ a }}'), first_template)
+
+    def test_render_templates(self):
+        messages = render_templates(
+            'Halo {{ fullname }}, tagihan {{ amount }}',
+            [{'fullname': 'Ani', 'amount': 1000}, {'fullname': 'Budi', 'amount': 2000}],
+        )
+
+        self.assertEqual(messages, ['Halo Ani, tagihan 1000', 'Halo Budi, tagihan 2000'])
+        self.assertEqual(len(compiled_template_cache.templates), 1)
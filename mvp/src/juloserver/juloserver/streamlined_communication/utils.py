@@ -122,6 +122,16 @@ def get_telco_code_and_tsp_name(phone_number: str) -> Tuple[str, str]:
     telco_code_values_list = TelcoServiceProvider.objects.values_list(
         'provider_name', 'telco_code'
     )
+    return identify_telco_code_and_tsp_name(phone_number, telco_code_values_list)
+
+
+def identify_telco_code_and_tsp_name(
+    phone_number: str, telco_code_values_list: list
+) -> Tuple[str, str]:
+    """
+    get_telco_code_and_tsp_name over (provider_name, telco_code) already loaded, for the
+    callers that identify many phone numbers.
+    """
     try:
         phone_number = format_valid_e164_indo_phone_number(phone_number)
     except InvalidPhoneNumberError:
@@ -1,7 +1,6 @@
 # flake8:
 import csv
 import os
-from io import StringIO
 from builtins import str
 from builtins import range
 import logging
@@ -191,8 +190,13 @@ from juloserver.loan.services.loan_prize_chance import (
 from juloserver.streamlined_communication.tasks import (
     send_sms_campaign_async,
     handle_failed_campaign_and_notify_slack,
+    process_sms_campaign,
     set_campaign_status_partial_or_done,
 )
+from juloserver.streamlined_communication.services2.sms_campaign import (
+    get_sms_campaign_blast_setting,
+    get_user_segment_csv_data,
+)
 from juloserver.integapiv1.tasks2.callback_tasks import update_voice_call_record
 from ..integapiv1.serializers import VoiceCallbackResultSerializer
 from ..julo.clients.alicloud import JuloAlicloudClient
@@ -4304,7 +4308,13 @@ class ApproveRejectCommsCampaignView(StandardizedExceptionHandlerMixin, APIView)
                 status=StreamlinedCommCampaignConstants.CampaignStatus.ON_GOING,
                 confirmed_by=user,
             )
-            response = self.process_sms_campaign_with_user_segment(campaign_id)
+            if get_sms_campaign_blast_setting():
+                process_sms_campaign.delay(campaign_id)
+                response = success_response(
+                    {"message": "SMS campaign tasks enqueued for processing"}
+                )
+            else:
+                response = self.process_sms_campaign_with_user_segment(campaign_id)
             return JsonResponse({'data': response.data}, status=response.status_code)
         return general_error_response({'message': 'Invalid action_type'})
 
@@ -4426,31 +4436,7 @@ class ApproveRejectCommsCampaignView(StandardizedExceptionHandlerMixin, APIView)
                  Otherwise, it returns (None, None).
         """
 
-        csv_content = b''
-        for chunk in downloadable_response.streaming_content:
-            csv_content += chunk
-
-        csv_content_str = csv_content.decode('utf-8')
-        csv_file = StringIO(csv_content_str)
-
-        csv_reader = csv.reader(csv_file)
-        header = None
-        try:
-            header = next(csv_reader)
-        except StopIteration:
-            return None, None
-
-        if header[0] in ['application_id', 'account_id', 'customer_id', 'phone_number']:
-            csv_data_list = []
-            for row in csv_reader:
-                if row[0].strip():
-                    try:
-                        data = int(row[0].strip())
-                        csv_data_list.append(data)
-                    except ValueError:
-                        print(f"Skipping invalid value: {row[0]}")
-            return header[0], csv_data_list
-        return None, None
+        return get_user_segment_csv_data(downloadable_response)
 
 
 class DownloadCampaignReportView(StandardizedExceptionHandlerMixin, ListAPIView):
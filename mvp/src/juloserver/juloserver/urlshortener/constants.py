@@ -0,0 +1,15 @@
+BASE58_ALPHABET = "0123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+
+
+class UrlShortenerConst(object):
+    # the encoded id is padded to 7 characters so the short urls never have the length of
+    # the random ones of generate_string (11) or of the first migration (6)
+    ID_LENGTH = 7
+    # random characters after the id, the redirect is public so the ids are not enough
+    SUFFIX_LENGTH = 3
+    ID_BLOCK_SIZE = 100
+    SHORTEN_MANY_BATCH_SIZE = 10000
+    DEFAULT_LOCAL_CACHE_SIZE = 100000
+    DEFAULT_LOCAL_CACHE_TTL_SECONDS = 5 * 60
+    DEFAULT_REDIS_CACHE_TTL_SECONDS = 24 * 3600
+    REDIRECT_CACHE_KEY = 'short_url:redirect:{}'
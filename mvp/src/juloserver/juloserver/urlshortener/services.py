@@ -1,44 +1,309 @@
+import logging
+import os
+import secrets
+import threading
+import time
 from builtins import range
+from collections import OrderedDict
+from datetime import timedelta
+from itertools import islice
 
 import shortuuid
 from django.conf import settings
-from django.db import IntegrityError
+from django.db import IntegrityError, connections, router
 
+from .constants import BASE58_ALPHABET, UrlShortenerConst
 from .models import ShortenedUrl
-from juloserver.julo.services2 import encrypt
+from juloserver.julo.constants import FeatureNameConst
+from juloserver.julo.models import FeatureSetting
+from juloserver.julo.services2 import encrypt, get_redis_client
+
+logger = logging.getLogger(__name__)
 
 
 class UrlCollisionException(Exception):
     pass
 
 
+def get_url_shortener_engine_setting():
+    """
+    Return:
+        dict of the redirect cache parameters when the short urls are issued from the
+        sequence and the redirects are cached, None otherwise
+    """
+    feature_setting = FeatureSetting.objects.get_cached(
+        FeatureNameConst.URL_SHORTENER_ENGINE, is_active=True
+    )
+    if not feature_setting:
+        return None
+
+    parameters = feature_setting.parameters or {}
+    return dict(
+        local_cache_ttl_seconds=parameters.get(
+            'local_cache_ttl_seconds', UrlShortenerConst.DEFAULT_LOCAL_CACHE_TTL_SECONDS
+        ),
+        redis_cache_ttl_seconds=parameters.get(
+            'redis_cache_ttl_seconds', UrlShortenerConst.DEFAULT_REDIS_CACHE_TTL_SECONDS
+        ),
+    )
+
+
 def shorten_url(full_url, get_object=False):
+    if get_url_shortener_engine_setting():
+        shortened_url = ShortenedUrl.objects.create(
+            full_url=full_url, **get_short_url_fields(short_url_id_allocator.allocate(1)[0])
+        )
+    else:
+        shortened_url = create_random_shortened_url(full_url)
+
+    created_url = settings.URL_SHORTENER_BASE + shortened_url.short_url
+    if get_object:
+        return created_url, shortened_url
+    return created_url
+
+
+def create_random_shortened_url(full_url):
     retry_count = 5
 
     for attempt in range(0, retry_count):
         try:
-            shortened_url = ShortenedUrl.objects.create(
-                short_url=generate_string(), full_url=full_url
-            )
-            break
+            return ShortenedUrl.objects.create(short_url=generate_string(), full_url=full_url)
         except IntegrityError:
             continue
-    else:
-        raise UrlCollisionException("Too many short url collision on database.")
 
-    created_url = settings.URL_SHORTENER_BASE + shortened_url.short_url
-    if get_object:
-        return created_url, shortened_url
-    return created_url
+    raise UrlCollisionException("Too many short url collision on database.")
 
 
 def generate_string():
-    string_base = "0123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
-    short_url = shortuuid.ShortUUID(string_base).random(length=11)
+    short_url = shortuuid.ShortUUID(BASE58_ALPHABET).random(length=11)
 
     return short_url
 
 
+def encode_base58(number, length=1):
+    """number in BASE58_ALPHABET, left padded with its zero to length characters"""
+    characters = []
+    while number:
+        number, remainder = divmod(number, len(BASE58_ALPHABET))
+        characters.append(BASE58_ALPHABET[remainder])
+    characters.extend(BASE58_ALPHABET[0] * (length - len(characters)))
+    return ''.join(reversed(characters))
+
+
+def generate_short_url(shortened_url_id):
+    """
+    The id makes the short url unique without checking the table, the random suffix keeps
+    the other short urls from being guessed from one of them.
+    """
+    suffix = secrets.randbelow(len(BASE58_ALPHABET) ** UrlShortenerConst.SUFFIX_LENGTH)
+    return encode_base58(shortened_url_id, UrlShortenerConst.ID_LENGTH) + encode_base58(
+        suffix, UrlShortenerConst.SUFFIX_LENGTH
+    )
+
+
+def get_short_url_fields(shortened_url_id):
+    return dict(id=shortened_url_id, short_url=generate_short_url(shortened_url_id))
+
+
+class ShortUrlIdAllocator(object):
+    """
+    Takes the ids of the new short urls from the shortened_url id sequence, block_size ids
+    more than asked at a time so most single short urls do not wait for the sequence. The
+    ids of a block not used before the process exits are a gap in the ids, like a rolled
+    back insert.
+    """
+
+    def __init__(self, block_size=UrlShortenerConst.ID_BLOCK_SIZE):
+        self.block_size = block_size
+        self.lock = threading.Lock()
+        self.ids = []
+        self.pid = None
+
+    def allocate(self, count):
+        with self.lock:
+            # a forked worker must not issue the ids of its parent block
+            if self.pid != os.getpid():
+                self.ids = []
+                self.pid = os.getpid()
+            if len(self.ids) < count:
+                self.ids.extend(self.fetch_ids(count - len(self.ids) + self.block_size))
+
+            ids = self.ids[:count]
+            self.ids = self.ids[count:]
+        return ids
+
+    def fetch_ids(self, count):
+        meta = ShortenedUrl._meta
+        with connections[router.db_for_write(ShortenedUrl)].cursor() as cursor:
+            cursor.execute(
+                'SELECT nextval(pg_get_serial_sequence(%s, %s)) FROM generate_series(1, %s)',
+                [meta.db_table, meta.pk.column, count],
+            )
+            return [shortened_url_id for shortened_url_id, in cursor.fetchall()]
+
+    def clear(self):
+        with self.lock:
+            self.ids = []
+
+
+short_url_id_allocator = ShortUrlIdAllocator()
+
+
+def shorten_many(full_urls, dedupe=False):
+    """
+    Short urls of many full urls, in the same order, with one insert statement for every
+    SHORTEN_MANY_BATCH_SIZE urls.
+
+    Args:
+        full_urls: iterable of full urls
+        dedupe: reuse the short url of the full urls that already have one, a full url
+            repeated in full_urls gets a single short url
+    Return:
+        list of short urls
+    """
+    full_urls = iter(full_urls)
+    created_urls = []
+    while True:
+        batch = list(islice(full_urls, UrlShortenerConst.SHORTEN_MANY_BATCH_SIZE))
+        if not batch:
+            return created_urls
+
+        short_urls = get_short_urls_by_full_url(batch) if dedupe else {}
+        new_full_urls = [full_url for full_url in batch if full_url not in short_urls]
+        if dedupe:
+            new_full_urls = list(OrderedDict.fromkeys(new_full_urls))
+
+        shortened_urls = [
+            ShortenedUrl(full_url=full_url, **get_short_url_fields(shortened_url_id))
+            for full_url, shortened_url_id in zip(
+                new_full_urls, short_url_id_allocator.allocate(len(new_full_urls))
+            )
+        ]
+        ShortenedUrl.objects.bulk_create(shortened_urls)
+
+        if dedupe:
+            short_urls.update(
+                (shortened_url.full_url, shortened_url.short_url)
+                for shortened_url in shortened_urls
+            )
+            created_urls.extend(
+                settings.URL_SHORTENER_BASE + short_urls[full_url] for full_url in batch
+            )
+        else:
+            created_urls.extend(
+                settings.URL_SHORTENER_BASE + shortened_url.short_url
+                for shortened_url in shortened_urls
+            )
+
+
+def get_short_urls_by_full_url(full_urls):
+    """
+    The last short url of each full url, with the hash index of full_url built by the
+    create_shortened_url_full_url_index command.
+    """
+    short_urls = {}
+    for full_url, short_url in (
+        ShortenedUrl.objects.filter(full_url__in=set(full_urls))
+        .order_by('id')
+        .values_list('full_url', 'short_url')
+    ):
+        short_urls[full_url] = short_url
+    return short_urls
+
+
+def get_or_shorten_url(full_url):
+    shortened_url = ShortenedUrl.objects.filter(full_url=full_url).last()
+    if shortened_url:
+        return settings.URL_SHORTENER_BASE + shortened_url.short_url
+    return shorten_url(full_url)
+
+
+class ShortUrlRedirectCache(object):
+    """
+    Process-local LRU of the full urls of the clicked short urls. A short url is not
+    changed once issued, the ttl only bounds the rare update of a campaign short url.
+    """
+
+    def __init__(self, max_size=UrlShortenerConst.DEFAULT_LOCAL_CACHE_SIZE):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, short_url):
+        with self.lock:
+            entry = self.entries.get(short_url)
+            if not entry:
+                return None
+
+            full_url, expired_at = entry
+            if expired_at < time.monotonic():
+                del self.entries[short_url]
+                return None
+            self.entries.move_to_end(short_url)
+            return full_url
+
+    def set(self, short_url, full_url, ttl_seconds):
+        with self.lock:
+            self.entries[short_url] = (full_url, time.monotonic() + ttl_seconds)
+            self.entries.move_to_end(short_url)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+short_url_redirect_cache = ShortUrlRedirectCache()
+
+
+def get_full_url(short_url, setting=None):
+    """
+    The full url of a short url from the process cache, then redis, then the database.
+    Unknown short urls are not cached.
+    """
+    setting = setting or get_url_shortener_engine_setting()
+    if not setting:
+        shortened_url = ShortenedUrl.objects.get_or_none(short_url=short_url)
+        return shortened_url.full_url if shortened_url else None
+
+    full_url = short_url_redirect_cache.get(short_url)
+    if full_url:
+        return full_url
+
+    redis_key = UrlShortenerConst.REDIRECT_CACHE_KEY.format(short_url)
+    try:
+        redis_client = get_redis_client()
+        full_url = redis_client.get(redis_key)
+    except Exception as error:
+        logger.warning({'action': 'get_full_url', 'short_url': short_url, 'error': str(error)})
+        redis_client = None
+
+    if not full_url:
+        full_url = (
+            ShortenedUrl.objects.filter(short_url=short_url)
+            .values_list('full_url', flat=True)
+            .first()
+        )
+        if not full_url:
+            return None
+
+        if redis_client:
+            try:
+                redis_client.set(
+                    redis_key,
+                    full_url,
+                    expire_time=timedelta(seconds=setting['redis_cache_ttl_seconds']),
+                )
+            except Exception as error:
+                logger.warning(
+                    {'action': 'get_full_url', 'short_url': short_url, 'error': str(error)}
+                )
+
+    short_url_redirect_cache.set(short_url, full_url, setting['local_cache_ttl_seconds'])
+    return full_url
+
+
 def get_payment_detail_shortened_url(payment):
     # will temporarily return earlier
     return '-'
@@ -50,7 +315,4 @@ def get_payment_detail_shortened_url(payment):
     encoded_payment_id = encrypttext.encode_string(str(payment.id))
     url = settings.PAYMENT_DETAILS + str(encoded_payment_id)
 
-    shortened_url = ShortenedUrl.objects.filter(full_url=url).last()
-    return (
-        settings.URL_SHORTENER_BASE + shortened_url.short_url if shortened_url else shorten_url(url)
-    )
+    return get_or_shorten_url(url)
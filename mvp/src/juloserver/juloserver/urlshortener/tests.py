@@ -1,8 +1,20 @@
 import re
 
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from mock import patch
 
-from juloserver.urlshortener.services import generate_string
+from juloserver.julo.constants import FeatureNameConst
+from juloserver.julo.services2.redis_helper import MockRedisHelper
+from juloserver.julo.tests.factories import FeatureSettingFactory
+from juloserver.urlshortener.models import ShortenedUrl
+from juloserver.urlshortener.services import (
+    encode_base58,
+    generate_string,
+    get_full_url,
+    short_url_redirect_cache,
+    shorten_many,
+    shorten_url,
+)
 
 
 class TestGenerateString(TestCase):
@@ -16,3 +28,65 @@ class TestGenerateString(TestCase):
         short_url = generate_string()
 
         assert re.match("[a-zA-Z0-9]+", short_url)
+
+
+class TestEncodeBase58(TestCase):
+    def test_encode_base58(self):
+        self.assertEqual(encode_base58(0, 7), '0000000')
+        self.assertEqual(encode_base58(57), 'z')
+        self.assertEqual(encode_base58(58, 3), '010')
+        self.assertEqual(len({encode_base58(number, 7) for number in range(10000)}), 10000)
+
+
+@override_settings(URL_SHORTENER_BASE='https://julo.co.id/s/')
+class TestUrlShortenerEngine(TestCase):
+    def setUp(self):
+        FeatureSettingFactory(
+            feature_name=FeatureNameConst.URL_SHORTENER_ENGINE, is_active=True, parameters={}
+        )
+        short_url_redirect_cache.clear()
+
+    def test_shorten_url(self):
+        created_url, shortened_url = shorten_url('https://julo.co.id/a', get_object=True)
+
+        self.assertEqual(created_url, 'https://julo.co.id/s/' + shortened_url.short_url)
+        self.assertEqual(len(shortened_url.short_url), 10)
+
+    def test_shorten_many(self):
+        full_urls = ['https://julo.co.id/{}'.format(index) for index in range(5)]
+
+        with self.assertNumQueries(2):
+            created_urls = shorten_many(full_urls)
+
+        self.assertEqual(len(set(created_urls)), 5)
+        for full_url, created_url in zip(full_urls, created_urls):
+            short_url = created_url.replace('https://julo.co.id/s/', '')
+            self.assertEqual(ShortenedUrl.objects.get(short_url=short_url).full_url, full_url)
+
+    def test_shorten_many_dedupe(self):
+        existing_url = shorten_url('https://julo.co.id/a')
+
+        created_urls = shorten_many(
+            ['https://julo.co.id/a', 'https://julo.co.id/b', 'https://julo.co.id/b'], dedupe=True
+        )
+
+        self.assertEqual(created_urls[0], existing_url)
+        self.assertEqual(created_urls[1], created_urls[2])
+        self.assertEqual(ShortenedUrl.objects.filter(full_url='https://julo.co.id/b').count(), 1)
+
+    @patch('juloserver.urlshortener.services.get_redis_client')
+    def test_redirect_cache(self, mock_get_redis_client):
+        mock_get_redis_client.return_value = MockRedisHelper()
+        mock_get_redis_client.return_value.client.flushall()
+        short_url = shorten_url('https://julo.co.id/a').replace('https://julo.co.id/s/', '')
+
+        response = self.client.get('/urlshortener/{}'.format(short_url))
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response['Location'], 'https://julo.co.id/a')
+
+        ShortenedUrl.objects.filter(short_url=short_url).update(full_url='https://julo.co.id/b')
+        # from the process cache, then from redis
+        self.assertEqual(get_full_url(short_url), 'https://julo.co.id/a')
+        short_url_redirect_cache.clear()
+        self.assertEqual(get_full_url(short_url), 'https://julo.co.id/a')
+        self.assertIsNone(get_full_url('unknown'))
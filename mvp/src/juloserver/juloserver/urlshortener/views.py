@@ -3,7 +3,7 @@ from rest_framework.response import Response
 from rest_framework.status import HTTP_302_FOUND, HTTP_404_NOT_FOUND
 from rest_framework.views import APIView
 
-from juloserver.urlshortener.models import ShortenedUrl
+from juloserver.urlshortener.services import get_full_url
 
 
 # Create your views here.
@@ -13,11 +13,11 @@ class UrlShortenerView(APIView):
 
     def get(self, request, shorturl):
 
-        shortened_url = ShortenedUrl.objects.get_or_none(short_url=shorturl)
-        if shortened_url is not None:
+        full_url = get_full_url(shorturl) if shorturl else None
+        if full_url is not None:
             return Response(
                 status=HTTP_302_FOUND,
-                headers={'Location': shortened_url.full_url},
+                headers={'Location': full_url},
             )
         else:
             return Response(
@@ -12,3 +12,17 @@ class MobileUserActionLogView(object):
 
 class MobileUserActionLogEvent(object):
     ONCLICK = "onClick"
+
+
+class UserActionLogBuffer(object):
+    MOBILE = 'mobile'
+    WEB = 'web'
+
+    @classmethod
+    def all(cls):
+        return [cls.MOBILE, cls.WEB]
+
+
+USER_ACTION_LOG_BUFFER_KEY = 'user_action_log:buffer:{}'
+USER_ACTION_LOG_DEAD_LETTER_KEY = 'user_action_log:dead_letter:{}'
+USER_ACTION_LOG_INGEST_METRICS_KEY = 'user_action_log:ingest_metrics:{}'
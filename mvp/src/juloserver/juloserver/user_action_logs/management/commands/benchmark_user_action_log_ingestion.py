@@ -0,0 +1,107 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import router, transaction
+from django.utils import timezone
+
+from juloserver.julo.services2 import get_redis_client
+from juloserver.user_action_logs.constants import UserActionLogBuffer
+from juloserver.user_action_logs.models import MobileUserActionLog
+from juloserver.user_action_logs.services import (
+    DEFAULT_FLUSH_SIZE,
+    DEFAULT_INSERT_BATCH_SIZE,
+    UserActionLogIngestion,
+    encode_buffered_events,
+)
+from juloserver.user_action_logs.tasks import BATCH_SIZE
+
+BENCHMARK_BUFFER_KEY = 'user_action_log:buffer:benchmark'
+
+
+def generate_requests(event_count, events_per_request):
+    activities = ['SplashScreenActivity', 'JuloApp', 'Julo1HomeActivity', 'LoginActivity']
+    for start in range(0, event_count, events_per_request):
+        customer_id = random.randint(1, 10 ** 9)
+        yield [
+            dict(
+                log_ts=timezone.now(),
+                customer_id=customer_id,
+                application_id=customer_id,
+                app_version='8.18.1',
+                android_id='f2139f5be7a6d392',
+                device_brand='asus',
+                device_model='Asus ASUS_X00TD',
+                android_api_level=28,
+                session_id='benchmark',
+                module='benchmark',
+                activity=random.choice(activities),
+                activity_counter=index,
+                event='onStart',
+            )
+            for index in range(min(events_per_request, event_count - start))
+        ]
+
+
+class Command(BaseCommand):
+    help = (
+        'Replay synthetic mobile user action logs through the per request insert of '
+        'store_mobile_user_action_log and through the buffered ingestion, in rows per second. '
+        'Every row is rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=1000000)
+        parser.add_argument('--events-per-request', type=int, default=25)
+        parser.add_argument('--flush-size', type=int, default=DEFAULT_FLUSH_SIZE)
+        parser.add_argument('--insert-batch-size', type=int, default=DEFAULT_INSERT_BATCH_SIZE)
+        parser.add_argument('--skip-legacy', action='store_true')
+
+    def handle(self, *args, **options):
+        using = router.db_for_write(MobileUserActionLog)
+        if not options['skip_legacy']:
+            with transaction.atomic(using=using):
+                start = time.time()
+                for events in generate_requests(
+                    options['events'], options['events_per_request']
+                ):
+                    MobileUserActionLog.objects.bulk_create(
+                        [MobileUserActionLog(**event) for event in events],
+                        batch_size=BATCH_SIZE,
+                    )
+                self.write_result('per request', options['events'], time.time() - start)
+                transaction.set_rollback(True, using=using)
+
+        redis_client = get_redis_client()
+        redis_client.delete_key(BENCHMARK_BUFFER_KEY)
+        ingestion = UserActionLogIngestion(
+            UserActionLogBuffer.MOBILE,
+            flush_size=options['flush_size'],
+            insert_batch_size=options['insert_batch_size'],
+            max_flush_rounds=1,
+            buffer_key=BENCHMARK_BUFFER_KEY,
+        )
+        with transaction.atomic(using=using):
+            start = time.time()
+            row_count = 0
+            for events in generate_requests(options['events'], options['events_per_request']):
+                buffer_length = redis_client.rpush(
+                    BENCHMARK_BUFFER_KEY, encode_buffered_events(events)
+                )
+                if buffer_length >= options['flush_size']:
+                    row_count += ingestion.flush()
+            while redis_client.llen(BENCHMARK_BUFFER_KEY):
+                row_count += ingestion.flush()
+            self.write_result('buffered', row_count, time.time() - start)
+            transaction.set_rollback(True, using=using)
+
+        redis_client.delete_key(BENCHMARK_BUFFER_KEY)
+
+    def write_result(self, name, row_count, elapsed):
+        self.stdout.write(
+            self.style.SUCCESS(
+                '{}: {} rows in {:.1f}s, {:.0f} rows/s'.format(
+                    name, row_count, elapsed, row_count / max(elapsed, 0.001)
+                )
+            )
+        )
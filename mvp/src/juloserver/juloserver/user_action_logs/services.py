@@ -0,0 +1,295 @@
+"""
+Buffered ingestion of the user action logs.
+
+The views push the validated events of a request to a redis list instead of sending a celery
+task per request. A buffer is flushed by the push that makes it reach flush_size requests and
+by the periodic flush_user_action_log_buffers task, so an event waits at most one period.
+A flush writes the events of many requests with multi-row INSERTs of insert_batch_size rows
+and sends the fraud checks from the same decoded events.
+
+A request that can not be decoded or written is moved to a dead letter list instead of
+going back to the buffer, so it does not keep the other requests of its flush from being
+written. Only the requests not written because the database is unavailable go back.
+"""
+import pickle
+import time
+import zlib
+from collections import namedtuple
+
+from django.db import InterfaceError, OperationalError, router, transaction
+from django.utils import timezone
+
+from juloserver.julo.clients import get_julo_sentry_client
+from juloserver.julo.constants import FeatureNameConst
+from juloserver.julo.models import FeatureSetting
+from juloserver.julo.services2 import get_redis_client
+from juloserver.julolog.julolog import JuloLog
+from juloserver.user_action_logs.constants import (
+    USER_ACTION_LOG_BUFFER_KEY,
+    USER_ACTION_LOG_DEAD_LETTER_KEY,
+    USER_ACTION_LOG_INGEST_METRICS_KEY,
+    UserActionLogBuffer,
+)
+from juloserver.user_action_logs.models import MobileUserActionLog, WebUserActionLog
+
+logger = JuloLog(__name__)
+
+DEFAULT_FLUSH_SIZE = 200
+DEFAULT_INSERT_BATCH_SIZE = 1000
+DEFAULT_MAX_FLUSH_ROUNDS = 50
+FRAUD_CHECK_ACTIVITY = 'ChangePhoneActivity'
+TRANSIENT_DATABASE_ERRORS = (InterfaceError, OperationalError)
+
+BufferedRequest = namedtuple('BufferedRequest', ['value', 'enqueued_at', 'logs'])
+
+
+def get_buffered_ingestion_setting():
+    """
+    Return:
+        dict of flush_size, insert_batch_size and max_flush_rounds when the buffered
+        ingestion is enabled, None otherwise
+    """
+    feature_setting = FeatureSetting.objects.get_cached(
+        FeatureNameConst.USER_ACTION_LOG_BUFFERED_INGESTION, is_active=True
+    )
+    if not feature_setting:
+        return None
+
+    parameters = feature_setting.parameters or {}
+    return dict(
+        flush_size=parameters.get('flush_size', DEFAULT_FLUSH_SIZE),
+        insert_batch_size=parameters.get('insert_batch_size', DEFAULT_INSERT_BATCH_SIZE),
+        max_flush_rounds=parameters.get('max_flush_rounds', DEFAULT_MAX_FLUSH_ROUNDS),
+    )
+
+
+def encode_buffered_events(events):
+    return zlib.compress(pickle.dumps({'enqueued_at': time.time(), 'events': events}))
+
+
+def decode_buffered_events(value):
+    return pickle.loads(zlib.decompress(value))
+
+
+def buffer_user_action_logs(buffer_name, events, flush_size=DEFAULT_FLUSH_SIZE):
+    """
+    Push the events of one request. Only the push that makes the buffer reach flush_size
+    sends the flush task, the periodic task flushes whatever is left.
+    """
+    from juloserver.user_action_logs.tasks import flush_user_action_log_buffer
+
+    buffer_length = get_redis_client().rpush(
+        USER_ACTION_LOG_BUFFER_KEY.format(buffer_name), encode_buffered_events(events)
+    )
+    if buffer_length == flush_size:
+        flush_user_action_log_buffer.delay(buffer_name)
+
+    return buffer_length
+
+
+def pop_buffered_values(redis_client, buffer_key, count):
+    pipeline = redis_client.pipeline()
+    pipeline.lrange(buffer_key, 0, count - 1)
+    pipeline.ltrim(buffer_key, count, -1)
+    values, _ = pipeline.execute()
+    return values
+
+
+def get_fraud_check_log_data(log):
+    return {
+        'log_ts': log.log_ts,
+        'customer_id': log.customer_id,
+        'activity': log.activity,
+        'fragment': log.fragment,
+        'event': log.event,
+        'view': log.view,
+    }
+
+
+class UserActionLogIngestion(object):
+    model_classes = {
+        UserActionLogBuffer.MOBILE: MobileUserActionLog,
+        UserActionLogBuffer.WEB: WebUserActionLog,
+    }
+
+    def __init__(
+        self,
+        buffer_name,
+        flush_size=DEFAULT_FLUSH_SIZE,
+        insert_batch_size=DEFAULT_INSERT_BATCH_SIZE,
+        max_flush_rounds=DEFAULT_MAX_FLUSH_ROUNDS,
+        buffer_key=None,
+    ):
+        self.buffer_name = buffer_name
+        self.buffer_key = buffer_key or USER_ACTION_LOG_BUFFER_KEY.format(buffer_name)
+        self.dead_letter_key = USER_ACTION_LOG_DEAD_LETTER_KEY.format(buffer_name)
+        self.model_class = self.model_classes[buffer_name]
+        self.flush_size = flush_size
+        self.insert_batch_size = insert_batch_size
+        self.max_flush_rounds = max_flush_rounds
+        self.redis_client = get_redis_client()
+
+    def flush(self):
+        """
+        Write the buffered requests, flush_size requests per round, until the buffer is
+        empty or max_flush_rounds is reached.
+
+        Return:
+            count of the rows written
+        """
+        row_count = 0
+        for _ in range(self.max_flush_rounds):
+            values = pop_buffered_values(self.redis_client, self.buffer_key, self.flush_size)
+            if not values:
+                break
+
+            row_count += self.write(values)
+            if len(values) < self.flush_size:
+                break
+
+        return row_count
+
+    def write(self, values):
+        start = time.time()
+        buffered_requests = []
+        for value in values:
+            try:
+                buffered_requests.append(self.decode(value))
+            except Exception as error:
+                self.move_to_dead_letter(value, error)
+
+        written_requests = self.insert(buffered_requests)
+        logs = [log for request in written_requests for log in request.logs]
+        # the rows are committed, a failure from here on must not push the requests back
+        try:
+            if self.buffer_name == UserActionLogBuffer.MOBILE:
+                self.send_fraud_checks([request.logs for request in written_requests])
+                self.log_continue_views(logs)
+
+            elapsed = max(time.time() - start, 0.001)
+            oldest_enqueued_at = min(
+                [request.enqueued_at for request in buffered_requests] or [start]
+            )
+            self.record_metrics(len(logs), elapsed, time.time() - oldest_enqueued_at)
+        except Exception:
+            get_julo_sentry_client().captureException()
+
+        return len(logs)
+
+    def decode(self, value):
+        buffered_request = decode_buffered_events(value)
+        if self.buffer_name == UserActionLogBuffer.MOBILE:
+            events = buffered_request['events']
+        else:
+            events = [buffered_request['events']]
+        return BufferedRequest(
+            value,
+            buffered_request['enqueued_at'],
+            [self.model_class(**event) for event in events],
+        )
+
+    def insert(self, buffered_requests):
+        """
+        Write the requests with one transaction per batch. A failed batch is split in halves
+        until the request that fails is alone, that request is moved to the dead letter.
+
+        Return:
+            list of the requests written
+        """
+        written_requests = []
+        batches = [buffered_requests] if buffered_requests else []
+        while batches:
+            batch = batches.pop()
+            try:
+                with transaction.atomic(using=router.db_for_write(self.model_class)):
+                    self.model_class.objects.bulk_create(
+                        [log for request in batch for log in request.logs],
+                        batch_size=self.insert_batch_size,
+                    )
+            except TRANSIENT_DATABASE_ERRORS:
+                # the requests not written yet go back to the buffer for the next flush
+                self.redis_client.rpush(
+                    self.buffer_key,
+                    *[request.value for pending in batches + [batch] for request in pending]
+                )
+                raise
+            except Exception as error:
+                if len(batch) == 1:
+                    self.move_to_dead_letter(batch[0].value, error)
+                else:
+                    middle = len(batch) // 2
+                    batches.extend([batch[middle:], batch[:middle]])
+                continue
+
+            written_requests.extend(batch)
+
+        return written_requests
+
+    def move_to_dead_letter(self, value, error):
+        """Called in the except block of the error, sentry reads the exception from it."""
+        self.redis_client.rpush(self.dead_letter_key, value)
+        logger.error(
+            {
+                'message': 'user action log request moved to the dead letter',
+                'buffer_name': self.buffer_name,
+                'error': str(error),
+            }
+        )
+        get_julo_sentry_client().captureException()
+
+    def send_fraud_checks(self, request_logs):
+        """
+        One check per request like store_mobile_user_action_log, but only for the requests
+        the check acts on, the others would be a task doing nothing.
+        """
+        from juloserver.fraud_security.tasks import process_mobile_user_action_log_checks
+
+        for logs in request_logs:
+            if any(log.activity == FRAUD_CHECK_ACTIVITY for log in logs):
+                process_mobile_user_action_log_checks.apply_async(
+                    [[get_fraud_check_log_data(log) for log in logs]]
+                )
+
+    def log_continue_views(self, logs):
+        logger_view = [
+            {
+                'android_id': log.android_id,
+                'app_version': log.app_version,
+                'device_brand': log.device_brand,
+                'device_model': log.device_model,
+                'application_id': log.application_id,
+                **get_fraud_check_log_data(log),
+            }
+            for log in logs
+            if log.view == 'btnContinue'
+        ]
+        if logger_view:
+            logger.info(
+                {
+                    'message': 'Done process execute store_mobile_user_action_log',
+                    'data': logger_view,
+                }
+            )
+
+    def record_metrics(self, row_count, elapsed, lag):
+        metrics = {
+            'flushed_at': timezone.localtime(timezone.now()).isoformat(),
+            'row_count': row_count,
+            'rows_per_second': round(row_count / elapsed, 2),
+            'ingest_lag_seconds': round(lag, 3),
+            'buffer_length': self.redis_client.llen(self.buffer_key),
+        }
+        self.redis_client.hmset(
+            USER_ACTION_LOG_INGEST_METRICS_KEY.format(self.buffer_name), metrics
+        )
+        logger.info(
+            {
+                'message': 'user action log buffer flushed',
+                'buffer_name': self.buffer_name,
+                **metrics,
+            }
+        )
+
+
+def get_ingest_metrics(buffer_name):
+    return get_redis_client().hgetall(USER_ACTION_LOG_INGEST_METRICS_KEY.format(buffer_name))
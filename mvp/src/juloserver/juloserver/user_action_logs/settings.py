@@ -0,0 +1,8 @@
+from datetime import timedelta
+
+USER_ACTION_LOG_SCHEDULE = {
+    'flush_user_action_log_buffers': {
+        'task': 'juloserver.user_action_logs.tasks.flush_user_action_log_buffers',
+        'schedule': timedelta(seconds=10),
+    },
+}
@@ -5,7 +5,12 @@ from celery.task import task
 
 from juloserver.fraud_security.tasks import process_mobile_user_action_log_checks
 from juloserver.julo.clients import get_julo_sentry_client
+from juloserver.user_action_logs.constants import UserActionLogBuffer
 from juloserver.user_action_logs.models import MobileUserActionLog, WebUserActionLog
+from juloserver.user_action_logs.services import (
+    UserActionLogIngestion,
+    get_buffered_ingestion_setting,
+)
 from juloserver.julolog.julolog import JuloLog
 
 logger = JuloLog(__name__)
@@ -78,3 +83,20 @@ def store_mobile_user_action_log(validated_data_compressed: bytes):
 @task(queue='user_action_log')
 def store_web_log(data: dict):
     WebUserActionLog.objects.create(**data)
+
+
+@task(queue='user_action_log')
+def flush_user_action_log_buffer(buffer_name):
+    """Write the buffered user action logs, see user_action_logs.services."""
+    setting = get_buffered_ingestion_setting() or {}
+    return UserActionLogIngestion(buffer_name, **setting).flush()
+
+
+@task(queue='user_action_log')
+def flush_user_action_log_buffers():
+    """
+    Periodic flush, for the buffers that did not reach flush_size.
+    It still runs when the feature setting is turned off, to drain what was buffered.
+    """
+    for buffer_name in UserActionLogBuffer.all():
+        flush_user_action_log_buffer(buffer_name)
@@ -0,0 +1,151 @@
+from django.db import DataError, OperationalError
+from django.test import TestCase
+from django.utils import timezone
+from mock import patch
+
+from juloserver.julo.services2.redis_helper import MockRedisHelper
+from juloserver.user_action_logs.constants import (
+    USER_ACTION_LOG_BUFFER_KEY,
+    UserActionLogBuffer,
+)
+from juloserver.user_action_logs.models import MobileUserActionLog
+from juloserver.user_action_logs.services import (
+    UserActionLogIngestion,
+    buffer_user_action_logs,
+    get_ingest_metrics,
+)
+
+
+def get_mobile_event(customer_id, activity='SplashScreenActivity'):
+    return dict(
+        log_ts=timezone.now(),
+        customer_id=customer_id,
+        application_id=None,
+        app_version='8.18.1',
+        android_id='f2139f5be7a6d392',
+        device_brand='asus',
+        android_api_level=28,
+        session_id='ofCmcEQoEo_86',
+        module='splash_landing',
+        activity=activity,
+        activity_counter=1,
+        event='onStart',
+    )
+
+
+@patch('juloserver.user_action_logs.services.get_redis_client')
+class TestUserActionLogIngestion(TestCase):
+    def setUp(self):
+        self.redis_client = MockRedisHelper()
+
+    @patch('juloserver.fraud_security.tasks.process_mobile_user_action_log_checks.apply_async')
+    @patch('juloserver.user_action_logs.tasks.flush_user_action_log_buffer.delay')
+    def test_flush_many_requests(
+        self, mock_flush_delay, mock_fraud_checks, mock_get_redis_client
+    ):
+        mock_get_redis_client.return_value = self.redis_client
+        for customer_id in range(1, 4):
+            buffer_user_action_logs(
+                UserActionLogBuffer.MOBILE,
+                [get_mobile_event(customer_id), get_mobile_event(customer_id)],
+                flush_size=3,
+            )
+        buffer_user_action_logs(
+            UserActionLogBuffer.MOBILE,
+            [get_mobile_event(4, activity='ChangePhoneActivity')],
+            flush_size=3,
+        )
+        mock_flush_delay.assert_called_once_with(UserActionLogBuffer.MOBILE)
+
+        row_count = UserActionLogIngestion(
+            UserActionLogBuffer.MOBILE, flush_size=3, insert_batch_size=1000
+        ).flush()
+
+        self.assertEqual(row_count, 7)
+        self.assertEqual(MobileUserActionLog.objects.count(), 7)
+        mock_fraud_checks.assert_called_once()
+        self.assertEqual(mock_fraud_checks.call_args[0][0][0][0]['customer_id'], 4)
+        metrics = get_ingest_metrics(UserActionLogBuffer.MOBILE)
+        self.assertEqual(metrics['row_count'], '1')
+        self.assertEqual(metrics['buffer_length'], '0')
+
+    def test_failed_flush_is_pushed_back(self, mock_get_redis_client):
+        mock_get_redis_client.return_value = self.redis_client
+        buffer_user_action_logs(UserActionLogBuffer.MOBILE, [get_mobile_event(1)])
+        ingestion = UserActionLogIngestion(UserActionLogBuffer.MOBILE)
+
+        with patch.object(
+            MobileUserActionLog.objects, 'bulk_create', side_effect=OperationalError('db down')
+        ), self.assertRaises(OperationalError):
+            ingestion.flush()
+
+        self.assertEqual(self.redis_client.llen(ingestion.buffer_key), 1)
+        self.assertEqual(ingestion.flush(), 1)
+
+    @patch('juloserver.user_action_logs.services.get_julo_sentry_client')
+    def test_bad_requests_are_moved_to_dead_letter(
+        self, mock_get_sentry_client, mock_get_redis_client
+    ):
+        mock_get_redis_client.return_value = self.redis_client
+        buffer_user_action_logs(UserActionLogBuffer.MOBILE, [get_mobile_event(1)])
+        buffer_user_action_logs(
+            UserActionLogBuffer.MOBILE, [dict(get_mobile_event(2), unknown_field=1)]
+        )
+        self.redis_client.rpush(
+            USER_ACTION_LOG_BUFFER_KEY.format(UserActionLogBuffer.MOBILE), b'not a request'
+        )
+        buffer_user_action_logs(
+            UserActionLogBuffer.MOBILE, [get_mobile_event(3), get_mobile_event(3)]
+        )
+        ingestion = UserActionLogIngestion(UserActionLogBuffer.MOBILE)
+
+        self.assertEqual(ingestion.flush(), 3)
+        self.assertEqual(MobileUserActionLog.objects.count(), 3)
+        self.assertEqual(self.redis_client.llen(ingestion.buffer_key), 0)
+        self.assertEqual(self.redis_client.llen(ingestion.dead_letter_key), 2)
+        self.assertEqual(mock_get_sentry_client.return_value.captureException.call_count, 2)
+
+    @patch('juloserver.user_action_logs.services.get_julo_sentry_client')
+    def test_bad_rows_are_moved_to_dead_letter(
+        self, mock_get_sentry_client, mock_get_redis_client
+    ):
+        mock_get_redis_client.return_value = self.redis_client
+        for customer_id in range(1, 6):
+            buffer_user_action_logs(UserActionLogBuffer.MOBILE, [get_mobile_event(customer_id)])
+        ingestion = UserActionLogIngestion(UserActionLogBuffer.MOBILE)
+        bulk_create = MobileUserActionLog.objects.bulk_create
+
+        def fail_on_customer_3(logs, **kwargs):
+            if any(log.customer_id == 3 for log in logs):
+                raise DataError('value too long')
+            return bulk_create(logs, **kwargs)
+
+        with patch.object(
+            MobileUserActionLog.objects, 'bulk_create', side_effect=fail_on_customer_3
+        ):
+            self.assertEqual(ingestion.flush(), 4)
+
+        self.assertEqual(
+            sorted(MobileUserActionLog.objects.values_list('customer_id', flat=True)),
+            [1, 2, 4, 5],
+        )
+        self.assertEqual(self.redis_client.llen(ingestion.buffer_key), 0)
+        self.assertEqual(self.redis_client.llen(ingestion.dead_letter_key), 1)
+
+    @patch('juloserver.user_action_logs.services.get_julo_sentry_client')
+    @patch('juloserver.fraud_security.tasks.process_mobile_user_action_log_checks.apply_async')
+    def test_failure_after_commit_is_not_pushed_back(
+        self, mock_fraud_checks, mock_get_sentry_client, mock_get_redis_client
+    ):
+        mock_get_redis_client.return_value = self.redis_client
+        mock_fraud_checks.side_effect = ValueError('broker down')
+        buffer_user_action_logs(
+            UserActionLogBuffer.MOBILE, [get_mobile_event(1, activity='ChangePhoneActivity')]
+        )
+        ingestion = UserActionLogIngestion(UserActionLogBuffer.MOBILE)
+
+        self.assertEqual(ingestion.flush(), 1)
+        self.assertEqual(ingestion.flush(), 0)
+        self.assertEqual(MobileUserActionLog.objects.count(), 1)
+        self.assertEqual(self.redis_client.llen(ingestion.buffer_key), 0)
+        mock_get_sentry_client.return_value.captureException.assert_called_once()
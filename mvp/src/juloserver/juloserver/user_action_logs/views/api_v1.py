@@ -6,12 +6,17 @@ from rest_framework.views import APIView
 
 from juloserver.application_flow.services2.bank_statement import LBSJWTAuthentication
 from juloserver.core.authentication import JWTAuthentication
+from juloserver.user_action_logs.constants import UserActionLogBuffer
 from juloserver.user_action_logs.models import WebUserActionLog
 from juloserver.user_action_logs.serializers import (
     CustomMobileUserActionLogSerializer,
     WebUserActionLogSerializer,
     AgentAssignWebUserActionLogSerializer,
 )
+from juloserver.user_action_logs.services import (
+    buffer_user_action_logs,
+    get_buffered_ingestion_setting,
+)
 from juloserver.user_action_logs.tasks import store_mobile_user_action_log, store_web_log
 from juloserver.user_action_logs.views import UserActionLogAuthentication
 from juloserver.standardized_api_response.mixin import (
@@ -52,8 +57,16 @@ class SubmitLog(StandardizedExceptionHandlerMixin, APIView):
             request=request,
         )
 
-        validated_data_compress = zlib.compress(pickle.dumps(serializer.validated_data))
-        store_mobile_user_action_log.delay(validated_data_compress)
+        buffered_ingestion_setting = get_buffered_ingestion_setting()
+        if buffered_ingestion_setting:
+            buffer_user_action_logs(
+                UserActionLogBuffer.MOBILE,
+                serializer.validated_data,
+                buffered_ingestion_setting['flush_size'],
+            )
+        else:
+            validated_data_compress = zlib.compress(pickle.dumps(serializer.validated_data))
+            store_mobile_user_action_log.delay(validated_data_compress)
 
         logger.info(
             {
@@ -86,7 +99,15 @@ class WebLog(StandardizedExceptionHandlerMixin, APIView):
         if not serializer.is_valid():
             return custom_bad_request_response(serializer.errors)
 
-        store_web_log.delay(dict(serializer.validated_data))
+        buffered_ingestion_setting = get_buffered_ingestion_setting()
+        if buffered_ingestion_setting:
+            buffer_user_action_logs(
+                UserActionLogBuffer.WEB,
+                dict(serializer.validated_data),
+                buffered_ingestion_setting['flush_size'],
+            )
+        else:
+            store_web_log.delay(dict(serializer.validated_data))
         return created_response(data={'message': 'Data submitted successfully'})
 
 
@@ -1,5 +1,5 @@
 from builtins import str
-from collections import OrderedDict
+from collections import Counter, OrderedDict
 from django.utils import timezone
 from django.db.models import Case, When, Value, BooleanField, CharField, Q
 from babel.dates import format_date
@@ -44,7 +44,8 @@ from .waiver_related import get_partial_account_payments_by_program
 
 from juloserver.apiv2.models import LoanRefinancingScoreJ1
 
-from juloserver.julo.models import FeatureSetting
+from juloserver.julo.models import FeatureSetting, Loan
+from juloserver.julo.statuses import LoanStatusCodes
 from juloserver.julo.constants import FeatureNameConst
 from juloserver.minisquad.utils import collection_detokenize_sync_object_model
 from juloserver.julo.utils import display_rupiah
@@ -112,9 +113,9 @@ def can_account_get_refinancing_centralized(account_id):
     if not account:
         return False, "Invalid Account ID"
 
-    feature_setting = FeatureSetting.objects.filter(
-        feature_name=FeatureNameConst.REFINANCING_RESTRICT_CHANNELING_LOAN, is_active=True
-    ).last()
+    feature_setting = FeatureSetting.objects.get_cached(
+        FeatureNameConst.REFINANCING_RESTRICT_CHANNELING_LOAN, is_active=True
+    )
     if not feature_setting:
         return True, ""
 
@@ -128,9 +129,9 @@ def can_account_get_refinancing_centralized(account_id):
     if account.loan_set.filter(filter).exists():
         return False, criteria["message"]
 
-    bss_feature_setting = FeatureSetting.objects.filter(
-        feature_name=FeatureBSSRefinancing.FEATURE_NAME, is_active=True
-    ).exists()
+    bss_feature_setting = FeatureSetting.objects.get_cached(
+        FeatureBSSRefinancing.FEATURE_NAME, is_active=True
+    ) is not None
 
     if not bss_feature_setting:
         return True, "BSS Feature setting is off"
@@ -158,6 +159,70 @@ def can_account_get_refinancing_centralized(account_id):
     return True, ''
 
 
+def get_refinancing_centralized_eligible_account_ids(account_ids):
+    """
+    Same rules as can_account_get_refinancing_centralized for many accounts,
+    with a fixed number of queries
+    """
+    account_ids = set(account_ids)
+    feature_setting = FeatureSetting.objects.get_cached(
+        FeatureNameConst.REFINANCING_RESTRICT_CHANNELING_LOAN, is_active=True
+    )
+    if not feature_setting or not account_ids:
+        return account_ids
+
+    criteria = feature_setting.parameters
+
+    filter = Q()
+    for key, values in criteria["data"].items():
+        queries = values['query']
+        filter = filter | Q(**queries)
+
+    account_ids -= set(
+        Loan.objects.filter(account_id__in=account_ids)
+        .filter(filter)
+        .values_list('account_id', flat=True)
+    )
+
+    bss_feature_setting = FeatureSetting.objects.get_cached(
+        FeatureBSSRefinancing.FEATURE_NAME, is_active=True
+    ) is not None
+    if not bss_feature_setting or not account_ids:
+        return account_ids
+
+    channeling_lender_block = LenderCurrent.objects.filter(
+        lender_name=BSSChannelingConst.LENDER_NAME
+    ).last()
+    if not channeling_lender_block:
+        return account_ids
+
+    loan_account_ids = dict(
+        Loan.objects.filter(
+            account_id__in=account_ids,
+            loan_status_id__gte=LoanStatusCodes.CURRENT,
+            loan_status_id__lte=LoanStatusCodes.LOAN_180DPD,
+            lender_id=channeling_lender_block.id,
+        ).values_list('id', 'account_id')
+    )
+    if not loan_account_ids:
+        return account_ids
+
+    loan_counts = Counter(loan_account_ids.values())
+    write_off_counts = Counter(
+        loan_account_ids[loan_id]
+        for loan_id in ChannelingLoanWriteOff.objects.filter(
+            channeling_type=ChannelingConst.BSS,
+            is_write_off=True,
+            loan_id__in=list(loan_account_ids),
+        ).values_list('loan_id', flat=True)
+    )
+    return {
+        account_id
+        for account_id in account_ids
+        if loan_counts[account_id] == write_off_counts[account_id]
+    }
+
+
 def can_account_get_refinancing_centralized_crm(account_id, user):
     result, message = can_account_get_refinancing_centralized(account_id)
     if (